@@ -9,6 +9,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from ..core.config import get_config, SystemConfig
+from ..core.journal import get_operation_journal
 from ..remote.workstation import WorkstationManager
 from ..remote.ldplayer_manager import LDPlayerManager
 from ..utils.logger import get_logger, LogCategory
@@ -93,7 +94,12 @@ def get_ldplayer_manager(workstation_id: str) -> LDPlayerManager:
             )
         
         workstation_manager = WorkstationManager(workstation_config)
-        ldplayer_managers[workstation_id] = LDPlayerManager(workstation_manager)
+        ldplayer_managers[workstation_id] = LDPlayerManager(
+            workstation_manager,
+            concurrency=get_config().operation_concurrency,
+            journal=get_operation_journal(),
+            launch_limits={**get_config().launch_admission, **workstation_config.launch_limits}
+        )
 
     return ldplayer_managers[workstation_id]
 
@@ -76,7 +76,7 @@ async def get_server_status(config: SystemConfig = Depends(get_system_config)):
         for ws_id in workstation_managers.keys():
             if ws_id in ldplayer_managers:
                 ldplayer_manager = ldplayer_managers[ws_id]
-                total_emulators += len(ldplayer_manager.get_emulators())
+                total_emulators += len(await ldplayer_manager.get_emulators_async())
                 active_operations += len(ldplayer_manager.get_active_operations())
     except (KeyError, AttributeError, TypeError) as e:
         logger_api.log_error(f"Failed to count emulators/operations: {e}")
@@ -3,10 +3,11 @@ API роуты для управления операциями.
 """
 
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from ..core.config import get_system_config, SystemConfig
+from ..core.counters import get_fleet_counters
 from .dependencies import (
     get_ldplayer_manager, 
     ldplayer_managers, 
@@ -67,11 +68,16 @@ async def get_operations(config: SystemConfig = Depends(get_system_config)) -> L
 
 @router.get("/{operation_id}")
 @handle_api_errors(LogCategory.OPERATION)
-async def get_operation(operation_id: str, config: SystemConfig = Depends(get_system_config)) -> Dict[str, Any]:
+async def get_operation(
+    operation_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Ожидать завершения до N секунд (long-poll)"),
+    config: SystemConfig = Depends(get_system_config)
+) -> Dict[str, Any]:
     """Получить информацию об операции.
     
     Args:
         operation_id: ID операции
+        wait: Ожидать завершения операции до wait секунд (long-poll)
         
     Returns:
         Dict с информацией об операции
@@ -88,6 +94,8 @@ async def get_operation(operation_id: str, config: SystemConfig = Depends(get_sy
         operation = ldplayer_manager.get_operation(operation_id)
 
         if operation:
+            if wait:
+                await operation.wait(wait)
             return {
                 "id": operation.id,
                 "type": operation.type.value,
@@ -180,51 +188,63 @@ async def get_workstation_operations(workstation_id: str) -> List[Dict[str, Any]
 
 @router.get("/stats/summary")
 async def get_operations_stats(config: SystemConfig = Depends(get_system_config)) -> Dict[str, Any]:
-    """Получить статистику по операциям."""
+    """Получить статистику по операциям.
+
+    Числа читаются из счетчиков парка, которые обновляются при каждом
+    переходе операции, - без обхода операций всех станций.
+    """
+    counters = get_fleet_counters()
+    statuses = ("pending", "running", "completed", "failed", "cancelled")
+
     stats = {
-        "total_operations": 0,
-        "pending": 0,
-        "running": 0,
-        "completed": 0,
-        "failed": 0,
-        "cancelled": 0,
+        "total_operations": counters.operations(),
+        **{status_key: counters.operations(status=status_key) for status_key in statuses},
+        "by_type": counters.get_stats()["operations"]["by_type"],
         "by_workstation": {}
     }
 
     for ws_config in config.workstations:
-        try:
-            if ws_config.id not in ldplayer_managers:
-                continue
-
-            ldplayer_manager = ldplayer_managers[ws_config.id]
-            operations = ldplayer_manager.get_active_operations()
+        total = counters.operations(ws_config.id)
+        if ws_config.id not in ldplayer_managers and not total:
+            continue
 
-            ws_stats = {
-                "total": len(operations),
-                "pending": 0,
-                "running": 0,
-                "completed": 0,
-                "failed": 0,
-                "cancelled": 0
+        stats["by_workstation"][ws_config.id] = {
+            "name": ws_config.name,
+            "stats": {
+                "total": total,
+                **{status_key: counters.operations(ws_config.id, status_key) for status_key in statuses}
             }
+        }
 
-            for operation in operations:
-                stats["total_operations"] += 1
+    return stats
 
-                status_key = operation.status.value
-                if status_key in ws_stats:
-                    ws_stats[status_key] += 1
-                    stats[status_key] += 1
 
-            stats["by_workstation"][ws_config.id] = {
-                "name": ws_config.name,
-                "stats": ws_stats
-            }
+@router.get("/stats/scheduler")
+async def get_scheduler_stats(config: SystemConfig = Depends(get_system_config)) -> Dict[str, Any]:
+    """Получить метрики очередей операций по рабочим станциям.
 
-        except Exception:
-            continue
+    Returns:
+        Dict[str, Any]: Лимиты, глубина очередей и время ожидания по станциям
+    """
+    return {
+        ws_config.id: ldplayer_managers[ws_config.id].get_scheduler_stats()
+        for ws_config in config.workstations
+        if ws_config.id in ldplayer_managers
+    }
 
-    return stats
+
+@router.get("/stats/admission")
+async def get_admission_stats(config: SystemConfig = Depends(get_system_config)) -> Dict[str, Any]:
+    """Получить статистику допуска запусков по рабочим станциям.
+
+    Returns:
+        Dict[str, Any]: Ожидающие запуски, запас станции и запуски за минуту по станциям
+    """
+    return {
+        ws_config.id: ldplayer_managers[ws_config.id].get_admission_stats()
+        for ws_config in config.workstations
+        if ws_config.id in ldplayer_managers
+    }
 
 
 @router.delete("/cleanup", response_model=APIResponse)
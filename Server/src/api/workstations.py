@@ -3,22 +3,29 @@ API роуты для управления рабочими станциями.
 Требуют JWT аутентификацию.
 """
 
+import asyncio
+import json
 import os
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ..core.config import get_system_config, SystemConfig, config_manager, WorkstationConfig
 from ..core.models import WorkstationStatus
+from ..core.history import get_history_store, workstation_series, emulator_series
 from ..core.exceptions import (
     WorkstationException, WorkstationNotFoundError, WorkstationConnectionError,
     WorkstationCommandError, ValidationException, InvalidWorkstationConfig
 )
-from .dependencies import get_workstation_service, get_emulator_service, verify_token
+from .dependencies import get_workstation_service, get_emulator_service, get_workstation_manager, verify_token
 from ..utils.logger import get_logger, LogCategory
 from ..utils.mock_data import get_mock_workstations, get_mock_emulators
 from ..services.workstation_service import WorkstationService
 from ..services.emulator_service import EmulatorService
+from ..remote.protocols import connection_pool
+from ..remote.workstation import WorkstationManager
 from ..utils.validators import validate_pagination_params, validate_workstation_name, validate_ip_address
 from ..utils.constants import ErrorMessage, OperationStatus
 
@@ -231,6 +238,54 @@ async def remove_workstation(
         )
 
 
+@router.post("/test-connection")
+async def test_all_connections(
+    stream: bool = False,
+    host_timeout: float = 30.0,
+    deadline: float = 60.0,
+    config: SystemConfig = Depends(get_system_config),
+    current_user: str = Depends(verify_token)
+):
+    """Протестировать подключение ко всем рабочим станциям параллельно.
+
+    Время обхода определяется самой медленной станцией (но не больше deadline).
+    При stream=true результаты отдаются в формате NDJSON по мере ответа станций.
+    """
+    for ws_config in config.workstations:
+        connection_pool.get_connection(ws_config)
+
+    if stream:
+        async def stream_results():
+            async for ws_id, success, message in connection_pool.iter_test_all(host_timeout, deadline):
+                yield json.dumps(
+                    {"workstation_id": ws_id, "success": success, "message": message},
+                    ensure_ascii=False
+                ) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    started = time.perf_counter()
+    results = await connection_pool.test_all(host_timeout, deadline)
+    elapsed = time.perf_counter() - started
+
+    logger.log_system_event(
+        f"Connection sweep: {sum(ok for ok, _ in results.values())}/{len(results)} online",
+        {"elapsed_seconds": elapsed}
+    )
+
+    return APIResponse(
+        success=all(ok for ok, _ in results.values()),
+        message=f"Connection sweep completed in {elapsed:.2f}s",
+        data={
+            "elapsed_seconds": round(elapsed, 3),
+            "results": {
+                ws_id: {"success": ok, "message": message}
+                for ws_id, (ok, message) in results.items()
+            }
+        }
+    )
+
+
 @router.post("/{workstation_id}/test-connection", response_model=APIResponse)
 async def test_workstation_connection(
     workstation_id: str,
@@ -310,6 +365,27 @@ async def get_workstation_system_info(
         )
 
 
+@router.get("/{workstation_id}/latency")
+async def get_workstation_latency(
+    workstation_id: str,
+    manager: WorkstationManager = Depends(get_workstation_manager),
+    current_user: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    """Получить выученные задержки и адаптивные таймауты команд станции.
+
+    Таймаут действия = timeout_multiplier * p99 в границах
+    [min_command_timeout, max_command_timeout]; пока замеров мало,
+    timeout_seconds равен null и действует таймаут по умолчанию.
+    """
+    return {
+        "workstation_id": workstation_id,
+        "timeout_multiplier": manager.config.timeout_multiplier,
+        "min_command_timeout": manager.config.min_command_timeout,
+        "max_command_timeout": manager.config.max_command_timeout,
+        "actions": manager.get_latency_stats()
+    }
+
+
 @router.get("/{workstation_id}/emulators", tags=["emulators"])
 async def get_workstation_emulators(
     workstation_id: str,
@@ -384,3 +460,115 @@ async def scan_workstation_emulators(
         Результат сканирования
     """
     return await get_workstation_emulators(workstation_id, service, current_user)
+
+
+@router.get("/{workstation_id}/emulators/configs", tags=["emulators"])
+async def get_workstation_emulator_configs(
+    workstation_id: str,
+    refresh: bool = False,
+    service: WorkstationService = Depends(get_workstation_service),
+    current_user: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    """Получить поля конфигураций эмуляторов из индекса (колонками).
+
+    Индекс читает файлы конфигураций с диска сервера, поэтому доступен
+    только для локальной станции (LocalLDPlayerScanner); refresh=true
+    перечитывает только измененные файлы конфигураций.
+
+    Args:
+        workstation_id: ID рабочей станции
+        refresh: Обновить индекс перед ответом
+
+    Returns:
+        Колонки cpu, memory_mb, width, height, dpi и идентификаторов устройства
+    """
+    from ..remote.config_index import get_config_index
+    from ..remote.emulator_scanner import LOCAL_HOSTS
+
+    ws = await service.get_or_fail(workstation_id)
+    if ws.ip_address not in LOCAL_HOSTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Индекс конфигураций доступен только для локальной станции"
+        )
+    if not ws.ldplayer_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="У станции не задан путь к LDPlayer"
+        )
+
+    index = get_config_index(ws.ldplayer_path)
+    if refresh:
+        # Чтение файлов конфигураций - в потоке, чтобы не блокировать event loop
+        await asyncio.to_thread(index.refresh)
+
+    return {
+        "workstation_id": workstation_id,
+        "count": len(index),
+        "columns": index.columns(),
+        "stats": index.get_stats()
+    }
+
+
+async def _query_history(series: str, metric: str, start: Optional[float],
+                         end: Optional[float], resolution: str) -> Dict[str, Any]:
+    """Запрос диапазона истории (по умолчанию последний час)."""
+    end = end if end is not None else time.time()
+    start = start if start is not None else end - 3600
+    try:
+        return await asyncio.to_thread(get_history_store().query, series, metric, start, end, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{workstation_id}/history")
+async def get_workstation_history(
+    workstation_id: str,
+    metric: str = "active_emulators",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    resolution: str = "auto",
+    current_user: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    """Получить историю метрики рабочей станции.
+
+    Метрики: total_emulators, active_emulators, cpu_usage, memory_usage,
+    disk_usage, ldplayer_processes, online.
+
+    Args:
+        workstation_id: ID рабочей станции
+        metric: Метрика
+        start: Начало интервала (unix time, по умолчанию час назад)
+        end: Конец интервала (unix time, по умолчанию сейчас)
+        resolution: raw, 1m, 1h или auto (по длине интервала)
+
+    Returns:
+        Точки {ts, avg, min, max, count} по времени
+    """
+    return await _query_history(workstation_series(workstation_id), metric, start, end, resolution)
+
+
+@router.get("/{workstation_id}/emulators/{emulator_name}/history", tags=["emulators"])
+async def get_emulator_history(
+    workstation_id: str,
+    emulator_name: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    resolution: str = "auto",
+    current_user: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    """Получить историю состояния эмулятора (running: доля времени в запущенном состоянии).
+
+    Args:
+        workstation_id: ID рабочей станции
+        emulator_name: Имя эмулятора
+        start: Начало интервала (unix time, по умолчанию час назад)
+        end: Конец интервала (unix time, по умолчанию сейчас)
+        resolution: raw, 1m, 1h или auto (по длине интервала)
+
+    Returns:
+        Точки {ts, avg, min, max, count} по времени
+    """
+    return await _query_history(
+        emulator_series(f"{workstation_id}_{emulator_name}"), "running", start, end, resolution
+    )
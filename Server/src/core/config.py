@@ -48,7 +48,7 @@ class ServerConfig:
     access_token_expire_minutes: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkstationConfig:
     """Конфигурация рабочей станции."""
     id: str
@@ -67,6 +67,16 @@ class WorkstationConfig:
     smb_enabled: bool = True
     powershell_remoting_enabled: bool = True
     winrm_port: int = 5985
+    max_concurrent_commands: int = 4  # потоков на станцию для WinRM вызовов
+    min_sessions: int = 1  # минимум WinRM сессий в пуле станции
+    max_sessions: int = 4  # максимум WinRM сессий в пуле станции
+    session_idle_timeout: int = 300  # секунды простоя до закрытия лишней сессии
+    timeout_multiplier: float = 3.0  # таймаут команды = множитель * p99 задержки
+    min_command_timeout: float = 5.0  # нижняя граница адаптивного таймаута (секунды)
+    max_command_timeout: float = 600.0  # верхняя граница адаптивного таймаута (секунды)
+    emulators_cache_ttl: int = 30  # секунды, после которых список эмуляторов обновляется в фоне
+    emulators_max_staleness: int = 300  # секунды, сколько отдавать устаревший список при недоступной станции
+    launch_limits: Dict[str, float] = field(default_factory=dict)  # пороги допуска запусков поверх system.launch_admission
 
     # Мониторинг
     monitoring_enabled: bool = True
@@ -98,6 +108,8 @@ class SystemConfig:
     configs_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "configs")
     logs_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "logs")
     backups_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "backups")
+    history_db: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "history.db")
+    operations_journal: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "operations.db")
 
     # Настройки резервного копирования
     backup_enabled: bool = True
@@ -112,6 +124,31 @@ class SystemConfig:
         "disk_usage": 90.0
     })
 
+    # История метрик (сырые точки -> 1m -> 1h)
+    history_raw_retention: int = 21600  # секунды хранения сырых точек (6 часов)
+    history_minute_retention: int = 604800  # секунды хранения минутных агрегатов (7 дней)
+    history_hour_retention: int = 31536000  # секунды хранения часовых агрегатов (365 дней)
+
+    # Журнал операций
+    operations_journal_retention: int = 86400  # секунды хранения завершенных операций (1 день)
+
+    # Лимиты одновременных операций на станцию по классам нагрузки
+    operation_concurrency: Dict[str, int] = field(default_factory=lambda: {
+        "heavy": 2,  # create, clone, delete
+        "launch": 8,  # launch
+        "light": 8  # quit, rename, modify
+    })
+
+    # Допуск запусков эмуляторов по запасу ресурсов станции
+    launch_admission: Dict[str, float] = field(default_factory=lambda: {
+        "max_cpu_percent": 85.0,
+        "min_free_memory_percent": 15.0,
+        "max_booting": 4,  # эмуляторов, загружающихся одновременно
+        "max_running": 0,  # запущенных эмуляторов на станции (0 - без ограничения)
+        "boot_seconds": 60.0,
+        "max_wait": 600.0
+    })
+
 
 class ConfigManager:
     """Менеджер конфигурации системы."""
@@ -232,6 +269,16 @@ class ConfigManager:
                     "smb_enabled": ws.smb_enabled,
                     "powershell_remoting_enabled": ws.powershell_remoting_enabled,
                     "winrm_port": ws.winrm_port,
+                    "max_concurrent_commands": ws.max_concurrent_commands,
+                    "min_sessions": ws.min_sessions,
+                    "max_sessions": ws.max_sessions,
+                    "session_idle_timeout": ws.session_idle_timeout,
+                    "timeout_multiplier": ws.timeout_multiplier,
+                    "min_command_timeout": ws.min_command_timeout,
+                    "max_command_timeout": ws.max_command_timeout,
+                    "emulators_cache_ttl": ws.emulators_cache_ttl,
+                    "emulators_max_staleness": ws.emulators_max_staleness,
+                    "launch_limits": ws.launch_limits,
                     "monitoring_enabled": ws.monitoring_enabled,
                     "monitoring_interval": ws.monitoring_interval,
                     "status": ws.status,
@@ -244,11 +291,19 @@ class ConfigManager:
                 "configs_dir": str(config.configs_dir),
                 "logs_dir": str(config.logs_dir),
                 "backups_dir": str(config.backups_dir),
+                "history_db": str(config.history_db),
+                "operations_journal": str(config.operations_journal),
                 "backup_enabled": config.backup_enabled,
                 "backup_interval": config.backup_interval,
                 "max_backups": config.max_backups,
                 "global_monitoring": config.global_monitoring,
-                "alert_thresholds": config.alert_thresholds
+                "alert_thresholds": config.alert_thresholds,
+                "history_raw_retention": config.history_raw_retention,
+                "history_minute_retention": config.history_minute_retention,
+                "history_hour_retention": config.history_hour_retention,
+                "operations_journal_retention": config.operations_journal_retention,
+                "operation_concurrency": config.operation_concurrency,
+                "launch_admission": config.launch_admission
             }
         }
 
@@ -274,11 +329,21 @@ class ConfigManager:
             configs_dir=Path(system_data.get("configs_dir", "")),
             logs_dir=Path(system_data.get("logs_dir", "")),
             backups_dir=Path(system_data.get("backups_dir", "")),
+            history_db=Path(system_data.get("history_db", Path(__file__).parent.parent.parent / "history.db")),
+            operations_journal=Path(system_data.get(
+                "operations_journal", Path(__file__).parent.parent.parent / "operations.db"
+            )),
             backup_enabled=system_data.get("backup_enabled", True),
             backup_interval=system_data.get("backup_interval", 3600),
             max_backups=system_data.get("max_backups", 10),
             global_monitoring=system_data.get("global_monitoring", True),
-            alert_thresholds=system_data.get("alert_thresholds", {})
+            alert_thresholds=system_data.get("alert_thresholds", {}),
+            history_raw_retention=system_data.get("history_raw_retention", 21600),
+            history_minute_retention=system_data.get("history_minute_retention", 604800),
+            history_hour_retention=system_data.get("history_hour_retention", 31536000),
+            operations_journal_retention=system_data.get("operations_journal_retention", 86400),
+            operation_concurrency=system_data.get("operation_concurrency", {"heavy": 2, "launch": 8, "light": 8}),
+            launch_admission=system_data.get("launch_admission", SystemConfig().launch_admission)
         )
 
     def _ensure_directories(self) -> None:
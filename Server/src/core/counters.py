@@ -0,0 +1,152 @@
+"""
+Счетчики состояния парка.
+
+Счетчики обновляются при каждом переходе состояния (реестр эмуляторов,
+переходы операций), а не пересчитываются обходом станций, эмуляторов и
+операций на каждый запрос. Каждое изменение сразу учитывается во всех
+уровнях агрегации (станция/статус, станция, статус, всего), поэтому
+сводные эндпоинты читают готовые числа за O(1).
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Ключ агрегата "любое значение" на уровне станции/типа или статуса
+ANY = '*'
+
+EMULATORS = 'emulators'
+OPERATIONS = 'operations'
+OPERATIONS_BY_TYPE = 'operations_by_type'
+
+
+def _key(value: Any) -> str:
+    """Ключ счетчика (значение enum или строка)."""
+    if value is None:
+        return ANY
+    return str(getattr(value, 'value', value))
+
+
+class FleetCounters:
+    """Потокобезопасные счетчики эмуляторов и операций парка."""
+
+    def __init__(self):
+        """Инициализация пустых счетчиков."""
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str, str], int] = {}
+
+    # ------------------------------------------------------------------
+    # Обновление
+    # ------------------------------------------------------------------
+
+    def _bump(self, kind: str, group: Any, status: Any, delta: int) -> None:
+        """Изменить счетчик и его агрегаты (под блокировкой)."""
+        group, status = _key(group), _key(status)
+        counts = self._counts
+        for key in ((kind, group, status), (kind, ANY, status), (kind, group, ANY), (kind, ANY, ANY)):
+            counts[key] = counts.get(key, 0) + delta
+
+    def emulator_added(self, workstation_id: str, status: Any) -> None:
+        """Эмулятор вошел в индекс статуса станции."""
+        with self._lock:
+            self._bump(EMULATORS, workstation_id, status, 1)
+
+    def emulator_removed(self, workstation_id: str, status: Any) -> None:
+        """Эмулятор покинул индекс статуса станции."""
+        with self._lock:
+            self._bump(EMULATORS, workstation_id, status, -1)
+
+    def operation_added(self, operation: Any) -> None:
+        """Операция поставлена на учет."""
+        with self._lock:
+            self._bump(OPERATIONS, operation.workstation_id, operation.status, 1)
+            self._bump(OPERATIONS_BY_TYPE, operation.type, operation.status, 1)
+
+    def operation_transition(self, operation: Any, previous_status: Any) -> None:
+        """Операция перешла из previous_status в текущий статус."""
+        with self._lock:
+            self._bump(OPERATIONS, operation.workstation_id, previous_status, -1)
+            self._bump(OPERATIONS_BY_TYPE, operation.type, previous_status, -1)
+            self._bump(OPERATIONS, operation.workstation_id, operation.status, 1)
+            self._bump(OPERATIONS_BY_TYPE, operation.type, operation.status, 1)
+
+    def operation_removed(self, operation: Any) -> None:
+        """Операция снята с учета (очистка завершенных)."""
+        with self._lock:
+            self._bump(OPERATIONS, operation.workstation_id, operation.status, -1)
+            self._bump(OPERATIONS_BY_TYPE, operation.type, operation.status, -1)
+
+    def reset(self, kind: Optional[str] = None) -> None:
+        """Обнулить счетчики вида (None - все)."""
+        with self._lock:
+            if kind is None:
+                self._counts.clear()
+            else:
+                for key in [key for key in self._counts if key[0] == kind]:
+                    del self._counts[key]
+
+    # ------------------------------------------------------------------
+    # Чтение (O(1))
+    # ------------------------------------------------------------------
+
+    def emulators(self, workstation_id: Optional[str] = None, status: Any = None) -> int:
+        """Количество эмуляторов станции (None - парка) в статусе (None - любом)."""
+        return self._counts.get((EMULATORS, _key(workstation_id), _key(status)), 0)
+
+    def operations(self, workstation_id: Optional[str] = None, status: Any = None) -> int:
+        """Количество операций станции (None - парка) в статусе (None - любом)."""
+        return self._counts.get((OPERATIONS, _key(workstation_id), _key(status)), 0)
+
+    def operations_by_type(self, operation_type: Any = None, status: Any = None) -> int:
+        """Количество операций типа (None - любого) в статусе (None - любом)."""
+        return self._counts.get((OPERATIONS_BY_TYPE, _key(operation_type), _key(status)), 0)
+
+    def breakdown(self, kind: str, group: Any = None) -> Dict[str, int]:
+        """Ненулевые счетчики по статусам для станции/типа (None - весь парк).
+
+        Args:
+            kind: EMULATORS, OPERATIONS или OPERATIONS_BY_TYPE
+            group: Станция или тип операции
+
+        Returns:
+            Dict[str, int]: Статус -> количество
+        """
+        group = _key(group)
+        with self._lock:
+            return {
+                status: count
+                for (key_kind, key_group, status), count in self._counts.items()
+                if key_kind == kind and key_group == group and status != ANY and count
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Сводка счетчиков парка.
+
+        Returns:
+            Dict[str, Any]: Эмуляторы и операции по статусам, операции по типам
+        """
+        with self._lock:
+            types: Dict[str, Dict[str, int]] = {}
+            for (kind, group, status), count in self._counts.items():
+                if kind == OPERATIONS_BY_TYPE and group != ANY and status != ANY and count:
+                    types.setdefault(group, {})[status] = count
+        return {
+            'emulators': {'total': self.emulators(), 'by_status': self.breakdown(EMULATORS)},
+            'operations': {
+                'total': self.operations(),
+                'by_status': self.breakdown(OPERATIONS),
+                'by_type': types
+            }
+        }
+
+
+# Глобальные счетчики парка
+_fleet_counters = FleetCounters()
+
+
+def get_fleet_counters() -> FleetCounters:
+    """Получить глобальные счетчики парка.
+
+    Returns:
+        FleetCounters: Счетчики эмуляторов и операций
+    """
+    return _fleet_counters
@@ -0,0 +1,193 @@
+"""
+Внутренняя шина событий сервера.
+
+Производители (менеджеры станций в потоках пула) публикуют события,
+потребители получают их синхронным обработчиком в потоке публикации
+или асинхронным потоком событий в своем event loop (WebSocket).
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Типы изменений эмуляторов (сверка list2)
+EMULATOR_ADDED = "added"
+EMULATOR_REMOVED = "removed"
+EMULATOR_STATUS_CHANGED = "status_changed"
+
+
+class EventStream:
+    """Асинхронный поток событий шины для одного потребителя.
+
+    Очередь ограничена: медленный потребитель теряет новые события,
+    а не задерживает публикацию.
+    """
+
+    def __init__(self, bus: 'EventBus', loop: asyncio.AbstractEventLoop, maxsize: int):
+        """Инициализация потока.
+
+        Args:
+            bus: Шина событий
+            loop: Event loop потребителя
+            maxsize: Максимальный размер очереди
+        """
+        self._bus = bus
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def _offer(self, event: Any) -> bool:
+        """Передать событие в loop потребителя (из любого потока).
+
+        Returns:
+            bool: False если loop потребителя закрыт
+        """
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+            return True
+        except RuntimeError:
+            return False
+
+    def _put(self, event: Any) -> None:
+        """Положить событие в очередь (в loop потребителя)."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def get(self) -> Any:
+        """Дождаться следующего события.
+
+        Returns:
+            Any: Событие
+        """
+        return await self._queue.get()
+
+    def close(self) -> None:
+        """Отписаться от шины."""
+        self._bus._remove_stream(self)
+
+    def __aiter__(self) -> 'EventStream':
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._queue.get()
+
+
+class EventBus:
+    """Потокобезопасная шина событий."""
+
+    def __init__(self, max_queue: int = 10000):
+        """Инициализация шины.
+
+        Args:
+            max_queue: Размер очереди асинхронного потока по умолчанию
+        """
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._handlers: List[Callable[[Any], None]] = []
+        self._streams: List[EventStream] = []
+
+        self.stats: Dict[str, int] = {'published': 0, 'handler_errors': 0}
+
+    def subscribe(self, handler: Callable[[Any], None]) -> Callable[[], None]:
+        """Подписать синхронный обработчик.
+
+        Обработчик вызывается в потоке публикации и не должен блокироваться.
+
+        Args:
+            handler: Функция, принимающая событие
+
+        Returns:
+            Callable[[], None]: Функция отписки
+        """
+        with self._lock:
+            self._handlers.append(handler)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if handler in self._handlers:
+                    self._handlers.remove(handler)
+
+        return unsubscribe
+
+    def stream(self, maxsize: Optional[int] = None) -> EventStream:
+        """Открыть асинхронный поток событий в текущем event loop.
+
+        Args:
+            maxsize: Размер очереди (None - max_queue шины)
+
+        Returns:
+            EventStream: Поток событий
+        """
+        stream = EventStream(self, asyncio.get_running_loop(), maxsize or self.max_queue)
+        with self._lock:
+            self._streams.append(stream)
+        return stream
+
+    def _remove_stream(self, stream: EventStream) -> None:
+        """Удалить поток из подписчиков."""
+        with self._lock:
+            if stream in self._streams:
+                self._streams.remove(stream)
+
+    def publish(self, events: Iterable[Any]) -> int:
+        """Опубликовать события всем подписчикам.
+
+        Args:
+            events: События в порядке возникновения
+
+        Returns:
+            int: Количество опубликованных событий
+        """
+        events = list(events)
+        if not events:
+            return 0
+
+        with self._lock:
+            handlers = list(self._handlers)
+            streams = list(self._streams)
+            self.stats['published'] += len(events)
+
+        closed = []
+        for event in events:
+            for handler in handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    self.stats['handler_errors'] += 1
+                    print(f"Ошибка обработчика события: {e}")
+            for stream in streams:
+                if stream not in closed and not stream._offer(event):
+                    closed.append(stream)
+
+        for stream in closed:
+            self._remove_stream(stream)
+        return len(events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику шины.
+
+        Returns:
+            Dict[str, Any]: Счетчики и количество подписчиков
+        """
+        with self._lock:
+            return {
+                **self.stats,
+                'handlers': len(self._handlers),
+                'streams': len(self._streams),
+                'dropped': sum(stream.dropped for stream in self._streams),
+            }
+
+
+# Глобальная шина событий
+_event_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    """Получить глобальную шину событий.
+
+    Returns:
+        EventBus: Шина событий сервера
+    """
+    return _event_bus
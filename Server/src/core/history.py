@@ -0,0 +1,342 @@
+"""
+История метрик рабочих станций и эмуляторов.
+
+Встроенное хранилище временных рядов на SQLite (WAL). Точки копятся
+в памяти и записываются пакетами одной транзакцией. При записи каждая
+точка сразу добавляется в минутные и часовые агрегаты (count, sum, min,
+max), а устаревшие сырые точки и агрегаты удаляются по срокам хранения:
+сырые -> 1m -> 1h. Запрос диапазона выбирает разрешение по длине
+интервала, поэтому графики и планирование мощностей не опрашивают станции.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Разрешение -> длина интервала агрегата в секундах (0 - сырые точки)
+RESOLUTIONS: Dict[str, int] = {'raw': 0, '1m': 60, '1h': 3600}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_series_ts ON samples (series, metric, ts);
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    series TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    PRIMARY KEY (resolution, series, metric, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (resolution, series, metric, bucket, count, total, min, max)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, series, metric, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    total = total + excluded.total,
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max)
+"""
+
+# Сырые точки удаляются не чаще одного раза в интервал
+_PRUNE_INTERVAL = 60.0
+
+Sample = Tuple[str, str, float, float]
+
+
+def workstation_series(workstation_id: str) -> str:
+    """Ключ ряда рабочей станции."""
+    return f"ws:{workstation_id}"
+
+
+def emulator_series(emulator_id: str) -> str:
+    """Ключ ряда эмулятора."""
+    return f"emu:{emulator_id}"
+
+
+class HistoryStore:
+    """Потокобезопасное хранилище истории метрик."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        raw_retention: int = 21600,
+        minute_retention: int = 604800,
+        hour_retention: int = 31536000,
+        batch_size: int = 1000,
+        flush_interval: float = 5.0
+    ):
+        """Инициализация хранилища.
+
+        Args:
+            path: Файл базы SQLite (":memory:" - в памяти)
+            raw_retention: Хранение сырых точек в секундах
+            minute_retention: Хранение минутных агрегатов в секундах
+            hour_retention: Хранение часовых агрегатов в секундах
+            batch_size: Размер буфера, при котором точки записываются сразу
+            flush_interval: Максимальное время точки в буфере в секундах
+        """
+        self.path = str(path)
+        self.retention: Dict[int, int] = {0: raw_retention, 60: minute_retention, 3600: hour_retention}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._buffer_lock = threading.Lock()
+        self._buffer: List[Sample] = []
+        self._last_flush = time.monotonic()
+        self._last_prune = 0.0
+
+        self.stats: Dict[str, int] = {'recorded': 0, 'written': 0, 'flushes': 0, 'pruned': 0}
+
+    # ------------------------------------------------------------------
+    # Запись
+    # ------------------------------------------------------------------
+
+    def record(self, series: str, metrics: Dict[str, float], ts: Optional[float] = None) -> None:
+        """Добавить точки ряда в буфер.
+
+        Args:
+            series: Ключ ряда (workstation_series / emulator_series)
+            metrics: Метрика -> значение
+            ts: Время точки (unix time, по умолчанию сейчас)
+        """
+        ts = time.time() if ts is None else ts
+        samples = [(series, metric, ts, float(value)) for metric, value in metrics.items() if value is not None]
+        with self._buffer_lock:
+            self._buffer.extend(samples)
+            self.stats['recorded'] += len(samples)
+
+    def record_workstation(self, workstation_id: str, metrics: Dict[str, float], ts: Optional[float] = None) -> None:
+        """Добавить метрики рабочей станции.
+
+        Args:
+            workstation_id: ID рабочей станции
+            metrics: Метрика -> значение (total_emulators, cpu_usage, ...)
+            ts: Время точки
+        """
+        self.record(workstation_series(workstation_id), metrics, ts)
+
+    def record_emulators(self, emulators: Iterable[Any], ts: Optional[float] = None) -> None:
+        """Добавить состояние эмуляторов (running: 1 или 0).
+
+        Args:
+            emulators: Эмуляторы (id и status)
+            ts: Время точки
+        """
+        ts = time.time() if ts is None else ts
+        samples = [
+            (emulator_series(emulator.id), 'running', ts,
+             1.0 if getattr(emulator.status, 'value', emulator.status) == 'running' else 0.0)
+            for emulator in emulators
+        ]
+        with self._buffer_lock:
+            self._buffer.extend(samples)
+            self.stats['recorded'] += len(samples)
+
+    def flush_due(self) -> bool:
+        """Пора ли записать буфер (размер или возраст)."""
+        with self._buffer_lock:
+            if not self._buffer:
+                return False
+            return (len(self._buffer) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self) -> int:
+        """Записать буфер одной транзакцией и обновить агрегаты.
+
+        Returns:
+            int: Количество записанных точек
+        """
+        with self._buffer_lock:
+            samples, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not samples:
+            return 0
+
+        rollups: Dict[Tuple[int, str, str, int], List[float]] = {}
+        for series, metric, ts, value in samples:
+            for resolution in (60, 3600):
+                key = (resolution, series, metric, int(ts // resolution) * resolution)
+                rollup = rollups.get(key)
+                if rollup is None:
+                    rollups[key] = [1, value, value, value]
+                else:
+                    rollup[0] += 1
+                    rollup[1] += value
+                    rollup[2] = min(rollup[2], value)
+                    rollup[3] = max(rollup[3], value)
+
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT INTO samples (series, metric, ts, value) VALUES (?, ?, ?, ?)", samples)
+                self._conn.executemany(_UPSERT_ROLLUP, [key + tuple(rollup) for key, rollup in rollups.items()])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                with self._buffer_lock:
+                    self._buffer[:0] = samples
+                raise
+            self.stats['written'] += len(samples)
+            self.stats['flushes'] += 1
+
+        if time.monotonic() - self._last_prune >= _PRUNE_INTERVAL:
+            self.prune()
+        return len(samples)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Удалить точки и агрегаты старше сроков хранения.
+
+        Args:
+            now: Текущее время (unix time)
+
+        Returns:
+            int: Количество удаленных строк
+        """
+        now = time.time() if now is None else now
+        with self._db_lock:
+            deleted = self._conn.execute("DELETE FROM samples WHERE ts < ?", (now - self.retention[0],)).rowcount
+            for resolution in (60, 3600):
+                deleted += self._conn.execute(
+                    "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                    (resolution, now - self.retention[resolution])
+                ).rowcount
+            self._last_prune = time.monotonic()
+            self.stats['pruned'] += deleted
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Запросы
+    # ------------------------------------------------------------------
+
+    def choose_resolution(self, start: float, end: float, now: Optional[float] = None) -> str:
+        """Выбрать разрешение для интервала.
+
+        Сырые точки - для интервалов до часа в пределах их хранения,
+        минутные агрегаты - до двух суток, иначе часовые.
+        """
+        now = time.time() if now is None else now
+        span = end - start
+        if span <= 3600 and start >= now - self.retention[0]:
+            return 'raw'
+        if span <= 2 * 86400 and start >= now - self.retention[60]:
+            return '1m'
+        return '1h'
+
+    def query(
+        self,
+        series: str,
+        metric: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: str = 'auto'
+    ) -> Dict[str, Any]:
+        """Получить точки ряда за интервал.
+
+        Args:
+            series: Ключ ряда
+            metric: Метрика
+            start: Начало интервала (unix time)
+            end: Конец интервала (по умолчанию сейчас)
+            resolution: raw, 1m, 1h или auto
+
+        Returns:
+            Dict[str, Any]: Разрешение и точки {ts, avg, min, max, count} по времени
+
+        Raises:
+            ValueError: Неизвестное разрешение или пустой интервал
+        """
+        end = time.time() if end is None else end
+        if end < start:
+            raise ValueError("Конец интервала раньше начала")
+        if resolution == 'auto':
+            resolution = self.choose_resolution(start, end)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Неизвестное разрешение: {resolution}")
+
+        self.flush()
+        seconds = RESOLUTIONS[resolution]
+        with self._db_lock:
+            if seconds == 0:
+                rows = self._conn.execute(
+                    "SELECT ts, value, value, value, 1 FROM samples "
+                    "WHERE series = ? AND metric = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                    (series, metric, start, end)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT bucket, total / count, min, max, count FROM rollups "
+                    "WHERE resolution = ? AND series = ? AND metric = ? AND bucket >= ? AND bucket <= ? "
+                    "ORDER BY bucket",
+                    (seconds, series, metric, int(start // seconds) * seconds, end)
+                ).fetchall()
+
+        return {
+            'series': series,
+            'metric': metric,
+            'resolution': resolution,
+            'points': [
+                {'ts': ts, 'avg': avg, 'min': low, 'max': high, 'count': count}
+                for ts, avg, low, high, count in rows
+            ]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику хранилища.
+
+        Returns:
+            Dict[str, Any]: Счетчики и размер буфера
+        """
+        with self._buffer_lock:
+            return {**self.stats, 'buffered': len(self._buffer)}
+
+    def close(self) -> None:
+        """Записать буфер и закрыть базу."""
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+# Глобальное хранилище истории (создается при первом обращении)
+_history_store: Optional[HistoryStore] = None
+_history_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Получить глобальное хранилище истории метрик.
+
+    Returns:
+        HistoryStore: Хранилище в файле history_db конфигурации системы
+    """
+    global _history_store
+    with _history_lock:
+        if _history_store is None:
+            from .config import get_config
+
+            config = get_config()
+            _history_store = HistoryStore(
+                config.history_db,
+                raw_retention=config.history_raw_retention,
+                minute_retention=config.history_minute_retention,
+                hour_retention=config.history_hour_retention
+            )
+        return _history_store
@@ -0,0 +1,393 @@
+"""
+Индексированный реестр эмуляторов всего парка.
+
+Хранит последнее известное состояние эмуляторов всех рабочих станций
+с хэш-индексами по ID, по имени внутри станции, по станции и по статусу.
+Реестр обновляется результатами list2 и результатами операций, поэтому
+поиск эмулятора и выборки по станции/статусу не перебирают весь список.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .counters import EMULATORS, FleetCounters, get_fleet_counters
+from .events import EMULATOR_ADDED, EMULATOR_REMOVED
+
+
+def _status_key(status: Any) -> Any:
+    """Ключ индекса статуса (значение enum или сама строка)."""
+    return getattr(status, 'value', status)
+
+
+class EmulatorInventory:
+    """Потокобезопасный реестр эмуляторов с индексами.
+
+    Индексы:
+        ID эмулятора -> эмулятор
+        станция -> имя -> эмулятор
+        (станция, статус) -> ID -> эмулятор
+    """
+
+    def __init__(self, counters: Optional[FleetCounters] = None):
+        """Инициализация пустого реестра.
+
+        Args:
+            counters: Счетчики парка, которые реестр ведет по индексам статуса
+                (по умолчанию собственные)
+        """
+        self.counters = counters if counters is not None else FleetCounters()
+        self._lock = threading.RLock()
+        self._by_id: Dict[str, Any] = {}
+        self._by_workstation: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self._refreshed: Dict[str, float] = {}
+
+        self.stats: Dict[str, int] = {'refreshes': 0, 'updates': 0, 'changes': 0}
+
+    # ------------------------------------------------------------------
+    # Обновление
+    # ------------------------------------------------------------------
+
+    def replace_workstation(self, workstation_id: str, emulators: Iterable[Any]) -> Dict[str, int]:
+        """Заменить состояние станции результатом list2.
+
+        Args:
+            workstation_id: ID рабочей станции
+            emulators: Полный список эмуляторов станции
+
+        Returns:
+            Dict[str, int]: Количество добавленных, обновленных и удаленных эмуляторов
+        """
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        with self._lock:
+            previous = self._by_workstation.get(workstation_id, {})
+            seen = set()
+
+            for emulator in emulators:
+                seen.add(emulator.id)
+                counts['updated' if emulator.id in self._by_id else 'added'] += 1
+                self._insert(emulator)
+
+            for emulator in [emu for emu in previous.values() if emu.id not in seen]:
+                self._remove(emulator.id)
+                counts['removed'] += 1
+
+            self._by_workstation.setdefault(workstation_id, {})
+            self._refreshed[workstation_id] = time.time()
+            self.stats['refreshes'] += 1
+        return counts
+
+    def apply_changes(self, workstation_id: str, changes: Iterable[Any]) -> int:
+        """Применить изменения станции из сверки list2.
+
+        Работа пропорциональна числу изменений, а не числу эмуляторов станции.
+        Статус в объекте эмулятора уже изменен сверкой - реестр только
+        переносит его между индексами статуса.
+
+        Args:
+            workstation_id: ID рабочей станции
+            changes: События EmulatorChange
+
+        Returns:
+            int: Количество примененных изменений
+        """
+        applied = 0
+        with self._lock:
+            for change in changes:
+                emulator = change.emulator
+                if change.type == EMULATOR_REMOVED:
+                    # Объект мог быть переименован операцией - удаляется только та же запись
+                    current = self._by_workstation.get(workstation_id, {}).get(change.name)
+                    if current is emulator:
+                        self._remove(emulator.id)
+                elif change.type == EMULATOR_ADDED or self._by_id.get(emulator.id) is not emulator:
+                    self._insert(emulator)
+                else:
+                    self._index_pop(workstation_id, _status_key(change.previous_status), emulator.id)
+                    self._index_add(emulator)
+                applied += 1
+
+            self._by_workstation.setdefault(workstation_id, {})
+            self._refreshed[workstation_id] = time.time()
+            self.stats['refreshes'] += 1
+            self.stats['changes'] += applied
+        return applied
+
+    def upsert(self, emulator: Any) -> None:
+        """Добавить или заменить эмулятор.
+
+        Args:
+            emulator: Эмулятор (id, name, workstation_id, status)
+        """
+        with self._lock:
+            self._insert(emulator)
+            self.stats['updates'] += 1
+
+    def set_status(self, workstation_id: str, name: str, status: Any) -> bool:
+        """Обновить статус эмулятора по результату операции.
+
+        Args:
+            workstation_id: ID рабочей станции
+            name: Имя эмулятора
+            status: Новый статус
+
+        Returns:
+            bool: True если эмулятор найден
+        """
+        with self._lock:
+            emulator = self._by_workstation.get(workstation_id, {}).get(name)
+            if emulator is None:
+                return False
+
+            self._index_pop(workstation_id, _status_key(emulator.status), emulator.id)
+            update_status = getattr(emulator, 'update_status', None)
+            if update_status is not None:
+                update_status(status)
+            else:
+                emulator.status = status
+            self._index_add(emulator)
+            self.stats['updates'] += 1
+            return True
+
+    def rename(self, workstation_id: str, old_name: str, new_name: str) -> bool:
+        """Переименовать эмулятор (ID строится из станции и имени).
+
+        Args:
+            workstation_id: ID рабочей станции
+            old_name: Текущее имя
+            new_name: Новое имя
+
+        Returns:
+            bool: True если эмулятор найден
+        """
+        with self._lock:
+            emulator = self._by_workstation.get(workstation_id, {}).get(old_name)
+            if emulator is None:
+                return False
+
+            self._remove(emulator.id)
+            emulator.name = new_name
+            emulator.id = f"{workstation_id}_{new_name}"
+            self._insert(emulator)
+            self.stats['updates'] += 1
+            return True
+
+    def remove(self, workstation_id: str, name: str) -> bool:
+        """Удалить эмулятор по имени.
+
+        Args:
+            workstation_id: ID рабочей станции
+            name: Имя эмулятора
+
+        Returns:
+            bool: True если эмулятор был в реестре
+        """
+        with self._lock:
+            emulator = self._by_workstation.get(workstation_id, {}).get(name)
+            if emulator is None:
+                return False
+            self._remove(emulator.id)
+            self.stats['updates'] += 1
+            return True
+
+    def forget_workstation(self, workstation_id: str) -> None:
+        """Удалить станцию и все ее эмуляторы из реестра.
+
+        Args:
+            workstation_id: ID рабочей станции
+        """
+        with self._lock:
+            for emulator_id in [emu.id for emu in self._by_workstation.get(workstation_id, {}).values()]:
+                self._remove(emulator_id)
+            self._by_workstation.pop(workstation_id, None)
+            for key in [key for key in self._by_status if key[0] == workstation_id]:
+                for _ in self._by_status.pop(key):
+                    self.counters.emulator_removed(workstation_id, key[1])
+            self._refreshed.pop(workstation_id, None)
+
+    def clear(self) -> None:
+        """Очистить реестр."""
+        with self._lock:
+            self._by_id.clear()
+            self._by_workstation.clear()
+            self._by_status.clear()
+            self._refreshed.clear()
+            self.counters.reset(EMULATORS)
+
+    # ------------------------------------------------------------------
+    # Запросы
+    # ------------------------------------------------------------------
+
+    def get(self, emulator_id: str) -> Optional[Any]:
+        """Найти эмулятор по ID (O(1)).
+
+        Args:
+            emulator_id: ID эмулятора
+
+        Returns:
+            Optional[Any]: Эмулятор или None
+        """
+        with self._lock:
+            return self._by_id.get(emulator_id)
+
+    def find(self, workstation_id: str, name: str) -> Optional[Any]:
+        """Найти эмулятор по имени на станции (O(1)).
+
+        Args:
+            workstation_id: ID рабочей станции
+            name: Имя эмулятора
+
+        Returns:
+            Optional[Any]: Эмулятор или None
+        """
+        with self._lock:
+            return self._by_workstation.get(workstation_id, {}).get(name)
+
+    def has_workstation(self, workstation_id: str) -> bool:
+        """Получал ли реестр список эмуляторов станции.
+
+        Args:
+            workstation_id: ID рабочей станции
+
+        Returns:
+            bool: True если станция хотя бы раз обновлялась
+        """
+        with self._lock:
+            return workstation_id in self._refreshed
+
+    def by_workstation(self, workstation_id: str) -> List[Any]:
+        """Эмуляторы станции (O(k), k - эмуляторов на станции).
+
+        Args:
+            workstation_id: ID рабочей станции
+
+        Returns:
+            List[Any]: Эмуляторы станции
+        """
+        with self._lock:
+            return list(self._by_workstation.get(workstation_id, {}).values())
+
+    def by_status(self, status: Any, workstation_id: Optional[str] = None) -> List[Any]:
+        """Эмуляторы с заданным статусом (O(k + станций), k - размер выборки).
+
+        Args:
+            status: Статус эмулятора
+            workstation_id: Ограничить станцией (None - весь парк)
+
+        Returns:
+            List[Any]: Эмуляторы с этим статусом
+        """
+        key = _status_key(status)
+        with self._lock:
+            stations = self._by_workstation if workstation_id is None else [workstation_id]
+            return [
+                emulator
+                for station in stations
+                for emulator in self._by_status.get((station, key), {}).values()
+            ]
+
+    def count(self, workstation_id: Optional[str] = None, status: Any = None) -> int:
+        """Количество эмуляторов.
+
+        Args:
+            workstation_id: ID станции (None - весь парк)
+            status: Статус (None - любой)
+
+        Returns:
+            int: Количество эмуляторов
+        """
+        with self._lock:
+            if status is None:
+                if workstation_id is None:
+                    return len(self._by_id)
+                return len(self._by_workstation.get(workstation_id, {}))
+            if workstation_id is None:
+                return self.counters.emulators(status=status)
+            return len(self._by_status.get((workstation_id, _status_key(status)), {}))
+
+    def page(self, offset: int = 0, limit: int = 100,
+             workstation_id: Optional[str] = None) -> Tuple[List[Any], int]:
+        """Страница эмуляторов парка или станции (O(offset + limit)).
+
+        Args:
+            offset: Смещение
+            limit: Размер страницы
+            workstation_id: ID станции (None - весь парк)
+
+        Returns:
+            Tuple[List[Any], int]: (эмуляторы страницы, всего)
+        """
+        with self._lock:
+            source = self._by_id if workstation_id is None else self._by_workstation.get(workstation_id, {})
+            return list(itertools.islice(source.values(), offset, offset + limit)), len(source)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику реестра.
+
+        Returns:
+            Dict[str, Any]: Размеры индексов и счетчики обновлений
+        """
+        with self._lock:
+            return {
+                **self.stats,
+                'emulators': len(self._by_id),
+                'workstations': len(self._by_workstation),
+                'by_status': self.counters.breakdown(EMULATORS),
+            }
+
+    # ------------------------------------------------------------------
+    # Индексы (вызываются под блокировкой)
+    # ------------------------------------------------------------------
+
+    def _insert(self, emulator: Any) -> None:
+        """Добавить эмулятор во все индексы, заменив прежнюю запись."""
+        if emulator.id in self._by_id:
+            self._remove(emulator.id)
+
+        stations = self._by_workstation.setdefault(emulator.workstation_id, {})
+        existing = stations.get(emulator.name)
+        if existing is not None and existing.id != emulator.id:
+            # Имя на станции уникально - прежняя запись с этим именем устарела
+            self._remove(existing.id)
+
+        self._by_id[emulator.id] = emulator
+        stations[emulator.name] = emulator
+        self._index_add(emulator)
+
+    def _remove(self, emulator_id: str) -> None:
+        """Удалить эмулятор из всех индексов."""
+        emulator = self._by_id.pop(emulator_id, None)
+        if emulator is None:
+            return
+        stations = self._by_workstation.get(emulator.workstation_id)
+        if stations is not None and stations.get(emulator.name) is emulator:
+            del stations[emulator.name]
+        self._index_pop(emulator.workstation_id, _status_key(emulator.status), emulator_id)
+
+    def _index_add(self, emulator: Any) -> None:
+        """Добавить эмулятор в индекс его статуса и учесть в счетчиках."""
+        index = self._by_status.setdefault((emulator.workstation_id, _status_key(emulator.status)), {})
+        if emulator.id not in index:
+            self.counters.emulator_added(emulator.workstation_id, emulator.status)
+        index[emulator.id] = emulator
+
+    def _index_pop(self, workstation_id: str, key: Any, emulator_id: str) -> None:
+        """Убрать эмулятор из индекса статуса и из счетчиков."""
+        index = self._by_status.get((workstation_id, key))
+        if index is not None and index.pop(emulator_id, None) is not None:
+            self.counters.emulator_removed(workstation_id, key)
+
+
+# Глобальный реестр эмуляторов (ведет глобальные счетчики парка)
+_inventory = EmulatorInventory(get_fleet_counters())
+
+
+def get_inventory() -> EmulatorInventory:
+    """Получить глобальный реестр эмуляторов.
+
+    Returns:
+        EmulatorInventory: Реестр эмуляторов парка
+    """
+    return _inventory
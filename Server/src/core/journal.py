@@ -0,0 +1,298 @@
+"""
+Журнал операций.
+
+Каждая операция и каждый переход ее статуса дописываются в журнал на
+SQLite (WAL). Записи копятся в буфере, и фоновый поток фиксирует все
+накопленное одной транзакцией (групповая фиксация), поэтому переходы
+сотен операций не стоят отдельной транзакции каждый. При запуске
+обработчика операций журнал воспроизводится: незавершенные операции
+восстанавливаются с последним записанным статусом.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models import Operation, OperationPriority, OperationStatus, OperationType
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation_id TEXT NOT NULL,
+    workstation_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS journal_operation ON journal (operation_id, seq);
+CREATE INDEX IF NOT EXISTS journal_workstation ON journal (workstation_id, seq);
+"""
+
+_TERMINAL = (OperationStatus.COMPLETED.value, OperationStatus.FAILED.value, OperationStatus.CANCELLED.value)
+
+# Удаление операций, завершенных раньше срока хранения
+_COMPACT = """
+DELETE FROM journal WHERE operation_id IN (
+    SELECT last.operation_id FROM journal AS last
+    WHERE last.seq = (SELECT MAX(seq) FROM journal WHERE operation_id = last.operation_id)
+      AND last.status IN (?, ?, ?) AND last.ts < ?
+)
+"""
+
+# Завершенные операции удаляются не чаще одного раза в интервал
+_COMPACT_INTERVAL = 60.0
+
+Entry = Tuple[str, str, float, str, Optional[str]]
+
+
+def _spec(operation: Operation) -> str:
+    """Описание операции для восстановления (первая запись операции)."""
+    return json.dumps({
+        'type': operation.type.value,
+        'emulator_id': operation.emulator_id,
+        'parameters': operation.parameters,
+        'priority': int(operation.priority),
+        'owner': operation.owner,
+        'created_at': operation.created_at.timestamp(),
+    }, default=str)
+
+
+class OperationJournal:
+    """Потокобезопасный журнал операций с групповой фиксацией."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        retention: int = 86400,
+        batch_size: int = 500,
+        flush_interval: float = 0.05
+    ):
+        """Инициализация журнала.
+
+        Args:
+            path: Файл базы SQLite (":memory:" - в памяти)
+            retention: Хранение завершенных операций в секундах
+            batch_size: Размер буфера, при котором фиксация не ждет интервала
+            flush_interval: Окно групповой фиксации в секундах
+        """
+        self.path = str(path)
+        self.retention = retention
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._cond = threading.Condition()
+        self._buffer: List[Entry] = []
+        self._committer: Optional[threading.Thread] = None
+        self._closing = False
+        self._last_compact = time.monotonic()
+
+        self.stats: Dict[str, int] = {'appended': 0, 'written': 0, 'commits': 0, 'compacted': 0}
+
+    # ------------------------------------------------------------------
+    # Запись
+    # ------------------------------------------------------------------
+
+    def record_added(self, operation: Operation) -> None:
+        """Записать постановку операции на учет (с описанием для восстановления).
+
+        Args:
+            operation: Операция
+        """
+        self._append((operation.id, operation.workstation_id, time.time(),
+                      operation.status.value, _spec(operation)))
+
+    def record_transition(self, operation: Operation) -> None:
+        """Записать переход операции в текущий статус.
+
+        Args:
+            operation: Операция (результат и ошибка пишутся для завершенных)
+        """
+        data = None
+        if operation.status.value in _TERMINAL:
+            data = json.dumps({'result': operation.result, 'error': operation.error_message}, default=str)
+        self._append((operation.id, operation.workstation_id, time.time(), operation.status.value, data))
+
+    def _append(self, entry: Entry) -> None:
+        """Добавить запись в буфер и разбудить поток фиксации."""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Журнал операций закрыт")
+            self._buffer.append(entry)
+            self.stats['appended'] += 1
+            if self._committer is None:
+                self._committer = threading.Thread(target=self._commit_loop, name="operation-journal", daemon=True)
+                self._committer.start()
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def _commit_loop(self) -> None:
+        """Фоновая групповая фиксация буфера."""
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size and not self._closing:
+                    self._cond.wait(self.flush_interval)
+                closing = self._closing
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Ошибка записи журнала операций: {e}")
+            if closing:
+                return
+
+    def flush(self) -> int:
+        """Зафиксировать буфер одной транзакцией.
+
+        Returns:
+            int: Количество записанных записей
+        """
+        # Буфер забирается под блокировкой базы, чтобы фиксации шли в порядке записей
+        with self._db_lock:
+            with self._cond:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO journal (operation_id, workstation_id, ts, status, data) VALUES (?, ?, ?, ?, ?)",
+                    entries
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                with self._cond:
+                    self._buffer[:0] = entries
+                raise
+            self.stats['written'] += len(entries)
+            self.stats['commits'] += 1
+
+        if time.monotonic() - self._last_compact >= _COMPACT_INTERVAL:
+            self.compact()
+        return len(entries)
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Удалить записи операций, завершенных раньше срока хранения.
+
+        Args:
+            now: Текущее время (unix time)
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        now = time.time() if now is None else now
+        with self._db_lock:
+            deleted = self._conn.execute(_COMPACT, (*_TERMINAL, now - self.retention)).rowcount
+            self._last_compact = time.monotonic()
+            self.stats['compacted'] += deleted
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Воспроизведение
+    # ------------------------------------------------------------------
+
+    def replay(self, workstation_id: Optional[str] = None) -> List[Operation]:
+        """Восстановить незавершенные операции из журнала.
+
+        Args:
+            workstation_id: ID рабочей станции (None - все станции)
+
+        Returns:
+            List[Operation]: Операции со статусом PENDING или RUNNING
+                в порядке постановки на учет
+        """
+        self.flush()
+        with self._db_lock:
+            if workstation_id is None:
+                rows = self._conn.execute(
+                    "SELECT operation_id, workstation_id, status, data FROM journal ORDER BY seq"
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT operation_id, workstation_id, status, data FROM journal "
+                    "WHERE workstation_id = ? ORDER BY seq",
+                    (workstation_id,)
+                ).fetchall()
+
+        # Последний статус и последнее описание каждой операции
+        state: Dict[str, List[Any]] = {}
+        for operation_id, ws_id, status, data in rows:
+            if data is not None and status not in _TERMINAL:
+                # Повторная постановка на учет начинает операцию заново
+                state.pop(operation_id, None)
+                state[operation_id] = [ws_id, status, json.loads(data)]
+            elif operation_id in state:
+                state[operation_id][1] = status
+
+        operations = []
+        for operation_id, (ws_id, status, spec) in state.items():
+            if status in _TERMINAL:
+                continue
+            operations.append(Operation(
+                id=operation_id,
+                type=OperationType(spec['type']),
+                emulator_id=spec['emulator_id'],
+                workstation_id=ws_id,
+                status=OperationStatus(status),
+                parameters=spec['parameters'] or {},
+                created_at=datetime.fromtimestamp(spec['created_at']),
+                priority=OperationPriority(spec['priority']),
+                owner=spec['owner']
+            ))
+        return operations
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику журнала.
+
+        Returns:
+            Dict[str, Any]: Счетчики записи и размер буфера
+        """
+        with self._cond:
+            return {**self.stats, 'buffered': len(self._buffer)}
+
+    def close(self) -> None:
+        """Остановить фиксацию, записать буфер и закрыть базу."""
+        with self._cond:
+            self._closing = True
+            committer = self._committer
+            self._cond.notify()
+        if committer is not None:
+            committer.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+# Глобальный журнал операций (создается при первом обращении)
+_operation_journal: Optional[OperationJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_operation_journal() -> OperationJournal:
+    """Получить глобальный журнал операций.
+
+    Returns:
+        OperationJournal: Журнал в файле operations_journal конфигурации системы
+    """
+    global _operation_journal
+    with _journal_lock:
+        if _operation_journal is None:
+            from .config import get_config
+
+            config = get_config()
+            _operation_journal = OperationJournal(
+                config.operations_journal,
+                retention=config.operations_journal_retention
+            )
+        return _operation_journal
@@ -5,9 +5,11 @@
 операций и других сущностей системы.
 """
 
+import asyncio
+import time
 from datetime import datetime
-from enum import Enum
-from typing import Dict, List, Optional, Any
+from enum import Enum, IntEnum
+from typing import Callable, Dict, List, Optional, Any
 from ..utils.logger import get_logger, LogCategory
 from dataclasses import dataclass, field
 from pydantic import BaseModel, Field, ConfigDict
@@ -43,6 +45,7 @@ class OperationType(str, Enum):
     RESTART = "restart"
     CLONE = "clone"
     MODIFY = "modify"
+    PIPELINE = "pipeline"  # конвейер зависимых операций (см. remote/pipeline.py)
 
 
 class OperationStatus(str, Enum):
@@ -54,6 +57,13 @@ class OperationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class OperationPriority(IntEnum):
+    """Приоритет операции в очереди станции (меньше - раньше)."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
 @dataclass
 class EmulatorConfig:
     """Конфигурация эмулятора LDPlayer."""
@@ -99,8 +109,29 @@ class EmulatorConfig:
         return params
 
 
+# Значения EmulatorConfig по умолчанию для сериализации эмуляторов без конфигурации
+_DEFAULT_CONFIG = EmulatorConfig()
+
+
+def _as_datetime(value: Any) -> datetime:
+    """Метка времени эмулятора (unix time или datetime) в datetime."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(value)
+
+
 class Emulator:
-    """Модель эмулятора LDPlayer."""
+    """Модель эмулятора LDPlayer.
+
+    Компактное представление: поля в __slots__, метки времени хранятся
+    как unix time, а EmulatorConfig создается при первом обращении -
+    списки из list2 не держат конфигурацию и datetime на каждый эмулятор.
+    """
+
+    __slots__ = (
+        'id', 'name', 'workstation_id', 'status', '_config', '_created_date', '_last_activity',
+        'uptime', 'adb_port', 'config_path', 'start_count', 'error_count'
+    )
 
     def __init__(
         self,
@@ -118,18 +149,19 @@ class Emulator:
             name: Имя эмулятора
             workstation_id: ID рабочей станции
             status: Статус эмулятора
-            config: Конфигурация эмулятора
+            config: Конфигурация эмулятора (None - по умолчанию, создается при обращении)
             **kwargs: Дополнительные параметры
         """
         self.id = id
         self.name = name
         self.workstation_id = workstation_id
         self.status = status
-        self.config = config or EmulatorConfig()
+        self._config = config
 
         # Дополнительные поля
-        self.created_date = kwargs.get('created_date', datetime.now())
-        self.last_activity = kwargs.get('last_activity', datetime.now())
+        now = time.time()
+        self._created_date = kwargs.get('created_date', now)
+        self._last_activity = kwargs.get('last_activity', now)
         self.uptime = kwargs.get('uptime', 0)
         self.adb_port = kwargs.get('adb_port', 5555)
         self.config_path = kwargs.get('config_path', '')
@@ -138,25 +170,56 @@ class Emulator:
         self.start_count = kwargs.get('start_count', 0)
         self.error_count = kwargs.get('error_count', 0)
 
+    @property
+    def config(self) -> EmulatorConfig:
+        """Конфигурация эмулятора (по умолчанию создается при первом обращении)."""
+        if self._config is None:
+            self._config = EmulatorConfig()
+        return self._config
+
+    @config.setter
+    def config(self, value: Optional[EmulatorConfig]) -> None:
+        self._config = value
+
+    @property
+    def created_date(self) -> datetime:
+        """Дата создания."""
+        return _as_datetime(self._created_date)
+
+    @created_date.setter
+    def created_date(self, value: Any) -> None:
+        self._created_date = value
+
+    @property
+    def last_activity(self) -> datetime:
+        """Время последней активности."""
+        return _as_datetime(self._last_activity)
+
+    @last_activity.setter
+    def last_activity(self, value: Any) -> None:
+        self._last_activity = value
+
     def to_dict(self) -> Dict[str, Any]:
         """Преобразовать эмулятор в словарь.
 
         Returns:
             Dict[str, Any]: Словарь с данными эмулятора
         """
+        # Конфигурация по умолчанию не создается ради сериализации
+        config = self._config if self._config is not None else _DEFAULT_CONFIG
         return {
             'id': self.id,
             'name': self.name,
             'workstation_id': self.workstation_id,
             'status': self.status.value,
             'config': {
-                'android_version': self.config.android_version,
-                'screen_size': self.config.screen_size,
-                'cpu_cores': self.config.cpu_cores,
-                'memory_mb': self.config.memory_mb,
-                'dpi': self.config.dpi,
-                'fps': self.config.fps,
-                'custom_settings': self.config.custom_settings
+                'android_version': config.android_version,
+                'screen_size': config.screen_size,
+                'cpu_cores': config.cpu_cores,
+                'memory_mb': config.memory_mb,
+                'dpi': config.dpi,
+                'fps': config.fps,
+                'custom_settings': config.custom_settings if config is not _DEFAULT_CONFIG else {}
             },
             'created_date': self.created_date.isoformat(),
             'last_activity': self.last_activity.isoformat(),
@@ -232,7 +295,7 @@ class Emulator:
         """
         old_status = self.status
         self.status = new_status
-        self.last_activity = datetime.now()
+        self._last_activity = time.time()
 
         # Обновить статистику
         if new_status == EmulatorStatus.RUNNING and old_status != EmulatorStatus.RUNNING:
@@ -307,7 +370,7 @@ class Workstation:
         self.last_seen = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Operation:
     """Операция с эмулятором."""
 
@@ -329,10 +392,81 @@ class Operation:
     result: Optional[str] = None
     error_message: Optional[str] = None
 
+    # Планирование: полоса приоритета и владелец для справедливой очереди
+    priority: OperationPriority = OperationPriority.NORMAL
+    owner: Optional[str] = None
+
+    # Наблюдатель переходов статуса (счетчики парка): (операция, прежний статус)
+    on_transition: Optional[Callable[['Operation', OperationStatus], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Ожидающие завершения (создаются при первом wait)
+    _waiters: Optional[List[asyncio.Future]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """Операция в конечном статусе."""
+        return self.status in _FINISHED_STATUSES
+
+    def _set_status(self, status: OperationStatus) -> bool:
+        """Сменить статус, уведомить наблюдателя и разбудить ожидающих завершения.
+
+        Конечный статус окончательный: переходы из него игнорируются.
+
+        Returns:
+            bool: True если статус сменен
+        """
+        if self.is_finished:
+            return False
+        previous, self.status = self.status, status
+        if self.on_transition is not None and previous != status:
+            self.on_transition(self, previous)
+        if self._waiters and status in _FINISHED_STATUSES:
+            waiters, self._waiters = self._waiters, None
+            for future in waiters:
+                try:
+                    # Переход может произойти в потоке пула - будим в цикле ожидающего
+                    future.get_loop().call_soon_threadsafe(_resolve_waiter, future)
+                except RuntimeError:
+                    pass
+        return True
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Дождаться завершения операции без опроса статуса.
+
+        Args:
+            timeout: Таймаут ожидания в секундах (None - без ограничения)
+
+        Returns:
+            bool: True если операция завершена, False по таймауту
+        """
+        if self.is_finished:
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        if self._waiters is None:
+            self._waiters = []
+        self._waiters.append(future)
+        if self.is_finished:
+            # Завершилась из другого потока между проверками
+            return True
+
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if self._waiters and future in self._waiters:
+                self._waiters.remove(future)
+
     def start(self) -> None:
-        """Начать выполнение операции."""
-        self.status = OperationStatus.RUNNING
+        """Начать выполнение операции (завершенная операция не перезапускается)."""
+        if self.is_finished:
+            return
         self.started_at = datetime.now()
+        self._set_status(OperationStatus.RUNNING)
 
     def complete(self, success: bool = True, result: str = None, error: str = None) -> None:
         """Завершить операцию.
@@ -342,15 +476,33 @@ class Operation:
             result: Результат выполнения
             error: Сообщение об ошибке
         """
-        self.status = OperationStatus.COMPLETED if success else OperationStatus.FAILED
+        # Итог отмененной (или уже завершенной) операции не перезаписывается
+        if self.is_finished:
+            return
         self.completed_at = datetime.now()
         self.result = result
         self.error_message = error
+        self._set_status(OperationStatus.COMPLETED if success else OperationStatus.FAILED)
 
-    def cancel(self) -> None:
-        """Отменить операцию."""
-        self.status = OperationStatus.CANCELLED
+    def cancel(self) -> bool:
+        """Отменить операцию.
+
+        Returns:
+            bool: True если операция отменена, False если она уже завершена
+        """
+        if self.is_finished:
+            return False
         self.completed_at = datetime.now()
+        return self._set_status(OperationStatus.CANCELLED)
+
+
+_FINISHED_STATUSES = (OperationStatus.COMPLETED, OperationStatus.FAILED, OperationStatus.CANCELLED)
+
+
+def _resolve_waiter(future: asyncio.Future) -> None:
+    """Завершить future ожидающего, если он еще ждет."""
+    if not future.done():
+        future.set_result(None)
 
 
 # Pydantic модели для API
@@ -5,6 +5,7 @@
 а также WebSocket интерфейс для real-time обновлений.
 """
 
+import asyncio
 import json
 import os
 import time
@@ -12,7 +13,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, status
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Query, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -31,6 +32,13 @@ from ..remote.protocols import connection_pool
 from ..api.auth_routes import router as auth_router, get_current_active_user  # JWT Authentication + dependency
 from ..utils.auth import require_role  # Auth helpers
 from ..utils.cache import get_cache_stats, invalidate_cache  # 🚀 Performance caching
+from ..utils.error_handler import get_error_handler
+from ..utils.retry_budget import get_retry_budgets
+from ..core.inventory import get_inventory
+from ..core.counters import get_fleet_counters
+from ..core.journal import get_operation_journal
+from ..core.events import get_event_bus
+from ..remote.reconciler import EmulatorChange
 from ..core.models import UserInDB, UserRole  # User models for type hints (import after existing models)
 from ..utils.detailed_logging import (  # Сверх детальное логирование
     log_http_request, 
@@ -69,6 +77,7 @@ ldplayer_managers: Dict[str, LDPlayerManager] = {}
 
 monitor: Optional[WorkstationMonitor] = None
 websocket_connections: List[WebSocket] = []
+emulator_events_task: Optional[asyncio.Task] = None
 
 
 def initialize_di_services() -> None:
@@ -88,7 +97,12 @@ def initialize_di_services() -> None:
         container.register("workstation_manager", workstation_manager)
         
         # Создать LDPlayer менеджер (основной, на localhost)
-        ldplayer_manager = LDPlayerManager(workstation_manager)
+        ldplayer_manager = LDPlayerManager(
+            workstation_manager,
+            concurrency=config.operation_concurrency,
+            journal=get_operation_journal(),
+            launch_limits=config.launch_admission
+        )
         container.register("ldplayer_manager", ldplayer_manager)
         logger.log_system_event("LDPlayerManager initialized")
         
@@ -170,6 +184,11 @@ async def startup_event():
         logger.log_error(e, "Failed to initialize DI container")
         raise
     
+    # Изменения эмуляторов из сверки list2 -> WebSocket клиенты
+    global emulator_events_task
+    emulator_events_task = asyncio.create_task(forward_emulator_events())
+    logger.log_system_event("Emulator change events forwarding started")
+    
     print("[OK] Server started successfully")
 
 
@@ -181,6 +200,13 @@ async def shutdown_event():
     print("[SHUTDOWN] LDPlayer Management System Server")
     logger.log_system_event("Shutting down LDPlayer Management System")
     
+    if emulator_events_task is not None:
+        emulator_events_task.cancel()
+        await asyncio.gather(emulator_events_task, return_exceptions=True)
+    
+    # Записать накопленные переходы операций
+    get_operation_journal().flush()
+
     try:
         # Очистить ресурсы DI контейнера (если есть)
         logger.log_system_event("DI container resources cleaned up")
@@ -438,7 +464,12 @@ def get_ldplayer_manager(workstation_id: str) -> LDPlayerManager:
     """
     if workstation_id not in ldplayer_managers:
         workstation_manager = get_workstation_manager(workstation_id)
-        ldplayer_managers[workstation_id] = LDPlayerManager(workstation_manager)
+        ldplayer_managers[workstation_id] = LDPlayerManager(
+            workstation_manager,
+            concurrency=get_config().operation_concurrency,
+            journal=get_operation_journal(),
+            launch_limits={**get_config().launch_admission, **workstation_manager.config.launch_limits}
+        )
 
     return ldplayer_managers[workstation_id]
 
@@ -459,6 +490,21 @@ async def broadcast_websocket_event(event_type: str, data: Dict[str, Any]):
     await websocket_manager.broadcast(event)
 
 
+async def forward_emulator_events() -> None:
+    """Передавать изменения эмуляторов из шины событий клиентам WebSocket.
+
+    Клиенты получают только добавленные, удаленные и сменившие статус
+    эмуляторы, а не полный список станции на каждом опросе.
+    """
+    stream = get_event_bus().stream()
+    try:
+        async for event in stream:
+            if isinstance(event, EmulatorChange):
+                await broadcast_websocket_event(f"emulator_{event.type}", event.to_dict())
+    finally:
+        stream.close()
+
+
 # Serve static files and web UI
 @app.get("/")
 async def index():
@@ -615,14 +661,11 @@ async def get_server_status(current_user: UserInDB = Depends(get_current_active_
         if ws.status == WorkstationStatus.ONLINE
     ])
 
-    total_emulators = sum(
-        len(get_ldplayer_manager(ws.id).get_emulators())
-        for ws in config.workstations
-    )
-
-    active_operations = sum(
-        len(get_ldplayer_manager(ws.id).get_active_operations())
-        for ws in config.workstations
+    # Счетчики парка обновляются при переходах состояния - без опроса станций
+    counters = get_fleet_counters()
+    total_emulators = counters.emulators()
+    active_operations = (
+        counters.operations(status=OperationStatus.PENDING) + counters.operations(status=OperationStatus.RUNNING)
     )
 
     return ServerStatus(
@@ -639,12 +682,22 @@ async def get_server_status(current_user: UserInDB = Depends(get_current_active_
 def _get_workstations_list() -> List[Dict[str, Any]]:
     """Вспомогательная функция для получения списка рабочих станций (для кэширования)"""
     config = get_config()
+    inventory = get_inventory()
+    counters = get_fleet_counters()
     workstations_data = []
     
     for ws_config in config.workstations:
         # Получить актуальный статус
         status_str = ws_config.status
 
+        # Количества из счетчиков, если список станции уже получен, иначе из последнего мониторинга
+        if inventory.has_workstation(ws_config.id):
+            total_emulators = counters.emulators(ws_config.id)
+            active_emulators = counters.emulators(ws_config.id, EmulatorStatus.RUNNING)
+        else:
+            total_emulators = ws_config.total_emulators
+            active_emulators = ws_config.active_emulators
+
         # Handle last_seen - can be str (from config) or datetime (from model)
         last_seen_str = None
         if ws_config.last_seen:
@@ -658,8 +711,8 @@ def _get_workstations_list() -> List[Dict[str, Any]]:
             "name": ws_config.name,
             "ip_address": ws_config.ip_address,
             "status": status_str,
-            "total_emulators": ws_config.total_emulators,
-            "active_emulators": ws_config.active_emulators,
+            "total_emulators": total_emulators,
+            "active_emulators": active_emulators,
             "cpu_usage": ws_config.cpu_usage,
             "memory_usage": ws_config.memory_usage,
             "disk_usage": ws_config.disk_usage,
@@ -751,7 +804,8 @@ async def get_workstation(
     manager = get_workstation_manager(workstation_id)
 
     # Получить системную информацию
-    system_info = manager.get_system_info()
+    system_info = await manager.get_system_info_async()
+    emulators = await manager.get_emulators_list_async()
 
     return {
         "id": manager.config.id,
@@ -759,7 +813,7 @@ async def get_workstation(
         "ip_address": manager.config.ip_address,
         "status": manager.config.status.value if hasattr(manager.config.status, 'value') else str(manager.config.status),
         "system_info": system_info,
-        "emulators": [emu.to_dict() for emu in manager.get_emulators_list()]
+        "emulators": [emu.to_dict() for emu in emulators]
     }
 
 
@@ -771,7 +825,7 @@ async def test_workstation_connection(
     """Протестировать подключение к рабочей станции. Требуется аутентификация."""
     manager = get_workstation_manager(workstation_id)
 
-    success, message = manager.test_connection()
+    success, message = await manager.test_connection_async()
 
     if success:
         return APIResponse(success=True, message=message)
@@ -786,7 +840,7 @@ async def get_workstation_emulators(
 ):
     """Получить список эмуляторов на рабочей станции. Требуется аутентификация."""
     manager = get_ldplayer_manager(workstation_id)
-    emulators = manager.get_emulators()
+    emulators = await manager.get_emulators_async()
 
     return [emu.to_dict() for emu in emulators]
 
@@ -816,7 +870,7 @@ async def create_emulator(
         )
 
         # Создать операцию
-        operation = ldplayer_manager.create_emulator(name, config)
+        operation = ldplayer_manager.create_emulator(name, config, owner=current_user.username)
 
         # Отправить событие через WebSocket
         await broadcast_websocket_event("emulator_creating", {
@@ -839,6 +893,70 @@ async def create_emulator(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/workstations/{workstation_id}/pipelines", response_model=APIResponse)
+async def run_operation_pipeline(
+    workstation_id: str,
+    pipeline_data: Dict[str, Any],
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    """Выполнить конвейер зависимых операций (DAG) на станции. Требуется роль OPERATOR или ADMIN.
+
+    Тело: {"steps": [{"id", "type", "parameters", "after": [ID шагов]}]}.
+    """
+    require_role(current_user, UserRole.OPERATOR)
+
+    try:
+        ldplayer_manager = get_ldplayer_manager(workstation_id)
+        operation = ldplayer_manager.run_pipeline(pipeline_data.get("steps", []), owner=current_user.username)
+
+        return APIResponse(
+            success=True,
+            message=f"Конвейер из {len(operation.parameters['steps'])} шагов поставлен в очередь",
+            data={"operation_id": operation.id, "steps": operation.parameters["steps"]}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/emulators/provision", response_model=APIResponse)
+async def provision_emulators(
+    provision_data: Dict[str, Any],
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    """Подготовить эмуляторы конвейером clone → modify → launch. Требуется роль OPERATOR или ADMIN.
+
+    Тело: {"workstation_id", "source_name", "names": [...], "settings": {...}, "launch": true}.
+    """
+    require_role(current_user, UserRole.OPERATOR)
+
+    try:
+        workstation_id = provision_data["workstation_id"]
+        names = provision_data["names"]
+
+        ldplayer_manager = get_ldplayer_manager(workstation_id)
+        operation = ldplayer_manager.provision_emulators(
+            provision_data["source_name"],
+            names,
+            settings=provision_data.get("settings"),
+            launch=provision_data.get("launch", True),
+            owner=current_user.username
+        )
+
+        return APIResponse(
+            success=True,
+            message=f"Подготовка {len(names)} эмуляторов поставлена в очередь",
+            data={"operation_id": operation.id, "steps": operation.parameters["steps"]}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/api/emulators/{emulator_id}/start", response_model=APIResponse)
 async def start_emulator(
     emulator_id: str,
@@ -855,7 +973,7 @@ async def start_emulator(
 
         for ws_config in config.workstations:
             ldplayer_manager = get_ldplayer_manager(ws_config.id)
-            emulators = ldplayer_manager.get_emulators()
+            emulators = await ldplayer_manager.get_emulators_async()
 
             for emu in emulators:
                 if emu.id == emulator_id:
@@ -869,7 +987,7 @@ async def start_emulator(
             raise HTTPException(status_code=404, detail=f"Эмулятор {emulator_id} не найден")
 
         # Создать операцию запуска
-        operation = ldplayer_manager.start_emulator(emulator.name)
+        operation = ldplayer_manager.start_emulator(emulator.name, owner=current_user.username)
 
         # Отправить событие через WebSocket
         await broadcast_websocket_event("emulator_starting", {
@@ -906,7 +1024,7 @@ async def stop_emulator(
 
         for ws_config in config.workstations:
             ldplayer_manager = get_ldplayer_manager(ws_config.id)
-            emulators = ldplayer_manager.get_emulators()
+            emulators = await ldplayer_manager.get_emulators_async()
 
             for emu in emulators:
                 if emu.id == emulator_id:
@@ -920,7 +1038,7 @@ async def stop_emulator(
             raise HTTPException(status_code=404, detail=f"Эмулятор {emulator_id} не найден")
 
         # Создать операцию остановки
-        operation = ldplayer_manager.stop_emulator(emulator.name)
+        operation = ldplayer_manager.stop_emulator(emulator.name, owner=current_user.username)
 
         # Отправить событие через WebSocket
         await broadcast_websocket_event("emulator_stopping", {
@@ -957,7 +1075,7 @@ async def delete_emulator(
 
         for ws_config in config.workstations:
             ldplayer_manager = get_ldplayer_manager(ws_config.id)
-            emulators = ldplayer_manager.get_emulators()
+            emulators = await ldplayer_manager.get_emulators_async()
 
             for emu in emulators:
                 if emu.id == emulator_id:
@@ -971,7 +1089,7 @@ async def delete_emulator(
             raise HTTPException(status_code=404, detail=f"Эмулятор {emulator_id} не найден")
 
         # Создать операцию удаления
-        operation = ldplayer_manager.delete_emulator(emulator.name)
+        operation = ldplayer_manager.delete_emulator(emulator.name, owner=current_user.username)
 
         # Отправить событие через WebSocket
         await broadcast_websocket_event("emulator_deleting", {
@@ -1018,12 +1136,19 @@ async def get_operations(current_user: UserInDB = Depends(get_current_active_use
 @app.get("/api/operations/{operation_id}", response_model=Dict[str, Any])
 async def get_operation(
     operation_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Ожидать завершения до N секунд (long-poll)"),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
-    """Получить информацию об операции. Требуется аутентификация."""
+    """Получить информацию об операции. Требуется аутентификация.
+
+    С параметром wait ответ приходит в момент завершения операции
+    или по истечении wait секунд с текущим статусом.
+    """
     for ldplayer_manager in ldplayer_managers.values():
         operation = ldplayer_manager.get_operation(operation_id)
         if operation:
+            if wait:
+                await operation.wait(wait)
             return {
                 "id": operation.id,
                 "type": operation.type.value,
@@ -1160,6 +1285,10 @@ async def get_performance_metrics(
     require_role(current_user, UserRole.ADMIN)
     
     cache_stats = get_cache_stats()
+
+    # Суммарная экономия от переиспользования WinRM shell
+    shell_stats = [manager.get_shell_stats() for manager in workstation_managers.values()]
+    emulator_list_stats = [manager.get_emulators_cache_stats() for manager in workstation_managers.values()]
     
     return {
         "status": "success",
@@ -1177,6 +1306,28 @@ async def get_performance_metrics(
             },
             "websockets": {
                 "active_connections": len(websocket_connections)
+            },
+            "winrm_shells": {
+                "shells_opened": sum(stats.get('shells_opened', 0) for stats in shell_stats),
+                "commands": sum(stats.get('commands', 0) for stats in shell_stats),
+                "round_trips_saved": sum(stats.get('round_trips_saved', 0) for stats in shell_stats),
+                "handshake_seconds_saved": round(
+                    sum(stats.get('handshake_seconds_saved', 0.0) for stats in shell_stats), 3
+                )
+            },
+            "emulator_list": {
+                "cache_hits": sum(stats['hits'] for stats in emulator_list_stats),
+                "coalesced": sum(stats['coalesced'] for stats in emulator_list_stats),
+                "remote_calls": sum(stats['remote_calls'] for stats in emulator_list_stats)
+            },
+            "circuit_breakers": get_error_handler().get_circuit_breaker_stats(),
+            "retry_budgets": get_retry_budgets().get_stats(),
+            "emulator_inventory": get_inventory().get_stats(),
+            "fleet_counters": get_fleet_counters().get_stats(),
+            "event_bus": get_event_bus().get_stats(),
+            "session_pools": {
+                ws_id: manager.get_session_pool_stats()
+                for ws_id, manager in workstation_managers.items()
             }
         },
         "timestamp": datetime.now().isoformat()
@@ -58,6 +58,7 @@ app.include_router(operations_router)
 
 # Глобальные переменные
 monitor: WorkstationMonitor = None
+session_maintenance_task: asyncio.Task = None
 websocket_connections: List[WebSocket] = []
 
 
@@ -171,6 +172,53 @@ async def stop_monitoring():
         logger.log_system_event("Мониторинг рабочих станций остановлен", {})
 
 
+async def connect_workstations():
+    """Параллельно подключиться ко всем рабочим станциям.
+
+    Результаты логируются по мере ответа станций, поэтому медленная
+    станция не задерживает остальные.
+    """
+    config = get_config()
+    for ws_config in config.workstations:
+        connection_pool.get_connection(ws_config)
+
+    started = datetime.now()
+    async for ws_id, connected in connection_pool.iter_connect_all():
+        logger.log_system_event(
+            f"Подключение к станции {ws_id}: {'успешно' if connected else 'ошибка'}",
+            {"workstation_id": ws_id, "connected": connected}
+        )
+
+    logger.log_system_event(
+        "Подключение к рабочим станциям завершено",
+        {
+            "connected": len(connection_pool.get_connected_workstations()),
+            "elapsed_seconds": (datetime.now() - started).total_seconds()
+        }
+    )
+
+
+async def maintain_session_pools(interval: int = 60):
+    """Периодически проверять пулы сессий и закрывать простаивающие сессии.
+
+    Args:
+        interval: Интервал обслуживания в секундах
+    """
+    while True:
+        try:
+            await asyncio.sleep(interval)
+
+            await asyncio.gather(*[
+                manager.run_in_executor(manager.maintain_sessions, timeout=interval)
+                for manager in workstation_managers.values()
+            ], return_exceptions=True)
+
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.log_system_event(f"Ошибка обслуживания пулов сессий: {e}", {"error": str(e)})
+
+
 async def start_operation_processors():
     """Запустить обработчики операций для всех менеджеров."""
     for ws_id, ldplayer_manager in ldplayer_managers.items():
@@ -185,6 +233,7 @@ async def start_operation_processors():
 @app.on_event("startup")
 async def startup_event():
     """Действия при запуске сервера."""
+    global session_maintenance_task
     import os
     
     logger.log_system_event("🚀 Запуск LDPlayer Management System Server", {})
@@ -232,6 +281,12 @@ async def startup_event():
 
             # Запустить обработчики операций
             await start_operation_processors()
+
+            # Подключиться к станциям в фоне, не задерживая запуск сервера
+            asyncio.create_task(connect_workstations())
+
+            # Фоновые проверки живости и вытеснение простаивающих сессий
+            session_maintenance_task = asyncio.create_task(maintain_session_pools())
             
             logger.log_system_event("✅ Сервер успешно запущен с мониторингом", {})
         else:
@@ -251,6 +306,10 @@ async def shutdown_event():
         # Остановить мониторинг
         await stop_monitoring()
 
+        # Остановить обслуживание пулов сессий
+        if session_maintenance_task:
+            session_maintenance_task.cancel()
+
         # Закрыть все подключения
         connection_pool.cleanup()
 
@@ -0,0 +1,169 @@
+"""
+Контроль допуска запусков эмуляторов.
+
+Одновременный запуск десятков LDPlayer на одной станции упирается в CPU
+и диск, и загрузка эмуляторов начинает падать. Контроллер допускает
+очередной запуск, только пока у станции есть запас: загрузка CPU и
+свободная память в пределах порогов (телеметрия мониторинга), число
+еще загружающихся эмуляторов и запущенных эмуляторов ниже потолков
+станции. Остальные запуски ждут и допускаются по мере освобождения
+ресурсов.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+@dataclass
+class LaunchLimits:
+    """Пороги и потолки запусков для станции."""
+
+    max_cpu_percent: float = 85.0  # выше - новые запуски ждут
+    min_free_memory_percent: float = 15.0  # ниже - новые запуски ждут
+    max_booting: int = 4  # эмуляторов, загружающихся одновременно
+    max_running: int = 0  # запущенных эмуляторов на станции (0 - без ограничения)
+    boot_seconds: float = 60.0  # сколько эмулятор считается загружающимся после запуска
+    max_wait: float = 600.0  # секунды ожидания допуска до отказа
+    recheck_interval: float = 1.0  # секунды между проверками запаса
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'LaunchLimits':
+        """Создать пороги из словаря конфигурации (неизвестные ключи игнорируются)."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in (data or {}).items() if key in known})
+
+
+class LaunchAdmissionController:
+    """Допуск запусков эмуляторов станции по запасу ресурсов."""
+
+    def __init__(
+        self,
+        limits: LaunchLimits,
+        telemetry: Callable[[], Dict[str, Optional[float]]],
+        running: Callable[[], int]
+    ):
+        """Инициализация контроллера.
+
+        Args:
+            limits: Пороги и потолки станции
+            telemetry: Текущая телеметрия станции (cpu_usage, memory_usage в процентах)
+            running: Количество запущенных эмуляторов станции
+        """
+        self.limits = limits
+        self._telemetry = telemetry
+        self._running = running
+
+        self._booting: Deque[float] = deque()  # время допуска загружающихся эмуляторов
+        self._launches: Deque[float] = deque()  # время допусков за последнюю минуту
+        self._changed = asyncio.Event()
+        self._waiting = 0
+
+        self.stats: Dict[str, Any] = {'admitted': 0, 'deferred': 0, 'rejected': 0, 'wait_seconds': 0.0}
+
+    def _expire(self, now: float) -> None:
+        """Убрать загрузившиеся эмуляторы и допуски старше минуты."""
+        while self._booting and self._booting[0] <= now - self.limits.boot_seconds:
+            self._booting.popleft()
+        while self._launches and self._launches[0] <= now - 60.0:
+            self._launches.popleft()
+
+    def headroom(self, now: Optional[float] = None) -> int:
+        """Сколько запусков можно допустить сейчас.
+
+        Returns:
+            int: Количество запусков (0 - станция без запаса)
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        limits = self.limits
+
+        telemetry = self._telemetry()
+        cpu = telemetry.get('cpu_usage') or 0.0
+        memory = telemetry.get('memory_usage') or 0.0
+        if cpu >= limits.max_cpu_percent or 100.0 - memory <= limits.min_free_memory_percent:
+            return 0
+
+        slots = limits.max_booting - len(self._booting)
+        if limits.max_running:
+            slots = min(slots, limits.max_running - self._running())
+        return max(slots, 0)
+
+    async def acquire(self, wanted: int = 1) -> int:
+        """Дождаться допуска запусков.
+
+        Args:
+            wanted: Сколько эмуляторов нужно запустить
+
+        Returns:
+            int: Допущено запусков (от 1 до wanted), 0 если запас не появился за max_wait
+        """
+        started = time.monotonic()
+        deadline = started + self.limits.max_wait
+        deferred = False
+
+        while True:
+            now = time.monotonic()
+            granted = min(wanted, self.headroom(now))
+            if granted > 0:
+                self._booting.extend([now] * granted)
+                self._launches.extend([now] * granted)
+                self.stats['admitted'] += granted
+                self.stats['wait_seconds'] += now - started
+                return granted
+
+            if now >= deadline:
+                self.stats['rejected'] += wanted
+                return 0
+            if not deferred:
+                deferred = True
+                self.stats['deferred'] += 1
+
+            # Запас проверяется заново по сигналу или через recheck_interval
+            self._changed.clear()
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(),
+                    min(self.limits.recheck_interval, max(deadline - now, 0.0))
+                )
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiting -= 1
+
+    def release(self, count: int = 1) -> None:
+        """Вернуть допуски несостоявшихся запусков (ошибка launch).
+
+        Args:
+            count: Количество запусков
+        """
+        for _ in range(min(count, len(self._booting))):
+            self._booting.pop()
+        for _ in range(min(count, len(self._launches))):
+            self._launches.pop()
+        self.notify()
+
+    def notify(self) -> None:
+        """Разбудить ожидающих для повторной проверки запаса."""
+        self._changed.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику допуска.
+
+        Returns:
+            Dict[str, Any]: Допущенные и отложенные запуски, загружающиеся
+                эмуляторы, запас и запуски за последнюю минуту
+        """
+        now = time.monotonic()
+        headroom = self.headroom(now)
+        return {
+            **self.stats,
+            'waiting': self._waiting,
+            'booting': len(self._booting),
+            'headroom': headroom,
+            'launches_per_minute': len(self._launches),
+            'limits': {f.name: getattr(self.limits, f.name) for f in fields(self.limits)}
+        }
@@ -0,0 +1,233 @@
+"""
+Пакетное выполнение команд ldconsole.exe за один WinRM round-trip.
+
+Вместо отдельного вызова на каждый эмулятор набор действий одной
+рабочей станции компилируется в PowerShell скрипт. Скрипт выполняет
+ldconsole.exe для каждого элемента и возвращает JSON массив с кодом
+возврата и выводом по каждому элементу.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .workstation import WorkstationManager
+
+
+# Действия ldconsole, которые можно выполнять пакетом
+BATCH_ACTIONS = ('launch', 'quit', 'remove', 'modify')
+
+# Скрипт постоянный: меняется только JSON манифест внутри одинарных кавычек.
+# Манифест - объект с массивом items, чтобы ConvertFrom-Json в PowerShell 5.1
+# не разворачивал вложенные массивы.
+_SCRIPT_TEMPLATE = (
+    "$ld='{ldconsole}';"
+    "$m=@((ConvertFrom-Json '{manifest}').items);"
+    "$r=@(foreach($i in 0..($m.Count-1)){{"
+    "$o=(& $ld @($m[$i].a) 2>&1|Out-String);"
+    "[pscustomobject]@{{i=$i;c=$LASTEXITCODE;o=$o}}}});"
+    "ConvertTo-Json -InputObject $r -Compress"
+)
+
+# Бюджет длины скрипта. -EncodedCommand кодирует UTF-16 в base64
+# (x8/3), а командная строка Windows ограничена 8191 символом.
+DEFAULT_MAX_SCRIPT_CHARS = 2500
+
+
+class BatchItem:
+    """Одно действие ldconsole в пакете."""
+
+    __slots__ = ('action', 'name', 'params')
+
+    def __init__(self, action: str, name: str, params: Optional[Dict[str, Any]] = None):
+        """Инициализация элемента пакета.
+
+        Args:
+            action: Действие ldconsole (launch, quit, remove, modify)
+            name: Имя эмулятора
+            params: Дополнительные параметры (--key value)
+        """
+        if action not in BATCH_ACTIONS:
+            raise ValueError(f"Действие '{action}' не поддерживается пакетным выполнением")
+
+        self.action = action
+        self.name = name
+        self.params = params or {}
+
+    def to_args(self) -> List[str]:
+        """Собрать аргументы командной строки ldconsole.
+
+        Returns:
+            List[str]: Аргументы команды
+        """
+        args = [self.action, '--name', self.name]
+        for key, value in self.params.items():
+            if value is not None:
+                args.extend([f'--{key}', str(value)])
+        return args
+
+
+class BatchItemResult:
+    """Результат выполнения одного элемента пакета."""
+
+    __slots__ = ('exit_code', 'output', 'error')
+
+    def __init__(self, exit_code: int, output: str = "", error: Optional[str] = None):
+        """Инициализация результата.
+
+        Args:
+            exit_code: Код возврата ldconsole (-1 если элемент не выполнялся)
+            output: Вывод ldconsole (stdout и stderr)
+            error: Ошибка выполнения пакета, если элемент не выполнился
+        """
+        self.exit_code = exit_code
+        self.output = output
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        """Успешно ли выполнен элемент."""
+        return self.error is None and self.exit_code == 0
+
+
+class LDConsoleBatchExecutor:
+    """Исполнитель пакетов команд ldconsole для одной рабочей станции."""
+
+    def __init__(self, workstation: WorkstationManager,
+                 max_script_chars: int = DEFAULT_MAX_SCRIPT_CHARS):
+        """Инициализация исполнителя.
+
+        Args:
+            workstation: Менеджер рабочей станции
+            max_script_chars: Максимальная длина одного скрипта в символах
+        """
+        self.workstation = workstation
+        self.max_script_chars = max_script_chars
+
+        self.stats: Dict[str, int] = {
+            'batches': 0,
+            'items': 0,
+            'round_trips': 0,
+            'failed_chunks': 0,
+        }
+
+    def build_script(self, items: List[BatchItem]) -> str:
+        """Скомпилировать элементы в PowerShell скрипт.
+
+        Args:
+            items: Элементы пакета
+
+        Returns:
+            str: Текст скрипта
+        """
+        return _SCRIPT_TEMPLATE.format(
+            ldconsole=_quote(self.workstation.config.ldconsole_path),
+            manifest=_quote(_encode_manifest(items))
+        )
+
+    def chunk(self, items: List[BatchItem]) -> List[List[BatchItem]]:
+        """Разбить элементы на части, каждая из которых укладывается в бюджет скрипта.
+
+        Args:
+            items: Элементы пакета
+
+        Returns:
+            List[List[BatchItem]]: Части пакета (элемент длиннее бюджета идет отдельно)
+        """
+        overhead = len(self.build_script([]))
+        budget = self.max_script_chars - overhead
+
+        chunks: List[List[BatchItem]] = []
+        current: List[BatchItem] = []
+        used = 0
+
+        for item in items:
+            size = len(_quote(json.dumps({'a': item.to_args()}, separators=(',', ':')))) + 1
+            if current and used + size > budget:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += size
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def execute(self, items: List[BatchItem]) -> List[BatchItemResult]:
+        """Выполнить пакет (блокирующий вызов).
+
+        Ошибка одной части пакета помечает неуспешными только ее элементы.
+
+        Args:
+            items: Элементы пакета
+
+        Returns:
+            List[BatchItemResult]: Результаты в порядке элементов
+        """
+        results: List[BatchItemResult] = []
+        self.stats['batches'] += 1
+        self.stats['items'] += len(items)
+
+        for chunk in self.chunk(items):
+            self.stats['round_trips'] += 1
+            try:
+                status_code, stdout, stderr = self.workstation.run_powershell(self.build_script(chunk))
+                if status_code != 0 and not stdout.strip():
+                    raise ValueError(f"Скрипт завершился с кодом {status_code}: {stderr}")
+                results.extend(parse_batch_output(stdout, len(chunk)))
+            except Exception as e:
+                self.stats['failed_chunks'] += 1
+                results.extend(BatchItemResult(-1, error=str(e)) for _ in chunk)
+
+        return results
+
+
+def parse_batch_output(output: str, expected: int) -> List[BatchItemResult]:
+    """Разобрать JSON вывод пакетного скрипта.
+
+    Args:
+        output: stdout скрипта
+        expected: Ожидаемое количество элементов
+
+    Returns:
+        List[BatchItemResult]: Результаты по элементам
+
+    Raises:
+        ValueError: Если вывод не является корректным JSON массивом
+    """
+    start = output.find('[')
+    if start < 0:
+        raise ValueError(f"Пакетный скрипт не вернул JSON: {output[:200]!r}")
+
+    try:
+        records = json.loads(output[start:])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Некорректный JSON в выводе пакета: {e}")
+
+    by_index: Dict[int, Tuple[int, str]] = {}
+    for record in records:
+        exit_code = record.get('c')
+        by_index[int(record['i'])] = (
+            int(exit_code) if exit_code is not None else -1,
+            (record.get('o') or '').strip()
+        )
+
+    return [
+        BatchItemResult(*by_index[i]) if i in by_index
+        else BatchItemResult(-1, error="Нет результата для элемента пакета")
+        for i in range(expected)
+    ]
+
+
+def _encode_manifest(items: List[BatchItem]) -> str:
+    """Сериализовать элементы в JSON манифест (только ASCII)."""
+    return json.dumps(
+        {'items': [{'a': item.to_args()} for item in items]},
+        ensure_ascii=True,
+        separators=(',', ':')
+    )
+
+
+def _quote(value: str) -> str:
+    """Экранировать строку для одинарных кавычек PowerShell."""
+    return value.replace("'", "''")
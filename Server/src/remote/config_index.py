@@ -0,0 +1,286 @@
+"""
+Инкрементальный индекс конфигураций эмуляторов LDPlayer.
+
+Конфигурации vms/config/*.config - JSON (LDPlayer 9) или key=value
+(старые версии). Индекс хранит разобранные поля по ключу
+(путь, mtime, размер): при обновлении файлы только перечисляются,
+а читаются заново лишь измененные. Сканер и API получают поля из
+памяти - построчно (find) или колонками (columns).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONFIG_SUFFIX = ".config"
+
+# Ключ JSON конфигурации LDPlayer 9 -> поле индекса
+_JSON_FIELDS = {
+    'statusSettings.playerName': 'name',
+    'advancedSettings.cpuCount': 'cpu',
+    'advancedSettings.memorySize': 'memory_mb',
+    'advancedSettings.resolutionDpi': 'dpi',
+    'propertySettings.phoneIMEI': 'imei',
+    'propertySettings.phoneAndroidId': 'android_id',
+    'propertySettings.macAddress': 'mac',
+    'propertySettings.phoneModel': 'model',
+    'propertySettings.phoneManufacturer': 'manufacturer',
+}
+
+_INT_FIELDS = {'cpu', 'memory_mb', 'width', 'height', 'dpi'}
+
+_INDEX_RE = re.compile(r'^leidian(\d+)$')
+
+
+class ConfigRow(NamedTuple):
+    """Разобранные поля одного файла конфигурации."""
+    path: str
+    index: Optional[int]
+    name: str
+    cpu: Optional[int]
+    memory_mb: Optional[int]
+    width: Optional[int]
+    height: Optional[int]
+    dpi: Optional[int]
+    imei: Optional[str]
+    android_id: Optional[str]
+    mac: Optional[str]
+    model: Optional[str]
+    manufacturer: Optional[str]
+
+    @property
+    def resolution(self) -> Optional[str]:
+        """Разрешение WxH (None если не задано)."""
+        if self.width is None and self.height is None:
+            return None
+        return f"{self.width or '?'}x{self.height or '?'}"
+
+
+CONFIG_COLUMNS = ConfigRow._fields
+
+
+def parse_config(path: str, text: str) -> ConfigRow:
+    """Разобрать содержимое файла конфигурации.
+
+    Args:
+        path: Путь к файлу (имя файла - запасное имя эмулятора)
+        text: Содержимое файла
+
+    Returns:
+        ConfigRow: Поля конфигурации (отсутствующие - None)
+    """
+    stem = Path(path).stem
+    fields: Dict[str, Any] = {}
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    if isinstance(data, dict):
+        for key, field in _JSON_FIELDS.items():
+            if key in data:
+                fields[field] = data[key]
+        resolution = data.get('advancedSettings.resolution')
+        if isinstance(resolution, dict):
+            fields['width'] = resolution.get('width')
+            fields['height'] = resolution.get('height')
+    else:
+        # Старый формат key=value
+        for line in text.splitlines():
+            line = line.strip()
+            if '=' not in line or line.startswith('#'):
+                continue
+            key, value = line.split('=', 1)
+            key = key.strip().lower()
+            value = value.strip().strip('"')
+            if 'memory' in key and 'phone' in key:
+                fields['memory_mb'] = value
+            elif 'cpucore' in key:
+                fields['cpu'] = value
+            elif 'width' in key:
+                fields['width'] = value
+            elif 'height' in key:
+                fields['height'] = value
+
+    for field in _INT_FIELDS & fields.keys():
+        try:
+            fields[field] = int(fields[field])
+        except (TypeError, ValueError):
+            fields[field] = None
+
+    match = _INDEX_RE.match(stem)
+    return ConfigRow(
+        path=path,
+        index=int(match.group(1)) if match else None,
+        name=fields.get('name') or stem,
+        cpu=fields.get('cpu'),
+        memory_mb=fields.get('memory_mb'),
+        width=fields.get('width'),
+        height=fields.get('height'),
+        dpi=fields.get('dpi'),
+        imei=fields.get('imei'),
+        android_id=fields.get('android_id'),
+        mac=fields.get('mac'),
+        model=fields.get('model'),
+        manufacturer=fields.get('manufacturer'),
+    )
+
+
+class ConfigIndex:
+    """Потокобезопасный индекс конфигураций эмуляторов одной установки LDPlayer."""
+
+    def __init__(self, config_dirs: List[str]):
+        """Инициализация индекса.
+
+        Args:
+            config_dirs: Каталоги с *.config (поздние переопределяют ранние по имени)
+        """
+        self.config_dirs = [str(path) for path in config_dirs]
+        self._lock = threading.Lock()
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._rows: Dict[str, ConfigRow] = {}
+        self._by_name: Dict[str, ConfigRow] = {}
+        self._by_index: Dict[int, ConfigRow] = {}
+        self._columns: Optional[Dict[str, List[Any]]] = None
+
+        self.stats: Dict[str, int] = {'refreshes': 0, 'files_read': 0, 'files_removed': 0, 'errors': 0}
+
+    def refresh(self) -> int:
+        """Перечитать измененные файлы конфигурации.
+
+        Returns:
+            int: Количество прочитанных или удаленных файлов
+        """
+        seen: Dict[str, Tuple[int, int]] = {}
+        for config_dir in self.config_dirs:
+            try:
+                entries = list(os.scandir(config_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(CONFIG_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                seen[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            self.stats['refreshes'] += 1
+            changed = 0
+
+            for path in [path for path in self._rows if path not in seen]:
+                del self._rows[path]
+                del self._stamps[path]
+                self.stats['files_removed'] += 1
+                changed += 1
+
+            for path, stamp in seen.items():
+                if self._stamps.get(path) == stamp:
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                        row = parse_config(path, f.read())
+                except OSError as e:
+                    logger.warning(f"Error reading config {path}: {e}")
+                    self.stats['errors'] += 1
+                    continue
+                self._rows[path] = row
+                self._stamps[path] = stamp
+                self.stats['files_read'] += 1
+                changed += 1
+
+            if changed:
+                self._rebuild()
+            return changed
+
+    def _rebuild(self) -> None:
+        """Перестроить индексы по имени/индексу и сбросить колонки (под блокировкой)."""
+        order = {config_dir: position for position, config_dir in enumerate(self.config_dirs)}
+        rows = sorted(self._rows.values(), key=lambda row: (order.get(os.path.dirname(row.path), 0), row.path))
+        self._by_name = {row.name: row for row in rows}
+        self._by_index = {row.index: row for row in rows if row.index is not None}
+        self._columns = None
+
+    def find(self, name: str) -> Optional[ConfigRow]:
+        """Найти конфигурацию эмулятора по имени.
+
+        Args:
+            name: Имя эмулятора (playerName или имя файла)
+
+        Returns:
+            Optional[ConfigRow]: Поля конфигурации или None
+        """
+        return self._by_name.get(name)
+
+    def find_index(self, index: int) -> Optional[ConfigRow]:
+        """Найти конфигурацию эмулятора по индексу ldconsole (leidian<index>.config).
+
+        Args:
+            index: Индекс эмулятора
+
+        Returns:
+            Optional[ConfigRow]: Поля конфигурации или None
+        """
+        return self._by_index.get(index)
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Получить колоночное представление индекса.
+
+        Колонки строятся один раз после изменения и переиспользуются.
+
+        Returns:
+            Dict[str, List[Any]]: Поле -> значения в порядке строк
+        """
+        with self._lock:
+            if self._columns is None:
+                rows = list(self._by_name.values())
+                self._columns = {
+                    column: [row[position] for row in rows]
+                    for position, column in enumerate(CONFIG_COLUMNS)
+                }
+            return self._columns
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику индекса.
+
+        Returns:
+            Dict[str, Any]: Счетчики и размер индекса
+        """
+        with self._lock:
+            return {**self.stats, 'files': len(self._rows), 'emulators': len(self._by_name)}
+
+
+# Индексы по пути установки LDPlayer (живут между сканированиями)
+_indexes: Dict[str, ConfigIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_config_index(ldplayer_path: str) -> ConfigIndex:
+    """Получить индекс конфигураций установки LDPlayer.
+
+    Args:
+        ldplayer_path: Путь к LDPlayer
+
+    Returns:
+        ConfigIndex: Индекс vms/config и vms/leidian этой установки
+    """
+    key = os.path.normcase(os.path.abspath(ldplayer_path))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            root = Path(ldplayer_path)
+            index = ConfigIndex([str(root / "vms" / "config"), str(root / "vms" / "leidian")])
+            _indexes[key] = index
+        return index
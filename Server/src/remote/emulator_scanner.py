@@ -10,14 +10,16 @@ LDPlayer Emulator Scanner - сканирование эмуляторов лок
 
 import os
 import subprocess
-import json
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
+from .config_index import get_config_index
+from .ldconsole_parser import LDConsoleParseError, List2Record, parse_list2, parse_runninglist
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +63,41 @@ class EmulatorInfo:
         }
 
 
+def record_to_info(record: List2Record) -> EmulatorInfo:
+    """Преобразовать запись list2 в информацию об эмуляторе."""
+    return EmulatorInfo(
+        name=record.name,
+        id=record.name,
+        pid=record.pid if record.pid > 0 else None,
+        status=EmulatorStatus.RUNNING if record.running else EmulatorStatus.STOPPED,
+        resolution=f"{record.width}x{record.height}" if record.width else None
+    )
+
+
+def settle_running_status(emulators: List[EmulatorInfo], runninglist: Optional[str]) -> int:
+    """Установить статус эмуляторов с неизвестным статусом по выводу runninglist.
+    
+    Один вызов runninglist заменяет отдельный isrunning на каждый эмулятор.
+    
+    Args:
+        emulators: Эмуляторы (меняются на месте)
+        runninglist: Вывод ldconsole runninglist (None - команда не выполнена)
+    
+    Returns:
+        int: Количество эмуляторов, получивших статус
+    """
+    if runninglist is None:
+        return 0
+    
+    running = set(parse_runninglist(runninglist))
+    settled = 0
+    for emu in emulators:
+        if emu.status == EmulatorStatus.UNKNOWN:
+            emu.status = EmulatorStatus.RUNNING if emu.name in running else EmulatorStatus.STOPPED
+            settled += 1
+    return settled
+
+
 class LocalLDPlayerScanner:
     """Сканер эмуляторов на локальной машине."""
     
@@ -72,15 +109,22 @@ class LocalLDPlayerScanner:
         r"C:\Program Files\LDPlayer",
     ]
     
-    def __init__(self, ldplayer_path: Optional[str] = None):
+    def __init__(
+        self,
+        ldplayer_path: Optional[str] = None,
+        ldconsole_runner: Optional[Callable[[List[str]], Tuple[int, str, str]]] = None
+    ):
         """Инициализировать сканер.
         
         Args:
             ldplayer_path: Путь к LDPlayer (автоопределение если None)
+            ldconsole_runner: Выполнение ldconsole по аргументам -> (код, stdout, stderr)
+                (по умолчанию subprocess; симулятор подставляет свою станцию)
         """
         self.ldplayer_path = ldplayer_path
         self._find_ldplayer_path()
         self.ldconsole_path = self._find_ldconsole()
+        self._ldconsole_runner = ldconsole_runner
     
     def _find_ldplayer_path(self) -> None:
         """Найти путь к LDPlayer."""
@@ -115,7 +159,7 @@ class LocalLDPlayerScanner:
         Returns:
             Список эмуляторов
         """
-        if not self.ldconsole_path:
+        if not self.ldconsole_path and self._ldconsole_runner is None:
             logger.error("LDConsole not found")
             return []
         
@@ -135,45 +179,18 @@ class LocalLDPlayerScanner:
     def _parse_ldconsole_list2(self) -> List[EmulatorInfo]:
         """Парсить вывод ldconsole list2.
         
-        Формат:
-        Name,Pid,Status,TopWindowHandle
-        leidian0,1234,Running,0x12345678
-        leidian1,0,Stop,0
+        Поддерживаются оба формата (см. ldconsole_parser):
+        0,LDPlayer,0,0,0,-1,-1,960,540,240
+        Name,Pid,Status,TopWindowHandle / leidian0,1234,Running,0x12345678
         """
-        if not self.ldconsole_path:
+        if not self.ldconsole_path and self._ldconsole_runner is None:
             return []
         
         try:
-            result = subprocess.run(
-                [self.ldconsole_path, "list2"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                encoding='utf-8'
-            )
-            
-            emulators = []
-            lines = result.stdout.strip().split('\n')
+            _, stdout, _ = self._run_ldconsole(["list2"], timeout=30)
             
-            # Пропустить заголовок
-            if not lines or "Name" in lines[0]:
-                lines = lines[1:]
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) < 2:
-                    continue
-                
-                emu = EmulatorInfo(
-                    name=parts[0],
-                    id=parts[0],
-                    pid=int(parts[1]) if parts[1].isdigit() else None,
-                    status=self._parse_status(parts[2] if len(parts) > 2 else "")
-                )
-                emulators.append(emu)
+            emulators = [record_to_info(record) for record in parse_list2(stdout)]
+            for emu in emulators:
                 logger.debug(f"Found emulator: {emu.name} (PID: {emu.pid})")
             
             return emulators
@@ -181,10 +198,38 @@ class LocalLDPlayerScanner:
         except subprocess.TimeoutExpired:
             logger.error("ldconsole list2 timed out")
             return []
+        except LDConsoleParseError as e:
+            logger.error(f"Invalid ldconsole list2 output: {e}")
+            return []
         except Exception as e:
             logger.error(f"Error parsing ldconsole output: {e}")
             return []
     
+    def _run_ldconsole(self, args: List[str], timeout: int) -> Tuple[int, str, str]:
+        """Выполнить ldconsole.
+        
+        Args:
+            args: Аргументы команды
+            timeout: Таймаут в секундах
+        
+        Returns:
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+        
+        Raises:
+            subprocess.TimeoutExpired: Команда не завершилась за timeout
+        """
+        if self._ldconsole_runner is not None:
+            return self._ldconsole_runner(args)
+        
+        result = subprocess.run(
+            [self.ldconsole_path, *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            encoding='utf-8'
+        )
+        return result.returncode, result.stdout, result.stderr
+    
     def _parse_status(self, status_str: str) -> EmulatorStatus:
         """Парсить статус эмулятора."""
         status_lower = status_str.lower()
@@ -196,96 +241,46 @@ class LocalLDPlayerScanner:
             return EmulatorStatus.UNKNOWN
     
     def _enhance_with_configs(self, emulators: List[EmulatorInfo]) -> None:
-        """Дополнить информацию из конфигурационных файлов."""
+        """Дополнить информацию из конфигурационных файлов.
+        
+        Поля берутся из индекса конфигураций: файлы перечитываются
+        только при изменении mtime/размера.
+        """
         if not self.ldplayer_path:
             return
         
-        config_dirs = [
-            Path(self.ldplayer_path) / "vms" / "config",
-            Path(self.ldplayer_path) / "vms" / "leidian",
-        ]
+        index = get_config_index(self.ldplayer_path)
+        index.refresh()
         
-        for config_dir in config_dirs:
-            if not config_dir.exists():
+        for emu in emulators:
+            row = index.find(emu.name)
+            if row is None:
                 continue
-            
-            for emu in emulators:
-                config_file = config_dir / f"{emu.name}.config"
-                if not config_file.exists():
-                    continue
-                
-                try:
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if '=' not in line or line.startswith('#'):
-                                continue
-                            
-                            key, value = line.split('=', 1)
-                            key = key.strip().lower()
-                            value = value.strip().strip('"')
-                            
-                            # Парсить значения
-                            if 'memory' in key and 'phone' in key:
-                                try:
-                                    emu.memory_mb = int(value)
-                                except:
-                                    pass
-                            elif 'cpucore' in key:
-                                try:
-                                    emu.cpu_cores = int(value)
-                                except:
-                                    pass
-                            elif 'width' in key:
-                                try:
-                                    width = int(value)
-                                    if emu.resolution:
-                                        height = emu.resolution.split('x')[1]
-                                        emu.resolution = f"{width}x{height}"
-                                    else:
-                                        emu.resolution = f"{width}x?"
-                                except:
-                                    pass
-                            elif 'height' in key:
-                                try:
-                                    height = int(value)
-                                    if emu.resolution:
-                                        width = emu.resolution.split('x')[0]
-                                        emu.resolution = f"{width}x{height}"
-                                    else:
-                                        emu.resolution = f"?x{height}"
-                                except:
-                                    pass
-                    
-                    emu.config_path = str(config_file)
-                except Exception as e:
-                    logger.warning(f"Error reading config for {emu.name}: {e}")
+            if row.memory_mb is not None:
+                emu.memory_mb = row.memory_mb
+            if row.cpu is not None:
+                emu.cpu_cores = row.cpu
+            if row.resolution is not None:
+                emu.resolution = row.resolution
+            emu.config_path = row.path
         
     def _check_running_status(self, emulators: List[EmulatorInfo]) -> None:
-        """Проверить статус запущенных эмуляторов через ldconsole isrunning."""
-        if not self.ldconsole_path:
+        """Определить статус эмуляторов с неизвестным статусом одним вызовом runninglist."""
+        if not any(emu.status == EmulatorStatus.UNKNOWN for emu in emulators):
+            return
+        if not self.ldconsole_path and self._ldconsole_runner is None:
             return
         
-        for emu in emulators:
-            if emu.status != EmulatorStatus.UNKNOWN:
-                continue
-            
-            try:
-                result = subprocess.run(
-                    [self.ldconsole_path, "isrunning", emu.name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if "1" in result.stdout:
-                    emu.status = EmulatorStatus.RUNNING
-                else:
-                    emu.status = EmulatorStatus.STOPPED
-            
-            except Exception as e:
-                logger.warning(f"Error checking status for {emu.name}: {e}")
-                emu.status = EmulatorStatus.UNKNOWN
+        try:
+            code, stdout, stderr = self._run_ldconsole(["runninglist"], timeout=10)
+        except Exception as e:
+            logger.warning(f"Error checking running emulators: {e}")
+            return
+        
+        if code != 0:
+            logger.warning(f"ldconsole runninglist failed: {stderr}")
+            return
+        settle_running_status(emulators, stdout)
 
 
 class RemoteLDPlayerScanner:
@@ -296,7 +291,8 @@ class RemoteLDPlayerScanner:
         host: str,
         username: str = "Administrator",
         password: str = "",
-        ldplayer_path: str = r"C:\LDPlayer\LDPlayer9"
+        ldplayer_path: str = r"C:\LDPlayer\LDPlayer9",
+        session_factory: Optional[Callable[[str], Any]] = None
     ):
         """Инициализировать удалённый сканер.
         
@@ -305,16 +301,22 @@ class RemoteLDPlayerScanner:
             username: Имя пользователя для WinRM
             password: Пароль
             ldplayer_path: Путь к LDPlayer на удалённой машине
+            session_factory: Фабрика WinRM сессий по хосту (по умолчанию winrm.Session)
         """
         self.host = host
         self.username = username
         self.password = password
         self.ldplayer_path = ldplayer_path
+        self._session_factory = session_factory
         self._session = None
     
     def _create_session(self):
         """Создать WinRM сессию."""
         try:
+            if self._session_factory is not None:
+                self._session = self._session_factory(self.host)
+                return True
+
             import winrm
             self._session = winrm.Session(
                 self.host,
@@ -337,26 +339,12 @@ class RemoteLDPlayerScanner:
             return []
         
         try:
-            # Выполнить PowerShell команду для получения списка
+            # Сырой вывод list2 разбирается тем же парсером, что и на сервере
             script = f"""
-            $emulators = @()
             $ldconsole = '{self.ldplayer_path}\\ldconsole.exe'
-            
             if (Test-Path $ldconsole) {{
-                $output = & $ldconsole list2 2>$null
-                foreach ($line in $output | Select-Object -Skip 1) {{
-                    if ($line.Trim()) {{
-                        $parts = $line -split ','
-                        $emulators += @{{
-                            name = $parts[0].Trim()
-                            pid = [int]::TryParse($parts[1].Trim(), [ref]0)
-                            status = if ($parts[2] -like '*run*') {{ 'Running' }} else {{ 'Stopped' }}
-                        }}
-                    }}
-                }}
+                & $ldconsole list2 2>$null
             }}
-            
-            $emulators | ConvertTo-Json
             """
             
             response = self._session.run_ps(script)
@@ -365,25 +353,52 @@ class RemoteLDPlayerScanner:
                 logger.error(f"Remote script error: {response.std_err}")
                 return []
             
-            data = json.loads(response.std_out)
-            if not isinstance(data, list):
-                data = [data]
-            
-            emulators = []
-            for item in data:
-                emu = EmulatorInfo(
-                    name=item.get("name", ""),
-                    status=EmulatorStatus.RUNNING if item.get("status") == "Running" else EmulatorStatus.STOPPED
-                )
-                emulators.append(emu)
-            
+            emulators = [record_to_info(record) for record in parse_list2(self._decode(response.std_out))]
+            self._check_running_status(emulators)
             return emulators
         
+        except LDConsoleParseError as e:
+            logger.error(f"Invalid remote ldconsole list2 output: {e}")
+            return []
         except Exception as e:
             logger.error(f"Error scanning remote emulators: {e}")
             return []
 
 
+    def _check_running_status(self, emulators: List[EmulatorInfo]) -> None:
+        """Определить статус эмуляторов с неизвестным статусом одним запросом runninglist."""
+        if not any(emu.status == EmulatorStatus.UNKNOWN for emu in emulators):
+            return
+        
+        script = f"""
+        $ldconsole = '{self.ldplayer_path}\\ldconsole.exe'
+        if (Test-Path $ldconsole) {{
+            & $ldconsole runninglist 2>$null
+        }}
+        """
+        try:
+            response = self._session.run_ps(script)
+        except Exception as e:
+            logger.warning(f"Error checking remote running emulators: {e}")
+            return
+        
+        if response.status_code != 0:
+            logger.warning(f"Remote runninglist error: {response.std_err}")
+            return
+        settle_running_status(emulators, self._decode(response.std_out))
+    
+    @staticmethod
+    def _decode(output: Any) -> str:
+        """Вывод WinRM в строку."""
+        if isinstance(output, bytes):
+            return output.decode('utf-8', errors='replace')
+        return output
+
+
+# Адреса, по которым станция считается этим хостом (сканируется LocalLDPlayerScanner)
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "0.0.0.0")
+
+
 class EmulatorScanner:
     """Универсальный сканер эмуляторов (локальный или удалённый)."""
     
@@ -392,7 +407,8 @@ class EmulatorScanner:
         host: str,
         username: Optional[str] = None,
         password: Optional[str] = None,
-        ldplayer_path: Optional[str] = None
+        ldplayer_path: Optional[str] = None,
+        session_factory: Optional[Callable[[str], Any]] = None
     ) -> "LocalLDPlayerScanner | RemoteLDPlayerScanner":
         """Создать сканер в зависимости от хоста.
         
@@ -401,16 +417,18 @@ class EmulatorScanner:
             username: Имя пользователя (для удалённого доступа)
             password: Пароль (для удалённого доступа)
             ldplayer_path: Путь к LDPlayer
+            session_factory: Фабрика WinRM сессий для удалённого сканера
         
         Returns:
             Локальный или удалённый сканер
         """
-        if host in ["127.0.0.1", "localhost", "0.0.0.0"]:
+        if host in LOCAL_HOSTS:
             return LocalLDPlayerScanner(ldplayer_path)
         else:
             return RemoteLDPlayerScanner(
                 host=host,
                 username=username or "Administrator",
                 password=password or "",
-                ldplayer_path=ldplayer_path or r"C:\LDPlayer\LDPlayer9"
+                ldplayer_path=ldplayer_path or r"C:\LDPlayer\LDPlayer9",
+                session_factory=session_factory
             )
@@ -0,0 +1,150 @@
+"""
+Учет задержек команд и адаптивные таймауты рабочей станции.
+
+Для каждого действия (echo, ldconsole list2, ldconsole add, ...) хранится
+EWMA и окно последних замеров. Таймаут команды равен множителю от p99
+окна, ограниченному снизу и сверху. Пока замеров мало, используется
+таймаут по умолчанию.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class _ActionLatency:
+    """Замеры задержки одного действия."""
+
+    __slots__ = ('samples', 'ewma', 'count', 'timeouts', 'last_timeout')
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.ewma: float = 0.0
+        self.count: int = 0
+        self.timeouts: int = 0
+        self.last_timeout: Optional[float] = None
+
+
+class LatencyTracker:
+    """Потокобезопасный учет задержек и расчет таймаутов по действиям."""
+
+    def __init__(
+        self,
+        multiplier: float = 3.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 600.0,
+        window: int = 200,
+        min_samples: int = 5,
+        alpha: float = 0.2
+    ):
+        """Инициализация трекера.
+
+        Args:
+            multiplier: Таймаут = multiplier * p99
+            min_timeout: Нижняя граница таймаута в секундах
+            max_timeout: Верхняя граница таймаута в секундах
+            window: Количество последних замеров для p99
+            min_samples: Минимум замеров, после которого таймаут адаптивный
+            alpha: Коэффициент сглаживания EWMA
+        """
+        if min_timeout <= 0 or max_timeout < min_timeout:
+            raise ValueError(f"Некорректные границы таймаута: {min_timeout}..{max_timeout}")
+
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.window = window
+        self.min_samples = min_samples
+        self.alpha = alpha
+
+        self._lock = threading.Lock()
+        self._actions: Dict[str, _ActionLatency] = {}
+
+    def record(self, action: str, seconds: float) -> None:
+        """Учесть успешное выполнение действия.
+
+        Args:
+            action: Ключ действия
+            seconds: Длительность выполнения
+        """
+        with self._lock:
+            entry = self._entry(action)
+            entry.samples.append(seconds)
+            entry.ewma = seconds if entry.count == 0 else (
+                self.alpha * seconds + (1 - self.alpha) * entry.ewma
+            )
+            entry.count += 1
+
+    def record_timeout(self, action: str, timeout: float) -> None:
+        """Учесть превышение таймаута.
+
+        Таймаут записывается как замер: реальная длительность неизвестна,
+        но не меньше таймаута. Так следующий таймаут для медленного хоста
+        увеличивается, а не обрезает команду снова.
+
+        Args:
+            action: Ключ действия
+            timeout: Таймаут, который был превышен
+        """
+        with self._lock:
+            entry = self._entry(action)
+            entry.samples.append(timeout)
+            entry.timeouts += 1
+            entry.last_timeout = timeout
+
+    def timeout_for(self, action: str, default: float) -> float:
+        """Рассчитать таймаут для действия.
+
+        Args:
+            action: Ключ действия
+            default: Таймаут, пока замеров недостаточно
+
+        Returns:
+            float: Таймаут в секундах
+        """
+        with self._lock:
+            entry = self._actions.get(action)
+            if entry is None or len(entry.samples) < self.min_samples:
+                return default
+            return self._clamp(self.multiplier * self._p99(entry))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Получить выученные задержки и таймауты по действиям.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Ключ действия -> EWMA, p99, таймаут и счетчики
+        """
+        with self._lock:
+            stats = {}
+            for action, entry in self._actions.items():
+                p99 = self._p99(entry) if entry.samples else 0.0
+                adaptive = len(entry.samples) >= self.min_samples
+                stats[action] = {
+                    'samples': len(entry.samples),
+                    'completed': entry.count,
+                    'ewma_ms': round(entry.ewma * 1000, 2),
+                    'p99_ms': round(p99 * 1000, 2),
+                    'timeout_seconds': round(self._clamp(self.multiplier * p99), 3) if adaptive else None,
+                    'timeouts': entry.timeouts,
+                    'last_timeout_seconds': entry.last_timeout,
+                }
+            return stats
+
+    def _entry(self, action: str) -> _ActionLatency:
+        """Получить (создать) замеры действия (вызывается под блокировкой)."""
+        entry = self._actions.get(action)
+        if entry is None:
+            entry = self._actions[action] = _ActionLatency(self.window)
+        return entry
+
+    def _clamp(self, seconds: float) -> float:
+        """Ограничить таймаут границами."""
+        return min(self.max_timeout, max(self.min_timeout, seconds))
+
+    @staticmethod
+    def _p99(entry: _ActionLatency) -> float:
+        """99-й перцентиль окна замеров (nearest-rank)."""
+        ordered = sorted(entry.samples)
+        rank = max(1, math.ceil(0.99 * len(ordered)))
+        return ordered[rank - 1]
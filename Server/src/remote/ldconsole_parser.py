@@ -0,0 +1,172 @@
+"""
+Разбор вывода ldconsole.exe (list2, runninglist).
+
+Общий строгий парсер для WorkstationManager, сверки снимков и сканеров.
+Строки list2 разбираются в компактные записи (кортежи), а объекты
+эмуляторов строят вызывающие - только для нужных строк.
+
+Поддерживаемые форматы list2:
+    LDPlayer 9: index,title,top_handle,bind_handle,android_started,pid,vbox_pid,width,height,dpi
+    С заголовком (старые версии, dnconsole): Name,Pid,Status,TopWindowHandle
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+LIST2_COLUMNS = 10
+
+
+class LDConsoleParseError(ValueError):
+    """Некорректный вывод ldconsole."""
+
+    def __init__(self, message: str, line_number: Optional[int] = None, line: Optional[str] = None):
+        """Инициализация ошибки.
+
+        Args:
+            message: Описание ошибки
+            line_number: Номер строки вывода (с 1)
+            line: Текст строки
+        """
+        if line_number is not None:
+            message = f"{message} (строка {line_number}: {line!r})"
+        super().__init__(message)
+        self.line_number = line_number
+        self.line = line
+
+
+class List2Record(NamedTuple):
+    """Строка вывода list2."""
+    index: int
+    name: str
+    top_handle: int
+    bind_handle: int
+    android_started: int
+    pid: int
+    vbox_pid: int
+    width: int
+    height: int
+    dpi: int
+
+    @property
+    def running(self) -> bool:
+        """Эмулятор запущен (есть окно, binder или загруженный Android)."""
+        return self.top_handle != 0 or self.bind_handle != 0 or self.android_started != 0
+
+
+_new_record = tuple.__new__
+
+
+def parse_list2_line(line: str) -> List2Record:
+    """Разобрать строку list2 формата LDPlayer 9.
+
+    Имя может содержать запятые: за ним всегда следуют 8 числовых колонок.
+
+    Args:
+        line: Строка без перевода строки
+
+    Returns:
+        List2Record: Запись эмулятора
+
+    Raises:
+        LDConsoleParseError: Если строка не соответствует формату
+    """
+    try:
+        index, name, top, bind, android, pid, vbox, width, height, dpi = line.split(',')
+    except ValueError:
+        head, *numbers = line.rsplit(',', LIST2_COLUMNS - 2)
+        index, _, name = head.partition(',')
+        if len(numbers) != LIST2_COLUMNS - 2 or not _:
+            raise LDConsoleParseError(f"Ожидалось {LIST2_COLUMNS} колонок list2", line=line) from None
+        top, bind, android, pid, vbox, width, height, dpi = numbers
+
+    try:
+        return _new_record(List2Record, (
+            int(index), name, int(top), int(bind), int(android),
+            int(pid), int(vbox), int(width), int(height), int(dpi)
+        ))
+    except ValueError:
+        raise LDConsoleParseError("Нечисловое значение в колонке list2", line=line) from None
+
+
+def has_list2_header(lines: List[str]) -> bool:
+    """Вывод list2 в формате с заголовком Name,Pid,Status,TopWindowHandle.
+
+    Args:
+        lines: Строки вывода list2
+    """
+    first = next((line for line in lines if line.strip()), '')
+    return first.strip().lower().startswith('name,')
+
+
+def parse_list2(output: str, strict: bool = True) -> List[List2Record]:
+    """Разобрать полный вывод list2 (формат определяется автоматически).
+
+    Args:
+        output: stdout команды ldconsole list2
+        strict: True - ошибка на некорректной строке, False - строка пропускается
+
+    Returns:
+        List[List2Record]: Записи в порядке вывода
+
+    Raises:
+        LDConsoleParseError: Если strict и вывод содержит некорректную строку
+    """
+    lines = output.splitlines()
+    if has_list2_header(lines):
+        return _parse_headered(lines, strict)
+
+    records: List[List2Record] = []
+    append = records.append
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            append(parse_list2_line(line))
+        except LDConsoleParseError as e:
+            if strict:
+                raise LDConsoleParseError(str(e), number, line) from None
+    return records
+
+
+def _parse_headered(lines: List[str], strict: bool) -> List[List2Record]:
+    """Разобрать list2 с заголовком Name,Pid,Status,TopWindowHandle."""
+    rows = [line.strip() for line in lines if line.strip()]
+    columns: Dict[str, int] = {
+        column.strip().lower(): position for position, column in enumerate(rows[0].split(','))
+    }
+    name_col = columns['name']
+    pid_col = columns.get('pid')
+    status_col = columns.get('status')
+    handle_col = columns.get('topwindowhandle')
+
+    records: List[List2Record] = []
+    for number, row in enumerate(rows[1:], 2):
+        parts = [part.strip() for part in row.split(',')]
+        try:
+            if len(parts) != len(columns) or not parts[name_col]:
+                raise ValueError(f"Ожидалось {len(columns)} колонок")
+            pid = int(parts[pid_col]) if pid_col is not None else -1
+            handle = int(parts[handle_col], 0) if handle_col is not None else 0
+        except ValueError as e:
+            if strict:
+                raise LDConsoleParseError(f"Некорректная строка list2: {e}", number, row) from None
+            continue
+
+        running = status_col is not None and 'run' in parts[status_col].lower()
+        records.append(_new_record(List2Record, (
+            number - 2, parts[name_col], handle, 0, int(running),
+            pid if pid > 0 else -1, -1, 0, 0, 0
+        )))
+    return records
+
+
+def parse_runninglist(output: str) -> List[str]:
+    """Разобрать вывод runninglist (имя запущенного эмулятора в строке).
+
+    Args:
+        output: stdout команды ldconsole runninglist
+
+    Returns:
+        List[str]: Имена запущенных эмуляторов
+    """
+    return [name for name in (line.strip() for line in output.splitlines()) if name]
@@ -9,16 +9,24 @@ import asyncio
 import json
 import re
 import time
-from typing import Dict, List, Optional, Tuple, Any
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Any, Union
 from enum import Enum
 
+from ..core.counters import FleetCounters, get_fleet_counters
+from ..core.inventory import EmulatorInventory, get_inventory
+from ..core.journal import OperationJournal
 from ..core.models import (
     Emulator, EmulatorStatus, EmulatorConfig,
-    Operation, OperationType, OperationStatus
+    Operation, OperationType, OperationStatus, OperationPriority
 )
 from .workstation import WorkstationManager
-from ..utils.error_handler import with_circuit_breaker, ErrorCategory
+from .admission import LaunchAdmissionController, LaunchLimits
+from .batch_executor import BatchItem, LDConsoleBatchExecutor
+from .operation_scheduler import OperationScheduler
+from .pipeline import PIPELINE_KEY, OperationPipeline, PipelineStep
 
 
 class CommandType(str, Enum):
@@ -38,29 +46,72 @@ class CommandType(str, Enum):
     RESTORE = "restore"
 
 
+# Операции, которые batch_operation выполняет одним пакетным скриптом
+BATCH_COMMANDS: Dict[OperationType, str] = {
+    OperationType.START: 'launch',
+    OperationType.STOP: 'quit',
+    OperationType.DELETE: 'remove',
+    OperationType.MODIFY: 'modify',
+}
+
+
 class LDPlayerManager:
     """Менеджер операций с LDPlayer эмуляторами."""
 
-    def __init__(self, workstation_manager: WorkstationManager):
+    def __init__(self, workstation_manager: WorkstationManager,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 journal: Optional[OperationJournal] = None,
+                 launch_limits: Optional[Dict[str, Any]] = None):
         """Инициализация менеджера LDPlayer.
 
         Args:
             workstation_manager: Менеджер рабочей станции
+            concurrency: Лимиты одновременных операций станции по классам нагрузки
+            journal: Журнал операций для восстановления после перезапуска
+            launch_limits: Пороги допуска запусков (None - запуски без контроля ресурсов)
         """
         self.workstation = workstation_manager
-        self._operation_queue: asyncio.Queue[Operation] = asyncio.Queue()
+        self.inventory: EmulatorInventory = get_inventory()
+        # Элемент очереди - отдельная операция или пакет операций одного типа
+        self._operation_queue: asyncio.Queue[Union[Operation, List[Operation]]] = asyncio.Queue()
         self._active_operations: Dict[str, Operation] = {}
+        # Недавно завершенные операции для запросов статуса и ожидания после завершения
+        self._finished_operations: 'OrderedDict[str, Operation]' = OrderedDict()
+        self._finished_limit: int = 1000
+        self._counters: FleetCounters = get_fleet_counters()
         self._operation_timeout: int = 300  # 5 минут таймаут
+        self._batch_executor = LDConsoleBatchExecutor(workstation_manager)
+        self.scheduler = OperationScheduler(self._execute_item, concurrency)
+        self.journal = journal
+        # Выполняющиеся конвейеры: ID операции конвейера -> задача
+        self._pipelines: Dict[str, asyncio.Task] = {}
+
+        self.admission: Optional[LaunchAdmissionController] = None
+        if launch_limits is not None:
+            config = workstation_manager.config
+            self.admission = LaunchAdmissionController(
+                LaunchLimits.from_dict(launch_limits),
+                telemetry=lambda: {'cpu_usage': config.cpu_usage, 'memory_usage': config.memory_usage},
+                running=lambda: self.inventory.count(config.id, EmulatorStatus.RUNNING)
+            )
 
     async def start_operation_processor(self) -> None:
-        """Запустить обработчик очереди операций."""
+        """Запустить обработчик очереди операций.
+
+        Перед обработкой очереди восстанавливаются незавершенные операции журнала.
+        """
+        try:
+            await self.recover_operations()
+        except Exception as e:
+            print(f"Ошибка восстановления операций из журнала: {e}")
+
         while True:
             try:
                 # Получить операцию из очереди
                 operation = await self._operation_queue.get()
 
-                # Выполнить операцию асинхронно
-                asyncio.create_task(self._execute_operation(operation))
+                # Планировщик запускает операцию (или пакет) при свободном слоте
+                self.scheduler.submit(operation)
 
             except asyncio.CancelledError:
                 break
@@ -73,15 +124,186 @@ class LDPlayerManager:
         Args:
             operation: Операция для выполнения
         """
-        self._active_operations[operation.id] = operation
+        self._track_operation(operation)
         self._operation_queue.put_nowait(operation)
 
+    def _track_operation(self, operation: Operation) -> None:
+        """Поставить операцию на учет (список операций, счетчики парка, журнал).
+
+        Args:
+            operation: Новая операция
+        """
+        previous = self._active_operations.get(operation.id)
+        if previous is not None and previous is not operation:
+            # Операция с тем же ID заменяется - прежняя снимается с учета
+            self._forget(previous)
+
+        self._active_operations[operation.id] = operation
+        operation.on_transition = self._on_transition
+        self._counters.operation_added(operation)
+        if self.journal is not None:
+            self.journal.record_added(operation)
+
+    def _forget(self, operation: Operation) -> None:
+        """Снять операцию с учета счетчиков парка (замена, вытеснение, очистка).
+
+        Args:
+            operation: Операция, которая больше не хранится менеджером
+        """
+        operation.on_transition = None
+        self._counters.operation_removed(operation)
+
+    def _on_transition(self, operation: Operation, previous_status: OperationStatus) -> None:
+        """Отразить переход операции в счетчиках парка и журнале."""
+        self._counters.operation_transition(operation, previous_status)
+        if self.journal is not None:
+            self.journal.record_transition(operation)
+        # Остановленный эмулятор освобождает место для ожидающих запусков
+        if (self.admission is not None and operation.type == OperationType.STOP
+                and operation.status == OperationStatus.COMPLETED):
+            self.admission.notify()
+
+    async def recover_operations(self) -> Dict[str, int]:
+        """Восстановить незавершенные операции станции из журнала.
+
+        Ожидавшие операции снова ставятся в очередь (пакетные типы - одним
+        пакетом на тип). Операции, выполнявшиеся в момент остановки,
+        сверяются с list2: достигнутое состояние завершает операцию,
+        иначе она выполняется заново.
+
+        Returns:
+            Dict[str, int]: Количество возобновленных, завершенных сверкой и проваленных операций
+        """
+        summary = {'resumed': 0, 'reconciled': 0, 'failed': 0}
+        if self.journal is None:
+            return summary
+
+        operations = await asyncio.to_thread(self.journal.replay, self.workstation.config.id)
+        if not operations:
+            return summary
+
+        if any(operation.status == OperationStatus.RUNNING for operation in operations):
+            # Одно чтение list2 для сверки всех операций в неизвестном состоянии
+            await self.workstation.get_emulators_list_async()
+
+        batches: Dict[OperationType, List[Operation]] = {}
+        for operation in operations:
+            if operation.type == OperationType.PIPELINE or (
+                    PIPELINE_KEY in operation.parameters and operation.status == OperationStatus.PENDING):
+                # Зависимости конвейера после перезапуска не восстанавливаются:
+                # ожидающие шаги отменяются, выполнявшиеся сверяются ниже
+                self._track_operation(operation)
+                if operation.type == OperationType.PIPELINE:
+                    operation.complete(False, error="Конвейер прерван перезапуском сервера")
+                else:
+                    operation.result = "Конвейер прерван перезапуском сервера"
+                    operation.cancel()
+                summary['failed'] += 1
+                self._retire(operation)
+                continue
+
+            if operation.status == OperationStatus.RUNNING:
+                outcome = self._reconcile_in_doubt(operation)
+                if outcome is not None:
+                    success, message = outcome
+                    self._track_operation(operation)
+                    if success:
+                        operation.complete(True, message)
+                        summary['reconciled'] += 1
+                    else:
+                        operation.complete(False, error=message)
+                        summary['failed'] += 1
+                    self._retire(operation)
+                    continue
+                operation.status = OperationStatus.PENDING
+
+            summary['resumed'] += 1
+            if operation.type in BATCH_COMMANDS:
+                self._track_operation(operation)
+                batches.setdefault(operation.type, []).append(operation)
+            else:
+                self.queue_operation(operation)
+
+        for batch in batches.values():
+            self._operation_queue.put_nowait(batch)
+
+        print(f"Восстановлено операций станции {self.workstation.config.id}: {summary}")
+        return summary
+
+    def _reconcile_in_doubt(self, operation: Operation) -> Optional[Tuple[bool, str]]:
+        """Сверить прерванную операцию с состоянием эмуляторов (list2).
+
+        Args:
+            operation: Операция, выполнявшаяся в момент остановки сервера
+
+        Returns:
+            Optional[Tuple[bool, str]]: (успех, сообщение), если исход известен,
+                None если операцию нужно выполнить заново
+        """
+        workstation_id = self.workstation.config.id
+        name = operation.parameters.get('name', '')
+        emulator = self.inventory.find(workstation_id, name)
+        running = emulator is not None and emulator.status == EmulatorStatus.RUNNING
+
+        if operation.type == OperationType.START:
+            return (True, f"Эмулятор '{name}' запущен (сверка после перезапуска)") if running else None
+        if operation.type == OperationType.STOP:
+            return None if running else (True, f"Эмулятор '{name}' остановлен (сверка после перезапуска)")
+        if operation.type == OperationType.CREATE:
+            return (True, f"Эмулятор '{name}' создан (сверка после перезапуска)") if emulator else None
+        if operation.type == OperationType.DELETE:
+            return None if emulator else (True, f"Эмулятор '{name}' удален (сверка после перезапуска)")
+        if operation.type == OperationType.RENAME:
+            old_name = operation.parameters.get('old_name', '')
+            new_name = operation.parameters.get('new_name', '')
+            if self.inventory.find(workstation_id, new_name) is not None:
+                return True, f"Эмулятор '{old_name}' переименован в '{new_name}' (сверка после перезапуска)"
+            if self.inventory.find(workstation_id, old_name) is not None:
+                return None
+            return False, f"Эмулятор '{old_name}' не найден после перезапуска"
+        if operation.type == OperationType.MODIFY:
+            # Изменение настроек можно безопасно повторить
+            return None
+
+        # Результат остальных операций по list2 не определить
+        return False, f"Операция {operation.type.value} прервана перезапуском сервера"
+
+    def _retire(self, operation: Operation) -> None:
+        """Перенести операцию из активных в недавно завершенные.
+
+        Args:
+            operation: Выполненная операция
+        """
+        if self._active_operations.get(operation.id) is operation:
+            del self._active_operations[operation.id]
+        self._finished_operations[operation.id] = operation
+        self._finished_operations.move_to_end(operation.id)
+        while len(self._finished_operations) > self._finished_limit:
+            _, evicted = self._finished_operations.popitem(last=False)
+            self._forget(evicted)
+
+    async def _execute_item(self, item: Union[Operation, List[Operation]]) -> None:
+        """Выполнить элемент очереди (операцию или пакет).
+
+        Args:
+            item: Операция или пакет операций одного типа
+        """
+        if isinstance(item, list):
+            await self._execute_batch(item)
+        else:
+            await self._execute_operation(item)
+
     async def _execute_operation(self, operation: Operation) -> None:
         """Выполнить операцию.
 
         Args:
             operation: Операция для выполнения
         """
+        if operation.is_finished:
+            # Отменена между выдачей слота и запуском
+            self._retire(operation)
+            return
+
         try:
             operation.start()
 
@@ -96,9 +318,16 @@ class LDPlayerManager:
                     operation.parameters.get('name', '')
                 )
             elif operation.type == OperationType.START:
-                success, message = await self._start_emulator_async(
-                    operation.parameters.get('name', '')
-                )
+                name = operation.parameters.get('name', '')
+                if self.admission is not None and await self._is_running(name):
+                    # Уже запущенный эмулятор не занимает слот загрузки
+                    success, message = True, f"Эмулятор '{name}' уже запущен"
+                elif self.admission is not None and not await self.admission.acquire(1):
+                    success, message = False, f"Нет запаса ресурсов станции для запуска '{name}'"
+                else:
+                    success, message = await self._start_emulator_async(name)
+                    if not success and self.admission is not None:
+                        self.admission.release(1)
             elif operation.type == OperationType.STOP:
                 success, message = await self._stop_emulator_async(
                     operation.parameters.get('name', '')
@@ -108,6 +337,17 @@ class LDPlayerManager:
                     operation.parameters.get('old_name', ''),
                     operation.parameters.get('new_name', '')
                 )
+            elif operation.type == OperationType.CLONE:
+                success, message = await self._clone_emulator_async(
+                    operation.parameters.get('source_name', ''),
+                    operation.parameters.get('new_name', '')
+                )
+            elif operation.type == OperationType.MODIFY:
+                settings = {key: value for key, value in operation.parameters.items()
+                            if key not in ('name', PIPELINE_KEY)}
+                success, message = await self._modify_emulator_async(
+                    operation.parameters.get('name', ''), settings
+                )
             else:
                 success = False
                 message = f"Неизвестный тип операции: {operation.type}"
@@ -118,10 +358,150 @@ class LDPlayerManager:
         except Exception as e:
             operation.complete(False, error=str(e))
         finally:
-            # Удалить из активных операций
-            self._active_operations.pop(operation.id, None)
+            # Перенести из активных в завершенные
+            self._retire(operation)
+
+    async def _execute_batch(self, operations: List[Operation]) -> None:
+        """Выполнить пакет однотипных операций одним скриптом.
+
+        Состояние эмуляторов читается один раз: отсутствующие эмуляторы
+        и эмуляторы, уже находящиеся в нужном состоянии, в скрипт не попадают.
+        Результаты скрипта раскладываются по исходным операциям.
+
+        Args:
+            operations: Операции одного типа на этой рабочей станции
+        """
+        # Операции, отмененные в очереди, не выполняются
+        operations = [operation for operation in operations if operation.status != OperationStatus.CANCELLED]
+        pending: List[Operation] = []
+        items: List[BatchItem] = []
+        try:
+            for operation in operations:
+                operation.start()
+
+            await self.workstation.get_emulators_list_async()
+            workstation_id = self.workstation.config.id
+
+            for operation in operations:
+                name = operation.parameters.get('name', '')
+                item, outcome = self._prepare_batch_item(operation, self.inventory.find(workstation_id, name))
+                if item is None:
+                    operation.complete(*outcome)
+                else:
+                    pending.append(operation)
+                    items.append(item)
+
+            if items and self.admission is not None and pending[0].type == OperationType.START:
+                await self._launch_admitted(pending, items)
+            elif items:
+                results = await self.workstation.run_in_executor(
+                    self._batch_executor.execute, items,
+                    timeout=self._operation_timeout
+                )
+                self._complete_batch(pending, items, results)
+
+        except Exception as e:
+            for operation in operations:
+                if operation.status == OperationStatus.RUNNING:
+                    operation.complete(False, error=str(e))
+        finally:
+            if items:
+                # Успешные элементы уже внесены в кэш, итог пакета (в том числе
+                # неудачных элементов) проверяется фоновым list2 при следующем чтении
+                self.workstation.mark_emulators_unverified()
+            for operation in operations:
+                self._retire(operation)
+
+    async def _launch_admitted(self, operations: List[Operation], items: List[BatchItem]) -> None:
+        """Запустить эмуляторы пакета частями по мере допуска контроллера ресурсов.
+
+        Args:
+            operations: Операции запуска
+            items: Элементы пакета для операций
+        """
+        remaining = list(zip(operations, items))
+        while remaining:
+            # Операции, отмененные во время ожидания допуска, не запускаются
+            remaining = [(op, item) for op, item in remaining if op.status != OperationStatus.CANCELLED]
+            if not remaining:
+                return
+
+            granted = await self.admission.acquire(len(remaining))
+            if not granted:
+                for operation, _ in remaining:
+                    operation.complete(False, error="Нет запаса ресурсов станции для запуска")
+                return
+
+            chunk, remaining = remaining[:granted], remaining[granted:]
+            results = await self.workstation.run_in_executor(
+                self._batch_executor.execute, [item for _, item in chunk],
+                timeout=self._operation_timeout
+            )
+            failed = sum(1 for result in results if not result.success)
+            if failed:
+                self.admission.release(failed)
+            self._complete_batch([op for op, _ in chunk], [item for _, item in chunk], results)
+
+    def _complete_batch(self, operations: List[Operation], items: List[BatchItem], results: List[Any]) -> None:
+        """Разложить результаты пакетного скрипта по операциям.
+
+        Args:
+            operations: Операции в порядке элементов пакета
+            items: Элементы пакета операций
+            results: Результаты элементов пакета
+        """
+        for operation, item, result in zip(operations, items, results):
+            name = operation.parameters.get('name', '')
+            if result.success:
+                self._apply_batch_result(operation.type, item)
+                operation.complete(True, f"{BATCH_COMMANDS[operation.type]} '{name}': {result.output or 'OK'}")
+            else:
+                operation.complete(False, error=result.error or
+                                   f"Код возврата {result.exit_code}: {result.output}")
+
+    def _apply_batch_result(self, operation_type: OperationType, item: BatchItem) -> None:
+        """Отразить успешный элемент пакета в кэше станции и реестре эмуляторов.
+
+        Args:
+            operation_type: Тип операции
+            item: Выполненный элемент пакета
+        """
+        if operation_type == OperationType.MODIFY:
+            self.workstation.apply_emulator_result(operation_type, item.name, params=item.params)
+        elif operation_type in (OperationType.START, OperationType.STOP, OperationType.DELETE):
+            self.workstation.apply_emulator_result(operation_type, item.name)
+
+    def _prepare_batch_item(self, operation: Operation,
+                            emulator: Optional[Emulator]) -> Tuple[Optional[BatchItem], Tuple]:
+        """Подготовить элемент пакета для операции.
+
+        Args:
+            operation: Операция
+            emulator: Текущее состояние эмулятора (None если не найден)
+
+        Returns:
+            Tuple: (элемент пакета или None, аргументы operation.complete если элемента нет)
+        """
+        name = operation.parameters.get('name', '')
+
+        if emulator is None:
+            return None, (False, None, f"Эмулятор '{name}' не найден")
+
+        if operation.type == OperationType.START and emulator.status == EmulatorStatus.RUNNING:
+            return None, (True, f"Эмулятор '{name}' уже запущен")
+
+        if operation.type == OperationType.STOP and emulator.status == EmulatorStatus.STOPPED:
+            return None, (True, f"Эмулятор '{name}' уже остановлен")
+
+        params: Dict[str, Any] = {}
+        if operation.type == OperationType.MODIFY:
+            settings = {k: v for k, v in operation.parameters.items() if k != 'name'}
+            params, error = self.workstation.build_modify_params(settings)
+            if error:
+                return None, (False, None, error)
+
+        return BatchItem(BATCH_COMMANDS[operation.type], name, params), ()
 
-    @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Create emulator async")
     async def _create_emulator_async(self, name: str, config: Dict[str, Any] = None) -> Tuple[bool, str]:
         """Асинхронное создание эмулятора.
 
@@ -132,61 +512,67 @@ class LDPlayerManager:
         Returns:
             Tuple[bool, str]: (успех, сообщение)
         """
-        # Выполнить в executor для избежания блокировки
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.workstation.create_emulator,
-            name,
-            config
+        # Выполнить в пуле станции для избежания блокировки event loop
+        return await self.workstation.run_in_executor(
+            self.workstation.create_emulator, name, config,
+            timeout=self._operation_timeout
         )
 
-    @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Delete emulator async")
     async def _delete_emulator_async(self, name: str) -> Tuple[bool, str]:
         """Асинхронное удаление эмулятора."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.workstation.delete_emulator,
-            name
+        return await self.workstation.run_in_executor(
+            self.workstation.delete_emulator, name,
+            timeout=self._operation_timeout
         )
 
-    @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Start emulator async")
+    async def _is_running(self, name: str) -> bool:
+        """Запущен ли эмулятор по реестру (список станции берется из кэша list2)."""
+        await self.workstation.get_emulators_list_async()
+        emulator = self.inventory.find(self.workstation.config.id, name)
+        return emulator is not None and emulator.status == EmulatorStatus.RUNNING
+
     async def _start_emulator_async(self, name: str) -> Tuple[bool, str]:
         """Асинхронный запуск эмулятора."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.workstation.start_emulator,
-            name
+        return await self.workstation.run_in_executor(
+            self.workstation.start_emulator, name,
+            timeout=self._operation_timeout
         )
 
-    @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Stop emulator async")
     async def _stop_emulator_async(self, name: str) -> Tuple[bool, str]:
         """Асинхронная остановка эмулятора."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.workstation.stop_emulator,
-            name
+        return await self.workstation.run_in_executor(
+            self.workstation.stop_emulator, name,
+            timeout=self._operation_timeout
         )
 
     async def _rename_emulator_async(self, old_name: str, new_name: str) -> Tuple[bool, str]:
         """Асинхронное переименование эмулятора."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.workstation.rename_emulator,
-            old_name,
-            new_name
+        return await self.workstation.run_in_executor(
+            self.workstation.rename_emulator, old_name, new_name,
+            timeout=self._operation_timeout
         )
 
-    def create_emulator(self, name: str, config: EmulatorConfig = None) -> Operation:
+    async def _clone_emulator_async(self, source_name: str, new_name: str) -> Tuple[bool, str]:
+        """Асинхронное клонирование эмулятора."""
+        return await self.workstation.run_in_executor(
+            self.workstation.clone_emulator, source_name, new_name,
+            timeout=self._operation_timeout
+        )
+
+    async def _modify_emulator_async(self, name: str, settings: Dict[str, Any]) -> Tuple[bool, str]:
+        """Асинхронное изменение настроек эмулятора."""
+        return await self.workstation.run_in_executor(
+            self.workstation.modify_emulator, name, settings,
+            timeout=self._operation_timeout
+        )
+
+    def create_emulator(self, name: str, config: EmulatorConfig = None, owner: Optional[str] = None) -> Operation:
         """Создать эмулятор.
 
         Args:
             name: Имя эмулятора
             config: Конфигурация эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции
@@ -196,6 +582,8 @@ class LDPlayerManager:
             type=OperationType.CREATE,
             emulator_id=f"{self.workstation.config.id}_{name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={
                 'name': name,
                 'config': config.__dict__ if config else None
@@ -205,11 +593,12 @@ class LDPlayerManager:
         self.queue_operation(operation)
         return operation
 
-    def delete_emulator(self, name: str) -> Operation:
+    def delete_emulator(self, name: str, owner: Optional[str] = None) -> Operation:
         """Удалить эмулятор.
 
         Args:
             name: Имя эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции
@@ -219,17 +608,20 @@ class LDPlayerManager:
             type=OperationType.DELETE,
             emulator_id=f"{self.workstation.config.id}_{name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={'name': name}
         )
 
         self.queue_operation(operation)
         return operation
 
-    def start_emulator(self, name: str) -> Operation:
+    def start_emulator(self, name: str, owner: Optional[str] = None) -> Operation:
         """Запустить эмулятор.
 
         Args:
             name: Имя эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции
@@ -239,17 +631,20 @@ class LDPlayerManager:
             type=OperationType.START,
             emulator_id=f"{self.workstation.config.id}_{name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={'name': name}
         )
 
         self.queue_operation(operation)
         return operation
 
-    def stop_emulator(self, name: str) -> Operation:
+    def stop_emulator(self, name: str, owner: Optional[str] = None) -> Operation:
         """Остановить эмулятор.
 
         Args:
             name: Имя эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции
@@ -259,18 +654,21 @@ class LDPlayerManager:
             type=OperationType.STOP,
             emulator_id=f"{self.workstation.config.id}_{name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={'name': name}
         )
 
         self.queue_operation(operation)
         return operation
 
-    def rename_emulator(self, old_name: str, new_name: str) -> Operation:
+    def rename_emulator(self, old_name: str, new_name: str, owner: Optional[str] = None) -> Operation:
         """Переименовать эмулятор.
 
         Args:
             old_name: Текущее имя эмулятора
             new_name: Новое имя эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции
@@ -280,6 +678,8 @@ class LDPlayerManager:
             type=OperationType.RENAME,
             emulator_id=f"{self.workstation.config.id}_{old_name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={
                 'old_name': old_name,
                 'new_name': new_name
@@ -297,6 +697,14 @@ class LDPlayerManager:
         """
         return self.workstation.get_emulators_list()
 
+    async def get_emulators_async(self) -> List[Emulator]:
+        """Асинхронно получить список эмуляторов на рабочей станции.
+
+        Returns:
+            List[Emulator]: Список эмуляторов
+        """
+        return await self.workstation.get_emulators_list_async()
+
     def get_emulator(self, name: str) -> Optional[Emulator]:
         """Получить эмулятор по имени.
 
@@ -306,8 +714,7 @@ class LDPlayerManager:
         Returns:
             Optional[Emulator]: Объект эмулятора или None
         """
-        emulators = self.get_emulators()
-        return next((emu for emu in emulators if emu.name == name), None)
+        return self.workstation.find_emulator(name)
 
     def get_operation(self, operation_id: str) -> Optional[Operation]:
         """Получить операцию по ID.
@@ -318,7 +725,10 @@ class LDPlayerManager:
         Returns:
             Optional[Operation]: Объект операции или None
         """
-        return self._active_operations.get(operation_id)
+        operation = self._active_operations.get(operation_id)
+        if operation is None:
+            operation = self._finished_operations.get(operation_id)
+        return operation
 
     def get_active_operations(self) -> List[Operation]:
         """Получить список активных операций.
@@ -334,18 +744,31 @@ class LDPlayerManager:
         Args:
             operation_id: ID операции для отмены
 
+        Отменить можно ожидающую операцию (планировщик ее пропустит) или
+        конвейер (его ожидающие шаги отменяются). Выполняющаяся на станции
+        команда ldconsole не прерывается, поэтому такая операция не отменяется.
+
         Returns:
             bool: True если операция была отменена
         """
         operation = self._active_operations.get(operation_id)
-        if operation and operation.status == OperationStatus.RUNNING:
-            operation.cancel()
+        if operation is None:
+            return False
+
+        if operation.type == OperationType.PIPELINE:
+            # Конвейер снимается с учета по завершении своей задачи
+            return operation.cancel()
+        if operation.status == OperationStatus.PENDING and operation.cancel():
+            self._retire(operation)
             return True
         return False
 
     async def wait_for_operation(self, operation_id: str, timeout: int = None) -> Operation:
         """Ожидать завершения операции.
 
+        Ожидающий просыпается в момент перехода операции в конечный статус;
+        уже завершенная операция возвращается сразу.
+
         Args:
             operation_id: ID операции
             timeout: Таймаут ожидания в секундах
@@ -354,20 +777,15 @@ class LDPlayerManager:
             Operation: Завершенная операция
 
         Raises:
+            ValueError: Если операция не найдена
             asyncio.TimeoutError: Если операция не завершилась в таймаут
         """
-        operation = self._active_operations.get(operation_id)
+        operation = self.get_operation(operation_id)
         if not operation:
             raise ValueError(f"Операция {operation_id} не найдена")
 
-        timeout = timeout or self._operation_timeout
-
-        start_time = datetime.now()
-        while operation.status in [OperationStatus.PENDING, OperationStatus.RUNNING]:
-            if datetime.now() - start_time > timedelta(seconds=timeout):
-                raise asyncio.TimeoutError(f"Таймаут ожидания операции {operation_id}")
-
-            await asyncio.sleep(1)
+        if not await operation.wait(timeout or self._operation_timeout):
+            raise asyncio.TimeoutError(f"Таймаут ожидания операции {operation_id}")
 
         return operation
 
@@ -375,8 +793,9 @@ class LDPlayerManager:
         """
         Clean up completed operations from memory.
         
-        Removes operations that have been completed for more than keep_hours.
-        Useful for preventing memory leaks from accumulation of old operations.
+        Removes finished operations (recently finished map and any finished
+        operation still left among the active ones) that have been completed
+        for more than keep_hours, and takes them off the fleet counters.
         
         Args:
             keep_hours: Hours to keep completed operations (default 1 hour)
@@ -384,39 +803,28 @@ class LDPlayerManager:
         Returns:
             int: Number of operations cleaned up
         """
-        from datetime import datetime, timedelta
-        from ..core.models import OperationStatus
-        
-        current_time = datetime.now()
-        threshold_time = current_time - timedelta(hours=keep_hours)
-        
-        operations_to_remove = []
-        
-        for op_id, operation in self._active_operations.items():
-            # Check if operation is completed
-            if operation.status in [OperationStatus.SUCCESS, OperationStatus.FAILED, OperationStatus.CANCELLED]:
-                # Check if it completed before threshold
-                if hasattr(operation, 'completed_at') and operation.completed_at:
-                    if operation.completed_at < threshold_time:
-                        operations_to_remove.append(op_id)
-                # If no completed_at time, check against end_time from update
-                elif hasattr(operation, 'updated_at') and operation.updated_at:
-                    if operation.updated_at < threshold_time:
-                        operations_to_remove.append(op_id)
-        
-        # Remove identified operations
-        for op_id in operations_to_remove:
-            del self._active_operations[op_id]
-        
-        return len(operations_to_remove)
+        threshold_time = datetime.now() - timedelta(hours=keep_hours)
+        removed = 0
+
+        for operations in (self._finished_operations, self._active_operations):
+            expired = [
+                op_id for op_id, operation in operations.items()
+                if operation.is_finished and operation.completed_at and operation.completed_at < threshold_time
+            ]
+            for op_id in expired:
+                self._forget(operations.pop(op_id))
+            removed += len(expired)
 
-    def clone_emulator(self, source_name: str, new_name: str, config: EmulatorConfig = None) -> Operation:
+        return removed
+
+    def clone_emulator(self, source_name: str, new_name: str, config: EmulatorConfig = None, owner: Optional[str] = None) -> Operation:
         """Клонировать эмулятор.
 
         Args:
             source_name: Имя исходного эмулятора
             new_name: Имя нового эмулятора
             config: Конфигурация для нового эмулятора
+            owner: Пользователь, от имени которого выполняется операция
 
         Returns:
             Operation: Объект операции клонирования
@@ -432,6 +840,8 @@ class LDPlayerManager:
             type=OperationType.CLONE,
             emulator_id=f"{self.workstation.config.id}_{new_name}",
             workstation_id=self.workstation.config.id,
+            priority=OperationPriority.INTERACTIVE,
+            owner=owner,
             parameters={
                 'source_name': source_name,
                 'new_name': new_name,
@@ -446,12 +856,20 @@ class LDPlayerManager:
         return operation
 
     def batch_operation(self, emulator_names: List[str], operation_type: OperationType,
+                       owner: Optional[str] = None,
+                       priority: OperationPriority = OperationPriority.BULK,
                        **kwargs) -> List[Operation]:
         """Выполнить групповую операцию с несколькими эмуляторами.
 
+        Операции START/STOP/DELETE/MODIFY выполняются одним пакетным
+        скриптом (несколько round-trip на сотни эмуляторов), остальные
+        ставятся в очередь по одной.
+
         Args:
             emulator_names: Список имен эмуляторов
             operation_type: Тип операции
+            owner: Пользователь, от имени которого выполняется операция
+            priority: Полоса приоритета (по умолчанию пакетная)
             **kwargs: Дополнительные параметры операции
 
         Returns:
@@ -465,14 +883,126 @@ class LDPlayerManager:
                 type=operation_type,
                 emulator_id=f"{self.workstation.config.id}_{name}",
                 workstation_id=self.workstation.config.id,
+                priority=priority,
+                owner=owner,
                 parameters={'name': name, **kwargs}
             )
 
             operations.append(operation)
-            self.queue_operation(operation)
+
+        if operation_type in BATCH_COMMANDS and operations:
+            # Один пакетный скрипт вместо round-trip на каждый эмулятор
+            for operation in operations:
+                self._track_operation(operation)
+            self._operation_queue.put_nowait(operations)
+        else:
+            for operation in operations:
+                self.queue_operation(operation)
 
         return operations
 
+    def run_pipeline(self, steps: List[Dict[str, Any]], owner: Optional[str] = None,
+                     priority: OperationPriority = OperationPriority.NORMAL) -> Operation:
+        """Выполнить конвейер зависимых операций (DAG) без обращений клиента между шагами.
+
+        Шаг ставится в очередь, как только успешно завершились шаги из его
+        after; независимые ветви идут параллельно в пределах лимитов
+        планировщика. Шаги с неуспешной зависимостью отменяются.
+
+        Args:
+            steps: Шаги вида {'id', 'type', 'parameters', 'after': [ID шагов]}
+            owner: Пользователь, от имени которого выполняется конвейер
+            priority: Полоса приоритета шагов
+
+        Returns:
+            Operation: Операция конвейера (тип PIPELINE), завершается после всех шагов
+
+        Raises:
+            ValueError: Некорректный шаг, неизвестная зависимость или цикл
+        """
+        pipeline = OperationPipeline(
+            f"pipeline_{uuid.uuid4().hex[:12]}",
+            self.workstation.config.id,
+            [PipelineStep.from_dict(step) for step in steps],
+            owner=owner,
+            priority=priority
+        )
+
+        self._track_operation(pipeline.operation)
+        for step in pipeline.steps.values():
+            self._track_operation(step)
+
+        task = asyncio.get_running_loop().create_task(self._run_pipeline(pipeline))
+        self._pipelines[pipeline.operation.id] = task
+        return pipeline.operation
+
+    async def _run_pipeline(self, pipeline: OperationPipeline) -> None:
+        """Довести конвейер до конца и снять его с учета.
+
+        Args:
+            pipeline: Конвейер операций
+        """
+        try:
+            await pipeline.run(self._operation_queue.put_nowait, self._retire)
+        except Exception as e:
+            print(f"Ошибка выполнения конвейера {pipeline.operation.id}: {e}")
+            if not pipeline.operation.is_finished:
+                pipeline.operation.complete(False, error=str(e))
+        finally:
+            self._retire(pipeline.operation)
+            self._pipelines.pop(pipeline.operation.id, None)
+
+    def provision_emulators(self, source_name: str, names: List[str],
+                            settings: Optional[Dict[str, Any]] = None, launch: bool = True,
+                            owner: Optional[str] = None,
+                            priority: OperationPriority = OperationPriority.BULK) -> Operation:
+        """Подготовить эмуляторы конвейером clone → modify → launch.
+
+        Цепочки разных эмуляторов независимы и выполняются параллельно.
+
+        Args:
+            source_name: Имя эмулятора-образца
+            names: Имена новых эмуляторов
+            settings: Настройки modify для каждой копии (None - без шага modify)
+            launch: Запустить копии после подготовки
+            owner: Пользователь, от имени которого выполняется операция
+            priority: Полоса приоритета (по умолчанию пакетная)
+
+        Returns:
+            Operation: Операция конвейера
+        """
+        steps: List[Dict[str, Any]] = []
+        for name in names:
+            previous = f"clone:{name}"
+            steps.append({'id': previous, 'type': OperationType.CLONE.value,
+                          'parameters': {'source_name': source_name, 'new_name': name}})
+            if settings:
+                steps.append({'id': f"modify:{name}", 'type': OperationType.MODIFY.value,
+                              'parameters': {'name': name, **settings}, 'after': [previous]})
+                previous = f"modify:{name}"
+            if launch:
+                steps.append({'id': f"start:{name}", 'type': OperationType.START.value,
+                              'parameters': {'name': name}, 'after': [previous]})
+
+        return self.run_pipeline(steps, owner=owner, priority=priority)
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Получить метрики очереди операций станции.
+
+        Returns:
+            Dict[str, Any]: Глубина очереди, выполняющиеся операции и время ожидания
+        """
+        return self.scheduler.get_stats()
+
+    def get_admission_stats(self) -> Optional[Dict[str, Any]]:
+        """Получить статистику допуска запусков.
+
+        Returns:
+            Optional[Dict[str, Any]]: Допущенные и ожидающие запуски, запас станции
+                и запуски за минуту (None если контроль не включен)
+        """
+        return self.admission.get_stats() if self.admission is not None else None
+
     def get_system_stats(self) -> Dict[str, Any]:
         """Получить статистику системы.
 
@@ -481,6 +1011,14 @@ class LDPlayerManager:
         """
         return self.workstation.get_system_info()
 
+    async def get_system_stats_async(self) -> Dict[str, Any]:
+        """Асинхронно получить статистику системы.
+
+        Returns:
+            Dict[str, Any]: Статистика системы
+        """
+        return await self.workstation.get_system_info_async()
+
     def backup_emulators(self, backup_path: str) -> Tuple[bool, str]:
         """Создать резервную копию всех эмуляторов.
 
@@ -492,35 +1030,40 @@ class LDPlayerManager:
         """
         return self.workstation.backup_configs(backup_path)
 
-    def is_operation_safe(self, operation: Operation, active_emulators: List[Emulator]) -> Tuple[bool, str]:
+    def is_operation_safe(self, operation: Operation,
+                          active_emulators: Optional[List[Emulator]] = None) -> Tuple[bool, str]:
         """Проверить безопасность выполнения операции.
 
         Args:
             operation: Операция для проверки
-            active_emulators: Список активных эмуляторов
+            active_emulators: Список эмуляторов (None - реестр эмуляторов станции)
 
         Returns:
             Tuple[bool, str]: (безопасно, причина)
         """
         emulator_name = operation.parameters.get('name')
 
+        if active_emulators is not None:
+            find = {emu.name: emu for emu in active_emulators}.get
+        else:
+            workstation_id = operation.workstation_id or self.workstation.config.id
+            find = lambda name: self.inventory.find(workstation_id, name)
+
         if operation.type == OperationType.DELETE:
             # Проверить, что эмулятор не запущен
-            emulator = next((emu for emu in active_emulators if emu.name == emulator_name), None)
+            emulator = find(emulator_name)
             if emulator and emulator.status == EmulatorStatus.RUNNING:
                 return False, f"Нельзя удалить запущенный эмулятор '{emulator_name}'"
 
         elif operation.type == OperationType.CREATE:
             # Проверить, что имя не занято
-            name_exists = any(emu.name == emulator_name for emu in active_emulators)
-            if name_exists:
+            if find(emulator_name) is not None:
                 return False, f"Эмулятор с именем '{emulator_name}' уже существует"
 
         elif operation.type == OperationType.RENAME:
             new_name = operation.parameters.get('new_name')
             # Проверить, что новое имя не занято
-            name_exists = any(emu.name == new_name for emu in active_emulators)
-            if name_exists:
+            if find(new_name) is not None:
                 return False, f"Эмулятор с именем '{new_name}' уже существует"
 
         return True, "Операция безопасна"
@@ -0,0 +1,228 @@
+"""
+Планировщик операций рабочей станции.
+
+Операции из очереди LDPlayerManager не запускаются все сразу: каждая
+попадает в класс нагрузки (тяжелые create/clone/delete, запуски launch,
+легкие quit/rename/...) со своим лимитом одновременных выполнений на
+станции. Запуски выделены в отдельный класс: ожидая допуска по ресурсам
+станции, они не занимают слоты остановок.
+Внутри класса ожидающие операции разложены по полосам приоритета
+(интерактивные запросы раньше пакетных), а внутри полосы владельцы
+обслуживаются по кругу, чтобы большой пакет одного пользователя не
+задерживал запросы остальных.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from ..core.models import Operation, OperationPriority, OperationStatus, OperationType
+
+# Классы нагрузки
+HEAVY = 'heavy'
+LAUNCH = 'launch'
+LIGHT = 'light'
+
+# Тип операции -> класс нагрузки
+OPERATION_CLASSES: Dict[OperationType, str] = {
+    OperationType.CREATE: HEAVY,
+    OperationType.CLONE: HEAVY,
+    OperationType.DELETE: HEAVY,
+    OperationType.START: LAUNCH,
+    OperationType.STOP: LIGHT,
+    OperationType.RESTART: LIGHT,
+    OperationType.RENAME: LIGHT,
+    OperationType.MODIFY: LIGHT,
+}
+
+# Лимиты одновременных выполнений на станцию по умолчанию
+DEFAULT_CONCURRENCY: Dict[str, int] = {HEAVY: 2, LAUNCH: 8, LIGHT: 8}
+
+# Владелец операций без пользователя (внутренние задачи)
+SYSTEM_OWNER = 'system'
+
+# Элемент очереди - отдельная операция или пакет операций одного типа
+Item = Union[Operation, List[Operation]]
+
+
+class _Lane:
+    """Полоса приоритета: очереди владельцев и круговой порядок их обслуживания."""
+
+    __slots__ = ('queues', 'order', 'size')
+
+    def __init__(self):
+        self.queues: Dict[str, Deque[Tuple[float, Item]]] = {}
+        self.order: Deque[str] = deque()
+        self.size = 0
+
+    def push(self, owner: str, entry: Tuple[float, Item]) -> None:
+        """Добавить элемент в конец очереди владельца."""
+        queue = self.queues.get(owner)
+        if queue is None:
+            queue = self.queues[owner] = deque()
+            self.order.append(owner)
+        queue.append(entry)
+        self.size += 1
+
+    def pop(self) -> Tuple[float, Item]:
+        """Взять элемент следующего по кругу владельца."""
+        owner = self.order.popleft()
+        queue = self.queues[owner]
+        entry = queue.popleft()
+        if queue:
+            self.order.append(owner)
+        else:
+            del self.queues[owner]
+        self.size -= 1
+        return entry
+
+
+def _operations(item: Item) -> List[Operation]:
+    """Операции элемента очереди."""
+    return item if isinstance(item, list) else [item]
+
+
+class OperationScheduler:
+    """Ограничение параллельности, приоритеты и справедливая очередь операций станции."""
+
+    def __init__(
+        self,
+        execute: Callable[[Item], Awaitable[None]],
+        concurrency: Optional[Dict[str, int]] = None
+    ):
+        """Инициализация планировщика.
+
+        Args:
+            execute: Выполнение элемента (операции или пакета)
+            concurrency: Класс нагрузки -> лимит одновременных выполнений
+        """
+        self._execute = execute
+        self.concurrency: Dict[str, int] = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        for load_class, limit in self.concurrency.items():
+            if limit < 1:
+                raise ValueError(f"Лимит класса '{load_class}' должен быть не меньше 1: {limit}")
+
+        self._lanes: Dict[str, List[_Lane]] = {
+            load_class: [_Lane() for _ in OperationPriority] for load_class in self.concurrency
+        }
+        self._running: Dict[str, int] = {load_class: 0 for load_class in self.concurrency}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Ожидание в очереди по полосам: количество, сумма и максимум (секунды)
+        self._waits: Dict[str, List[float]] = {priority.name.lower(): [0, 0.0, 0.0] for priority in OperationPriority}
+        self.stats: Dict[str, int] = {'submitted': 0, 'dispatched': 0, 'skipped': 0, 'completed': 0}
+
+    @staticmethod
+    def classify(item: Item) -> Tuple[str, OperationPriority, str]:
+        """Класс нагрузки, приоритет и владелец элемента.
+
+        Пакет занимает один слот своего класса (скрипт выполняется одной
+        сессией), его приоритет - наивысший среди операций пакета.
+        """
+        operations = _operations(item)
+        first = operations[0]
+        load_class = OPERATION_CLASSES.get(first.type, HEAVY)
+        priority = min(operation.priority for operation in operations)
+        return load_class, OperationPriority(priority), first.owner or SYSTEM_OWNER
+
+    def submit(self, item: Item) -> None:
+        """Поставить элемент в очередь и запустить ожидающие при наличии слотов.
+
+        Вызывается из event loop.
+
+        Args:
+            item: Операция или пакет операций одного типа
+        """
+        if not _operations(item):
+            return
+        load_class, priority, owner = self.classify(item)
+        self._lanes.setdefault(load_class, [_Lane() for _ in OperationPriority])
+        self._running.setdefault(load_class, 0)
+        self.concurrency.setdefault(load_class, 1)
+
+        self._lanes[load_class][priority].push(owner, (time.monotonic(), item))
+        self.stats['submitted'] += 1
+        self._dispatch(load_class)
+
+    def _dispatch(self, load_class: str) -> None:
+        """Запустить ожидающие элементы класса в пределах лимита."""
+        lanes = self._lanes[load_class]
+        while self._running[load_class] < self.concurrency[load_class]:
+            priority = next((priority for priority, lane in enumerate(lanes) if lane.size), None)
+            if priority is None:
+                return
+            enqueued, item = lanes[priority].pop()
+
+            if all(operation.status == OperationStatus.CANCELLED for operation in _operations(item)):
+                # Операция отменена, пока ждала слот
+                self.stats['skipped'] += 1
+                continue
+
+            wait = self._waits[OperationPriority(priority).name.lower()]
+            waited = time.monotonic() - enqueued
+            wait[0] += 1
+            wait[1] += waited
+            wait[2] = max(wait[2], waited)
+
+            self._running[load_class] += 1
+            self.stats['dispatched'] += 1
+            task = asyncio.create_task(self._run(load_class, item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, load_class: str, item: Item) -> None:
+        """Выполнить элемент и освободить слот класса."""
+        try:
+            await self._execute(item)
+        except Exception as e:
+            print(f"Ошибка выполнения операции: {e}")
+        finally:
+            self._running[load_class] -= 1
+            self.stats['completed'] += 1
+            self._dispatch(load_class)
+
+    def queue_depth(self, load_class: Optional[str] = None) -> int:
+        """Количество ожидающих элементов класса (None - всех классов)."""
+        classes = [load_class] if load_class is not None else list(self._lanes)
+        return sum(lane.size for name in classes for lane in self._lanes.get(name, ()))
+
+    def running(self, load_class: Optional[str] = None) -> int:
+        """Количество выполняющихся элементов класса (None - всех классов)."""
+        if load_class is not None:
+            return self._running.get(load_class, 0)
+        return sum(self._running.values())
+
+    async def drain(self) -> None:
+        """Дождаться выполнения всех запущенных и ожидающих элементов."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить метрики планировщика.
+
+        Returns:
+            Dict[str, Any]: Лимиты, выполняющиеся и ожидающие элементы по классам,
+                глубина полос и время ожидания по приоритетам
+        """
+        return {
+            **self.stats,
+            'classes': {
+                load_class: {
+                    'limit': self.concurrency[load_class],
+                    'running': self._running[load_class],
+                    'queued': {
+                        priority.name.lower(): lanes[priority].size for priority in OperationPriority
+                    }
+                }
+                for load_class, lanes in self._lanes.items()
+            },
+            'wait_seconds': {
+                lane: {
+                    'count': int(count),
+                    'avg': total / count if count else 0.0,
+                    'max': longest
+                }
+                for lane, (count, total, longest) in self._waits.items()
+            }
+        }
@@ -0,0 +1,225 @@
+"""
+Конвейеры зависимых операций.
+
+Готовый к работе эмулятор получается цепочкой clone → modify → launch,
+где каждый шаг ждет предыдущий. Конвейер принимает всю цепочку (в общем
+случае - DAG шагов) одним запросом: шаг ставится в очередь станции, как
+только успешно завершились все его зависимости, без обращений клиента
+между шагами. Независимые ветви (например, разные эмуляторы) выполняются
+параллельно в пределах лимитов планировщика операций.
+
+Частичный отказ: шаг с ошибкой (или отмененный) отменяет все зависящие
+от него шаги, независимые ветви доводятся до конца, выполненные шаги не
+откатываются. Итог записывается в операцию конвейера (тип PIPELINE),
+которую клиент ожидает вместо отдельных операций шагов.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.models import Operation, OperationPriority, OperationStatus, OperationType
+
+# Параметр операции шага: {'id': ID конвейера, 'after': [ID операций-зависимостей]}
+PIPELINE_KEY = 'pipeline'
+
+# Типы операций, допустимые в качестве шагов
+STEP_TYPES = (
+    OperationType.CREATE, OperationType.CLONE, OperationType.MODIFY, OperationType.START,
+    OperationType.STOP, OperationType.RENAME, OperationType.DELETE
+)
+
+
+@dataclass
+class PipelineStep:
+    """Описание шага конвейера."""
+    id: str
+    type: OperationType
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    after: List[str] = field(default_factory=list)  # ID шагов, которые должны завершиться успешно
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PipelineStep':
+        """Создать шаг из описания запроса.
+
+        Raises:
+            ValueError: Если не указан ID или тип шага не поддерживается
+        """
+        step_id = str(data.get('id') or '')
+        if not step_id:
+            raise ValueError("Не указан ID шага конвейера")
+        try:
+            step_type = OperationType(data.get('type'))
+        except ValueError:
+            raise ValueError(f"Неизвестный тип шага '{step_id}': {data.get('type')}")
+        if step_type not in STEP_TYPES:
+            raise ValueError(f"Тип {step_type.value} не может быть шагом конвейера")
+        return cls(step_id, step_type, dict(data.get('parameters') or {}), list(data.get('after') or []))
+
+    @property
+    def emulator_name(self) -> str:
+        """Имя эмулятора, над которым выполняется шаг."""
+        params = self.parameters
+        return params.get('name') or params.get('new_name') or params.get('old_name') or ''
+
+
+def _topological_order(steps: List[PipelineStep]) -> List[PipelineStep]:
+    """Упорядочить шаги так, чтобы зависимости шли раньше зависимых.
+
+    Raises:
+        ValueError: Повтор ID, зависимость от неизвестного шага или цикл
+    """
+    by_id: Dict[str, PipelineStep] = {}
+    for step in steps:
+        if step.id in by_id:
+            raise ValueError(f"Повторяющийся ID шага конвейера: '{step.id}'")
+        by_id[step.id] = step
+
+    remaining = {step.id: len(set(step.after)) for step in steps}
+    dependents: Dict[str, List[str]] = {step.id: [] for step in steps}
+    for step in steps:
+        for dependency in set(step.after):
+            if dependency not in by_id:
+                raise ValueError(f"Шаг '{step.id}' зависит от неизвестного шага '{dependency}'")
+            dependents[dependency].append(step.id)
+
+    ready = [step.id for step in steps if not remaining[step.id]]
+    ordered = []
+    while ready:
+        step_id = ready.pop(0)
+        ordered.append(by_id[step_id])
+        for dependent in dependents[step_id]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                ready.append(dependent)
+
+    if len(ordered) != len(steps):
+        cyclic = sorted(step_id for step_id, count in remaining.items() if count)
+        raise ValueError(f"Цикл в зависимостях шагов конвейера: {', '.join(cyclic)}")
+    return ordered
+
+
+class OperationPipeline:
+    """DAG операций станции с общей операцией-итогом."""
+
+    def __init__(
+        self,
+        pipeline_id: str,
+        workstation_id: str,
+        steps: List[PipelineStep],
+        owner: Optional[str] = None,
+        priority: OperationPriority = OperationPriority.NORMAL
+    ):
+        """Создать операции конвейера.
+
+        Args:
+            pipeline_id: ID конвейера (он же ID операции PIPELINE)
+            workstation_id: ID рабочей станции
+            steps: Шаги конвейера
+            owner: Пользователь, от имени которого выполняются шаги
+            priority: Полоса приоритета шагов
+
+        Raises:
+            ValueError: Пустой конвейер или некорректные зависимости шагов
+        """
+        if not steps:
+            raise ValueError("Конвейер без шагов")
+        ordered = _topological_order(steps)
+
+        # Операции шагов в топологическом порядке: проход по ним сверху вниз
+        # видит отмену зависимости раньше зависимого шага
+        self.steps: Dict[str, Operation] = {}
+        self.after: Dict[str, List[str]] = {}
+        for step in ordered:
+            self.after[step.id] = list(dict.fromkeys(step.after))
+            self.steps[step.id] = Operation(
+                id=f"{pipeline_id}:{step.id}",
+                type=step.type,
+                emulator_id=f"{workstation_id}_{step.emulator_name}",
+                workstation_id=workstation_id,
+                priority=priority,
+                owner=owner,
+                parameters={**step.parameters, PIPELINE_KEY: {
+                    'id': pipeline_id,
+                    'after': [f"{pipeline_id}:{dependency}" for dependency in self.after[step.id]]
+                }}
+            )
+
+        self.operation = Operation(
+            id=pipeline_id,
+            type=OperationType.PIPELINE,
+            emulator_id="",
+            workstation_id=workstation_id,
+            priority=priority,
+            owner=owner,
+            parameters={'steps': [
+                {'id': step.id, 'type': step.type.value, 'operation_id': self.steps[step.id].id,
+                 'after': self.after[step.id]}
+                for step in ordered
+            ]}
+        )
+
+    async def run(self, submit: Callable[[Operation], None], retire: Callable[[Operation], None]) -> None:
+        """Выполнить конвейер.
+
+        Args:
+            submit: Постановка операции шага в очередь станции
+            retire: Снятие невыполненного (пропущенного) шага с учета
+        """
+        self.operation.start()
+        cancelled = asyncio.ensure_future(self.operation.wait())
+        released: Dict[str, asyncio.Future] = {}
+
+        try:
+            while not self.operation.is_finished:
+                for step_id, step in self.steps.items():
+                    if step_id in released or step.is_finished:
+                        continue
+                    dependencies = [self.steps[dependency] for dependency in self.after[step_id]]
+                    blocked = next((dep for dep in dependencies
+                                    if dep.is_finished and dep.status != OperationStatus.COMPLETED), None)
+                    if blocked is not None:
+                        self._skip(step, f"Пропущен: шаг '{blocked.id}' не выполнен", retire)
+                    elif all(dep.status == OperationStatus.COMPLETED for dep in dependencies):
+                        submit(step)
+                        released[step_id] = asyncio.ensure_future(step.wait())
+
+                waiting = [future for future in released.values() if not future.done()]
+                if not waiting:
+                    break
+                await asyncio.wait([*waiting, cancelled], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancelled.cancel()
+            for future in released.values():
+                future.cancel()
+
+        if self.operation.status == OperationStatus.CANCELLED:
+            # Ожидающие шаги отменяются, уже выполняющиеся доводятся до конца
+            for step in self.steps.values():
+                if step.status == OperationStatus.PENDING:
+                    self._skip(step, "Конвейер отменен", retire)
+            return
+
+        self._finish()
+
+    @staticmethod
+    def _skip(step: Operation, reason: str, retire: Callable[[Operation], None]) -> None:
+        """Отменить шаг, который не будет выполнен."""
+        step.result = reason
+        step.cancel()
+        retire(step)
+
+    def _finish(self) -> None:
+        """Записать итог конвейера в его операцию."""
+        statuses = [step.status for step in self.steps.values()]
+        summary = (f"Выполнено шагов: {statuses.count(OperationStatus.COMPLETED)} из {len(statuses)}, "
+                   f"с ошибкой: {statuses.count(OperationStatus.FAILED)}, "
+                   f"пропущено: {statuses.count(OperationStatus.CANCELLED)}")
+
+        failed = [step for step in self.steps.values() if step.status == OperationStatus.FAILED]
+        if not failed and statuses.count(OperationStatus.COMPLETED) == len(statuses):
+            self.operation.complete(True, summary)
+            return
+
+        errors = "; ".join(f"{step.id}: {step.error_message or step.result}" for step in failed)
+        self.operation.complete(False, summary, errors or "Шаги конвейера отменены")
@@ -9,23 +9,30 @@
 """
 
 import asyncio
+import base64
 import json
 import os
 import shutil
 import subprocess
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 
 try:
     import winrm
+    from winrm.exceptions import WinRMOperationTimeoutError
     WINRM_AVAILABLE = True
 except ImportError:
     WINRM_AVAILABLE = False
     print("PyWinRM не установлен. Используйте: pip install pywinrm")
 
+    class WinRMOperationTimeoutError(Exception):
+        """Заглушка: очередной опрос вывода не дождался данных."""
+
 # SMB протокол использует стандартные os функции Windows
 # Не требует дополнительных библиотек
 SMB_AVAILABLE = True
@@ -75,17 +82,282 @@ class ConnectionProtocol:
         raise NotImplementedError
 
 
+class ShellCommandResult:
+    """Результат команды в формате winrm.Response."""
+
+    __slots__ = ('status_code', 'std_out', 'std_err')
+
+    def __init__(self, status_code: int, std_out: bytes, std_err: bytes):
+        self.status_code = status_code
+        self.std_out = std_out
+        self.std_err = std_err
+
+
+class WinRMShell:
+    """Долгоживущий удаленный shell поверх WinRM сессии.
+
+    winrm.Session.run_cmd на каждую команду открывает shell, выполняет
+    команду и закрывает shell (вместе с HTTP сессией). Этот класс держит
+    один shell открытым и пропускает через него множество команд.
+
+    Shell пересоздается при ошибке, после простоя дольше max_idle_seconds
+    и после max_commands команд. Если shell занят другим потоком, команда
+    выполняется разово через session.run_cmd, чтобы не сериализовать вызовы.
+    """
+
+    def __init__(self, session: Any, max_idle_seconds: float = 300, max_commands: int = 1000,
+                 stats: Optional[Dict[str, Any]] = None):
+        """Инициализация shell.
+
+        Args:
+            session: winrm.Session (или совместимый объект)
+            max_idle_seconds: Максимальное время простоя shell
+            max_commands: Количество команд до пересоздания shell
+            stats: Общий словарь счетчиков (для нескольких shell одной станции)
+        """
+        self.session = session
+        self.max_idle_seconds = max_idle_seconds
+        self.max_commands = max_commands
+
+        self._lock = threading.Lock()
+        self._shell_id: Optional[str] = None
+        self._shell_commands: int = 0
+        self._last_used: float = 0.0
+
+        # Средняя стоимость open_shell + close_shell в секундах
+        self._handshake_cost: float = 0.0
+
+        self.stats: Dict[str, Any] = stats if stats is not None else self.empty_stats()
+
+    @staticmethod
+    def empty_stats() -> Dict[str, Any]:
+        """Создать словарь счетчиков shell.
+
+        Returns:
+            Dict[str, Any]: Нулевые счетчики
+        """
+        return {
+            'shells_opened': 0,
+            'shells_recycled': 0,
+            'commands': 0,
+            'reused_commands': 0,
+            'one_shot_commands': 0,
+            'errors': 0,
+            'round_trips_saved': 0,
+            'handshake_seconds_saved': 0.0,
+        }
+
+    @property
+    def protocol(self) -> Any:
+        """Низкоуровневый winrm.Protocol сессии (None если недоступен)."""
+        return getattr(self.session, 'protocol', None)
+
+    @property
+    def is_open(self) -> bool:
+        """Открыт ли shell на удаленной стороне."""
+        return self._shell_id is not None
+
+    @property
+    def idle_seconds(self) -> float:
+        """Время с последней успешной команды (inf если shell закрыт)."""
+        if self._shell_id is None:
+            return float('inf')
+        return time.monotonic() - self._last_used
+
+    def run_cmd(self, command: str, args: List[str] = (),
+                timeout: Optional[float] = None) -> ShellCommandResult:
+        """Выполнить команду через долгоживущий shell.
+
+        Args:
+            command: Команда для выполнения
+            args: Аргументы команды
+            timeout: Срок получения вывода в секундах (None - без ограничения)
+
+        Returns:
+            ShellCommandResult: Код возврата, stdout и stderr
+
+        Raises:
+            TimeoutError: Если команда не завершилась за timeout
+        """
+        if self.protocol is None or not self._lock.acquire(blocking=False):
+            return self._run_one_shot(command, args)
+
+        try:
+            return self._run_in_shell(command, list(args or ()), timeout)
+        finally:
+            self._lock.release()
+
+    def run_ps(self, script: str, timeout: Optional[float] = None) -> ShellCommandResult:
+        """Выполнить PowerShell скрипт через долгоживущий shell.
+
+        Args:
+            script: Текст скрипта
+            timeout: Срок получения вывода в секундах (None - без ограничения)
+
+        Returns:
+            ShellCommandResult: Код возврата, stdout и stderr
+        """
+        encoded = base64.b64encode(script.encode('utf_16_le')).decode('ascii')
+        result = self.run_cmd(f'powershell -encodedcommand {encoded}', timeout=timeout)
+
+        clean_error = getattr(self.session, '_clean_error_msg', None)
+        if result.std_err and clean_error is not None:
+            try:
+                result.std_err = clean_error(result.std_err)
+            except Exception:
+                pass
+        return result
+
+    def close(self) -> None:
+        """Закрыть shell на удаленной стороне."""
+        with self._lock:
+            self._close_shell()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику использования shell.
+
+        Returns:
+            Dict[str, Any]: Счетчики открытий, переиспользования и экономии
+        """
+        stats = dict(self.stats)
+        stats['handshake_seconds_saved'] = round(stats['handshake_seconds_saved'], 3)
+        stats['avg_handshake_ms'] = round(self._handshake_cost * 1000, 2)
+        stats['is_open'] = self.is_open
+        return stats
+
+    def _run_in_shell(self, command: str, args: List[str],
+                      timeout: Optional[float] = None) -> ShellCommandResult:
+        """Выполнить команду в открытом shell (вызывается под блокировкой)."""
+        if self._shell_id is not None and self._needs_recycle():
+            self._close_shell()
+            self.stats['shells_recycled'] += 1
+
+        reused = self._shell_id is not None
+        if not reused:
+            self._open_shell()
+
+        protocol = self.protocol
+        try:
+            command_id = protocol.run_command(self._shell_id, command, args)
+            try:
+                std_out, std_err, status_code = self._receive(command_id, timeout)
+            finally:
+                protocol.cleanup_command(self._shell_id, command_id)
+        except Exception:
+            # Состояние shell неизвестно - открыть новый при следующем вызове.
+            # Закрытие shell завершает и зависший удаленный процесс.
+            self.stats['errors'] += 1
+            self._close_shell()
+            raise
+
+        self._shell_commands += 1
+        self._last_used = time.monotonic()
+        self.stats['commands'] += 1
+
+        if reused:
+            # Без переиспользования каждая команда стоила бы open_shell + close_shell
+            self.stats['reused_commands'] += 1
+            self.stats['round_trips_saved'] += 2
+            self.stats['handshake_seconds_saved'] += self._handshake_cost
+
+        return ShellCommandResult(status_code, std_out, std_err)
+
+    def _receive(self, command_id: str, timeout: Optional[float]) -> Tuple[bytes, bytes, int]:
+        """Получить вывод команды с учетом срока.
+
+        protocol.get_command_output опрашивает shell до завершения команды
+        без ограничения по времени. Здесь опрос идет по одному запросу
+        Receive, и между запросами проверяется срок. Точность проверки
+        ограничена operation_timeout_sec сессии (длительность одного опроса).
+        """
+        protocol = self.protocol
+        receive = getattr(protocol, '_raw_get_command_output', None)
+        if timeout is None or receive is None:
+            return protocol.get_command_output(self._shell_id, command_id)
+
+        deadline = time.monotonic() + timeout
+        std_out: List[bytes] = []
+        std_err: List[bytes] = []
+        while True:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Команда не завершилась за {timeout:.1f}s")
+            try:
+                out, err, status_code, done = receive(self._shell_id, command_id)
+            except WinRMOperationTimeoutError:
+                # Нет нового вывода за время опроса - команда еще выполняется
+                continue
+            std_out.append(out)
+            std_err.append(err)
+            if done:
+                return b''.join(std_out), b''.join(std_err), status_code
+
+    def _run_one_shot(self, command: str, args: List[str]) -> ShellCommandResult:
+        """Выполнить команду разово (отдельный shell на команду)."""
+        self.stats['one_shot_commands'] += 1
+        result = self.session.run_cmd(command, list(args or ()))
+        return ShellCommandResult(result.status_code, result.std_out, result.std_err)
+
+    def _needs_recycle(self) -> bool:
+        """Проверить, пора ли пересоздать shell."""
+        if self._shell_commands >= self.max_commands:
+            return True
+        return time.monotonic() - self._last_used > self.max_idle_seconds
+
+    def _open_shell(self) -> None:
+        """Открыть новый shell и учесть стоимость рукопожатия."""
+        started = time.perf_counter()
+        self._shell_id = self.protocol.open_shell()
+        self._record_handshake(time.perf_counter() - started)
+
+        self._shell_commands = 0
+        self._last_used = time.monotonic()
+        self.stats['shells_opened'] += 1
+
+    def _close_shell(self) -> None:
+        """Закрыть shell, не прерываясь на ошибках удаленной стороны."""
+        shell_id, self._shell_id = self._shell_id, None
+        if shell_id is None:
+            return
+
+        started = time.perf_counter()
+        try:
+            try:
+                # Сохранить HTTP сессию для следующего shell
+                self.protocol.close_shell(shell_id, close_session=False)
+            except TypeError:
+                # Старые версии pywinrm не поддерживают close_session
+                self.protocol.close_shell(shell_id)
+        except Exception:
+            return
+        self._record_handshake(time.perf_counter() - started)
+
+    def _record_handshake(self, seconds: float) -> None:
+        """Обновить скользящую оценку стоимости рукопожатия."""
+        if self._handshake_cost == 0.0:
+            self._handshake_cost = seconds
+        else:
+            self._handshake_cost = 0.8 * self._handshake_cost + 0.2 * seconds
+
+
 class WinRMProtocol(ConnectionProtocol):
     """Протокол на основе PyWinRM."""
 
-    def __init__(self, workstation_config: WorkstationConfig):
-        """Инициализация WinRM протокола."""
+    def __init__(self, workstation_config: WorkstationConfig,
+                 session_factory: Optional[Callable[[WorkstationConfig], Any]] = None):
+        """Инициализация WinRM протокола.
+
+        Args:
+            workstation_config: Конфигурация рабочей станции
+            session_factory: Фабрика WinRM сессий (по умолчанию winrm.Session)
+        """
         super().__init__(workstation_config)
         self._session: Optional[winrm.Session] = None
+        self._shell: Optional[WinRMShell] = None
+        self._session_factory = session_factory
 
     def connect(self) -> bool:
         """Установить WinRM подключение."""
-        if not WINRM_AVAILABLE:
+        if not WINRM_AVAILABLE and self._session_factory is None:
             self._last_error = "PyWinRM не установлен"
             return False
 
@@ -94,7 +366,9 @@ class WinRMProtocol(ConnectionProtocol):
             endpoint = f"http://{self.config.ip_address}:{self.config.winrm_port}/wsman"
 
             # Создать сессию аутентификации
-            if self.config.domain:
+            if self._session_factory is not None:
+                self._session = self._session_factory(self.config)
+            elif self.config.domain:
                 # Доменная аутентификация
                 self._session = winrm.Session(
                     endpoint,
@@ -107,8 +381,9 @@ class WinRMProtocol(ConnectionProtocol):
                     auth=(self.config.username, self.config.password)
                 )
 
-            # Тест подключения
-            result = self._session.run_cmd('echo', ['test'])
+            # Тест подключения (открывает shell, который будет переиспользован)
+            self._shell = WinRMShell(self._session)
+            result = self._shell.run_cmd('echo', ['test'])
             if result.status_code == 0:
                 self._connected = True
                 self._last_error = None
@@ -125,6 +400,9 @@ class WinRMProtocol(ConnectionProtocol):
     def disconnect(self) -> None:
         """Закрыть WinRM подключение."""
         super().disconnect()
+        if self._shell:
+            self._shell.close()
+            self._shell = None
         if self._session:
             try:
                 self._session.close()
@@ -139,7 +417,7 @@ class WinRMProtocol(ConnectionProtocol):
             return False
 
         try:
-            result = self._session.run_cmd('echo', ['test'])
+            result = self._shell.run_cmd('echo', ['test'])
             return result.status_code == 0
         except Exception as e:
             self._last_error = f"Ошибка теста подключения: {e}"
@@ -160,7 +438,7 @@ class WinRMProtocol(ConnectionProtocol):
 
         try:
             args = args or []
-            result = self._session.run_cmd(command, args)
+            result = self._shell.run_cmd(command, args)
 
             stdout = result.std_out.decode('utf-8', errors='ignore') if result.std_out else ""
             stderr = result.std_err.decode('utf-8', errors='ignore') if result.std_err else ""
@@ -171,6 +449,14 @@ class WinRMProtocol(ConnectionProtocol):
             self._last_error = f"Ошибка выполнения команды: {e}"
             return 1, "", str(e)
 
+    def get_shell_stats(self) -> Dict[str, Any]:
+        """Получить статистику переиспользования shell.
+
+        Returns:
+            Dict[str, Any]: Статистика shell (пустая если нет подключения)
+        """
+        return self._shell.get_stats() if self._shell else {}
+
 
 class SMBProtocol(ConnectionProtocol):
     """Протокол для работы с файловой системой через SMB."""
@@ -387,13 +673,16 @@ class FallbackProtocol(ConnectionProtocol):
 class RemoteConnectionManager:
     """Менеджер удаленных подключений с поддержкой нескольких протоколов."""
 
-    def __init__(self, workstation_config: WorkstationConfig):
+    def __init__(self, workstation_config: WorkstationConfig,
+                 session_factory: Optional[Callable[[WorkstationConfig], Any]] = None):
         """Инициализация менеджера подключений.
 
         Args:
             workstation_config: Конфигурация рабочей станции
+            session_factory: Фабрика WinRM сессий (по умолчанию winrm.Session)
         """
         self.config = workstation_config
+        self._session_factory = session_factory
         self._primary_protocol: Optional[ConnectionProtocol] = None
         self._fallback_protocol: Optional[FallbackProtocol] = None
         self._connection_attempts: int = 0
@@ -407,12 +696,14 @@ class RemoteConnectionManager:
         """
         # Создать протоколы если нужно
         if not self._primary_protocol:
-            if WINRM_AVAILABLE:
-                self._primary_protocol = WinRMProtocol(self.config)
+            if WINRM_AVAILABLE or self._session_factory is not None:
+                self._primary_protocol = WinRMProtocol(self.config, self._session_factory)
             else:
                 self._primary_protocol = PowerShellProtocol(self.config)
 
-        if not self._fallback_protocol:
+        # Резервные протоколы обращаются к настоящей станции (SMB, локальный
+        # PowerShell), поэтому с подмененным транспортом не используются
+        if not self._fallback_protocol and self._session_factory is None:
             self._fallback_protocol = FallbackProtocol(self.config)
 
         # Попытка подключения через основной протокол
@@ -421,7 +712,7 @@ class RemoteConnectionManager:
             return True
 
         # Попытка подключения через резервные протоколы
-        if self._fallback_protocol.connect():
+        if self._fallback_protocol and self._fallback_protocol.connect():
             self._connection_attempts = 0
             return True
 
@@ -501,7 +792,7 @@ class RemoteConnectionManager:
         """
         try:
             # Тест базового подключения
-            if not self.is_connected and not self.connect():
+            if not self.is_connected() and not self.connect():
                 return False, "Не удалось установить соединение"
 
             # Тест команды echo
@@ -531,12 +822,26 @@ class RemoteConnectionManager:
 
 
 class ConnectionPool:
-    """Пул подключений для управления несколькими рабочими станциями."""
+    """Пул подключений для управления несколькими рабочими станциями.
+
+    Подключение, отключение и тестирование станций выполняются параллельно
+    в отдельном пуле потоков: у каждой станции свой таймаут, у всего обхода -
+    общий срок. Время обхода равно max(задержка станции), а не их сумме.
+    """
 
-    def __init__(self):
-        """Инициализация пула подключений."""
+    def __init__(self, max_workers: int = 32,
+                 session_factory: Optional[Callable[[WorkstationConfig], Any]] = None):
+        """Инициализация пула подключений.
+
+        Args:
+            max_workers: Максимум одновременных блокирующих вызовов
+            session_factory: Фабрика WinRM сессий (по умолчанию winrm.Session)
+        """
+        self._session_factory = session_factory
         self._connections: Dict[str, RemoteConnectionManager] = {}
         self._lock = asyncio.Lock()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def get_connection(self, workstation_config: WorkstationConfig) -> RemoteConnectionManager:
         """Получить менеджер подключений для рабочей станции.
@@ -548,30 +853,167 @@ class ConnectionPool:
             RemoteConnectionManager: Менеджер подключений
         """
         if workstation_config.id not in self._connections:
-            self._connections[workstation_config.id] = RemoteConnectionManager(workstation_config)
+            self._connections[workstation_config.id] = RemoteConnectionManager(
+                workstation_config, self._session_factory
+            )
 
         return self._connections[workstation_config.id]
 
-    async def connect_all(self) -> Dict[str, bool]:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Получить (лениво создать) пул потоков для обходов станций."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="conn-pool"
+            )
+        return self._executor
+
+    async def _sweep(
+        self,
+        action: Callable[[RemoteConnectionManager], Any],
+        host_timeout: float,
+        deadline: Optional[float]
+    ) -> AsyncIterator[Tuple[str, Any, Optional[str]]]:
+        """Параллельно выполнить действие для всех станций пула.
+
+        Результаты выдаются по мере ответа станций. Станции, не ответившие
+        за host_timeout или до общего срока deadline, выдаются с ошибкой.
+
+        Args:
+            action: Блокирующая функция от менеджера подключений
+            host_timeout: Таймаут одной станции в секундах
+            deadline: Общий срок обхода в секундах (None - без ограничения)
+
+        Yields:
+            Tuple[str, Any, Optional[str]]: (ID станции, результат, ошибка)
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        connections = list(self._connections.items())
+
+        async def run_one(workstation_id: str, connection: RemoteConnectionManager):
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(executor, action, connection),
+                    host_timeout
+                )
+                return workstation_id, result, None
+            except asyncio.TimeoutError:
+                return workstation_id, None, f"Превышен таймаут станции ({host_timeout}s)"
+            except Exception as e:
+                return workstation_id, None, str(e)
+
+        tasks = [asyncio.ensure_future(run_one(*item)) for item in connections]
+        pending = [workstation_id for workstation_id, _ in connections]
+
+        try:
+            for next_result in asyncio.as_completed(tasks, timeout=deadline):
+                try:
+                    workstation_id, result, error = await next_result
+                except asyncio.TimeoutError:
+                    break
+                pending.remove(workstation_id)
+                yield workstation_id, result, error
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Дождаться отмены: потоки станций продолжат работу, но задачи не повиснут
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for workstation_id in pending:
+            yield workstation_id, None, f"Превышен общий срок обхода ({deadline}s)"
+
+    async def iter_connect_all(
+        self,
+        host_timeout: float = 15.0,
+        deadline: Optional[float] = 60.0
+    ) -> AsyncIterator[Tuple[str, bool]]:
+        """Подключиться ко всем станциям, выдавая результаты по мере готовности.
+
+        Args:
+            host_timeout: Таймаут подключения одной станции в секундах
+            deadline: Общий срок в секундах
+
+        Yields:
+            Tuple[str, bool]: (ID станции, успех подключения)
+        """
+        async with self._lock:
+            async for workstation_id, result, _ in self._sweep(
+                lambda connection: connection.connect(), host_timeout, deadline
+            ):
+                yield workstation_id, bool(result)
+
+    async def connect_all(
+        self,
+        host_timeout: float = 15.0,
+        deadline: Optional[float] = 60.0
+    ) -> Dict[str, bool]:
         """Подключиться ко всем рабочим станциям.
 
+        Args:
+            host_timeout: Таймаут подключения одной станции в секундах
+            deadline: Общий срок в секундах
+
         Returns:
             Dict[str, bool]: Словарь с результатами подключения
             ключ - ID станции, значение - успех подключения
         """
-        results = {}
+        return {
+            workstation_id: connected
+            async for workstation_id, connected in self.iter_connect_all(host_timeout, deadline)
+        }
+
+    async def iter_test_all(
+        self,
+        host_timeout: float = 30.0,
+        deadline: Optional[float] = 60.0
+    ) -> AsyncIterator[Tuple[str, bool, str]]:
+        """Протестировать все станции, выдавая результаты по мере готовности.
+
+        Args:
+            host_timeout: Таймаут теста одной станции в секундах
+            deadline: Общий срок в секундах
 
+        Yields:
+            Tuple[str, bool, str]: (ID станции, успех, сообщение)
+        """
         async with self._lock:
-            for workstation_id, connection in self._connections.items():
-                results[workstation_id] = connection.connect()
+            async for workstation_id, result, error in self._sweep(
+                lambda connection: connection.test_connection(), host_timeout, deadline
+            ):
+                if error is not None:
+                    yield workstation_id, False, error
+                else:
+                    yield workstation_id, result[0], result[1]
+
+    async def test_all(
+        self,
+        host_timeout: float = 30.0,
+        deadline: Optional[float] = 60.0
+    ) -> Dict[str, Tuple[bool, str]]:
+        """Протестировать подключение ко всем рабочим станциям.
+
+        Args:
+            host_timeout: Таймаут теста одной станции в секундах
+            deadline: Общий срок в секундах
 
-        return results
+        Returns:
+            Dict[str, Tuple[bool, str]]: ID станции -> (успех, сообщение)
+        """
+        return {
+            workstation_id: (success, message)
+            async for workstation_id, success, message in self.iter_test_all(host_timeout, deadline)
+        }
 
-    async def disconnect_all(self) -> None:
-        """Отключиться от всех рабочих станций."""
+    async def disconnect_all(self, host_timeout: float = 10.0) -> None:
+        """Отключиться от всех рабочих станций.
+
+        Args:
+            host_timeout: Таймаут отключения одной станции в секундах
+        """
         async with self._lock:
-            for connection in self._connections.values():
-                connection.disconnect()
+            async for _ in self._sweep(lambda connection: connection.disconnect(), host_timeout, None):
+                pass
 
     def get_connected_workstations(self) -> List[str]:
         """Получить список ID подключенных рабочих станций.
@@ -581,7 +1023,7 @@ class ConnectionPool:
         """
         connected = []
         for workstation_id, connection in self._connections.items():
-            if connection.is_connected:
+            if connection.is_connected():
                 connected.append(workstation_id)
         return connected
 
@@ -591,6 +1033,10 @@ class ConnectionPool:
             connection.disconnect()
         self._connections.clear()
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
 
 # Глобальный пул подключений
 connection_pool = ConnectionPool()
@@ -0,0 +1,203 @@
+"""
+Сверка последовательных снимков list2 рабочей станции.
+
+Строка list2 (index,name,handles,...) неизменна, пока эмулятор не
+изменился, поэтому неизменные строки находятся по хэшу и переиспользуют
+прежний объект эмулятора. Разбираются только новые и измененные строки,
+а результат сверки - события добавления, удаления и смены статуса.
+Вывод с заголовком (Name,Pid,Status,...) сначала приводится к строкам
+формата LDPlayer 9, формат определяется по каждому снимку.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.events import EMULATOR_ADDED, EMULATOR_REMOVED, EMULATOR_STATUS_CHANGED
+from .ldconsole_parser import LDConsoleParseError, has_list2_header, parse_list2
+
+
+@dataclass
+class EmulatorChange:
+    """Изменение эмулятора между двумя снимками list2."""
+    type: str
+    workstation_id: str
+    name: str
+    emulator: Any
+    status: Any
+    previous_status: Any = None
+    index: Optional[int] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразовать событие в словарь для WebSocket.
+
+        Returns:
+            Dict[str, Any]: Данные события
+        """
+        return {
+            'type': self.type,
+            'workstation_id': self.workstation_id,
+            'emulator_id': f"{self.workstation_id}_{self.name}",
+            'name': self.name,
+            'index': self.index,
+            'status': getattr(self.status, 'value', self.status),
+            'previous_status': getattr(self.previous_status, 'value', self.previous_status),
+            'timestamp': self.timestamp,
+        }
+
+
+def _snapshot_lines(output: str) -> List[Tuple[int, str]]:
+    """Непустые строки снимка в формате LDPlayer 9 с номерами строк вывода.
+
+    Raises:
+        LDConsoleParseError: Некорректная строка вывода с заголовком
+    """
+    lines = output.splitlines()
+    if not has_list2_header(lines):
+        return [(number, line.strip()) for number, line in enumerate(lines, 1) if line.strip()]
+
+    # Колонки задает заголовок: строки разбираются целиком и записываются заново
+    return [(record.index + 2, ','.join(str(value) for value in record)) for record in parse_list2(output)]
+
+
+class _Entry:
+    """Эмулятор снимка и состояние, которое задает его строка list2."""
+
+    __slots__ = ('index', 'name', 'status', 'emulator')
+
+    def __init__(self, index: Optional[int], name: str, status: Any, emulator: Any):
+        self.index = index
+        self.name = name
+        self.status = status
+        self.emulator = emulator
+
+
+class ListReconciler:
+    """Сверка снимков list2 одной станции в события изменений.
+
+    Объекты эмуляторов общие с реестром парка: смена статуса применяется
+    к прежнему объекту, а не создает новый.
+    """
+
+    def __init__(self, workstation_id: str, parse_line: Callable[[str], Optional[Any]]):
+        """Инициализация сверки.
+
+        Args:
+            workstation_id: ID рабочей станции
+            parse_line: Разбор строки list2 в эмулятор (None - пропустить строку,
+                исключение - некорректный вывод)
+        """
+        self.workstation_id = workstation_id
+        self.parse_line = parse_line
+        self._lines: Dict[str, _Entry] = {}
+        self._by_name: Dict[str, _Entry] = {}
+
+        self.stats: Dict[str, int] = {'snapshots': 0, 'parsed': 0, 'events': 0}
+
+    def reconcile(self, output: str) -> Tuple[List[Any], List[EmulatorChange]]:
+        """Сверить новый вывод list2 с предыдущим снимком.
+
+        Сначала разбираются все новые строки, затем применяются изменения:
+        ошибка разбора не оставляет снимок и объекты наполовину обновленными.
+
+        Args:
+            output: Вывод команды ldconsole.exe list2
+
+        Returns:
+            Tuple[List[Any], List[EmulatorChange]]: (эмуляторы в порядке list2, изменения)
+
+        Raises:
+            LDConsoleParseError: Некорректная строка (с номером строки вывода)
+        """
+        rows: List[Tuple[str, Optional[_Entry], Any]] = []
+        for number, line in _snapshot_lines(output):
+            entry = self._lines.get(line)
+            if entry is not None and entry.emulator.name == entry.name:
+                rows.append((line, entry, None))
+                continue
+
+            try:
+                emulator = self.parse_line(line)
+            except LDConsoleParseError as e:
+                raise LDConsoleParseError(str(e), number, line) from None
+            if emulator is not None:
+                rows.append((line, None, emulator))
+
+        lines: Dict[str, _Entry] = {}
+        by_name: Dict[str, _Entry] = {}
+        emulators: List[Any] = []
+        changes: List[EmulatorChange] = []
+
+        for line, entry, parsed in rows:
+            if entry is None:
+                entry = self._apply_parsed(line, parsed, changes)
+            elif entry.emulator.status != entry.status:
+                # Статус изменен результатом операции, но list2 его не подтвердил
+                changes.append(self._status_change(entry, entry.status))
+
+            lines[line] = entry
+            by_name[entry.name] = entry
+            emulators.append(entry.emulator)
+
+        for name in self._by_name.keys() - by_name.keys():
+            entry = self._by_name[name]
+            changes.append(EmulatorChange(
+                type=EMULATOR_REMOVED,
+                workstation_id=self.workstation_id,
+                name=name,
+                emulator=entry.emulator,
+                status=entry.status,
+                index=entry.index,
+            ))
+
+        self._lines = lines
+        self._by_name = by_name
+        self.stats['snapshots'] += 1
+        self.stats['parsed'] += sum(1 for _, entry, _ in rows if entry is None)
+        self.stats['events'] += len(changes)
+        return emulators, changes
+
+    def reset(self) -> None:
+        """Забыть снимок - следующая сверка вернет все эмуляторы как добавленные."""
+        self._lines = {}
+        self._by_name = {}
+
+    def _apply_parsed(self, line: str, emulator: Any, changes: List[EmulatorChange]) -> _Entry:
+        """Сопоставить разобранную строку с прежним снимком и записать изменение."""
+        try:
+            index: Optional[int] = int(line.split(',', 1)[0])
+        except ValueError:
+            index = None
+
+        previous = self._by_name.get(emulator.name)
+        if previous is None or previous.emulator.name != previous.name:
+            changes.append(EmulatorChange(
+                type=EMULATOR_ADDED,
+                workstation_id=self.workstation_id,
+                name=emulator.name,
+                emulator=emulator,
+                status=emulator.status,
+                index=index,
+            ))
+            return _Entry(index, emulator.name, emulator.status, emulator)
+
+        # Тот же эмулятор: изменились handle или поля без влияния на статус
+        entry = _Entry(index, previous.name, emulator.status, previous.emulator)
+        if previous.emulator.status != emulator.status:
+            changes.append(self._status_change(entry, emulator.status))
+        return entry
+
+    def _status_change(self, entry: _Entry, status: Any) -> EmulatorChange:
+        """Применить статус строки к объекту эмулятора и создать событие."""
+        previous_status = entry.emulator.status
+        entry.emulator.status = status
+        return EmulatorChange(
+            type=EMULATOR_STATUS_CHANGED,
+            workstation_id=self.workstation_id,
+            name=entry.name,
+            emulator=entry.emulator,
+            status=status,
+            previous_status=previous_status,
+            index=entry.index,
+        )
@@ -0,0 +1,308 @@
+"""
+Ограниченный пул удаленных сессий для одной рабочей станции.
+
+Пул выдает сессии во временное пользование (borrow/return), держит
+не меньше min_size и не больше max_size сессий, проверяет простаивающие
+сессии пробой и закрывает лишние после простоя.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, Type, TypeVar
+
+
+T = TypeVar('T')
+
+
+class _PooledEntry(Generic[T]):
+    """Сессия в пуле с временем последнего использования."""
+
+    __slots__ = ('session', 'last_used')
+
+    def __init__(self, session: T):
+        self.session = session
+        self.last_used = time.monotonic()
+
+
+class SessionPool(Generic[T]):
+    """Потокобезопасный пул сессий с проверками и вытеснением по простою."""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], T],
+        min_size: int = 1,
+        max_size: int = 4,
+        idle_timeout: float = 300,
+        acquire_timeout: float = 30,
+        probe: Optional[Callable[[T], bool]] = None,
+        closer: Optional[Callable[[T], None]] = None,
+        discard_on: Tuple[Type[BaseException], ...] = (ConnectionError,)
+    ):
+        """Инициализация пула.
+
+        Args:
+            name: Имя пула (обычно ID рабочей станции)
+            factory: Создает новую подключенную сессию
+            min_size: Минимум сессий, поддерживаемых maintain()
+            max_size: Максимум одновременно существующих сессий
+            idle_timeout: Простой в секундах, после которого лишняя сессия закрывается
+            acquire_timeout: Таймаут ожидания свободной сессии по умолчанию
+            probe: Проверка живости сессии (True - сессия рабочая)
+            closer: Закрытие сессии
+            discard_on: Исключения внутри lease(), после которых сессия выбрасывается
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Некорректные размеры пула: min={min_size}, max={max_size}")
+
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._factory = factory
+        self._probe = probe
+        self._closer = closer
+        self._discard_on = discard_on
+
+        self._cond = threading.Condition()
+        self._idle: List[_PooledEntry[T]] = []
+        self._total = 0
+        self._in_use = 0
+        self._closed = False
+
+        self.stats: Dict[str, int] = {
+            'created': 0,
+            'closed': 0,
+            'borrowed': 0,
+            'waits': 0,
+            'wait_timeouts': 0,
+            'create_errors': 0,
+            'probe_failures': 0,
+            'evicted_idle': 0,
+            'peak_in_use': 0,
+        }
+
+    @property
+    def size(self) -> int:
+        """Текущее количество сессий (свободных и занятых)."""
+        return self._total
+
+    def acquire(self, timeout: Optional[float] = None) -> T:
+        """Взять сессию из пула.
+
+        Args:
+            timeout: Таймаут ожидания свободной сессии (None - acquire_timeout)
+
+        Returns:
+            T: Сессия
+
+        Raises:
+            TimeoutError: Если свободная сессия не появилась за timeout
+            RuntimeError: Если пул закрыт
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"Пул сессий '{self.name}' закрыт")
+
+                if self._idle:
+                    # LIFO: самая "теплая" сессия, холодные вытесняются maintain()
+                    entry = self._idle.pop()
+                    self._mark_borrowed()
+                    return entry.session
+
+                if self._total < self.max_size:
+                    # Зарезервировать место, сессию создать вне блокировки
+                    self._total += 1
+                    self._mark_borrowed()
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['wait_timeouts'] += 1
+                    raise TimeoutError(
+                        f"Нет свободных сессий в пуле '{self.name}' ({self.max_size} заняты)"
+                    )
+                self.stats['waits'] += 1
+                self._cond.wait(remaining)
+
+        try:
+            session = self._factory()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self.stats['create_errors'] += 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.stats['created'] += 1
+        return session
+
+    def release(self, session: T, discard: bool = False) -> None:
+        """Вернуть сессию в пул.
+
+        Args:
+            session: Сессия, полученная через acquire()
+            discard: Закрыть сессию вместо возврата (например, после сетевой ошибки)
+        """
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._total -= 1
+            else:
+                self._idle.append(_PooledEntry(session))
+                session = None
+            self._cond.notify()
+
+        if session is not None:
+            self._close_session(session)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[T]:
+        """Контекстный менеджер для взятия сессии во временное пользование.
+
+        Args:
+            timeout: Таймаут ожидания свободной сессии
+
+        Yields:
+            T: Сессия
+        """
+        session = self.acquire(timeout)
+        discard = False
+        try:
+            yield session
+        except self._discard_on:
+            discard = True
+            raise
+        finally:
+            self.release(session, discard=discard)
+
+    def maintain(self) -> Dict[str, int]:
+        """Проверить свободные сессии, вытеснить простаивающие и добрать до min_size.
+
+        Вызывается периодически из фоновой задачи (блокирующий вызов).
+
+        Returns:
+            Dict[str, int]: Количество проверенных, закрытых и созданных сессий
+        """
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return {'probed': 0, 'closed': 0, 'created': 0}
+            checking, self._idle = self._idle, []
+            remaining = self._total
+
+        keep: List[_PooledEntry[T]] = []
+        to_close: List[T] = []
+        probed = 0
+
+        # Самые старые по использованию - первые кандидаты на вытеснение
+        checking.sort(key=lambda entry: entry.last_used)
+        for entry in checking:
+            if now - entry.last_used > self.idle_timeout and remaining > self.min_size:
+                remaining -= 1
+                self.stats['evicted_idle'] += 1
+                to_close.append(entry.session)
+                continue
+
+            if self._probe is not None:
+                probed += 1
+                if not self._safe_probe(entry.session):
+                    remaining -= 1
+                    self.stats['probe_failures'] += 1
+                    to_close.append(entry.session)
+                    continue
+            keep.append(entry)
+
+        with self._cond:
+            if self._closed:
+                # Пул закрыли во время проверки - проверенные сессии тоже закрыть
+                to_close.extend(entry.session for entry in keep)
+                keep = []
+            self._total -= len(to_close)
+            self._idle = keep + self._idle
+            missing = max(0, self.min_size - self._total) if not self._closed else 0
+            self._total += missing
+            self._cond.notify_all()
+
+        for session in to_close:
+            self._close_session(session)
+
+        created = 0
+        for _ in range(missing):
+            try:
+                session = self._factory()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self.stats['create_errors'] += 1
+                continue
+            created += 1
+            with self._cond:
+                self.stats['created'] += 1
+                if not self._closed:
+                    self._idle.insert(0, _PooledEntry(session))
+                    self._cond.notify()
+                    continue
+                self._total -= 1
+            self._close_session(session)
+
+        return {'probed': probed, 'closed': len(to_close), 'created': created}
+
+    def close(self) -> None:
+        """Закрыть пул и все свободные сессии (занятые закроются при возврате)."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+
+        for entry in idle:
+            self._close_session(entry.session)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику пула.
+
+        Returns:
+            Dict[str, Any]: Размеры пула и счетчики
+        """
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'total': self._total,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                **self.stats,
+            }
+
+    def _mark_borrowed(self) -> None:
+        """Учесть выдачу сессии (вызывается под блокировкой)."""
+        self._in_use += 1
+        self.stats['borrowed'] += 1
+        self.stats['peak_in_use'] = max(self.stats['peak_in_use'], self._in_use)
+
+    def _safe_probe(self, session: T) -> bool:
+        """Выполнить пробу, считая исключение неуспехом."""
+        try:
+            return bool(self._probe(session))
+        except Exception:
+            return False
+
+    def _close_session(self, session: T) -> None:
+        """Закрыть сессию, игнорируя ошибки удаленной стороны."""
+        with self._cond:
+            self.stats['closed'] += 1
+        if self._closer is not None:
+            try:
+                self._closer(session)
+            except Exception:
+                pass
@@ -0,0 +1,606 @@
+"""
+Симулятор рабочей станции LDPlayer для тестов и бенчмарков.
+
+Заменяет winrm.Session: SimulatedSession и SimulatedProtocol реализуют
+те же методы (run_cmd, run_ps, open_shell, run_command, receive, ...),
+а SimulatedWorkstation хранит состояние эмуляторов и отвечает как
+ldconsole.exe (list, list2, runninglist, isrunning, add, launch, ...).
+
+Каждый запрос WinRM стоит одну задержку сети (latency ± jitter) и с
+вероятностью failure_rate завершается ConnectionError. Работает на
+Linux без pywinrm, поэтому позволяет гонять WorkstationManager,
+LDPlayerManager и RemoteLDPlayerScanner на парке из десятков станций.
+
+Пример:
+    fleet = SimulatedFleet(workstations=50, emulators=200, running=50, latency=0.005)
+    managers = [WorkstationManager(config, session_factory=fleet.session_factory)
+                for config in fleet.configs()]
+"""
+
+import base64
+import itertools
+import json
+import ntpath
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..core.config import WorkstationConfig
+from .protocols import ShellCommandResult, WinRMOperationTimeoutError
+
+
+# Имена исполняемого файла консоли LDPlayer
+LDCONSOLE_NAMES = ('ldconsole', 'ldconsole.exe', 'dnconsole', 'dnconsole.exe')
+
+# Манифест пакетного скрипта (см. batch_executor._SCRIPT_TEMPLATE)
+_MANIFEST_RE = re.compile(r"ConvertFrom-Json '((?:[^']|'')*)'")
+
+
+class SimulatedEmulator:
+    """Состояние одного эмулятора на симулируемой станции."""
+
+    __slots__ = ('index', 'name', 'running', 'top_handle', 'bind_handle',
+                 'pid', 'vbox_pid', 'width', 'height', 'dpi', 'cpu', 'memory')
+
+    def __init__(self, index: int, name: str):
+        self.index = index
+        self.name = name
+        self.running = False
+        self.top_handle = 0
+        self.bind_handle = 0
+        self.pid = -1
+        self.vbox_pid = -1
+        self.width = 960
+        self.height = 540
+        self.dpi = 240
+        self.cpu = 2
+        self.memory = 2048
+
+    def to_list2(self) -> str:
+        """Строка вывода ldconsole list2.
+
+        Формат: index,title,top_handle,bind_handle,android_started,pid,vbox_pid,width,height,dpi
+        """
+        return (
+            f"{self.index},{self.name},{self.top_handle},{self.bind_handle},"
+            f"{int(self.running)},{self.pid},{self.vbox_pid},{self.width},{self.height},{self.dpi}"
+        )
+
+
+class SimulatedWorkstation:
+    """Рабочая станция с LDPlayer: состояние эмуляторов и профиль сети."""
+
+    def __init__(
+        self,
+        name: str,
+        emulators: int = 0,
+        running: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        action_latency: Optional[Dict[str, float]] = None,
+        cpu_load: float = 5.0,
+        memory_load: float = 30.0,
+        seed: Optional[int] = None
+    ):
+        """Инициализация станции.
+
+        Args:
+            name: Имя станции
+            emulators: Количество эмуляторов при старте
+            running: Сколько из них запущено
+            latency: Задержка одного WinRM запроса в секундах
+            jitter: Случайное отклонение задержки (±jitter)
+            failure_rate: Вероятность сетевой ошибки на запрос (0..1)
+            action_latency: Время выполнения действий ldconsole (add -> 2.0)
+            cpu_load: Загрузка CPU станции в процентах
+            memory_load: Занятая физическая память в процентах
+            seed: Seed генератора для воспроизводимых сбоев и задержек
+        """
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError(f"failure_rate должен быть в диапазоне 0..1: {failure_rate}")
+
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.action_latency = dict(action_latency or {})
+        self.cpu_load = cpu_load
+        self.memory_load = memory_load
+        self.online = True
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._handles = itertools.count(0x10010, 0x10)
+        self._pids = itertools.count(4000, 4)
+        self._emulators: Dict[int, SimulatedEmulator] = {}
+
+        self.stats: Dict[str, int] = {
+            'round_trips': 0,
+            'commands': 0,
+            'failures_injected': 0,
+            'shells_opened': 0,
+        }
+
+        for index in range(emulators):
+            self._add(f"LDPlayer-{index}" if index else "LDPlayer")
+        for emulator in list(self._emulators.values())[:running]:
+            self._launch(emulator)
+
+    @property
+    def emulators(self) -> List[SimulatedEmulator]:
+        """Эмуляторы станции в порядке индексов."""
+        with self._lock:
+            return [self._emulators[index] for index in sorted(self._emulators)]
+
+    @property
+    def running_count(self) -> int:
+        """Количество запущенных эмуляторов."""
+        with self._lock:
+            return sum(1 for emulator in self._emulators.values() if emulator.running)
+
+    def session(self) -> 'SimulatedSession':
+        """Создать новую WinRM сессию к станции.
+
+        Returns:
+            SimulatedSession: Сессия (аналог winrm.Session)
+        """
+        return SimulatedSession(self)
+
+    def round_trip(self) -> None:
+        """Один WinRM запрос: задержка сети и возможный сбой.
+
+        Raises:
+            ConnectionError: Станция недоступна или сработал сбой
+        """
+        with self._lock:
+            self.stats['round_trips'] += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(-self.jitter, self.jitter)
+            failed = not self.online or self._random.random() < self.failure_rate
+            if failed:
+                self.stats['failures_injected'] += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise ConnectionError(f"Симулятор: станция {self.name} не ответила")
+
+    def command_duration(self, command: str, args: List[str]) -> float:
+        """Время выполнения команды на станции (без задержки сети)."""
+        if _is_ldconsole(command) and args:
+            return self.action_latency.get(args[0], 0.0)
+        return 0.0
+
+    def execute(self, command: str, args: Iterable[str] = ()) -> Tuple[int, str, str]:
+        """Выполнить команду на станции.
+
+        Args:
+            command: Команда (echo, путь к ldconsole.exe, powershell ...)
+            args: Аргументы команды
+
+        Returns:
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+        """
+        tokens = command.split() if command.lower().startswith('powershell') else [command]
+        tokens.extend(args)
+        program = ntpath.basename(tokens[0]).lower()
+
+        with self._lock:
+            self.stats['commands'] += 1
+
+        if program == 'echo':
+            return 0, ' '.join(tokens[1:]) + '\r\n', ''
+        if program == 'dir':
+            return 0, '', ''
+        if program in LDCONSOLE_NAMES:
+            return self.ldconsole(tokens[1:])
+        if program in ('powershell', 'powershell.exe'):
+            return self._powershell(tokens[1:])
+
+        return 1, '', f"'{tokens[0]}' is not recognized as an internal or external command\r\n"
+
+    def ldconsole(self, args: List[str]) -> Tuple[int, str, str]:
+        """Выполнить команду ldconsole.exe.
+
+        Args:
+            args: Аргументы (действие и параметры --key value)
+
+        Returns:
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+        """
+        if not args:
+            return 1, '', 'usage: ldconsole <command> [options]\r\n'
+
+        action, params = args[0], _parse_params(args[1:])
+        handler = getattr(self, f'_ld_{action}', None)
+        if handler is None:
+            return 1, '', f'unknown command: {action}\r\n'
+
+        with self._lock:
+            return handler(params)
+
+    # ------------------------------------------------------------------
+    # Команды ldconsole (вызываются под блокировкой)
+    # ------------------------------------------------------------------
+
+    def _ld_list(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        return 0, _lines(emulator.name for emulator in self._sorted()), ''
+
+    def _ld_list2(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        return 0, _lines(emulator.to_list2() for emulator in self._sorted()), ''
+
+    def _ld_runninglist(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        return 0, _lines(emulator.name for emulator in self._sorted() if emulator.running), ''
+
+    def _ld_isrunning(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        return 0, 'running' if emulator.running else 'stop', ''
+
+    def _ld_add(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._add(params.get('name'))
+        # ldconsole add возвращает индекс нового эмулятора как код возврата
+        return emulator.index, '', ''
+
+    def _ld_copy(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        source = self._find({'name': params.get('from', '')})
+        if source is None:
+            return _not_found()
+        emulator = self._add(params.get('name'))
+        emulator.width, emulator.height, emulator.dpi = source.width, source.height, source.dpi
+        emulator.cpu, emulator.memory = source.cpu, source.memory
+        return emulator.index, '', ''
+
+    def _ld_remove(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        del self._emulators[emulator.index]
+        return 0, '', ''
+
+    def _ld_rename(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        if 'title' not in params:
+            return 1, '', 'missing --title\r\n'
+        emulator.name = params['title']
+        return 0, '', ''
+
+    def _ld_modify(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        try:
+            if 'resolution' in params:
+                emulator.width, emulator.height, emulator.dpi = (
+                    int(value) for value in params['resolution'].split(',')
+                )
+            if 'cpu' in params:
+                emulator.cpu = int(params['cpu'])
+            if 'memory' in params:
+                emulator.memory = int(params['memory'])
+        except ValueError:
+            return 1, '', 'invalid parameter value\r\n'
+        return 0, '', ''
+
+    def _ld_launch(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        self._launch(emulator)
+        return 0, '', ''
+
+    def _ld_reboot(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        self._quit(emulator)
+        self._launch(emulator)
+        return 0, '', ''
+
+    def _ld_quit(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        emulator = self._find(params)
+        if emulator is None:
+            return _not_found()
+        self._quit(emulator)
+        return 0, '', ''
+
+    def _ld_quitall(self, params: Dict[str, str]) -> Tuple[int, str, str]:
+        for emulator in self._emulators.values():
+            self._quit(emulator)
+        return 0, '', ''
+
+    # ------------------------------------------------------------------
+    # PowerShell скрипты, которые отправляет сервер
+    # ------------------------------------------------------------------
+
+    def _powershell(self, args: List[str]) -> Tuple[int, str, str]:
+        """Выполнить PowerShell скрипт (из -EncodedCommand или аргументов)."""
+        lowered = [arg.lower() for arg in args]
+        if '-encodedcommand' in lowered:
+            encoded = args[lowered.index('-encodedcommand') + 1]
+            script = base64.b64decode(encoded).decode('utf_16_le')
+        else:
+            script = ' '.join(args)
+
+        manifest = _MANIFEST_RE.search(script)
+        if manifest is not None:
+            # Пакет ldconsole (LDConsoleBatchExecutor)
+            items = json.loads(manifest.group(1).replace("''", "'"))['items']
+            results = []
+            for i, item in enumerate(items):
+                code, out, err = self.ldconsole([str(arg) for arg in item['a']])
+                results.append({'i': i, 'c': code, 'o': out + err})
+            return 0, json.dumps(results, separators=(',', ':')), ''
+
+        if 'ldconsole' in script and 'list2' in script:
+            # Скрипт RemoteLDPlayerScanner: сырой вывод list2
+            return self.ldconsole(['list2'])
+
+        if 'ldconsole' in script and 'runninglist' in script:
+            # Проверка статусов RemoteLDPlayerScanner
+            return self.ldconsole(['runninglist'])
+
+        if 'Win32_OperatingSystem' in script:
+            # Телеметрия get_system_info: CIM значения в единицах Windows (КБ, байты)
+            total_kb, disk_bytes = 16 * 1024 * 1024, 512 * 1024 ** 3
+            return 0, json.dumps({
+                'cpu': self.cpu_load,
+                'memory_total': total_kb,
+                'memory_free': int(total_kb * (100.0 - self.memory_load) / 100.0),
+                'disk_total': disk_bytes,
+                'disk_free': disk_bytes // 2,
+                'ldplayer': self.running_count,
+            }), ''
+
+        return 1, '', 'Симулятор: неизвестный PowerShell скрипт\r\n'
+
+    # ------------------------------------------------------------------
+    # Вспомогательные методы (вызываются под блокировкой)
+    # ------------------------------------------------------------------
+
+    def _sorted(self) -> List[SimulatedEmulator]:
+        return [self._emulators[index] for index in sorted(self._emulators)]
+
+    def _find(self, params: Dict[str, str]) -> Optional[SimulatedEmulator]:
+        """Найти эмулятор по --index или --name (имя или индекс)."""
+        key = params.get('index', params.get('name'))
+        if key is None:
+            return None
+        for emulator in self._emulators.values():
+            if emulator.name == key:
+                return emulator
+        if key.isdigit():
+            return self._emulators.get(int(key))
+        return None
+
+    def _add(self, name: Optional[str]) -> SimulatedEmulator:
+        index = next(i for i in itertools.count() if i not in self._emulators)
+        emulator = SimulatedEmulator(index, name or f"LDPlayer-{index}")
+        self._emulators[index] = emulator
+        return emulator
+
+    def _launch(self, emulator: SimulatedEmulator) -> None:
+        if emulator.running:
+            return
+        emulator.running = True
+        emulator.top_handle = next(self._handles)
+        emulator.bind_handle = next(self._handles)
+        emulator.pid = next(self._pids)
+        emulator.vbox_pid = next(self._pids)
+
+    @staticmethod
+    def _quit(emulator: SimulatedEmulator) -> None:
+        emulator.running = False
+        emulator.top_handle = emulator.bind_handle = 0
+        emulator.pid = emulator.vbox_pid = -1
+
+
+class SimulatedProtocol:
+    """Аналог winrm.Protocol: shell и команды симулируемой станции.
+
+    Каждый метод - один WinRM запрос (задержка сети и возможный сбой).
+    Команда выполняется при run_command, ее вывод готов через время
+    action_latency; опрос до готовности ждет не дольше operation_timeout
+    и выбрасывает WinRMOperationTimeoutError, как настоящий Receive.
+    """
+
+    def __init__(self, workstation: SimulatedWorkstation, operation_timeout: float = 20.0):
+        self.workstation = workstation
+        self.operation_timeout = operation_timeout
+
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._shells: set = set()
+        self._commands: Dict[str, Tuple[float, Tuple[int, str, str]]] = {}
+
+    def open_shell(self, *args: Any, **kwargs: Any) -> str:
+        self.workstation.round_trip()
+        shell_id = f"shell-{next(self._ids)}"
+        with self._lock:
+            self._shells.add(shell_id)
+        with self.workstation._lock:
+            self.workstation.stats['shells_opened'] += 1
+        return shell_id
+
+    def close_shell(self, shell_id: str, close_session: bool = True) -> None:
+        self.workstation.round_trip()
+        with self._lock:
+            self._shells.discard(shell_id)
+
+    def run_command(self, shell_id: str, command: str, arguments: Iterable[str] = ()) -> str:
+        self.workstation.round_trip()
+        with self._lock:
+            if shell_id not in self._shells:
+                raise ConnectionError(f"Симулятор: shell {shell_id} не открыт")
+
+        args = list(arguments)
+        ready_at = time.monotonic() + self.workstation.command_duration(command, args)
+        result = self.workstation.execute(command, args)
+
+        command_id = f"cmd-{next(self._ids)}"
+        with self._lock:
+            self._commands[command_id] = (ready_at, result)
+        return command_id
+
+    def _raw_get_command_output(self, shell_id: str, command_id: str) -> Tuple[bytes, bytes, int, bool]:
+        self.workstation.round_trip()
+        with self._lock:
+            ready_at, (status_code, stdout, stderr) = self._commands[command_id]
+
+        remaining = ready_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, self.operation_timeout))
+            if remaining > self.operation_timeout:
+                raise WinRMOperationTimeoutError()
+
+        return stdout.encode('utf-8'), stderr.encode('utf-8'), status_code, True
+
+    def get_command_output(self, shell_id: str, command_id: str) -> Tuple[bytes, bytes, int]:
+        while True:
+            try:
+                stdout, stderr, status_code, _ = self._raw_get_command_output(shell_id, command_id)
+                return stdout, stderr, status_code
+            except WinRMOperationTimeoutError:
+                continue
+
+    def cleanup_command(self, shell_id: str, command_id: str) -> None:
+        self.workstation.round_trip()
+        with self._lock:
+            self._commands.pop(command_id, None)
+
+    @property
+    def open_shells(self) -> int:
+        """Количество открытых shell этой сессии."""
+        with self._lock:
+            return len(self._shells)
+
+
+class SimulatedSession:
+    """Аналог winrm.Session для симулируемой станции."""
+
+    def __init__(self, workstation: SimulatedWorkstation):
+        self.workstation = workstation
+        self.protocol = SimulatedProtocol(workstation)
+
+    def run_cmd(self, command: str, args: Iterable[str] = ()) -> ShellCommandResult:
+        """Выполнить команду разово: отдельный shell, как winrm.Session.run_cmd."""
+        shell_id = self.protocol.open_shell()
+        try:
+            command_id = self.protocol.run_command(shell_id, command, args)
+            stdout, stderr, status_code = self.protocol.get_command_output(shell_id, command_id)
+            self.protocol.cleanup_command(shell_id, command_id)
+        finally:
+            self.protocol.close_shell(shell_id)
+        return ShellCommandResult(status_code, stdout, stderr)
+
+    def run_ps(self, script: str) -> ShellCommandResult:
+        """Выполнить PowerShell скрипт через -EncodedCommand."""
+        encoded = base64.b64encode(script.encode('utf_16_le')).decode('ascii')
+        return self.run_cmd(f'powershell -encodedcommand {encoded}')
+
+    def close(self) -> None:
+        """Закрыть сессию (HTTP соединения у симулятора нет)."""
+
+
+class SimulatedFleet:
+    """Парк симулируемых станций с фабрикой сессий для менеджеров."""
+
+    def __init__(self, workstations: int = 1, emulators: int = 0, running: int = 0,
+                 seed: Optional[int] = None, prefix: str = "sim_ws", **profile: Any):
+        """Инициализация парка.
+
+        Args:
+            workstations: Количество станций
+            emulators: Эмуляторов на станции
+            running: Запущенных эмуляторов на станции
+            seed: Базовый seed (станция i получает seed + i)
+            prefix: Префикс ID станций
+            **profile: Параметры SimulatedWorkstation (latency, jitter, failure_rate, ...)
+        """
+        self.workstations: Dict[str, SimulatedWorkstation] = {}
+        self._addresses: Dict[str, str] = {}
+
+        for i in range(workstations):
+            ws_id = f"{prefix}_{i:03d}"
+            self.workstations[ws_id] = SimulatedWorkstation(
+                ws_id, emulators, running,
+                seed=None if seed is None else seed + i,
+                **profile
+            )
+            self._addresses[f"10.0.{i // 250}.{i % 250 + 1}"] = ws_id
+
+    def configs(self) -> List[WorkstationConfig]:
+        """Конфигурации станций парка.
+
+        Returns:
+            List[WorkstationConfig]: По одной конфигурации на станцию
+        """
+        return [
+            WorkstationConfig(id=ws_id, name=ws_id, ip_address=address)
+            for address, ws_id in self._addresses.items()
+        ]
+
+    def session_factory(self, target: Union[WorkstationConfig, str]) -> SimulatedSession:
+        """Создать сессию к станции парка.
+
+        Подходит как session_factory для WorkstationManager, ConnectionPool
+        и RemoteLDPlayerScanner.
+
+        Args:
+            target: Конфигурация станции, ее ID или IP адрес
+
+        Returns:
+            SimulatedSession: Новая сессия
+
+        Raises:
+            ConnectionError: Станция не входит в парк
+        """
+        key = getattr(target, 'id', target)
+        ws_id = key if key in self.workstations else self._addresses.get(getattr(target, 'ip_address', key))
+        if ws_id is None:
+            raise ConnectionError(f"Симулятор: неизвестная станция {key}")
+        return self.workstations[ws_id].session()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Счетчики запросов по станциям.
+
+        Returns:
+            Dict[str, Dict[str, int]]: ID станции -> счетчики
+        """
+        return {ws_id: dict(workstation.stats) for ws_id, workstation in self.workstations.items()}
+
+
+def _is_ldconsole(command: str) -> bool:
+    """Является ли команда вызовом ldconsole.exe."""
+    return ntpath.basename(command).lower() in LDCONSOLE_NAMES
+
+
+def _parse_params(args: List[str]) -> Dict[str, str]:
+    """Разобрать параметры --key value."""
+    params: Dict[str, str] = {}
+    key = None
+    for arg in args:
+        if arg.startswith('--'):
+            key = arg[2:]
+            params[key] = ''
+        elif key is not None:
+            params[key] = arg
+            key = None
+    return params
+
+
+def _lines(values: Iterable[str]) -> str:
+    """Вывод консоли Windows: строки с CRLF."""
+    return ''.join(f'{value}\r\n' for value in values)
+
+
+def _not_found() -> Tuple[int, str, str]:
+    """Ответ ldconsole на несуществующий эмулятор."""
+    return 1, "player don't exist!\r\n", ''
@@ -6,17 +6,21 @@
 """
 
 import asyncio
+import functools
 import json
 import os
 import subprocess
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Retry mechanism
 try:
-    from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+    from tenacity import retry, stop_after_attempt, wait_exponential
     TENACITY_AVAILABLE = True
 except ImportError:
     TENACITY_AVAILABLE = False
@@ -26,7 +30,7 @@ except ImportError:
         def decorator(func):
             return func
         return decorator
-    stop_after_attempt = wait_exponential = retry_if_exception_type = lambda x: x
+    stop_after_attempt = wait_exponential = lambda x: x
 
 try:
     import winrm
@@ -42,30 +46,183 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     print("psutil не установлен. Локальный мониторинг недоступен.")
 
-from ..core.models import Workstation as WorkstationModel, WorkstationStatus, Emulator, EmulatorStatus
+from ..core.models import Workstation as WorkstationModel, WorkstationStatus, Emulator, EmulatorStatus, OperationType
 from ..core.config import WorkstationConfig
-from ..utils.error_handler import with_circuit_breaker, ErrorCategory
+from ..core.events import get_event_bus
+from ..core.history import HistoryStore, get_history_store
+from ..core.inventory import get_inventory
+from ..utils.error_handler import with_circuit_breaker, CircuitOpenError, ErrorCategory
+from ..utils.retry_budget import get_retry_budgets
+from .latency import LatencyTracker
+from .ldconsole_parser import LDConsoleParseError, List2Record, parse_list2, parse_list2_line
+from .reconciler import ListReconciler
+from .protocols import WinRMShell
+from .session_pool import SessionPool
+
+
+# Ошибки, после которых команду имеет смысл повторить
+RETRYABLE_ERRORS = (ConnectionError, TimeoutError, OSError)
+
+# Пауза перед повтором команды: 2, 4, 8, 10 секунд
+_RETRY_WAIT = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _record_first_attempt(retry_state) -> None:
+    """Пополнить бюджет повторов первой попыткой команды (tenacity before)."""
+    if retry_state.attempt_number == 1:
+        get_retry_budgets().record_attempt(retry_state.args[0].config.id)
+
+
+def _retry_within_budget(retry_state) -> bool:
+    """Повторять сетевые ошибки, пока позволяет бюджет станции и парка (tenacity retry).
+
+    Команда с deadline (run_command_async) не повторяется, если пауза
+    перед повтором закончится после того, как вызывающий перестал ждать.
+    """
+    outcome = retry_state.outcome
+    if not outcome.failed or not isinstance(outcome.exception(), RETRYABLE_ERRORS):
+        return False
+    deadline = retry_state.kwargs.get('deadline')
+    if deadline is not None and time.monotonic() + _RETRY_WAIT(retry_state) >= deadline:
+        return False
+    return get_retry_budgets().try_retry(retry_state.args[0].config.id)
+
+
+# Телеметрия станции одним запросом: загрузка CPU, память (КБ), системный диск (байты)
+# и количество процессов LDPlayer
+_TELEMETRY_SCRIPT = (
+    "$os = Get-CimInstance Win32_OperatingSystem; "
+    "$disk = Get-CimInstance Win32_LogicalDisk -Filter \"DeviceID='$env:SystemDrive'\"; "
+    "@{"
+    "cpu = (Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average; "
+    "memory_total = $os.TotalVisibleMemorySize; memory_free = $os.FreePhysicalMemory; "
+    "disk_total = $disk.Size; disk_free = $disk.FreeSpace; "
+    "ldplayer = @(Get-Process | Where-Object {$_.ProcessName -like '*ld*'}).Count"
+    "} | ConvertTo-Json -Compress"
+)
+
+
+def _parse_telemetry(output: str) -> Dict[str, Any]:
+    """Разобрать вывод _TELEMETRY_SCRIPT.
+
+    Args:
+        output: JSON объект, напечатанный скриптом
+
+    Returns:
+        Dict[str, Any]: cpu_usage, memory_usage, disk_usage (проценты) и
+        ldplayer_processes; неизмеренные значения отсутствуют
+    """
+    try:
+        data = json.loads(output)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    def used_percent(total: Any, free: Any) -> Optional[float]:
+        try:
+            total, free = float(total), float(free)
+        except (TypeError, ValueError):
+            return None
+        return round((total - free) / total * 100.0, 1) if total > 0 else None
+
+    info: Dict[str, Any] = {}
+    if isinstance(data.get('cpu'), (int, float)):
+        info['cpu_usage'] = float(data['cpu'])
+    memory = used_percent(data.get('memory_total'), data.get('memory_free'))
+    if memory is not None:
+        info['memory_usage'] = memory
+    disk = used_percent(data.get('disk_total'), data.get('disk_free'))
+    if disk is not None:
+        info['disk_usage'] = disk
+    if isinstance(data.get('ldplayer'), int):
+        info['ldplayer_processes'] = data['ldplayer']
+    return info
+
+
+@dataclass
+class EmulatorListSnapshot:
+    """Список эмуляторов станции с возрастом данных."""
+    emulators: List[Emulator]
+    age: Optional[float]  # секунды с последнего успешного list2 (None - данных нет)
+    stale: bool  # старше TTL кэша: обновление идет в фоне или станция недоступна
+    verified: bool  # False - кэш исправлен результатом операции и еще не проверен
+    version: int
+    last_error: Optional[str] = None
 
 
 class WorkstationManager:
     """Менеджер для управления удаленными рабочими станциями."""
 
-    def __init__(self, config: WorkstationConfig):
+    def __init__(self, config: WorkstationConfig,
+                 session_factory: Optional[Callable[[WorkstationConfig], Any]] = None):
         """Инициализация менеджера рабочей станции.
 
         Args:
             config: Конфигурация рабочей станции
+            session_factory: Фабрика WinRM сессий (по умолчанию winrm.Session)
         """
         self.config = config
         self._winrm_session: Optional[winrm.Session] = None
+        self._session_factory = session_factory
         self._last_connection_attempt: Optional[datetime] = None
         self._connection_errors: int = 0
         self._max_connection_errors: int = 3
 
-        # Кэш данных
+        # Кэш данных (stale-while-revalidate): список старше TTL отдается
+        # сразу и обновляется в фоне, а при недоступной станции отдается
+        # до max_staleness, после чего чтение снова ждет list2.
         self._emulators_cache: Optional[List[Emulator]] = None
         self._cache_timestamp: Optional[datetime] = None
-        self._cache_ttl: int = 30  # секунды
+        self._cache_ttl: float = getattr(config, 'emulators_cache_ttl', 30)
+        self._max_staleness: float = max(self._cache_ttl, getattr(config, 'emulators_max_staleness', 300))
+        self._last_refresh_error: Optional[str] = None
+
+        # Single-flight для list2: пока запрос списка выполняется,
+        # остальные вызывающие ждут тот же результат, а не шлют свой list2.
+        self._emulators_flight: Optional[Future] = None
+        self._emulators_lock = threading.RLock()
+        self._emulators_stats: Dict[str, int] = {
+            'hits': 0, 'coalesced': 0, 'remote_calls': 0, 'patches': 0, 'verifications': 0,
+            'stale_served': 0, 'background_refreshes': 0, 'refresh_failures': 0
+        }
+
+        # Результат операции известен заранее: кэш правится на месте
+        # (оптимистичное состояние), а list2 выполняется лениво в фоне
+        # при следующем чтении, когда серия изменений закончилась.
+        # Версия растет при каждом изменении кэша.
+        self._cache_version: int = 0
+        self._cache_verified: bool = True
+        self._last_patch: float = 0.0
+        self._verify_delay: float = 5.0
+
+        # Сверка снимков list2: разбираются только измененные строки,
+        # реестр и подписчики шины получают только изменения.
+        self._reconciler = ListReconciler(config.id, self._parse_list2_line)
+
+        # Ограниченный пул потоков для блокирующих WinRM вызовов.
+        # Один зависший хост занимает только свои потоки и не блокирует event loop.
+        self._max_concurrent_commands: int = max(1, getattr(config, 'max_concurrent_commands', 4))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # Пул долгоживущих shell: команды не платят за open/close shell,
+        # а параллельные команды на одной станции идут по разным сессиям.
+        # Пока станция недавно успешно отвечала, проверка подключения не нужна.
+        self._shell_pool: Optional[SessionPool[WinRMShell]] = None
+        self._shell_pool_lock = threading.Lock()
+        self._primary_session_pooled: bool = False
+        self._shell_stats: Dict[str, Any] = WinRMShell.empty_stats()
+        self._last_command_ok: float = 0.0
+        self._shell_probe_interval: float = 30.0
+
+        # Таймауты команд подстраиваются под наблюдаемые задержки станции:
+        # быстрый хост быстрее признается зависшим, медленный не обрезается.
+        self._latency = LatencyTracker(
+            multiplier=getattr(config, 'timeout_multiplier', 3.0),
+            min_timeout=getattr(config, 'min_command_timeout', 5.0),
+            max_timeout=getattr(config, 'max_command_timeout', 600.0)
+        )
 
     @property
     def is_connected(self) -> bool:
@@ -77,13 +234,148 @@ class WorkstationManager:
         if self._winrm_session is None:
             return False
 
+        if time.monotonic() - self._last_command_ok < self._shell_probe_interval:
+            return True
+
         try:
             # Простая проверка подключения
-            self._winrm_session.run_cmd('echo', ['test'])
+            with self._get_shell_pool().lease() as shell:
+                shell.run_cmd('echo', ['test'], timeout=self.get_command_timeout('echo'))
+            self._last_command_ok = time.monotonic()
             return True
         except Exception:
             return False
 
+    def _create_session(self) -> Any:
+        """Создать новую WinRM сессию к рабочей станции.
+
+        Returns:
+            winrm.Session: Новая сессия
+
+        Raises:
+            ConnectionError: Если PyWinRM недоступен и фабрика не задана
+        """
+        if self._session_factory is not None:
+            return self._session_factory(self.config)
+
+        if not WINRM_AVAILABLE:
+            raise ConnectionError(f"PyWinRM недоступен для станции {self.config.name}")
+
+        endpoint = f"http://{self.config.ip_address}:{self.config.winrm_port}/wsman"
+
+        if self.config.domain:
+            # Доменная аутентификация
+            return winrm.Session(
+                endpoint,
+                auth=(f"{self.config.domain}\\{self.config.username}", self.config.password)
+            )
+
+        # Локальная аутентификация
+        return winrm.Session(
+            endpoint,
+            auth=(self.config.username, self.config.password)
+        )
+
+    def _new_pooled_shell(self) -> WinRMShell:
+        """Создать shell для пула (фабрика SessionPool).
+
+        Первый shell использует основную сессию, остальные - собственные.
+        """
+        with self._shell_pool_lock:
+            use_primary = not self._primary_session_pooled
+            self._primary_session_pooled = True
+
+        session = self._winrm_session if use_primary else self._create_session()
+        return WinRMShell(session, stats=self._shell_stats)
+
+    def _get_shell_pool(self) -> SessionPool[WinRMShell]:
+        """Получить (лениво создать) пул shell рабочей станции.
+
+        Returns:
+            SessionPool[WinRMShell]: Пул shell
+        """
+        with self._shell_pool_lock:
+            if self._shell_pool is None:
+                self._shell_pool = SessionPool(
+                    name=self.config.id,
+                    factory=self._new_pooled_shell,
+                    min_size=getattr(self.config, 'min_sessions', 1),
+                    max_size=getattr(self.config, 'max_sessions', 4),
+                    idle_timeout=getattr(self.config, 'session_idle_timeout', 300),
+                    probe=lambda shell: shell.run_cmd(
+                        'echo', ['test'], timeout=self.get_command_timeout('echo')
+                    ).status_code == 0,
+                    closer=WinRMShell.close,
+                    discard_on=(OSError,)
+                )
+            return self._shell_pool
+
+    def _close_shell_pool(self) -> None:
+        """Закрыть пул shell и все свободные shell."""
+        with self._shell_pool_lock:
+            pool, self._shell_pool = self._shell_pool, None
+            self._primary_session_pooled = False
+            self._last_command_ok = 0.0
+
+        if pool is not None:
+            pool.close()
+
+    def maintain_sessions(self) -> Dict[str, int]:
+        """Проверить свободные сессии, вытеснить простаивающие (блокирующий вызов).
+
+        Returns:
+            Dict[str, int]: Результат обслуживания пула
+        """
+        if self._shell_pool is None or self._winrm_session is None:
+            return {'probed': 0, 'closed': 0, 'created': 0}
+        return self._shell_pool.maintain()
+
+    def get_shell_stats(self) -> Dict[str, Any]:
+        """Получить статистику переиспользования WinRM shell.
+
+        Returns:
+            Dict[str, Any]: Счетчики shell за время работы менеджера
+        """
+        stats = dict(self._shell_stats)
+        stats['handshake_seconds_saved'] = round(stats['handshake_seconds_saved'], 3)
+        return stats
+
+    def _latency_key(self, command: str, args: Optional[List[str]] = None) -> str:
+        """Ключ действия для учета задержек (ldconsole:<действие> или имя команды)."""
+        if command == self.config.ldconsole_path:
+            return f"ldconsole:{args[0]}" if args else "ldconsole"
+        name = command.replace('\\', '/').rsplit('/', 1)[-1]
+        return name.split(' ', 1)[0].lower()
+
+    def get_command_timeout(self, command: str, args: Optional[List[str]] = None) -> float:
+        """Рассчитать таймаут команды по наблюдаемым задержкам станции.
+
+        Args:
+            command: Команда
+            args: Аргументы команды
+
+        Returns:
+            float: Таймаут в секундах (множитель * p99, в границах конфигурации)
+        """
+        default = 60 if command == self.config.ldconsole_path else 30
+        return self._latency.timeout_for(self._latency_key(command, args), default)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Получить выученные задержки и таймауты команд станции.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Действие -> EWMA, p99, таймаут и счетчики
+        """
+        return self._latency.get_stats()
+
+    def get_session_pool_stats(self) -> Dict[str, Any]:
+        """Получить статистику пула сессий.
+
+        Returns:
+            Dict[str, Any]: Статистика пула (пустая если пул не создан)
+        """
+        return self._shell_pool.get_stats() if self._shell_pool else {}
+
     @with_circuit_breaker(ErrorCategory.NETWORK, operation_name="Connect to workstation")
     def connect(self) -> bool:
         """Подключиться к рабочей станции.
@@ -99,30 +391,20 @@ class WorkstationManager:
         self._last_connection_attempt = datetime.now()
 
         try:
-            if not WINRM_AVAILABLE:
+            if not WINRM_AVAILABLE and self._session_factory is None:
                 print(f"PyWinRM недоступен для станции {self.config.name}")
                 return False
 
             # Создание сессии WinRM
-            endpoint = f"http://{self.config.ip_address}:{self.config.winrm_port}/wsman"
+            self._close_shell_pool()
+            self._winrm_session = self._create_session()
 
-            if self.config.domain:
-                # Доменная аутентификация
-                self._winrm_session = winrm.Session(
-                    endpoint,
-                    auth=(f"{self.config.domain}\\{self.config.username}", self.config.password)
-                )
-            else:
-                # Локальная аутентификация
-                self._winrm_session = winrm.Session(
-                    endpoint,
-                    auth=(self.config.username, self.config.password)
-                )
-
-            # Тест подключения
-            result = self._winrm_session.run_cmd('echo', ['test'])
+            # Тест подключения (открывает shell для последующих команд)
+            with self._get_shell_pool().lease() as shell:
+                result = shell.run_cmd('echo', ['test'], timeout=self.get_command_timeout('echo'))
             if result.status_code == 0:
                 self._connection_errors = 0
+                self._last_command_ok = time.monotonic()
                 self.config.status = WorkstationStatus.ONLINE
                 self.config.last_seen = datetime.now()
                 return True
@@ -138,6 +420,7 @@ class WorkstationManager:
 
     def disconnect(self) -> None:
         """Отключиться от рабочей станции."""
+        self._close_shell_pool()
         if self._winrm_session:
             try:
                 self._winrm_session.close()
@@ -147,20 +430,82 @@ class WorkstationManager:
                 self._winrm_session = None
 
         self.config.status = WorkstationStatus.OFFLINE
+        self.shutdown_executor()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Получить (лениво создать) пул потоков рабочей станции.
+
+        Returns:
+            ThreadPoolExecutor: Пул с ограниченным числом потоков
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_concurrent_commands,
+                    thread_name_prefix=f"ws-{self.config.id}"
+                )
+            return self._executor
+
+    def shutdown_executor(self) -> None:
+        """Остановить пул потоков, отменив ещё не начатые команды."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run_in_executor(self, func: Callable[..., Any], *args,
+                              timeout: Optional[float] = None) -> Any:
+        """Выполнить блокирующий вызов в пуле потоков рабочей станции.
+
+        Args:
+            func: Блокирующая функция
+            *args: Аргументы функции
+            timeout: Таймаут ожидания в секундах (None - без ограничения)
+
+        Returns:
+            Any: Результат функции
+
+        Raises:
+            TimeoutError: Если вызов не завершился за timeout
+
+        Note:
+            При отмене или таймауте ещё не начатый вызов снимается с очереди.
+            Уже выполняющийся поток WinRM нельзя прервать - он завершится сам,
+            но ожидающая корутина освобождается сразу.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+        if timeout is None:
+            return await future
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Превышен таймаут ({timeout}s) на станции {self.config.name}"
+            ) from None
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError, OSError)),
+        wait=_RETRY_WAIT,
+        retry=_retry_within_budget,
+        before=_record_first_attempt,
         reraise=True
     )
-    def run_command(self, command: str, args: List[str] = None, timeout: int = 30) -> Tuple[int, str, str]:
+    def run_command(self, command: str, args: List[str] = None,
+                    timeout: Optional[float] = None,
+                    deadline: Optional[float] = None) -> Tuple[int, str, str]:
         """Выполнить команду на удаленной рабочей станции.
 
         Args:
             command: Команда для выполнения
             args: Аргументы команды
-            timeout: Таймаут выполнения команды в секундах (default: 30)
+            timeout: Таймаут выполнения команды в секундах
+                (None - адаптивный, см. get_command_timeout)
+            deadline: Момент time.monotonic(), после которого результат
+                не нужен: попытка укладывается в него, повторы прекращаются
 
         Returns:
             Tuple[int, str, str]: (код возврата, stdout, stderr)
@@ -172,16 +517,40 @@ class WorkstationManager:
         if not self.is_connected and not self.connect():
             raise ConnectionError("Не удалось подключиться к рабочей станции")
 
+        args = args or []
+        key = self._latency_key(command, args)
+        if timeout is None:
+            timeout = self.get_command_timeout(command, args)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Истек срок ожидания команды {key} на станции {self.config.name}")
+            timeout = min(timeout, remaining)
+
         try:
-            args = args or []
-            # Используем timeout если WinRM поддерживает
-            result = self._winrm_session.run_cmd(command, args)
+            # Команда идет через долгоживущий shell без open/close на каждый вызов
+            with self._get_shell_pool().lease(timeout=timeout) as shell:
+                started = time.monotonic()
+                try:
+                    result = shell.run_cmd(command, args, timeout=timeout)
+                except TimeoutError:
+                    self._latency.record_timeout(key, timeout)
+                    raise
+                self._latency.record(key, time.monotonic() - started)
+            self._last_command_ok = time.monotonic()
 
             stdout = result.std_out.decode('utf-8', errors='ignore') if result.std_out else ""
             stderr = result.std_err.decode('utf-8', errors='ignore') if result.std_err else ""
 
             return result.status_code, stdout, stderr
 
+        except TimeoutError as e:
+            self._connection_errors += 1
+            learned = self._latency.get_stats().get(key, {})
+            raise TimeoutError(
+                f"Команда {key} превысила timeout ({timeout:.1f}s, "
+                f"p99 {learned.get('p99_ms', 0)}ms, EWMA {learned.get('ewma_ms', 0)}ms): {e}"
+            )
         except Exception as e:
             self._connection_errors += 1
             # Преобразуем в типы для retry
@@ -193,22 +562,37 @@ class WorkstationManager:
                 raise OSError(f"Ошибка выполнения команды: {e}")
 
     @with_circuit_breaker(ErrorCategory.EXTERNAL, operation_name="Run LDConsole command")
-    def run_ldconsole_command(self, action: str, emulator_name: str = None, timeout: int = 60, **kwargs) -> Tuple[int, str, str]:
+    def run_ldconsole_command(self, action: str, emulator_name: str = None,
+                              timeout: Optional[float] = None, **kwargs) -> Tuple[int, str, str]:
         """Выполнить команду ldconsole.exe на удаленной станции.
 
         Args:
             action: Действие (add, remove, launch, quit, list, etc.)
             emulator_name: Имя эмулятора (если требуется)
-            timeout: Таймаут выполнения команды в секундах (default: 60)
+            timeout: Таймаут выполнения команды в секундах (None - адаптивный)
             **kwargs: Дополнительные параметры
 
         Returns:
             Tuple[int, str, str]: (код возврата, stdout, stderr)
         
         Note:
-            Retry механизм наследуется от run_command (3 попытки с экспоненциальной задержкой)
+            Retry механизм наследуется от run_command (до 3 попыток с экспоненциальной
+            задержкой в пределах бюджета повторов)
+        """
+        cmd_args = self._build_ldconsole_args(action, emulator_name, **kwargs)
+        return self.run_command(self.config.ldconsole_path, cmd_args, timeout=timeout)
+
+    def _build_ldconsole_args(self, action: str, emulator_name: str = None, **kwargs) -> List[str]:
+        """Собрать аргументы командной строки ldconsole.exe.
+
+        Args:
+            action: Действие (add, remove, launch, quit, list, etc.)
+            emulator_name: Имя эмулятора (если требуется)
+            **kwargs: Дополнительные параметры
+
+        Returns:
+            List[str]: Аргументы команды
         """
-        # Подготовка команды
         cmd_args = [action]
 
         if emulator_name:
@@ -219,41 +603,465 @@ class WorkstationManager:
             if value is not None:
                 cmd_args.extend([f'--{key}', str(value)])
 
-        return self.run_command(self.config.ldconsole_path, cmd_args, timeout=timeout)
+        return cmd_args
 
-    @with_circuit_breaker(ErrorCategory.EXTERNAL, operation_name="Get emulators list")
-    def get_emulators_list(self) -> List[Emulator]:
-        """Получить список эмуляторов на рабочей станции.
+    async def run_command_async(self, command: str, args: List[str] = None,
+                                timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Асинхронно выполнить команду на удаленной рабочей станции.
+
+        Команда выполняется в ограниченном пуле потоков станции,
+        поэтому медленный хост не блокирует event loop. Повторы run_command
+        укладываются в timeout: после того как вызывающий перестал ждать,
+        поток пула команду не повторяет.
+
+        Args:
+            command: Команда для выполнения
+            args: Аргументы команды
+            timeout: Таймаут выполнения команды в секундах (None - адаптивный)
 
         Returns:
-            List[Emulator]: Список эмуляторов
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+
+        Raises:
+            ConnectionError: Если не удалось подключиться
+            TimeoutError: Если команда выполнялась дольше timeout
+        """
+        if timeout is None:
+            timeout = self.get_command_timeout(command, args)
+        return await self.run_in_executor(
+            functools.partial(self.run_command, command, args, timeout,
+                              deadline=time.monotonic() + timeout),
+            timeout=timeout
+        )
+
+    @with_circuit_breaker(ErrorCategory.EXTERNAL, operation_name="Run LDConsole command")
+    async def run_ldconsole_command_async(self, action: str, emulator_name: str = None,
+                                          timeout: Optional[float] = None, **kwargs) -> Tuple[int, str, str]:
+        """Асинхронно выполнить команду ldconsole.exe на удаленной станции.
+
+        Args:
+            action: Действие (add, remove, launch, quit, list, etc.)
+            emulator_name: Имя эмулятора (если требуется)
+            timeout: Таймаут выполнения команды в секундах (None - адаптивный)
+            **kwargs: Дополнительные параметры
+
+        Returns:
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+        """
+        cmd_args = self._build_ldconsole_args(action, emulator_name, **kwargs)
+        return await self.run_command_async(self.config.ldconsole_path, cmd_args, timeout=timeout)
+
+    def run_powershell(self, script: str) -> Tuple[int, str, str]:
+        """Выполнить PowerShell скрипт на удаленной рабочей станции.
+
+        Скрипт передается через -EncodedCommand, поэтому его длина
+        ограничена длиной командной строки Windows (~8191 символ).
+
+        Args:
+            script: Текст скрипта
+
+        Returns:
+            Tuple[int, str, str]: (код возврата, stdout, stderr)
+
+        Raises:
+            ConnectionError: Если не удалось подключиться
+        """
+        if not self.is_connected and not self.connect():
+            raise ConnectionError("Не удалось подключиться к рабочей станции")
+
+        try:
+            with self._get_shell_pool().lease() as shell:
+                result = shell.run_ps(script)
+            self._last_command_ok = time.monotonic()
+        except Exception as e:
+            self._connection_errors += 1
+            raise ConnectionError(f"Ошибка выполнения скрипта: {e}")
+
+        stdout = result.std_out.decode('utf-8', errors='ignore') if result.std_out else ""
+        stderr = result.std_err.decode('utf-8', errors='ignore') if result.std_err else ""
+
+        return result.status_code, stdout, stderr
+
+    async def check_connection_async(self, timeout: float = 10) -> bool:
+        """Асинхронно проверить подключение к рабочей станции.
+
+        Args:
+            timeout: Таймаут проверки в секундах
+
+        Returns:
+            bool: True если подключение активно
         """
-        # Проверка кэша
-        if (self._emulators_cache and self._cache_timestamp and
-            datetime.now() - self._cache_timestamp < timedelta(seconds=self._cache_ttl)):
+        try:
+            return await self.run_in_executor(lambda: self.is_connected, timeout=timeout)
+        except TimeoutError:
+            return False
+
+    def _cache_age(self) -> Optional[float]:
+        """Возраст кэша списка эмуляторов в секундах (None - кэша нет)."""
+        if self._emulators_cache is None or self._cache_timestamp is None:
+            return None
+        return (datetime.now() - self._cache_timestamp).total_seconds()
+
+    def _get_cached_emulators(self) -> Optional[List[Emulator]]:
+        """Вернуть список эмуляторов из кэша, если он не старше max_staleness."""
+        age = self._cache_age()
+        if age is not None and age < self._max_staleness:
             return self._emulators_cache
+        return None
+
+    def _invalidate_emulators_cache(self) -> None:
+        """Сбросить кэш списка эмуляторов после изменения на станции.
+
+        Запрос list2, начатый до изменения, дожидается своего результата,
+        но не попадает в кэш - следующий вызов выполнит свежий запрос.
+        """
+        with self._emulators_lock:
+            self._emulators_cache = None
+            self._emulators_flight = None
+            self._cache_version += 1
+
+    def apply_emulator_result(self, operation: OperationType, name: str, **details: Any) -> None:
+        """Отразить успешную операцию в кэше и реестре без запроса list2.
+
+        Кэш становится оптимистичным: следующее чтение после паузы
+        в изменениях запускает фоновую проверку list2.
+
+        Args:
+            operation: Тип выполненной операции
+            name: Имя эмулятора
+            **details: new_name для RENAME, params (параметры modify) для MODIFY
+        """
+        inventory = get_inventory()
+        workstation_id = self.config.id
+
+        with self._emulators_lock:
+            cache = self._emulators_cache
+            cached = next((emu for emu in cache if emu.name == name), None) if cache else None
+
+            if operation == OperationType.CREATE:
+                emulator = Emulator(
+                    id=f"{workstation_id}_{name}",
+                    name=name,
+                    workstation_id=workstation_id,
+                    status=EmulatorStatus.STOPPED
+                )
+                inventory.upsert(emulator)
+                if cache is not None and cached is None:
+                    self._emulators_cache = cache + [emulator]
+            elif operation == OperationType.DELETE:
+                inventory.remove(workstation_id, name)
+                if cached is not None:
+                    self._emulators_cache = [emu for emu in cache if emu is not cached]
+            elif operation == OperationType.RENAME:
+                new_name = details['new_name']
+                inventory.rename(workstation_id, name, new_name)
+                if cached is not None:
+                    cached.name = new_name
+                    cached.id = f"{workstation_id}_{new_name}"
+            elif operation in (OperationType.START, OperationType.STOP):
+                status = EmulatorStatus.RUNNING if operation == OperationType.START else EmulatorStatus.STOPPED
+                inventory.set_status(workstation_id, name, status)
+                if cached is not None:
+                    cached.status = status
+            elif operation == OperationType.MODIFY:
+                for emulator in {id(emu): emu for emu in (cached, inventory.find(workstation_id, name)) if emu}.values():
+                    self._apply_modify_params(emulator, details.get('params', {}))
+
+            self._emulators_stats['patches'] += 1
+            self.mark_emulators_unverified()
+
+    def mark_emulators_unverified(self) -> None:
+        """Пометить кэш как оптимистичный после изменения на станции.
+
+        Кэш остается доступным, следующее чтение после паузы в изменениях
+        запускает фоновую проверку list2.
+        """
+        with self._emulators_lock:
+            # Начатый до изменения list2 не должен перезаписать исправленный кэш
+            self._emulators_flight = None
+            self._cache_version += 1
+            self._cache_verified = False
+            self._last_patch = time.monotonic()
+
+    @staticmethod
+    def _apply_modify_params(emulator: Emulator, params: Dict[str, Any]) -> None:
+        """Перенести параметры modify в конфигурацию эмулятора."""
+        config = emulator.config
+        if 'resolution' in params:
+            parts = str(params['resolution']).split(',')
+            if len(parts) >= 3 and parts[2].strip().isdigit():
+                config.screen_size = f"{parts[0].strip()}x{parts[1].strip()}"
+                config.dpi = int(parts[2])
+        if 'cpu' in params:
+            config.cpu_cores = int(params['cpu'])
+        if 'memory' in params:
+            config.memory_mb = int(params['memory'])
+
+    def get_emulators_cache_version(self) -> Tuple[int, bool]:
+        """Получить версию кэша списка эмуляторов.
+
+        Returns:
+            Tuple[int, bool]: (версия, True если состояние подтверждено list2)
+        """
+        with self._emulators_lock:
+            return self._cache_version, self._cache_verified
+
+    def _join_emulators_flight(self) -> Tuple[Optional[List[Emulator]], Optional[Future], bool]:
+        """Вернуть кэш или присоединиться к выполняющемуся запросу list2.
+
+        Устаревший (старше TTL) и оптимистичный кэш отдаются сразу,
+        а обновление list2 запускается в фоне - одно на станцию.
+
+        Returns:
+            Tuple: (список из кэша, future запроса, True если вызывающий должен выполнить запрос)
+        """
+        verify: Optional[Future] = None
+        with self._emulators_lock:
+            cached = self._get_cached_emulators()
+            if cached is not None:
+                self._emulators_stats['hits'] += 1
+                stale = self._cache_age() >= self._cache_ttl
+                if stale:
+                    self._emulators_stats['stale_served'] += 1
+                unverified = (not self._cache_verified and
+                              time.monotonic() - self._last_patch >= self._verify_delay)
+                if self._emulators_flight is None and (stale or unverified):
+                    verify = Future()
+                    self._emulators_flight = verify
+                    self._emulators_stats['remote_calls'] += 1
+                    self._emulators_stats['background_refreshes' if stale else 'verifications'] += 1
+            elif self._emulators_flight is not None:
+                self._emulators_stats['coalesced'] += 1
+                return None, self._emulators_flight, False
+            else:
+                flight = Future()
+                self._emulators_flight = flight
+                self._emulators_stats['remote_calls'] += 1
+                return None, flight, True
+
+        if verify is not None:
+            self._start_emulators_flight(verify)
+        return cached, None, False
+
+    def _start_emulators_flight(self, flight: Future) -> None:
+        """Запустить общий запрос list2 в отдельном потоке.
+
+        Не в пуле станции: синхронные операции в пуле (start, stop, ...)
+        ждут этот запрос через find_emulator, и при занятых ими потоках
+        запрос из пула никогда бы не выполнился. Поток один на станцию -
+        запрос list2 выполняется не более одного одновременно.
+        """
+        threading.Thread(
+            target=self._run_emulators_flight, args=(flight,),
+            name=f"list2-{self.config.id}", daemon=True
+        ).start()
+
+    def _run_emulators_flight(self, flight: Future) -> None:
+        """Выполнить list2 и передать результат всем ожидающим (блокирующий вызов)."""
+        try:
+            output = self._fetch_list2_output()
+        except BaseException as e:
+            with self._emulators_lock:
+                if self._emulators_flight is flight:
+                    self._emulators_flight = None
+                # Кэш не сбрасывается: до max_staleness читатели получают прежний список
+                self._emulators_stats['refresh_failures'] += 1
+                self._last_refresh_error = str(e) or type(e).__name__
+            flight.set_exception(e)
+            return
+
+        emulators: Optional[List[Emulator]] = None
+        changes = []
+        error = "list2 завершился с ошибкой"
+        with self._emulators_lock:
+            current = self._emulators_flight is flight
+            if current:
+                self._emulators_flight = None
+
+            try:
+                if output is not None and current:
+                    emulators, changes = self._reconciler.reconcile(output)
+                elif output is not None:
+                    # Запрос начат до изменения на станции - его снимок не сверяется
+                    emulators = self._parse_emulators_list2(output)
+            except LDConsoleParseError as e:
+                # Частичный список удалил бы из реестра неразобранные эмуляторы
+                print(f"Ошибка парсинга списка эмуляторов: {e}")
+                output, error = None, str(e)
+
+            if output is None:
+                self._emulators_stats['refresh_failures'] += 1
+                self._last_refresh_error = error
+            elif current:
+                inventory = get_inventory()
+                if self._reconciler.stats['snapshots'] > 1 and inventory.has_workstation(self.config.id):
+                    inventory.apply_changes(self.config.id, changes)
+                else:
+                    # Первый снимок заменяет станцию целиком (и пустым списком)
+                    inventory.replace_workstation(self.config.id, emulators)
+                self._emulators_cache = emulators
+                self._cache_timestamp = datetime.now()
+                self._cache_version += 1
+                self._cache_verified = True
+                self._last_refresh_error = None
+
+        get_event_bus().publish(changes)
+        flight.set_result(emulators or [])
+
+    def _fetch_list2_output(self) -> Optional[str]:
+        """Выполнить list2 на станции без кэша и объединения запросов.
 
+        Returns:
+            Optional[str]: Вывод list2 (None при ошибке)
+        """
         try:
             # Выполнить команду list2 (расширенная информация)
             status_code, stdout, stderr = self.run_ldconsole_command('list2')
 
             if status_code != 0:
                 print(f"Ошибка получения списка эмуляторов: {stderr}")
-                return []
+                return None
+
+            return stdout
+
+        except CircuitOpenError:
+            # Станция недоступна - вызывающий получает быстрый отказ, а не пустой список
+            raise
+        except Exception as e:
+            print(f"Ошибка при получении списка эмуляторов: {e}")
+            return None
+
+    def get_emulators_list(self) -> List[Emulator]:
+        """Получить список эмуляторов на рабочей станции.
+
+        Одновременные вызовы при пустом кэше выполняют один запрос list2.
+        Список старше TTL отдается сразу и обновляется в фоне; при
+        недоступной станции прежний список отдается до max_staleness.
 
-            # Парсинг вывода команды list2
-            emulators = self._parse_emulators_list2(stdout)
+        Returns:
+            List[Emulator]: Список эмуляторов
+
+        Raises:
+            CircuitOpenError: Если circuit breaker станции открыт
+        """
+        cached, flight, leader = self._join_emulators_flight()
+        if cached is not None:
+            return cached
+
+        if leader:
+            self._run_emulators_flight(flight)
+        return flight.result()
+
+    async def get_emulators_list_async(self, timeout: float = 60) -> List[Emulator]:
+        """Асинхронно получить список эмуляторов на рабочей станции.
+
+        Одновременные вызовы (API и монитор) при пустом кэше ожидают
+        один общий запрос list2. Отмена одного ожидающего не прерывает
+        запрос для остальных.
+
+        Args:
+            timeout: Таймаут ожидания результата в секундах
 
-            # Обновить кэш
-            self._emulators_cache = emulators
-            self._cache_timestamp = datetime.now()
+        Returns:
+            List[Emulator]: Список эмуляторов
+
+        Raises:
+            CircuitOpenError: Если circuit breaker станции открыт
+        """
+        cached, flight, leader = self._join_emulators_flight()
+        if cached is not None:
+            return cached
 
-            return emulators
+        if leader:
+            self._start_emulators_flight(flight)
 
+        try:
+            # shield: таймаут или отмена ожидающего не отменяет общий запрос
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(flight)), timeout)
+        except (asyncio.CancelledError, CircuitOpenError):
+            raise
         except Exception as e:
             print(f"Ошибка при получении списка эмуляторов: {e}")
             return []
 
+    def get_emulators_cache_stats(self) -> Dict[str, Any]:
+        """Получить счетчики кэша и объединения запросов списка эмуляторов.
+
+        Returns:
+            Dict[str, Any]: hits, coalesced, remote_calls, patches, verifications, version, verified
+        """
+        with self._emulators_lock:
+            age = self._cache_age()
+            return {
+                **self._emulators_stats,
+                'version': self._cache_version,
+                'verified': self._cache_verified,
+                'age': age,
+                'stale': age is not None and age >= self._cache_ttl,
+            }
+
+    def _snapshot(self, emulators: Optional[List[Emulator]] = None) -> EmulatorListSnapshot:
+        """Состояние кэша для списка эмуляторов (None - текущий кэш)."""
+        with self._emulators_lock:
+            age = self._cache_age()
+            return EmulatorListSnapshot(
+                emulators=self._emulators_cache if emulators is None else emulators,
+                age=age,
+                stale=age is None or age >= self._cache_ttl,
+                verified=self._cache_verified,
+                version=self._cache_version,
+                last_error=self._last_refresh_error,
+            )
+
+    def _snapshot_of(self, emulators: List[Emulator], before: EmulatorListSnapshot) -> EmulatorListSnapshot:
+        """Снимок для прочитанного списка.
+
+        Если список отдан из кэша, а фоновое обновление уже заменило кэш,
+        возраст берется на момент чтения.
+        """
+        if emulators is before.emulators:
+            return before
+        return self._snapshot(emulators)
+
+    def get_emulators_snapshot(self) -> EmulatorListSnapshot:
+        """Получить список эмуляторов с возрастом и признаком устаревания.
+
+        Returns:
+            EmulatorListSnapshot: Список и состояние кэша
+        """
+        before = self._snapshot()
+        return self._snapshot_of(self.get_emulators_list(), before)
+
+    async def get_emulators_snapshot_async(self, timeout: float = 60) -> EmulatorListSnapshot:
+        """Асинхронно получить список эмуляторов с возрастом и признаком устаревания.
+
+        Args:
+            timeout: Таймаут ожидания результата в секундах
+
+        Returns:
+            EmulatorListSnapshot: Список и состояние кэша
+        """
+        before = self._snapshot()
+        return self._snapshot_of(await self.get_emulators_list_async(timeout), before)
+
+    def find_emulator(self, name: str) -> Optional[Emulator]:
+        """Найти эмулятор станции по имени.
+
+        Список обновляется через кэш list2, поиск идет по индексу
+        реестра парка без перебора списка.
+
+        Args:
+            name: Имя эмулятора
+
+        Returns:
+            Optional[Emulator]: Эмулятор или None
+        """
+        emulators = self.get_emulators_list()
+        inventory = get_inventory()
+        if emulators and not inventory.has_workstation(self.config.id):
+            inventory.replace_workstation(self.config.id, emulators)
+        return inventory.find(self.config.id, name)
+
     def _parse_emulators_list2(self, output: str) -> List[Emulator]:
         """Распарсить вывод команды list2.
 
@@ -262,54 +1070,34 @@ class WorkstationManager:
 
         Returns:
             List[Emulator]: Список эмуляторов
-            
-        Формат вывода list2:
-        index,name,topWindowHandle,vBoxWindowHandle,binderWindowHandle,width,height,resWidth,resHeight,dpi
-        Пример: 0,LDPlayer,0,0,0,-1,-1,960,540,160
+
+        Raises:
+            LDConsoleParseError: Если вывод содержит некорректную строку
         """
-        emulators = []
+        return [self._emulator_from_record(record) for record in parse_list2(output)]
 
-        try:
-            lines = output.strip().split('\n')
+    def _parse_list2_line(self, line: str) -> Emulator:
+        """Распарсить одну строку вывода list2.
 
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+        Args:
+            line: Строка list2 без пробелов по краям
 
-                # Парсинг CSV формата
-                parts = line.split(',')
-                
-                if len(parts) >= 10:
-                    try:
-                        index = int(parts[0])
-                        name = parts[1]
-                        top_handle = int(parts[2])
-                        vbox_handle = int(parts[3])
-                        binder_handle = int(parts[4])
-                        
-                        # Определить статус по наличию активных handle
-                        is_running = (top_handle != 0 or vbox_handle != 0 or binder_handle != 0)
-                        status = EmulatorStatus.RUNNING if is_running else EmulatorStatus.STOPPED
-                        
-                        # Создать объект эмулятора
-                        emulator = Emulator(
-                            id=f"{self.config.id}_{name}",
-                            name=name,
-                            workstation_id=self.config.id,
-                            status=status
-                        )
-
-                        emulators.append(emulator)
-                        
-                    except (ValueError, IndexError) as e:
-                        print(f"Ошибка парсинга строки '{line}': {e}")
-                        continue
+        Returns:
+            Emulator: Эмулятор
 
-        except Exception as e:
-            print(f"Ошибка парсинга списка эмуляторов: {e}")
+        Raises:
+            LDConsoleParseError: Если строка не соответствует формату list2
+        """
+        return self._emulator_from_record(parse_list2_line(line))
 
-        return emulators
+    def _emulator_from_record(self, record: List2Record) -> Emulator:
+        """Создать эмулятор станции из записи list2."""
+        return Emulator(
+            id=f"{self.config.id}_{record.name}",
+            name=record.name,
+            workstation_id=self.config.id,
+            status=EmulatorStatus.RUNNING if record.running else EmulatorStatus.STOPPED
+        )
 
     def _parse_status(self, status_str: str) -> EmulatorStatus:
         """Преобразовать строковый статус в enum.
@@ -359,17 +1147,16 @@ class WorkstationManager:
                 return False, f"Эмулятор создан, но не удалось получить его имя: {list_err}"
             
             # Парсинг последнего эмулятора
-            lines = list_out.strip().split('\n')
-            if not lines:
-                return False, "Эмулятор создан, но список пуст"
-            
-            last_line = lines[-1]
-            parts = last_line.split(',')
+            try:
+                records = parse_list2(list_out)
+            except LDConsoleParseError as e:
+                return False, f"Не удалось распарсить имя созданного эмулятора: {e}"
             
-            if len(parts) < 2:
-                return False, f"Не удалось распарсить имя созданного эмулятора: {last_line}"
+            if not records:
+                return False, "Эмулятор создан, но список пуст"
             
-            created_name = parts[1]
+            # Код возврата add - индекс созданного эмулятора
+            created_name = next((r.name for r in records if r.index == status_code), records[-1].name)
             
             # Шаг 3: Переименовать в нужное имя
             if created_name != name:
@@ -382,6 +1169,9 @@ class WorkstationManager:
                 if rename_code != 0:
                     return False, f"Эмулятор '{created_name}' создан, но не удалось переименовать в '{name}': {rename_err}"
             
+            # Добавить в кэш без повторного list2
+            self.apply_emulator_result(OperationType.CREATE, name)
+            
             # Шаг 4: Применить конфигурацию если есть
             if config:
                 modify_params = {}
@@ -399,14 +1189,43 @@ class WorkstationManager:
                     
                     if mod_status != 0:
                         return True, f"Эмулятор '{name}' создан, но не удалось применить конфигурацию: {mod_stderr}"
+                    
+                    self.apply_emulator_result(OperationType.MODIFY, name, params=modify_params)
             
-            # Очистить кэш
-            self._emulators_cache = None
             return True, f"Эмулятор '{name}' успешно создан"
 
         except Exception as e:
             return False, f"Исключение при создании эмулятора: {e}"
 
+    @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Clone emulator")
+    def clone_emulator(self, source_name: str, new_name: str) -> Tuple[bool, str]:
+        """Клонировать эмулятор (ldconsole copy).
+
+        Args:
+            source_name: Имя исходного эмулятора
+            new_name: Имя копии
+
+        Returns:
+            Tuple[bool, str]: (успех, сообщение)
+        """
+        try:
+            if self.find_emulator(source_name) is None:
+                return False, f"Исходный эмулятор '{source_name}' не найден"
+            if self.find_emulator(new_name) is not None:
+                return False, f"Эмулятор '{new_name}' уже существует"
+
+            # Как и add, copy возвращает индекс созданного эмулятора
+            status_code, stdout, stderr = self.run_ldconsole_command('copy', new_name, **{'from': source_name})
+
+            if status_code < 0 or (stderr and stderr.strip()) or "don't exist" in (stdout or ''):
+                return False, f"Ошибка клонирования эмулятора: {stderr or stdout or 'Неизвестная ошибка'}"
+
+            self.apply_emulator_result(OperationType.CREATE, new_name)
+            return True, f"Эмулятор '{source_name}' склонирован в '{new_name}'"
+
+        except Exception as e:
+            return False, f"Исключение при клонировании эмулятора: {e}"
+
     @with_circuit_breaker(ErrorCategory.EMULATOR, operation_name="Delete emulator")
     def delete_emulator(self, name: str) -> Tuple[bool, str]:
         """Удалить эмулятор с рабочей станции.
@@ -419,18 +1238,15 @@ class WorkstationManager:
         """
         try:
             # Проверить, что эмулятор существует
-            emulators = self.get_emulators_list()
-            emulator_exists = any(emu.name == name for emu in emulators)
-
-            if not emulator_exists:
+            if self.find_emulator(name) is None:
                 return False, f"Эмулятор '{name}' не найден"
 
             # Выполнить команду удаления
             status_code, stdout, stderr = self.run_ldconsole_command('remove', name)
 
             if status_code == 0:
-                # Очистить кэш
-                self._emulators_cache = None
+                # Убрать из кэша без повторного list2
+                self.apply_emulator_result(OperationType.DELETE, name)
                 return True, f"Эмулятор '{name}' успешно удален"
             else:
                 return False, f"Ошибка удаления эмулятора: {stderr}"
@@ -450,8 +1266,7 @@ class WorkstationManager:
         """
         try:
             # Проверить, что эмулятор существует
-            emulators = self.get_emulators_list()
-            emulator = next((emu for emu in emulators if emu.name == name), None)
+            emulator = self.find_emulator(name)
 
             if not emulator:
                 return False, f"Эмулятор '{name}' не найден"
@@ -463,6 +1278,7 @@ class WorkstationManager:
             status_code, stdout, stderr = self.run_ldconsole_command('launch', name)
 
             if status_code == 0:
+                self.apply_emulator_result(OperationType.START, name)
                 return True, f"Эмулятор '{name}' успешно запущен"
             else:
                 return False, f"Ошибка запуска эмулятора: {stderr}"
@@ -482,8 +1298,7 @@ class WorkstationManager:
         """
         try:
             # Проверить, что эмулятор существует
-            emulators = self.get_emulators_list()
-            emulator = next((emu for emu in emulators if emu.name == name), None)
+            emulator = self.find_emulator(name)
 
             if not emulator:
                 return False, f"Эмулятор '{name}' не найден"
@@ -495,6 +1310,7 @@ class WorkstationManager:
             status_code, stdout, stderr = self.run_ldconsole_command('quit', name)
 
             if status_code == 0:
+                self.apply_emulator_result(OperationType.STOP, name)
                 return True, f"Эмулятор '{name}' успешно остановлен"
             else:
                 return False, f"Ошибка остановки эмулятора: {stderr}"
@@ -514,14 +1330,11 @@ class WorkstationManager:
         """
         try:
             # Проверить, что эмулятор существует
-            emulators = self.get_emulators_list()
-            emulator_exists = any(emu.name == old_name for emu in emulators)
-
-            if not emulator_exists:
+            if self.find_emulator(old_name) is None:
                 return False, f"Эмулятор '{old_name}' не найден"
 
             # Проверить, что новое имя не занято
-            name_taken = any(emu.name == new_name for emu in emulators)
+            name_taken = get_inventory().find(self.config.id, new_name) is not None
             if name_taken:
                 return False, f"Имя '{new_name}' уже используется"
 
@@ -530,8 +1343,8 @@ class WorkstationManager:
             status_code, stdout, stderr = self.run_ldconsole_command('rename', old_name, title=new_name)
 
             if status_code == 0:
-                # Очистить кэш
-                self._emulators_cache = None
+                # Переименовать в кэше без повторного list2
+                self.apply_emulator_result(OperationType.RENAME, old_name, new_name=new_name)
                 return True, f"Эмулятор переименован с '{old_name}' на '{new_name}'"
             else:
                 return False, f"Ошибка переименования эмулятора: {stderr}"
@@ -539,6 +1352,75 @@ class WorkstationManager:
         except Exception as e:
             return False, f"Исключение при переименовании эмулятора: {e}"
 
+    def build_modify_params(self, settings: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Проверить настройки и собрать параметры команды modify.
+
+        Args:
+            settings: Словарь с настройками (см. modify_emulator)
+
+        Returns:
+            Tuple[Dict[str, Any], Optional[str]]: (параметры, сообщение об ошибке)
+        """
+        # Подготовить параметры для команды modify
+        modify_params = {}
+
+        # Производительность
+        if 'resolution' in settings:
+            modify_params['resolution'] = settings['resolution']
+        
+        if 'cpu' in settings:
+            cpu_value = settings['cpu']
+            if cpu_value not in [1, 2, 3, 4, 8]:
+                return {}, f"Недопустимое значение CPU: {cpu_value}. Допустимые: 1, 2, 3, 4, 8"
+            modify_params['cpu'] = cpu_value
+        
+        if 'memory' in settings:
+            memory_value = settings['memory']
+            allowed_memory = [256, 512, 768, 1024, 1536, 2048, 4096, 8192]
+            if memory_value not in allowed_memory:
+                return {}, f"Недопустимое значение памяти: {memory_value}. Допустимые: {allowed_memory}"
+            modify_params['memory'] = memory_value
+
+        # Идентификация устройства
+        if 'manufacturer' in settings:
+            modify_params['manufacturer'] = settings['manufacturer']
+        
+        if 'model' in settings:
+            modify_params['model'] = settings['model']
+        
+        if 'pnumber' in settings:
+            modify_params['pnumber'] = settings['pnumber']
+        
+        if 'imei' in settings:
+            modify_params['imei'] = settings['imei']
+        
+        if 'imsi' in settings:
+            modify_params['imsi'] = settings['imsi']
+        
+        if 'simserial' in settings:
+            modify_params['simserial'] = settings['simserial']
+        
+        if 'androidid' in settings:
+            modify_params['androidid'] = settings['androidid']
+        
+        if 'mac' in settings:
+            modify_params['mac'] = settings['mac']
+
+        # Системные настройки
+        if 'autorotate' in settings:
+            modify_params['autorotate'] = 1 if settings['autorotate'] else 0
+        
+        if 'lockwindow' in settings:
+            modify_params['lockwindow'] = 1 if settings['lockwindow'] else 0
+        
+        if 'root' in settings:
+            modify_params['root'] = 1 if settings['root'] else 0
+
+        if not modify_params:
+            return {}, "Не указаны параметры для изменения"
+
+        return modify_params, None
+
     def modify_emulator(self, name: str, settings: Dict[str, Any]) -> Tuple[bool, str]:
         """Изменить настройки эмулятора.
 
@@ -583,76 +1465,19 @@ class WorkstationManager:
         """
         try:
             # Проверить, что эмулятор существует
-            emulators = self.get_emulators_list()
-            emulator_exists = any(emu.name == name for emu in emulators)
-
-            if not emulator_exists:
+            if self.find_emulator(name) is None:
                 return False, f"Эмулятор '{name}' не найден"
 
-            # Подготовить параметры для команды modify
-            modify_params = {}
-
-            # Производительность
-            if 'resolution' in settings:
-                modify_params['resolution'] = settings['resolution']
-            
-            if 'cpu' in settings:
-                cpu_value = settings['cpu']
-                if cpu_value not in [1, 2, 3, 4, 8]:
-                    return False, f"Недопустимое значение CPU: {cpu_value}. Допустимые: 1, 2, 3, 4, 8"
-                modify_params['cpu'] = cpu_value
-            
-            if 'memory' in settings:
-                memory_value = settings['memory']
-                allowed_memory = [256, 512, 768, 1024, 1536, 2048, 4096, 8192]
-                if memory_value not in allowed_memory:
-                    return False, f"Недопустимое значение памяти: {memory_value}. Допустимые: {allowed_memory}"
-                modify_params['memory'] = memory_value
-
-            # Идентификация устройства
-            if 'manufacturer' in settings:
-                modify_params['manufacturer'] = settings['manufacturer']
-            
-            if 'model' in settings:
-                modify_params['model'] = settings['model']
-            
-            if 'pnumber' in settings:
-                modify_params['pnumber'] = settings['pnumber']
-            
-            if 'imei' in settings:
-                modify_params['imei'] = settings['imei']
-            
-            if 'imsi' in settings:
-                modify_params['imsi'] = settings['imsi']
-            
-            if 'simserial' in settings:
-                modify_params['simserial'] = settings['simserial']
-            
-            if 'androidid' in settings:
-                modify_params['androidid'] = settings['androidid']
-            
-            if 'mac' in settings:
-                modify_params['mac'] = settings['mac']
-
-            # Системные настройки
-            if 'autorotate' in settings:
-                modify_params['autorotate'] = 1 if settings['autorotate'] else 0
-            
-            if 'lockwindow' in settings:
-                modify_params['lockwindow'] = 1 if settings['lockwindow'] else 0
-            
-            if 'root' in settings:
-                modify_params['root'] = 1 if settings['root'] else 0
-
-            if not modify_params:
-                return False, "Не указаны параметры для изменения"
+            modify_params, error = self.build_modify_params(settings)
+            if error:
+                return False, error
 
             # Выполнить команду modify
             status_code, stdout, stderr = self.run_ldconsole_command('modify', name, **modify_params)
 
             if status_code == 0:
-                # Очистить кэш
-                self._emulators_cache = None
+                # Применить настройки к кэшу без повторного list2
+                self.apply_emulator_result(OperationType.MODIFY, name, params=modify_params)
                 
                 # Сформировать сообщение с перечислением изменений
                 changes = ", ".join([f"{k}={v}" for k, v in modify_params.items()])
@@ -673,8 +1498,7 @@ class WorkstationManager:
             Tuple[Optional[EmulatorStatus], str]: (статус, сообщение)
         """
         try:
-            emulators = self.get_emulators_list()
-            emulator = next((emu for emu in emulators if emu.name == name), None)
+            emulator = self.find_emulator(name)
 
             if emulator:
                 return emulator.status, "Статус получен успешно"
@@ -700,28 +1524,35 @@ class WorkstationManager:
         }
 
         try:
-            # Получить информацию о процессах
-            if self.is_connected:
-                status_code, stdout, stderr = self.run_command('powershell', [
-                    'Get-Process | Where-Object {$_.ProcessName -like "*ld*"} | Measure-Object | Select-Object -ExpandProperty Count'
-                ])
-
+            # Загрузка станции и процессы LDPlayer одним запросом
+            try:
+                status_code, stdout, stderr = self.run_powershell(_TELEMETRY_SCRIPT)
                 if status_code == 0:
-                    try:
-                        info['ldplayer_processes'] = int(stdout.strip())
-                    except ValueError:
-                        pass
+                    info.update(_parse_telemetry(stdout.strip()))
+            except ConnectionError as e:
+                print(f"Ошибка получения телеметрии станции {self.config.name}: {e}")
 
             # Получить статистику эмуляторов
             emulators = self.get_emulators_list()
             info['total_emulators'] = len(emulators)
-            info['running_emulators'] = len([emu for emu in emulators if emu.status == EmulatorStatus.RUNNING])
+            info['running_emulators'] = get_inventory().count(self.config.id, EmulatorStatus.RUNNING)
 
         except Exception as e:
             print(f"Ошибка получения системной информации: {e}")
 
         return info
 
+    async def get_system_info_async(self, timeout: float = 120) -> Dict[str, Any]:
+        """Асинхронно получить информацию о системе рабочей станции.
+
+        Args:
+            timeout: Общий таймаут сбора информации в секундах
+
+        Returns:
+            Dict[str, Any]: Информация о системе
+        """
+        return await self.run_in_executor(self.get_system_info, timeout=timeout)
+
     def backup_configs(self, backup_path: str) -> Tuple[bool, str]:
         """Создать резервную копию конфигураций эмуляторов.
 
@@ -794,6 +1625,20 @@ class WorkstationManager:
         except Exception as e:
             return False, f"Ошибка тестирования подключения: {e}"
 
+    async def test_connection_async(self, timeout: float = 60) -> Tuple[bool, str]:
+        """Асинхронно протестировать подключение к рабочей станции.
+
+        Args:
+            timeout: Таймаут теста в секундах
+
+        Returns:
+            Tuple[bool, str]: (успех, сообщение)
+        """
+        try:
+            return await self.run_in_executor(self.test_connection, timeout=timeout)
+        except TimeoutError as e:
+            return False, f"Ошибка тестирования подключения: {e}"
+
     def __enter__(self) -> 'WorkstationManager':
         """Контекстный менеджер - вход."""
         self.connect()
@@ -807,13 +1652,15 @@ class WorkstationManager:
 class WorkstationMonitor:
     """Мониторинг рабочих станций."""
 
-    def __init__(self, workstations: List[WorkstationManager]):
+    def __init__(self, workstations: List[WorkstationManager], history: Optional[HistoryStore] = None):
         """Инициализация мониторинга.
 
         Args:
             workstations: Список менеджеров рабочих станций
+            history: Хранилище истории метрик (по умолчанию глобальное)
         """
         self.workstations = workstations
+        self.history = history if history is not None else get_history_store()
         self.monitoring_tasks: List[asyncio.Task] = []
 
     async def start_monitoring(self, interval: int = 30) -> None:
@@ -837,6 +1684,9 @@ class WorkstationMonitor:
         await asyncio.gather(*self.monitoring_tasks, return_exceptions=True)
         self.monitoring_tasks.clear()
 
+        # Точки истории, накопленные с последней записи
+        await asyncio.to_thread(self.history.flush)
+
     async def _monitor_workstation(self, workstation: WorkstationManager, interval: int) -> None:
         """Мониторить отдельную рабочую станцию.
 
@@ -847,28 +1697,58 @@ class WorkstationMonitor:
         while True:
             try:
                 # Получить информацию о системе
-                system_info = workstation.get_system_info()
+                system_info = await workstation.get_system_info_async()
 
                 # Получить список эмуляторов
-                emulators = workstation.get_emulators_list()
+                emulators = await workstation.get_emulators_list_async()
 
                 # Обновить статистику в конфигурации
                 workstation.config.total_emulators = len(emulators)
-                workstation.config.active_emulators = len([
-                    emu for emu in emulators
-                    if emu.status == EmulatorStatus.RUNNING
-                ])
+                workstation.config.active_emulators = get_inventory().count(
+                    workstation.config.id, EmulatorStatus.RUNNING
+                )
+                workstation.config.cpu_usage = system_info.get('cpu_usage', 0.0)
+                workstation.config.memory_usage = system_info.get('memory_usage', 0.0)
+                workstation.config.disk_usage = system_info.get('disk_usage', 0.0)
 
                 # Обновить статус подключения
-                if workstation.is_connected:
+                if await workstation.check_connection_async():
                     workstation.config.status = WorkstationStatus.ONLINE
                 else:
                     workstation.config.status = WorkstationStatus.OFFLINE
 
+                await self._record_history(workstation, system_info, emulators)
+
                 await asyncio.sleep(interval)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Ошибка мониторинга станции {workstation.config.name}: {e}")
-                await asyncio.sleep(interval)
\ No newline at end of file
+                await asyncio.sleep(interval)
+
+    async def _record_history(self, workstation: WorkstationManager,
+                              system_info: Dict[str, Any], emulators: List[Emulator]) -> None:
+        """Сохранить точку истории станции и ее эмуляторов.
+
+        Args:
+            workstation: Менеджер рабочей станции
+            system_info: Результат get_system_info
+            emulators: Список эмуляторов станции
+        """
+        config = workstation.config
+        now = time.time()
+        self.history.record_workstation(config.id, {
+            'total_emulators': config.total_emulators,
+            'active_emulators': config.active_emulators,
+            'cpu_usage': config.cpu_usage,
+            'memory_usage': config.memory_usage,
+            'disk_usage': config.disk_usage,
+            'ldplayer_processes': system_info.get('ldplayer_processes'),
+            'online': 1 if config.status == WorkstationStatus.ONLINE else 0,
+        }, now)
+        self.history.record_emulators(emulators, now)
+
+        # Запись пакетом в потоке пула, чтобы не блокировать event loop
+        if self.history.flush_due():
+            await asyncio.to_thread(self.history.flush)
@@ -1,8 +1,11 @@
 """Emulator service with business logic."""
 
+import inspect
 from typing import List, Optional, Dict, Any, Tuple
 from src.services.base_service import BaseService
+from src.core.inventory import EmulatorInventory
 from src.models.entities import Emulator, EmulatorStatus
+from src.core.models import OperationType
 from src.utils.exceptions import EmulatorNotFoundError, WorkstationNotFoundError
 import logging
 
@@ -26,6 +29,35 @@ class EmulatorService(BaseService[Emulator]):
         super().__init__()
         self.manager = manager
     
+    async def _fetch_emulators(self) -> List[Emulator]:
+        """
+        Fetch emulators without blocking the event loop.
+        
+        Prefers the manager's async path (bounded per-workstation executor)
+        and falls back to the synchronous call for managers without it.
+        
+        Returns:
+            List of emulators
+        """
+        get_async = getattr(self.manager, 'get_emulators_async', None)
+        if inspect.iscoroutinefunction(get_async):
+            return await get_async()
+        return self.manager.get_emulators()
+    
+    def _inventory(self) -> Optional[EmulatorInventory]:
+        """
+        Get the indexed emulator inventory of the manager.
+        
+        Managers backed by the inventory keep it updated from list2
+        refreshes and operation results, so lookups and filters are
+        index queries. Managers without it are filtered as plain lists.
+        
+        Returns:
+            EmulatorInventory or None
+        """
+        inventory = getattr(self.manager, 'inventory', None)
+        return inventory if isinstance(inventory, EmulatorInventory) else None
+    
     async def get_all(
         self,
         limit: int = 100,
@@ -45,8 +77,12 @@ class EmulatorService(BaseService[Emulator]):
         """
         try:
             # Get all emulators from LDPlayer via manager
-            # LDPlayerManager.get_emulators() -> WorkstationManager.get_emulators_list()
-            all_emulators = self.manager.get_emulators()
+            # LDPlayerManager.get_emulators_async() -> WorkstationManager.get_emulators_list_async()
+            all_emulators = await self._fetch_emulators()
+            
+            inventory = self._inventory()
+            if workstation_id and inventory is not None:
+                return inventory.page(offset, limit, workstation_id)
             
             # Filter by workstation if specified
             if workstation_id:
@@ -76,6 +112,10 @@ class EmulatorService(BaseService[Emulator]):
             Emulator or None if not found
         """
         try:
+            inventory = self._inventory()
+            if inventory is not None:
+                await self._fetch_emulators()
+                return inventory.get(emulator_id)
             em = await self.manager.find_emulator(emulator_id)
             return em
         except Exception as e:
@@ -102,7 +142,10 @@ class EmulatorService(BaseService[Emulator]):
                 raise WorkstationNotFoundError(workstation_id)
             
             # Get emulators for this workstation
-            all_emus = self.manager.get_emulators()  # Синхронный метод!
+            all_emus = await self._fetch_emulators()
+            inventory = self._inventory()
+            if inventory is not None:
+                return inventory.by_workstation(workstation_id)
             emulators = [
                 em for em in all_emus
                 if em.workstation_id == workstation_id
@@ -327,15 +370,16 @@ class EmulatorService(BaseService[Emulator]):
             Dict with operation statuses
         """
         try:
-            operations = []
-            
-            for emulator_id in emulator_ids:
-                emulator_name = emulator_id.split("_", 1)[-1] if "_" in emulator_id else emulator_id
-                operation = self.manager.start_emulator(emulator_name)
-                operations.append({
-                    "emulator_id": emulator_id,
-                    "operation_id": operation.id
-                })
+            names = [
+                emulator_id.split("_", 1)[-1] if "_" in emulator_id else emulator_id
+                for emulator_id in emulator_ids
+            ]
+            # One batched ldconsole script per workstation instead of one round-trip per emulator
+            queued = self.manager.batch_operation(names, OperationType.START)
+            operations = [
+                {"emulator_id": emulator_id, "operation_id": operation.id}
+                for emulator_id, operation in zip(emulator_ids, queued)
+            ]
             
             logger.info(f"Queued batch start for {len(emulator_ids)} emulators")
             
@@ -360,15 +404,16 @@ class EmulatorService(BaseService[Emulator]):
             Dict with operation statuses
         """
         try:
-            operations = []
-            
-            for emulator_id in emulator_ids:
-                emulator_name = emulator_id.split("_", 1)[-1] if "_" in emulator_id else emulator_id
-                operation = self.manager.stop_emulator(emulator_name)
-                operations.append({
-                    "emulator_id": emulator_id,
-                    "operation_id": operation.id
-                })
+            names = [
+                emulator_id.split("_", 1)[-1] if "_" in emulator_id else emulator_id
+                for emulator_id in emulator_ids
+            ]
+            # One batched ldconsole script per workstation instead of one round-trip per emulator
+            queued = self.manager.batch_operation(names, OperationType.STOP)
+            operations = [
+                {"emulator_id": emulator_id, "operation_id": operation.id}
+                for emulator_id, operation in zip(emulator_ids, queued)
+            ]
             
             logger.info(f"Queued batch stop for {len(emulator_ids)} emulators")
             
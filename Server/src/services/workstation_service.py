@@ -179,24 +179,28 @@ class WorkstationService(BaseService[Workstation]):
                 "error_message": str (optional)
             }
         """
+        import asyncio
         import time
-        import socket
         
         ws = await self.get_or_fail(workstation_id)
         start_time = time.time()
         
         try:
-            # Test TCP connection to workstation
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)  # 5 second timeout
-            
-            # Try to connect to workstation IP + WinRM port (5985)
-            result = sock.connect_ex((ws.ip_address, 5985))
-            sock.close()
+            # Test TCP connection to workstation IP + WinRM port (5985)
+            # without blocking the event loop while the host is unreachable
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(ws.ip_address, 5985),
+                    timeout=5  # 5 second timeout
+                )
+                writer.close()
+                connected = True
+            except ConnectionRefusedError:
+                connected = False
             
             response_time_ms = (time.time() - start_time) * 1000
             
-            if result == 0:
+            if connected:
                 logger.info(f"Connection test succeeded for {workstation_id}")
                 return {
                     "connected": True,
@@ -216,7 +220,7 @@ class WorkstationService(BaseService[Workstation]):
                     "error_message": "Connection refused"
                 }
                 
-        except socket.timeout:
+        except asyncio.TimeoutError:
             response_time_ms = (time.time() - start_time) * 1000
             logger.warning(f"Connection test timeout for {workstation_id}")
             return {
@@ -227,7 +231,7 @@ class WorkstationService(BaseService[Workstation]):
                 "response_time_ms": response_time_ms,
                 "error_message": "Connection timeout"
             }
-        except socket.error as e:
+        except OSError as e:
             response_time_ms = (time.time() - start_time) * 1000
             logger.error(f"Connection test error for {workstation_id}: {e}")
             return {
@@ -7,6 +7,7 @@
 
 import asyncio
 import functools
+import threading
 import time
 import traceback
 from typing import Dict, List, Optional, Any, Callable, TypeVar, Union
@@ -14,6 +15,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 
 from .logger import get_logger, LogCategory, LogLevel, OperationType
+from .retry_budget import get_retry_budgets
 
 
 T = TypeVar('T')
@@ -116,6 +118,235 @@ class ConfigurationError(SystemError):
         super().__init__(message, ErrorCategory.CONFIGURATION, ErrorSeverity.HIGH, **kwargs)
 
 
+class CircuitState(str, Enum):
+    """Состояние circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Операция отклонена: circuit breaker открыт."""
+
+    def __init__(self, key: str, operation: str, retry_after: float):
+        super().__init__(
+            f"Circuit breaker активен для операции '{operation}' ({key}). "
+            f"Пожалуйста, повторите попытку через {retry_after:.0f}s."
+        )
+        self.key = key
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Circuit breaker со скользящим окном доли ошибок и half-open пробой.
+
+    Окно разбито на корзины фиксированной длины; суммы по окну
+    поддерживаются инкрементально, поэтому allow() и record_*() - O(1).
+    В закрытом состоянии allow() не берет блокировку.
+
+    Переходы:
+        CLOSED -> OPEN: доля ошибок в окне >= failure_rate при >= min_calls вызовах
+        OPEN -> HALF_OPEN: по истечении open_seconds, пропускается один пробный вызов
+        HALF_OPEN -> CLOSED: пробный вызов успешен
+        HALF_OPEN -> OPEN: пробный вызов неудачен (open_seconds удваивается до max_open_seconds)
+    """
+
+    def __init__(
+        self,
+        key: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 60,
+        buckets: int = 10,
+        open_seconds: float = 60,
+        max_open_seconds: float = 600,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Инициализация circuit breaker.
+
+        Args:
+            key: Ключ (категория:рабочая станция)
+            failure_rate: Доля ошибок в окне, открывающая breaker
+            min_calls: Минимум вызовов в окне для принятия решения
+            window_seconds: Длина скользящего окна в секундах
+            buckets: Количество корзин окна
+            open_seconds: Время в открытом состоянии до пробного вызова
+            max_open_seconds: Предел роста open_seconds после неудачных проб
+            clock: Источник монотонного времени
+        """
+        self.key = key
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bucket_seconds = window_seconds / buckets
+        self._epochs = [-1] * buckets
+        self._successes = [0] * buckets
+        self._failures = [0] * buckets
+        self._total_successes = 0
+        self._total_failures = 0
+
+        self.state = CircuitState.CLOSED
+        self._open_until = 0.0
+        self._current_open_seconds = open_seconds
+        self._probe_in_flight = False
+
+        self.stats: Dict[str, int] = {'opened': 0, 'rejected': 0, 'probes': 0}
+
+    def acquire(self) -> Optional[bool]:
+        """Запросить разрешение на вызов.
+
+        В состоянии HALF_OPEN разрешается ровно один пробный вызов;
+        его результат нужно сообщить через record_success/record_failure
+        (или release_probe, если результат неизвестен).
+
+        Returns:
+            Optional[bool]: None - вызов отклонен, False - обычный вызов, True - пробный вызов
+        """
+        if self.state is CircuitState.CLOSED:
+            return False
+
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return False
+            if self.state is CircuitState.OPEN and self._clock() >= self._open_until:
+                self.state = CircuitState.HALF_OPEN
+            if self.state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.stats['probes'] += 1
+                return True
+            self.stats['rejected'] += 1
+            return None
+
+    def allow(self) -> bool:
+        """Разрешить ли вызов (см. acquire).
+
+        Returns:
+            bool: True если вызов можно выполнять
+        """
+        return self.acquire() is not None
+
+    def record_success(self) -> Optional[CircuitState]:
+        """Учесть успешный вызов.
+
+        Returns:
+            Optional[CircuitState]: Новое состояние, если оно изменилось
+        """
+        with self._lock:
+            if self.state is not CircuitState.CLOSED:
+                if not self._probe_in_flight:
+                    # Запоздалый ответ вызова, начатого до открытия
+                    return None
+                self._reset_window()
+                self.state = CircuitState.CLOSED
+                self._probe_in_flight = False
+                self._current_open_seconds = self.open_seconds
+                return CircuitState.CLOSED
+
+            index = self._bucket()
+            self._successes[index] += 1
+            self._total_successes += 1
+            return None
+
+    def record_failure(self) -> Optional[CircuitState]:
+        """Учесть неудачный вызов.
+
+        Returns:
+            Optional[CircuitState]: Новое состояние, если оно изменилось
+        """
+        with self._lock:
+            if self.state is not CircuitState.CLOSED:
+                if not self._probe_in_flight:
+                    return None
+                # Пробный вызов неудачен - снова открыть с увеличенной паузой
+                self._probe_in_flight = False
+                self._current_open_seconds = min(self._current_open_seconds * 2, self.max_open_seconds)
+                return self._open()
+
+            index = self._bucket()
+            self._failures[index] += 1
+            self._total_failures += 1
+
+            calls = self._total_successes + self._total_failures
+            if calls >= self.min_calls and self._total_failures >= self.failure_rate * calls:
+                return self._open()
+            return None
+
+    def release_probe(self) -> None:
+        """Освободить пробный вызов без результата (например, при отмене)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    @property
+    def retry_after(self) -> float:
+        """Секунд до следующего пробного вызова (0 если breaker закрыт)."""
+        if self.state is CircuitState.CLOSED:
+            return 0.0
+        return max(0.0, self._open_until - self._clock())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить состояние и счетчики breaker.
+
+        Returns:
+            Dict[str, Any]: Состояние, вызовы и ошибки в окне, счетчики
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                self._bucket()
+            return {
+                'state': self.state.value,
+                'window_calls': self._total_successes + self._total_failures,
+                'window_failures': self._total_failures,
+                'retry_after_seconds': round(self.retry_after, 1),
+                **self.stats,
+            }
+
+    def _open(self) -> CircuitState:
+        """Перейти в OPEN (вызывается под блокировкой)."""
+        self.state = CircuitState.OPEN
+        self._open_until = self._clock() + self._current_open_seconds
+        self.stats['opened'] += 1
+        self._reset_window()
+        return CircuitState.OPEN
+
+    def _bucket(self) -> int:
+        """Индекс текущей корзины; устаревшие корзины вычитаются из сумм."""
+        epoch = int(self._clock() / self._bucket_seconds)
+        index = epoch % len(self._epochs)
+        if self._epochs[index] != epoch:
+            if epoch - max(self._epochs) >= len(self._epochs):
+                # Окно целиком устарело
+                self._reset_window()
+            else:
+                self._total_successes -= self._successes[index]
+                self._total_failures -= self._failures[index]
+                self._successes[index] = 0
+                self._failures[index] = 0
+                # Пропущенные корзины между последней записью и текущей
+                for missed in range(max(self._epochs) + 1, epoch):
+                    slot = missed % len(self._epochs)
+                    self._total_successes -= self._successes[slot]
+                    self._total_failures -= self._failures[slot]
+                    self._successes[slot] = 0
+                    self._failures[slot] = 0
+                    self._epochs[slot] = missed
+            self._epochs[index] = epoch
+        return index
+
+    def _reset_window(self) -> None:
+        """Очистить окно (вызывается под блокировкой)."""
+        buckets = len(self._epochs)
+        self._epochs = [-1] * buckets
+        self._successes = [0] * buckets
+        self._failures = [0] * buckets
+        self._total_successes = 0
+        self._total_failures = 0
+
+
 class ErrorHandler:
     """Централизованный обработчик ошибок."""
 
@@ -124,11 +355,14 @@ class ErrorHandler:
         self.logger = get_logger(LogCategory.SYSTEM)
         self.error_counts: Dict[str, int] = {}
         self.error_timestamps: Dict[str, datetime] = {}
-        self.circuit_breakers: Dict[str, bool] = {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
 
-        # Настройки восстановления
-        self.max_errors_per_minute = 10
-        self.circuit_breaker_timeout = 60  # секунды
+        # Настройки circuit breaker (на пару категория:рабочая станция)
+        self.failure_rate_threshold = 0.5
+        self.min_calls_in_window = 5
+        self.window_seconds = 60
+        self.circuit_breaker_timeout = 60  # секунды до пробного вызова
 
     def handle_error(
         self,
@@ -176,10 +410,6 @@ class ErrorHandler:
         # Обновить статистику ошибок
         self._update_error_stats(system_error)
 
-        # Проверить circuit breaker
-        if self._should_trigger_circuit_breaker(system_error):
-            self._trigger_circuit_breaker(system_error)
-
         if reraise:
             raise system_error
 
@@ -305,75 +535,78 @@ class ErrorHandler:
         self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
         self.error_timestamps[error_key] = datetime.now()
 
-    def _should_trigger_circuit_breaker(self, error: SystemError) -> bool:
-        """Проверить, нужно ли активировать circuit breaker.
+    def get_circuit_breaker(self, category: ErrorCategory, workstation_id: str = None) -> CircuitBreaker:
+        """Получить (создать) circuit breaker для категории и рабочей станции.
 
         Args:
-            error: Обработанная ошибка
+            category: Категория операций
+            workstation_id: ID рабочей станции
 
         Returns:
-            bool: True если нужно активировать circuit breaker
+            CircuitBreaker: Circuit breaker
         """
-        if error.severity not in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
-            return False
-
-        # Ключ для circuit breaker
-        cb_key = f"{error.category.value}:{error.workstation_id or 'global'}"
+        cb_key = f"{category.value}:{workstation_id or 'global'}"
+        breaker = self.circuit_breakers.get(cb_key)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self.circuit_breakers.get(cb_key)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        cb_key,
+                        failure_rate=self.failure_rate_threshold,
+                        min_calls=self.min_calls_in_window,
+                        window_seconds=self.window_seconds,
+                        open_seconds=self.circuit_breaker_timeout
+                    )
+                    self.circuit_breakers[cb_key] = breaker
+        return breaker
+
+    def is_failure(self, error: Exception) -> bool:
+        """Считать ли ошибку сбоем станции для circuit breaker.
+
+        Ошибки валидации и прочие ошибки низкой серьезности означают,
+        что станция ответила, и breaker их не учитывает.
 
-        # Проверить количество ошибок за последнюю минуту
-        if cb_key in self.error_timestamps:
-            minute_ago = datetime.now() - timedelta(minutes=1)
-            if self.error_timestamps[cb_key] < minute_ago:
-                # Сбросить счетчик если прошло больше минуты
-                self.error_counts[cb_key] = 0
+        Args:
+            error: Исключение операции
 
-        error_count = self.error_counts.get(cb_key, 0)
-        return error_count >= self.max_errors_per_minute
+        Returns:
+            bool: True если ошибка учитывается как сбой
+        """
+        _, severity = self._categorize_error(error)
+        return severity in (ErrorSeverity.HIGH, ErrorSeverity.CRITICAL)
 
-    def _trigger_circuit_breaker(self, error: SystemError) -> None:
-        """Активировать circuit breaker.
+    def log_circuit_transition(self, breaker: CircuitBreaker, state: Optional[CircuitState],
+                               workstation_id: str = None) -> None:
+        """Записать в лог смену состояния circuit breaker.
 
         Args:
-            error: Ошибка, вызвавшая активацию
+            breaker: Circuit breaker
+            state: Новое состояние (None - состояние не менялось)
+            workstation_id: ID рабочей станции
         """
-        cb_key = f"{error.category.value}:{error.workstation_id or 'global'}"
+        if state is None:
+            return
 
-        self.circuit_breakers[cb_key] = True
+        if state is CircuitState.OPEN:
+            message = f"Circuit breaker активирован: {breaker.key}"
+            level = LogLevel.WARNING
+        else:
+            message = f"Circuit breaker сброшен: {breaker.key}"
+            level = LogLevel.INFO
 
         self.logger.log_operation(
             OperationType.MODIFY,
             LogCategory.SYSTEM,
-            f"Circuit breaker активирован: {cb_key}",
-            workstation_id=error.workstation_id,
+            message,
+            workstation_id=workstation_id,
             additional_data={
-                "circuit_breaker_key": cb_key,
-                "timeout_seconds": self.circuit_breaker_timeout
+                "circuit_breaker_key": breaker.key,
+                "retry_after_seconds": round(breaker.retry_after, 1)
             },
-            level=LogLevel.WARNING
+            level=level
         )
 
-        # Запланировать восстановление circuit breaker
-        asyncio.create_task(self._reset_circuit_breaker(cb_key))
-
-    async def _reset_circuit_breaker(self, cb_key: str):
-        """Сбросить circuit breaker после таймаута.
-
-        Args:
-            cb_key: Ключ circuit breaker
-        """
-        await asyncio.sleep(self.circuit_breaker_timeout)
-
-        if cb_key in self.circuit_breakers:
-            self.circuit_breakers[cb_key] = False
-
-            self.logger.log_operation(
-                OperationType.MODIFY,
-                LogCategory.SYSTEM,
-                f"Circuit breaker сброшен: {cb_key}",
-                additional_data={"circuit_breaker_key": cb_key},
-                level=LogLevel.INFO
-            )
-
     def is_circuit_breaker_active(self, category: ErrorCategory, workstation_id: str = None) -> bool:
         """Проверить, активен ли circuit breaker.
 
@@ -382,10 +615,20 @@ class ErrorHandler:
             workstation_id: ID рабочей станции
 
         Returns:
-            bool: True если circuit breaker активен
+            bool: True если breaker открыт и пробный вызов еще не разрешен
         """
-        cb_key = f"{category.value}:{workstation_id or 'global'}"
-        return self.circuit_breakers.get(cb_key, False)
+        breaker = self.circuit_breakers.get(f"{category.value}:{workstation_id or 'global'}")
+        if breaker is None or breaker.state is CircuitState.CLOSED:
+            return False
+        return breaker.retry_after > 0
+
+    def get_circuit_breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Получить состояние всех circuit breaker.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Ключ breaker -> состояние и счетчики
+        """
+        return {key: breaker.get_stats() for key, breaker in list(self.circuit_breakers.items())}
 
     def get_error_stats(self) -> Dict[str, Any]:
         """Получить статистику ошибок.
@@ -410,7 +653,10 @@ class ErrorHandler:
         return {
             "total_errors": sum(self.error_counts.values()),
             "error_counts_by_category": self._group_errors_by_category(),
-            "circuit_breakers_active": len([k for k, v in self.circuit_breakers.items() if v]),
+            "circuit_breakers_active": len([
+                breaker for breaker in self.circuit_breakers.values()
+                if breaker.state is not CircuitState.CLOSED
+            ]),
             "errors_last_minute": sum(
                 count for key, count in self.error_counts.items()
                 if key in self.error_timestamps and self.error_timestamps[key] >= minute_ago
@@ -432,17 +678,20 @@ class ErrorHandler:
 class RetryMechanism:
     """Механизм повторных попыток."""
 
-    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 budget_key: Optional[str] = None):
         """Инициализация механизма повторных попыток.
 
         Args:
             max_attempts: Максимальное количество попыток
             base_delay: Базовая задержка в секундах
             max_delay: Максимальная задержка в секундах
+            budget_key: ID рабочей станции для бюджета повторов (None - только глобальный)
         """
         self.max_attempts = max_attempts
         self.base_delay = base_delay
         self.max_delay = max_delay
+        self.budget_key = budget_key
 
     def calculate_delay(self, attempt: int) -> float:
         """Рассчитать задержку перед следующей попыткой.
@@ -479,6 +728,8 @@ class RetryMechanism:
             Exception: Последняя ошибка если все попытки неудачны
         """
         last_error = None
+        budgets = get_retry_budgets()
+        budgets.record_attempt(self.budget_key)
 
         for attempt in range(1, self.max_attempts + 1):
             try:
@@ -491,8 +742,8 @@ class RetryMechanism:
                 if isinstance(e, SystemError) and not e.recoverable:
                     raise e
 
-                # Если это последняя попытка, выбросить ошибку
-                if attempt == self.max_attempts:
+                # Если это последняя попытка или бюджет повторов исчерпан, выбросить ошибку
+                if attempt == self.max_attempts or not budgets.try_retry(self.budget_key):
                     break
 
                 # Рассчитать задержку и ждать
@@ -628,12 +879,39 @@ def handle_system_error(
     return error_handler.handle_error(error, context=context, workstation_id=workstation_id, emulator_id=emulator_id)
 
 
+def _record_circuit_breaker_error(
+    error_handler: ErrorHandler,
+    error: Exception,
+    operation_name: str,
+    workstation_id: str = None
+) -> None:
+    """Учесть ошибку операции, не подменяя исходное исключение.
+
+    Args:
+        error_handler: Обработчик ошибок
+        error: Исходная ошибка операции
+        operation_name: Имя операции для контекста
+        workstation_id: ID рабочей станции
+    """
+    try:
+        error_handler.handle_error(error, context=operation_name, workstation_id=workstation_id)
+    except Exception as bookkeeping_error:
+        # Ошибка учета (например, нет event loop в рабочем потоке)
+        # не должна скрывать настоящую причину сбоя
+        get_logger(LogCategory.SYSTEM).logger.debug(
+            f"Не удалось учесть ошибку '{operation_name}': {bookkeeping_error}"
+        )
+
+
 def with_circuit_breaker(
     category: ErrorCategory,
     operation_name: str = None
 ):
     """Декоратор для защиты операций circuit breaker.
 
+    Breaker ведется на пару (категория, рабочая станция). Пока он открыт,
+    вызов отклоняется сразу, без обращения к станции и без логирования.
+
     Args:
         category: Категория ошибки для circuit breaker
         operation_name: Имя операции для логирования
@@ -642,74 +920,73 @@ def with_circuit_breaker(
         Decorated function with circuit breaker protection
     
     Raises:
-        RuntimeError: Если circuit breaker активен
+        CircuitOpenError: Если circuit breaker активен (наследник RuntimeError)
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def sync_wrapper(*args, **kwargs):
+        op_name = operation_name or func.__name__
+
+        def enter(args, kwargs):
             error_handler = get_error_handler()
-            
+
             # Получить workstation_id если есть
             workstation_id = kwargs.get('workstation_id') or (
                 getattr(args[0].config, 'workstation_id', None) or 
                 getattr(args[0].config, 'id', None) if (args and hasattr(args[0], 'config')) else None
             )
-            
-            # Проверить circuit breaker
-            if error_handler.is_circuit_breaker_active(category, workstation_id):
-                op_name = operation_name or func.__name__
-                logger = get_logger(LogCategory.SYSTEM)
-                logger.logger.warning(
-                    f"⚠️ Circuit breaker активен для {op_name}"
-                )
-                raise RuntimeError(
-                    f"Circuit breaker активен для операции '{op_name}'. "
-                    f"Пожалуйста, повторите попытку позже."
-                )
-            
-            # Выполнить функцию
+
+            breaker = error_handler.get_circuit_breaker(category, workstation_id)
+            probe = breaker.acquire()
+            if probe is None:
+                raise CircuitOpenError(breaker.key, op_name, breaker.retry_after)
+            return error_handler, breaker, workstation_id, probe
+
+        def leave(error_handler, breaker, workstation_id, probe, error=None):
+            if isinstance(error, CircuitOpenError):
+                # Отказ вложенного breaker - станция не вызывалась
+                if probe:
+                    breaker.release_probe()
+                return
+
+            if error is None:
+                state = breaker.record_success()
+            else:
+                _record_circuit_breaker_error(error_handler, error, op_name, workstation_id)
+                if error_handler.is_failure(error):
+                    state = breaker.record_failure()
+                else:
+                    state = breaker.record_success()
+            error_handler.log_circuit_transition(breaker, state, workstation_id)
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            error_handler, breaker, workstation_id, probe = enter(args, kwargs)
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
             except Exception as e:
-                error_handler.handle_error(
-                    e,
-                    category=category,
-                    context={'operation': operation_name or func.__name__}
-                )
+                leave(error_handler, breaker, workstation_id, probe, e)
                 raise
+            except BaseException:
+                if probe:
+                    breaker.release_probe()
+                raise
+            leave(error_handler, breaker, workstation_id, probe)
+            return result
         
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            error_handler = get_error_handler()
-            
-            # Получить workstation_id если есть
-            workstation_id = kwargs.get('workstation_id') or (
-                getattr(args[0].config, 'workstation_id', None) or 
-                getattr(args[0].config, 'id', None) if (args and hasattr(args[0], 'config')) else None
-            )
-            
-            # Проверить circuit breaker
-            if error_handler.is_circuit_breaker_active(category, workstation_id):
-                op_name = operation_name or func.__name__
-                logger = get_logger(LogCategory.SYSTEM)
-                logger.logger.warning(
-                    f"⚠️ Circuit breaker активен для {op_name}"
-                )
-                raise RuntimeError(
-                    f"Circuit breaker активен для операции '{op_name}'. "
-                    f"Пожалуйста, повторите попытку позже."
-                )
-            
-            # Выполнить функцию
+            error_handler, breaker, workstation_id, probe = enter(args, kwargs)
             try:
-                return await func(*args, **kwargs)
+                result = await func(*args, **kwargs)
             except Exception as e:
-                error_handler.handle_error(
-                    e,
-                    category=category,
-                    context={'operation': operation_name or func.__name__}
-                )
+                leave(error_handler, breaker, workstation_id, probe, e)
+                raise
+            except BaseException:
+                # Отмена пробного вызова не дает результата
+                if probe:
+                    breaker.release_probe()
                 raise
+            leave(error_handler, breaker, workstation_id, probe)
+            return result
         
         # Вернуть правильный wrapper в зависимости от типа функции
         if asyncio.iscoroutinefunction(func):
@@ -735,6 +1012,4 @@ def is_operation_safe(
     Returns:
         bool: True если операция безопасна
     """
-    return not error_handler.is_circuit_breaker_active(category, workstation_id)
-
     return not error_handler.is_circuit_breaker_active(category, workstation_id)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Бюджет повторных попыток для всего парка рабочих станций.
+
+Повторы разрешаются, только пока их доля не превышает заданную долю
+первых попыток. Каждая первая попытка пополняет бюджет на ratio токенов,
+каждый повтор тратит один токен. Небольшое пополнение по времени
+(min_per_second) оставляет возможность повтора при редких запросах.
+
+Бюджет ведется на каждую рабочую станцию и глобально: повтор разрешен,
+только если токен есть в обоих. Так сетевой сбой на всех станциях
+не умножает нагрузку повторами сотен операций в очереди.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class RetryBudget:
+    """Token bucket повторов одного уровня (станция или глобальный)."""
+
+    def __init__(
+        self,
+        name: str,
+        ratio: float = 0.2,
+        min_per_second: float = 0.5,
+        max_tokens: float = 20,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Инициализация бюджета.
+
+        Args:
+            name: Имя бюджета
+            ratio: Допустимая доля повторов от первых попыток
+            min_per_second: Пополнение токенов в секунду независимо от трафика
+            max_tokens: Емкость (максимальная серия повторов подряд)
+            clock: Источник монотонного времени
+        """
+        self.name = name
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._clock = clock
+        self.tokens = max_tokens
+        self._updated = clock()
+
+        self.stats: Dict[str, int] = {'attempts': 0, 'retries_allowed': 0, 'retries_denied': 0}
+
+    def deposit(self) -> None:
+        """Учесть первую попытку (вызывается под блокировкой реестра)."""
+        self._refill()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+        self.stats['attempts'] += 1
+
+    def has_token(self) -> bool:
+        """Есть ли токен на повтор (вызывается под блокировкой реестра)."""
+        self._refill()
+        return self.tokens >= 1
+
+    def withdraw(self) -> None:
+        """Потратить токен на повтор (вызывается под блокировкой реестра)."""
+        self.tokens -= 1
+        self.stats['retries_allowed'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить счетчики бюджета.
+
+        Returns:
+            Dict[str, Any]: Попытки, разрешенные и отклоненные повторы, остаток токенов
+        """
+        self._refill()
+        return {**self.stats, 'tokens': round(self.tokens, 2)}
+
+    def _refill(self) -> None:
+        """Пополнить токены за прошедшее время."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self.tokens = min(self.max_tokens, self.tokens + elapsed * self.min_per_second)
+
+
+class RetryBudgets:
+    """Реестр бюджетов повторов: глобальный и по рабочим станциям."""
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 0.5,
+        max_tokens: float = 20,
+        global_ratio: float = 0.1,
+        global_min_per_second: float = 2.0,
+        global_max_tokens: float = 100,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Инициализация реестра.
+
+        Args:
+            ratio: Доля повторов для станции
+            min_per_second: Пополнение бюджета станции в секунду
+            max_tokens: Емкость бюджета станции
+            global_ratio: Доля повторов для всего парка
+            global_min_per_second: Пополнение глобального бюджета в секунду
+            global_max_tokens: Емкость глобального бюджета
+            clock: Источник монотонного времени
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._global = RetryBudget('global', global_ratio, global_min_per_second, global_max_tokens, clock)
+        self._budgets: Dict[str, RetryBudget] = {}
+
+    def record_attempt(self, key: Optional[str] = None) -> None:
+        """Учесть первую попытку операции.
+
+        Args:
+            key: ID рабочей станции (None - только глобальный бюджет)
+        """
+        with self._lock:
+            self._global.deposit()
+            if key is not None:
+                self._budget(key).deposit()
+
+    def try_retry(self, key: Optional[str] = None) -> bool:
+        """Запросить разрешение на повтор.
+
+        Args:
+            key: ID рабочей станции (None - только глобальный бюджет)
+
+        Returns:
+            bool: True если повтор разрешен (токен списан)
+        """
+        with self._lock:
+            budget = self._budget(key) if key is not None else None
+
+            if budget is not None and not budget.has_token():
+                budget.stats['retries_denied'] += 1
+                return False
+            if not self._global.has_token():
+                self._global.stats['retries_denied'] += 1
+                if budget is not None:
+                    budget.stats['retries_denied'] += 1
+                return False
+
+            self._global.withdraw()
+            if budget is not None:
+                budget.withdraw()
+            return True
+
+    def get_budget(self, key: str) -> RetryBudget:
+        """Получить (создать) бюджет рабочей станции.
+
+        Args:
+            key: ID рабочей станции
+
+        Returns:
+            RetryBudget: Бюджет станции
+        """
+        with self._lock:
+            return self._budget(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику бюджетов.
+
+        Returns:
+            Dict[str, Any]: Глобальный бюджет и бюджеты станций
+        """
+        with self._lock:
+            return {
+                'global': self._global.get_stats(),
+                'workstations': {key: budget.get_stats() for key, budget in self._budgets.items()}
+            }
+
+    def _budget(self, key: str) -> RetryBudget:
+        """Получить (создать) бюджет станции (вызывается под блокировкой)."""
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = RetryBudget(
+                key, self.ratio, self.min_per_second, self.max_tokens, self._clock
+            )
+        return budget
+
+
+# Глобальный реестр бюджетов повторов
+_retry_budgets = RetryBudgets()
+
+
+def get_retry_budgets() -> RetryBudgets:
+    """Получить глобальный реестр бюджетов повторов.
+
+    Returns:
+        RetryBudgets: Реестр бюджетов
+    """
+    return _retry_budgets
@@ -0,0 +1,202 @@
+"""
+🛫 Тесты допуска запусков эмуляторов
+
+Проверяет:
+- Запас станции по CPU, свободной памяти, загружающимся и запущенным эмуляторам
+- Ожидание допуска и его выдачу при освобождении ресурсов
+- Отказ после max_wait и возврат допуска при ошибке запуска
+- Пакетный запуск поверх симулятора частями по запасу станции
+- Допуск по телеметрии, измеренной на станции мониторингом
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.counters import FleetCounters
+from src.core.history import HistoryStore
+from src.core.inventory import get_inventory
+from src.core.models import OperationStatus, OperationType
+from src.remote.admission import LaunchAdmissionController, LaunchLimits
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager, WorkstationMonitor
+
+
+def controller(telemetry=None, running: int = 0, **limits) -> LaunchAdmissionController:
+    """Контроллер с изменяемой телеметрией (словарь) и числом запущенных."""
+    telemetry = telemetry if telemetry is not None else {'cpu_usage': 10.0, 'memory_usage': 40.0}
+    limits.setdefault('recheck_interval', 0.01)
+    return LaunchAdmissionController(LaunchLimits(**limits), telemetry=lambda: telemetry, running=lambda: running)
+
+
+@pytest.mark.unit
+class TestHeadroom:
+    """Расчет запаса станции."""
+
+    def test_thresholds(self):
+        """Загрузка CPU и нехватка памяти закрывают допуск."""
+        telemetry = {'cpu_usage': 10.0, 'memory_usage': 40.0}
+        admission = controller(telemetry, max_booting=3)
+        assert admission.headroom() == 3
+
+        telemetry['cpu_usage'] = 90.0
+        assert admission.headroom() == 0
+
+        telemetry.update(cpu_usage=10.0, memory_usage=90.0)
+        assert admission.headroom() == 0
+
+        telemetry['memory_usage'] = None
+        assert admission.headroom() == 3
+
+    def test_ceilings(self):
+        """Загружающиеся и запущенные эмуляторы ограничены потолками станции."""
+        assert controller(running=18, max_booting=4, max_running=20).headroom() == 2
+        assert controller(running=25, max_booting=4, max_running=20).headroom() == 0
+        assert controller(running=25, max_booting=4).headroom() == 4
+
+    def test_from_dict(self):
+        """Неизвестные ключи конфигурации игнорируются."""
+        limits = LaunchLimits.from_dict({'max_booting': 2, 'comment': "x"})
+        assert (limits.max_booting, limits.max_cpu_percent) == (2, 85.0)
+        assert LaunchLimits.from_dict(None) == LaunchLimits()
+
+
+@pytest.mark.unit
+class TestAcquire:
+    """Ожидание и выдача допусков."""
+
+    async def test_booting_window(self):
+        """Допуски выдаются частями по мере загрузки эмуляторов."""
+        admission = controller(max_booting=2, boot_seconds=0.05)
+
+        assert await admission.acquire(5) == 2
+        started = time.monotonic()
+        assert await admission.acquire(3) == 2
+        assert time.monotonic() - started >= 0.04
+
+        stats = admission.get_stats()
+        assert (stats['admitted'], stats['deferred'], stats['booting']) == (4, 1, 2)
+        assert stats['launches_per_minute'] == 4
+
+    async def test_released_on_telemetry(self):
+        """Ожидающий запуск допускается, когда загрузка CPU падает."""
+        telemetry = {'cpu_usage': 95.0, 'memory_usage': 40.0}
+        admission = controller(telemetry, recheck_interval=5.0)
+
+        waiter = asyncio.create_task(admission.acquire(1))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+        assert admission.get_stats()['waiting'] == 1
+
+        telemetry['cpu_usage'] = 20.0
+        admission.notify()
+        assert await asyncio.wait_for(waiter, 1) == 1
+
+    async def test_max_wait_and_release(self):
+        """Без запаса в течение max_wait запуск отклоняется, release возвращает допуск."""
+        admission = controller(max_booting=1, max_wait=0.05)
+
+        assert await admission.acquire(1) == 1
+        assert await admission.acquire(2) == 0
+        assert admission.stats['rejected'] == 2
+
+        admission.release(1)
+        assert admission.headroom() == 1
+        assert admission.get_stats()['launches_per_minute'] == 0
+
+
+@pytest.fixture
+def manager():
+    """LDPlayerManager поверх симулятора с допуском не более двух загружающихся."""
+    fleet = SimulatedFleet(workstations=1, emulators=6, prefix="adm_ws")
+    config = fleet.configs()[0]
+    ldplayer = LDPlayerManager(
+        WorkstationManager(config, session_factory=fleet.session_factory),
+        launch_limits={'max_booting': 2, 'boot_seconds': 0.05, 'recheck_interval': 0.01}
+    )
+    ldplayer._counters = FleetCounters()
+    ldplayer.fleet = fleet
+    yield ldplayer
+    get_inventory().forget_workstation(config.id)
+    ldplayer.workstation.disconnect()
+    ldplayer.workstation.shutdown_executor()
+
+
+@pytest.mark.unit
+class TestManagerAdmission:
+    """Допуск запусков в LDPlayerManager."""
+
+    async def test_batch_in_chunks(self, manager):
+        """Пакет из 6 запусков выполняется частями по 2."""
+        execute = manager._batch_executor.execute
+        chunks = []
+
+        def recorded(items):
+            chunks.append(len(items))
+            return execute(items)
+
+        manager._batch_executor.execute = recorded
+        names = [emulator.name for emulator in manager.fleet.workstations["adm_ws_000"].emulators]
+        operations = manager.batch_operation(names, OperationType.START)
+
+        await manager._execute_item(manager._operation_queue.get_nowait())
+
+        assert chunks == [2, 2, 2]
+        assert all(op.status == OperationStatus.COMPLETED for op in operations)
+        assert all(emulator.running for emulator in manager.fleet.workstations["adm_ws_000"].emulators)
+        assert manager.get_admission_stats()['launches_per_minute'] == 6
+
+    async def test_rejected_launch(self, manager):
+        """Запуск без запаса станции завершается ошибкой, эмулятор не запускается."""
+        manager.workstation.config.cpu_usage = 99.0
+        manager.admission.limits.max_wait = 0.02
+
+        op = manager.start_emulator("LDPlayer-1")
+        await manager._execute_item(manager._operation_queue.get_nowait())
+
+        assert op.status == OperationStatus.FAILED
+        assert "Нет запаса ресурсов" in op.result
+        assert not any(emulator.running for emulator in manager.fleet.workstations["adm_ws_000"].emulators)
+
+    async def test_running_emulator_skips_admission(self, manager):
+        """Повторный запуск запущенного эмулятора не занимает слот загрузки."""
+        operations = []
+        for _ in range(3):
+            operations.append(manager.start_emulator("LDPlayer-1"))
+            await manager._execute_item(manager._operation_queue.get_nowait())
+
+        assert all(op.status == OperationStatus.COMPLETED for op in operations)
+        assert "уже запущен" in operations[-1].result
+        assert manager.get_admission_stats()['admitted'] == 1
+        assert manager.admission.headroom() == 1
+
+    async def test_measured_telemetry(self, manager):
+        """Загрузка станции, измеренная мониторингом, закрывает допуск."""
+        simulator = manager.fleet.workstations["adm_ws_000"]
+        simulator.cpu_load, simulator.memory_load = 40.0, 95.0
+        manager.admission.limits.max_wait = 0.02
+
+        info = manager.workstation.get_system_info()
+        assert (info['cpu_usage'], info['memory_usage'], info['disk_usage']) == (40.0, 95.0, 50.0)
+
+        monitor = WorkstationMonitor([manager.workstation], history=HistoryStore())
+        await monitor.start_monitoring(interval=60)
+        try:
+            deadline = time.monotonic() + 5
+            while manager.workstation.config.memory_usage != 95.0:
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.01)
+        finally:
+            await monitor.stop_monitoring()
+            monitor.history.close()
+
+        op = manager.start_emulator("LDPlayer-1")
+        await manager._execute_item(manager._operation_queue.get_nowait())
+        assert op.status == OperationStatus.FAILED
+        assert "Нет запаса ресурсов" in op.result
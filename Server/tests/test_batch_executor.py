@@ -0,0 +1,176 @@
+"""
+📦 Тесты пакетного выполнения ldconsole
+
+Проверяет:
+- Компиляцию действий в PowerShell скрипт и разбиение по бюджету длины
+- Разбор JSON результата и раскладку по операциям
+- Запуск 200 эмуляторов за несколько round-trip
+"""
+
+import base64
+import json
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.core.models import OperationStatus, OperationType
+from src.remote.batch_executor import (
+    BatchItem, LDConsoleBatchExecutor, parse_batch_output
+)
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.workstation import WorkstationManager
+
+
+class _Result:
+    """Результат команды в формате pywinrm."""
+
+    def __init__(self, stdout: str = "", status_code: int = 0):
+        self.status_code = status_code
+        self.std_out = stdout.encode("utf-8")
+        self.std_err = b""
+
+
+class FakeBatchSession:
+    """Сессия, исполняющая пакетные скрипты как удаленный PowerShell."""
+
+    def __init__(self, emulators: int, running=(), broken=()):
+        self.emulators = emulators
+        self.running = set(running)
+        self.broken = set(broken)
+        self.scripts = []
+
+    def run_cmd(self, command, args=()):
+        if command.startswith("powershell -encodedcommand "):
+            script = base64.b64decode(command.split()[-1]).decode("utf-16-le")
+            self.scripts.append(script)
+            manifest = script.split("ConvertFrom-Json '", 1)[1].split("').items", 1)[0]
+            items = json.loads(manifest.replace("''", "'"))["items"]
+            return _Result(json.dumps([
+                {"i": i, "c": 1 if item["a"][2] in self.broken else 0,
+                 "o": "error" if item["a"][2] in self.broken else ""}
+                for i, item in enumerate(items)
+            ]))
+        if "list2" in args:
+            return _Result("".join(
+                f"{i},emu-{i},{1 if f'emu-{i}' in self.running else 0},0,0,-1,-1,960,540,240\r\n"
+                for i in range(self.emulators)
+            ))
+        return _Result("test")
+
+
+def make_manager(session: FakeBatchSession) -> WorkstationManager:
+    """Создать менеджер станции с подменённой сессией."""
+    manager = WorkstationManager(WorkstationConfig(
+        id="ws_batch", name="ws_batch", ip_address="127.0.0.1"
+    ), session_factory=lambda config: session)
+    manager._winrm_session = session
+    return manager
+
+
+@pytest.mark.unit
+class TestBatchScript:
+    """Компиляция и разбор пакетного скрипта."""
+
+    def test_chunks_fit_command_line(self):
+        """Каждая часть укладывается в бюджет и лимит командной строки."""
+        executor = LDConsoleBatchExecutor(make_manager(FakeBatchSession(0)))
+        items = [BatchItem("launch", f"emulator-{i:04d}") for i in range(500)]
+
+        chunks = executor.chunk(items)
+
+        assert sum(len(chunk) for chunk in chunks) == 500
+        for chunk in chunks:
+            script = executor.build_script(chunk)
+            assert len(script) <= executor.max_script_chars
+            encoded = base64.b64encode(script.encode("utf_16_le"))
+            assert len("powershell -encodedcommand ") + len(encoded) < 8191
+
+    def test_quotes_are_escaped(self):
+        """Одинарные кавычки и не-ASCII символы не ломают скрипт."""
+        executor = LDConsoleBatchExecutor(make_manager(FakeBatchSession(0)))
+        script = executor.build_script([BatchItem("modify", "O'Brien ‘x’", {"model": "SM-G960F"})])
+
+        manifest = script.split("ConvertFrom-Json '", 1)[1].split("').items", 1)[0]
+        assert "''" in manifest
+        assert "‘" not in script
+        items = json.loads(manifest.replace("''", "'"))["items"]
+        assert items[0]["a"] == ["modify", "--name", "O'Brien ‘x’", "--model", "SM-G960F"]
+
+    def test_unsupported_action(self):
+        """Неподдерживаемое действие отклоняется."""
+        with pytest.raises(ValueError):
+            BatchItem("add", "x")
+
+    def test_parse_output(self):
+        """Отсутствующие элементы помечаются ошибкой."""
+        results = parse_batch_output('[{"i":0,"c":0,"o":"ok\\r\\n"},{"i":2,"c":3,"o":""}]', 3)
+
+        assert results[0].success and results[0].output == "ok"
+        assert results[1].error is not None
+        assert results[2].exit_code == 3 and not results[2].success
+
+        with pytest.raises(ValueError):
+            parse_batch_output("Access denied", 1)
+
+
+@pytest.mark.unit
+class TestBatchOperation:
+    """Раскладка результатов пакета по операциям."""
+
+    async def test_batch_start_fan_out(self):
+        """Результаты пакета раскладываются по операциям."""
+        session = FakeBatchSession(5, running={"emu-1"}, broken={"emu-2"})
+        manager = LDPlayerManager(make_manager(session))
+
+        operations = manager.batch_operation(
+            ["emu-0", "emu-1", "emu-2", "missing"], OperationType.START
+        )
+        batch = manager._operation_queue.get_nowait()
+        assert batch == operations
+
+        await manager._execute_batch(batch)
+
+        statuses = [op.status for op in operations]
+        assert statuses == [
+            OperationStatus.COMPLETED, OperationStatus.COMPLETED,
+            OperationStatus.FAILED, OperationStatus.FAILED
+        ]
+        assert "уже запущен" in operations[1].result
+        assert "не найден" in operations[3].error_message
+        assert manager.get_active_operations() == []
+
+        # В скрипт попали только emu-0 и emu-2
+        assert len(session.scripts) == 1
+
+    async def test_modify_validation(self):
+        """Некорректные настройки modify отклоняются до выполнения скрипта."""
+        session = FakeBatchSession(2)
+        manager = LDPlayerManager(make_manager(session))
+
+        operations = manager.batch_operation(["emu-0"], OperationType.MODIFY, cpu=7)
+        await manager._execute_batch(manager._operation_queue.get_nowait())
+
+        assert operations[0].status == OperationStatus.FAILED
+        assert session.scripts == []
+
+
+@pytest.mark.performance
+class TestBatchRoundTrips:
+    """Количество round-trip при массовых операциях."""
+
+    async def test_start_200_emulators(self):
+        """Запуск 200 эмуляторов - несколько round-trip, а не 200."""
+        session = FakeBatchSession(200)
+        manager = LDPlayerManager(make_manager(session))
+
+        operations = manager.batch_operation([f"emu-{i}" for i in range(200)], OperationType.START)
+        await manager._execute_batch(manager._operation_queue.get_nowait())
+
+        assert all(op.status == OperationStatus.COMPLETED for op in operations)
+        assert len(session.scripts) <= 5
+        assert manager._batch_executor.stats["round_trips"] == len(session.scripts)
+        manager.workstation.shutdown_executor()
@@ -0,0 +1,216 @@
+"""
+🩹 Тесты кэша списка эмуляторов
+
+Проверяет:
+- Создание, переименование, удаление, запуск и modify без повторного list2
+- Версию кэша и признак оптимистичного состояния
+- Ленивую фоновую проверку list2 после серии изменений
+- Отражение результатов пакетных операций в кэше
+- Stale-while-revalidate: устаревший список отдается сразу, обновление в фоне
+- Отдачу прежнего списка при недоступной станции до max_staleness
+- Сохранение настроек stale-while-revalidate в файле конфигурации
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import ConfigManager, SystemConfig, WorkstationConfig
+from src.core.inventory import get_inventory
+from src.core.models import EmulatorStatus, OperationType
+from src.remote.batch_executor import BatchItem
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+@pytest.fixture
+def simulated():
+    """Менеджер станции поверх симулятора с 5 эмуляторами."""
+    fleet = SimulatedFleet(workstations=1, emulators=5, prefix="patch_ws")
+    manager = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+    yield manager, fleet.workstations["patch_ws_000"]
+    get_inventory().forget_workstation(manager.config.id)
+    manager.disconnect()
+    manager.shutdown_executor()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Дождаться выполнения условия фоновой работой менеджера."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "фоновый list2 не завершился"
+        time.sleep(0.01)
+
+
+def wait_verified(manager: WorkstationManager) -> None:
+    """Дождаться подтверждения кэша фоновым list2."""
+    wait_for(lambda: manager.get_emulators_cache_version()[1])
+
+
+@pytest.mark.unit
+class TestCachePatching:
+    """Кэш правится по известному результату операции."""
+
+    def test_mutations_do_not_refetch(self, simulated):
+        """Серия изменений обслуживается одним list2."""
+        manager, station = simulated
+        manager.get_emulators_list()
+        version, verified = manager.get_emulators_cache_version()
+        assert verified
+
+        assert manager.create_emulator("farm", {"cpu": 4, "resolution": "1280,720,320"})[0]
+        assert manager.rename_emulator("LDPlayer-1", "bot")[0]
+        assert manager.delete_emulator("LDPlayer-2")[0]
+        assert manager.start_emulator("farm")[0]
+
+        names = {emu.name: emu for emu in manager.get_emulators_list()}
+        assert set(names) == {"LDPlayer", "bot", "LDPlayer-3", "LDPlayer-4", "farm"}
+        assert names["farm"].status == EmulatorStatus.RUNNING
+        assert names["farm"].config.cpu_cores == 4
+        assert names["farm"].config.screen_size == "1280x720"
+        assert manager.get_emulators_cache_stats()['remote_calls'] == 1
+        assert manager.get_emulators_cache_version() == (version + 5, False)
+        assert station.ldconsole(["isrunning", "--name", "farm"])[1] == "running"
+
+    def test_lazy_verification(self, simulated):
+        """Чтение после паузы в изменениях запускает одну фоновую проверку."""
+        manager, station = simulated
+        manager.get_emulators_list()
+        assert manager.stop_emulator("LDPlayer-3")[1].endswith("уже остановлен")
+        assert manager.start_emulator("LDPlayer-3")[0]
+
+        # Пауза еще не прошла - проверки нет
+        manager.get_emulators_list()
+        assert manager.get_emulators_cache_stats()['verifications'] == 0
+
+        # Изменение вне сервера станет видно после проверки
+        station.ldconsole(["quit", "--name", "LDPlayer-3"])
+        manager._verify_delay = 0
+        # Оптимистичный кэш отдается сразу, проверка идет в фоне
+        assert len(manager.get_emulators_list()) == 5
+
+        wait_verified(manager)
+        stats = manager.get_emulators_cache_stats()
+        assert (stats['verifications'], stats['remote_calls']) == (1, 2)
+        assert manager.find_emulator("LDPlayer-3").status == EmulatorStatus.STOPPED
+
+    async def test_batch_results_patch_cache(self, simulated):
+        """Успешные элементы пакета вносятся в кэш без list2."""
+        manager, station = simulated
+        ldplayer = LDPlayerManager(manager)
+        manager.get_emulators_list()
+
+        operations = ldplayer.batch_operation(["LDPlayer-1", "LDPlayer-4"], OperationType.START)
+        await ldplayer._execute_batch(ldplayer._operation_queue.get_nowait())
+
+        running = [emu.name for emu in manager.get_emulators_list() if emu.status == EmulatorStatus.RUNNING]
+        assert running == ["LDPlayer-1", "LDPlayer-4"]
+        assert station.running_count == 2
+        assert manager.get_emulators_cache_stats()['remote_calls'] == 1
+        assert not manager.get_emulators_cache_version()[1]
+        assert len(operations) == 2
+
+    async def test_failed_batch_marks_cache_unverified(self, simulated):
+        """Неудачный пакет не меняет кэш, но отправляет его на проверку list2."""
+        manager, station = simulated
+        ldplayer = LDPlayerManager(manager)
+        manager.get_emulators_list()
+        station._ld_launch = lambda params: (1, "", "launch failed")
+
+        # Исполнитель пакетов кэш станции не трогает
+        ldplayer._batch_executor.execute([BatchItem("launch", "LDPlayer-1")])
+        assert manager.get_emulators_cache_version()[1]
+
+        operations = ldplayer.batch_operation(["LDPlayer-1"], OperationType.START)
+        await ldplayer._execute_batch(ldplayer._operation_queue.get_nowait())
+
+        assert operations[0].error_message
+        assert manager.find_emulator("LDPlayer-1").status == EmulatorStatus.STOPPED
+        assert not manager.get_emulators_cache_version()[1]
+
+    async def test_batch_modify_patches_cache(self, simulated):
+        """Пакетный modify вносит новые настройки в кэш без list2."""
+        manager, station = simulated
+        ldplayer = LDPlayerManager(manager)
+        manager.get_emulators_list()
+
+        operations = ldplayer.batch_operation(["LDPlayer-1", "LDPlayer-2"], OperationType.MODIFY, cpu=4, memory=4096)
+        await ldplayer._execute_batch(ldplayer._operation_queue.get_nowait())
+
+        assert all(op.result and op.error_message is None for op in operations)
+        configs = [manager.find_emulator(name).config for name in ("LDPlayer-1", "LDPlayer-2")]
+        assert [(config.cpu_cores, config.memory_mb) for config in configs] == [(4, 4096), (4, 4096)]
+        assert [emulator.cpu for emulator in station.emulators[1:3]] == [4, 4]
+        assert manager.get_emulators_cache_stats()['remote_calls'] == 1
+
+
+@pytest.mark.unit
+class TestStaleWhileRevalidate:
+    """Устаревший список отдается сразу и обновляется в фоне."""
+
+    def test_stale_served_with_one_refresh(self):
+        """После TTL чтения получают прежний список, list2 выполняется один раз в фоне."""
+        fleet = SimulatedFleet(workstations=1, emulators=5, latency=0.02, prefix="swr_ws")
+        station = fleet.workstations["swr_ws_000"]
+        manager = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+        manager._cache_ttl = 0.05
+
+        try:
+            manager.get_emulators_list()
+            station.ldconsole(["launch", "--name", "LDPlayer-2"])
+            time.sleep(0.06)
+
+            started = time.perf_counter()
+            snapshots = [manager.get_emulators_snapshot() for _ in range(10)]
+            elapsed = time.perf_counter() - started
+
+            # Чтения не ждут list2 (задержка станции 20ms на обмен)
+            assert elapsed < 0.02
+            assert all(snapshot.stale and snapshot.age >= 0.05 for snapshot in snapshots)
+            assert all(len(snapshot.emulators) == 5 for snapshot in snapshots)
+            wait_for(lambda: not manager.get_emulators_cache_stats()['stale'])
+            stats = manager.get_emulators_cache_stats()
+            assert (stats['background_refreshes'], stats['remote_calls'], stats['stale_served']) == (1, 2, 10)
+            assert manager.find_emulator("LDPlayer-2").status == EmulatorStatus.RUNNING
+        finally:
+            get_inventory().forget_workstation(manager.config.id)
+            manager.disconnect()
+            manager.shutdown_executor()
+
+    def test_unreachable_host_keeps_state(self, simulated):
+        """Недоступная станция: прежний список с ошибкой до max_staleness, затем пустой."""
+        manager, station = simulated
+        manager._cache_ttl = 0
+        manager.get_emulators_list()
+        # ldconsole на станции перестал отвечать
+        station._ld_list2 = lambda params: (1, "", "ldconsole не отвечает")
+
+        assert len(manager.get_emulators_list()) == 5
+        wait_for(lambda: manager.get_emulators_cache_stats()['refresh_failures'] >= 1)
+
+        snapshot = manager.get_emulators_snapshot()
+        assert len(snapshot.emulators) == 5
+        assert snapshot.stale
+        assert snapshot.last_error
+
+        manager._max_staleness = 0
+        assert manager.get_emulators_list() == []
+
+    def test_settings_survive_save(self, tmp_path):
+        """TTL и max_staleness станции сохраняются и читаются из config.json."""
+        manager = ConfigManager(str(tmp_path / "config.json"))
+        manager._config = SystemConfig(
+            base_dir=tmp_path, configs_dir=tmp_path / "configs",
+            logs_dir=tmp_path / "logs", backups_dir=tmp_path / "backups",
+            workstations=[WorkstationConfig(id="ws", name="ws", ip_address="10.0.0.1",
+                                            emulators_cache_ttl=5, emulators_max_staleness=60)]
+        )
+        manager.save_config()
+
+        loaded = ConfigManager(str(tmp_path / "config.json")).load_config().workstations[0]
+        assert (loaded.emulators_cache_ttl, loaded.emulators_max_staleness) == (5, 60)
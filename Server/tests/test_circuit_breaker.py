@@ -0,0 +1,213 @@
+"""
+🔌 Тесты circuit breaker
+
+Проверяет:
+- Открытие по доле ошибок в скользящем окне
+- Half-open: ровно один пробный вызов, закрытие или повторное открытие
+- Работу декоратора из синхронного кода без event loop
+- Быстрый отказ для недоступной станции
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.utils.error_handler import (
+    CircuitBreaker, CircuitOpenError, CircuitState, ErrorCategory,
+    get_error_handler, with_circuit_breaker
+)
+
+
+class FakeClock:
+    """Управляемое монотонное время."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    """Создать breaker с окном 10s и паузой 30s."""
+    kwargs.setdefault('window_seconds', 10)
+    kwargs.setdefault('open_seconds', 30)
+    return CircuitBreaker("network:ws_test", min_calls=4, clock=clock, **kwargs)
+
+
+class FlakyHost:
+    """Объект станции с управляемыми сбоями."""
+
+    def __init__(self, ws_id: str):
+        self.config = WorkstationConfig(id=ws_id, name=ws_id, ip_address="127.0.0.1")
+        self.error = ConnectionError("connection refused")
+        self.calls = 0
+
+    @with_circuit_breaker(ErrorCategory.NETWORK, operation_name="Flaky call")
+    def call(self) -> str:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return "ok"
+
+    @with_circuit_breaker(ErrorCategory.NETWORK, operation_name="Flaky async call")
+    async def call_async(self) -> str:
+        return self.call.__wrapped__(self)
+
+
+@pytest.fixture
+def host(request):
+    """Станция с отдельным breaker, удаляемым после теста."""
+    flaky = FlakyHost(f"ws_cb_{request.node.name}")
+    yield flaky
+    handler = get_error_handler()
+    for key in [key for key in handler.circuit_breakers if key.endswith(flaky.config.id)]:
+        del handler.circuit_breakers[key]
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Переходы состояний breaker."""
+
+    def test_opens_on_failure_rate(self):
+        """Breaker открывается, когда доля ошибок достигает порога."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED  # вызовов меньше min_calls
+
+        assert breaker.record_failure() is CircuitState.OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after == pytest.approx(30)
+        assert breaker.get_stats()['rejected'] == 1
+
+    def test_window_forgets_old_failures(self):
+        """Ошибки за пределами окна не учитываются."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 11
+        breaker.record_failure()
+        breaker.record_success()
+
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.get_stats()['window_calls'] == 2
+
+    def test_half_open_single_probe(self):
+        """После паузы пропускается ровно один пробный вызов."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+
+        clock.now += 31
+        assert breaker.acquire() is True
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.acquire() is None
+
+        assert breaker.record_success() is CircuitState.CLOSED
+        assert breaker.acquire() is False
+
+    def test_failed_probe_reopens_with_backoff(self):
+        """Неудачная проба снова открывает breaker с удвоенной паузой."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+
+        clock.now += 31
+        assert breaker.allow()
+        assert breaker.record_failure() is CircuitState.OPEN
+        assert breaker.retry_after == pytest.approx(60)
+
+        # Проба без результата (отмена) освобождает место для следующей
+        clock.now += 61
+        assert breaker.allow()
+        breaker.release_probe()
+        assert breaker.allow()
+
+
+@pytest.mark.unit
+class TestCircuitBreakerDecorator:
+    """Декоратор with_circuit_breaker."""
+
+    def test_sync_call_without_event_loop(self, host):
+        """Синхронные вызовы открывают breaker без running loop."""
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                host.call()
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            host.call()
+
+        assert isinstance(exc_info.value, RuntimeError)
+        assert host.calls == 5
+        handler = get_error_handler()
+        assert handler.is_circuit_breaker_active(ErrorCategory.NETWORK, host.config.id)
+        assert not handler.is_circuit_breaker_active(ErrorCategory.EXTERNAL, host.config.id)
+
+    async def test_async_call(self, host):
+        """Асинхронные вызовы используют тот же breaker."""
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                await host.call_async()
+
+        with pytest.raises(CircuitOpenError):
+            await host.call_async()
+        with pytest.raises(CircuitOpenError):
+            host.call()
+
+    def test_probe_closes_after_recovery(self, host):
+        """Станция восстановилась - пробный вызов закрывает breaker."""
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                host.call()
+
+        breaker = get_error_handler().get_circuit_breaker(ErrorCategory.NETWORK, host.config.id)
+        breaker._open_until = 0.0
+        host.error = None
+
+        assert host.call() == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_validation_errors_do_not_open(self, host):
+        """Ошибки валидации не считаются сбоем станции."""
+        host.error = ValueError("invalid emulator name")
+        for _ in range(10):
+            with pytest.raises(ValueError):
+                host.call()
+
+        assert not get_error_handler().is_circuit_breaker_active(ErrorCategory.NETWORK, host.config.id)
+
+
+@pytest.mark.performance
+class TestFailFast:
+    """Стоимость вызова к недоступной станции."""
+
+    def test_open_breaker_rejects_in_microseconds(self, host):
+        """Отказ открытого breaker занимает микросекунды, а не таймаут."""
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                host.call()
+
+        calls = 10000
+        started = time.perf_counter()
+        for _ in range(calls):
+            try:
+                host.call()
+            except CircuitOpenError:
+                pass
+        per_call = (time.perf_counter() - started) / calls
+
+        assert host.calls == 5
+        assert per_call < 100e-6
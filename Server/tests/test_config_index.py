@@ -0,0 +1,184 @@
+"""
+🗂️ Тесты индекса конфигураций эмуляторов
+
+Проверяет:
+- Разбор JSON конфигураций LDPlayer 9 и старого формата key=value
+- Повторное чтение только измененных файлов (mtime, размер)
+- Удаление строк исчезнувших файлов
+- Колоночное представление и поиск по имени/индексу
+- Дополнение результатов LocalLDPlayerScanner из индекса
+- Эндпоинт конфигураций только для локальной станции
+"""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.workstations import get_workstation_emulator_configs
+from src.remote.config_index import ConfigIndex, get_config_index, parse_config
+from src.remote.emulator_scanner import EmulatorInfo, LocalLDPlayerScanner
+
+
+def write_config(directory: Path, index: int, name: str, cpu: int = 2, memory: int = 2048) -> Path:
+    """Записать JSON конфигурацию эмулятора как LDPlayer 9."""
+    path = directory / f"leidian{index}.config"
+    path.write_text(json.dumps({
+        "statusSettings.playerName": name,
+        "advancedSettings.cpuCount": cpu,
+        "advancedSettings.memorySize": memory,
+        "advancedSettings.resolution": {"width": 1280, "height": 720},
+        "advancedSettings.resolutionDpi": 240,
+        "propertySettings.phoneIMEI": f"86{index:013d}",
+        "propertySettings.phoneModel": "SM-G9880",
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def ldplayer(tmp_path):
+    """Каталог установки LDPlayer с vms/config."""
+    (tmp_path / "vms" / "config").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestParseConfig:
+    """Разбор файлов конфигурации."""
+
+    def test_json(self, ldplayer):
+        """Поля LDPlayer 9 и индекс из имени файла."""
+        path = write_config(ldplayer / "vms" / "config", 3, "farm", cpu=4)
+
+        row = parse_config(str(path), path.read_text(encoding="utf-8"))
+
+        assert (row.index, row.name, row.cpu, row.memory_mb, row.dpi) == (3, "farm", 4, 2048, 240)
+        assert row.resolution == "1280x720"
+        assert row.imei == "860000000000003"
+        assert row.android_id is None
+
+    def test_key_value(self):
+        """Старый формат key=value, имя берется из файла."""
+        row = parse_config("/vms/config/bot.config", 'phoneMemory="3072"\ncpuCores=2\n# width=1\nwidth=960\n')
+
+        assert (row.index, row.name, row.cpu, row.memory_mb) == (None, "bot", 2, 3072)
+        assert row.resolution == "960x?"
+
+
+@pytest.mark.unit
+class TestConfigIndex:
+    """Инкрементальное обновление индекса."""
+
+    def test_reads_only_changed_files(self, ldplayer):
+        """Повторное обновление читает только измененные и удаляет исчезнувшие файлы."""
+        config_dir = ldplayer / "vms" / "config"
+        paths = [write_config(config_dir, i, f"emu-{i}") for i in range(5)]
+        index = ConfigIndex([str(config_dir)])
+
+        assert index.refresh() == 5
+        assert index.refresh() == 0
+
+        write_config(config_dir, 1, "emu-1", cpu=8)
+        os.utime(paths[1], ns=(time.time_ns(), time.time_ns() + 10**9))
+        paths[4].unlink()
+
+        assert index.refresh() == 2
+        assert index.get_stats()['files_read'] == 6
+        assert index.find("emu-1").cpu == 8
+        assert index.find("emu-4") is None
+        assert index.find_index(2).name == "emu-2"
+
+    def test_columns(self, ldplayer):
+        """Колонки строятся по строкам индекса и переиспользуются до изменения."""
+        config_dir = ldplayer / "vms" / "config"
+        for i in range(3):
+            write_config(config_dir, i, f"emu-{i}", cpu=i + 1)
+        index = get_config_index(str(ldplayer))
+        index.refresh()
+
+        columns = index.columns()
+
+        assert sorted(columns["cpu"]) == [1, 2, 3]
+        assert set(columns["name"]) == {"emu-0", "emu-1", "emu-2"}
+        assert index.columns() is columns
+        assert get_config_index(str(ldplayer)) is index
+
+    def test_scanner_uses_index(self, ldplayer):
+        """Сканер дополняет эмуляторы из индекса по имени."""
+        write_config(ldplayer / "vms" / "config", 0, "LDPlayer", cpu=4, memory=4096)
+        scanner = LocalLDPlayerScanner(str(ldplayer))
+        emulators = [EmulatorInfo(name="LDPlayer"), EmulatorInfo(name="missing")]
+
+        scanner._enhance_with_configs(emulators)
+        scanner._enhance_with_configs(emulators)
+
+        assert (emulators[0].cpu_cores, emulators[0].memory_mb, emulators[0].resolution) == (4, 4096, "1280x720")
+        assert emulators[0].config_path.endswith("leidian0.config")
+        assert emulators[1].config_path is None
+        assert get_config_index(str(ldplayer)).get_stats()['files_read'] == 1
+
+
+class StationService:
+    """WorkstationService с одной станцией."""
+
+    def __init__(self, ip_address: str, ldplayer_path: str):
+        self.station = SimpleNamespace(ip_address=ip_address, ldplayer_path=ldplayer_path)
+
+    async def get_or_fail(self, workstation_id: str):
+        return self.station
+
+
+@pytest.mark.unit
+class TestConfigsEndpoint:
+    """GET /api/workstations/{id}/emulators/configs."""
+
+    async def test_local_station(self, ldplayer):
+        """Локальная станция отвечает колонками индекса после refresh."""
+        write_config(ldplayer / "vms" / "config", 0, "LDPlayer", cpu=4)
+
+        response = await get_workstation_emulator_configs(
+            "local", refresh=True, service=StationService("127.0.0.1", str(ldplayer)), current_user="admin"
+        )
+
+        assert response["count"] == 1
+        assert response["columns"]["cpu"] == [4]
+
+    async def test_remote_station(self, ldplayer):
+        """Путь удаленной станции не читается с диска сервера."""
+        write_config(ldplayer / "vms" / "config", 0, "LDPlayer")
+
+        with pytest.raises(HTTPException) as error:
+            await get_workstation_emulator_configs(
+                "ws_001", refresh=True, service=StationService("192.168.1.101", str(ldplayer)), current_user="admin"
+            )
+
+        assert error.value.status_code == 400
+        assert get_config_index(str(ldplayer)).get_stats()['files_read'] == 0
+
+
+@pytest.mark.performance
+class TestConfigIndexScale:
+    """Обновление индекса без изменений не читает файлы."""
+
+    def test_unchanged_refresh(self, ldplayer):
+        """1000 конфигураций: повторное обновление только перечисляет каталог."""
+        config_dir = ldplayer / "vms" / "config"
+        for i in range(1000):
+            write_config(config_dir, i, f"emu-{i}")
+        index = ConfigIndex([str(config_dir)])
+        index.refresh()
+
+        started = time.perf_counter()
+        changed = index.refresh()
+        elapsed = time.perf_counter() - started
+
+        assert changed == 0
+        assert index.get_stats()['files_read'] == 1000
+        assert elapsed < 0.5
@@ -0,0 +1,135 @@
+"""
+🌐 Тесты параллельного обхода ConnectionPool
+
+Проверяет:
+- connect_all выполняется параллельно (max задержки, а не сумма)
+- Таймаут станции и общий срок обхода
+- Потоковую выдачу результатов по мере ответа станций
+"""
+
+import threading
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.remote.protocols import ConnectionPool, RemoteConnectionManager
+
+
+class SlowConnection(RemoteConnectionManager):
+    """Менеджер подключений с заданной задержкой ответа."""
+
+    def __init__(self, ws_id: str, delay: float, ok: bool = True, release: threading.Event = None):
+        super().__init__(WorkstationConfig(id=ws_id, name=ws_id, ip_address="127.0.0.1"))
+        self.delay = delay
+        self.ok = ok
+        self.release = release or threading.Event()
+        self.connected = False
+
+    def connect(self) -> bool:
+        self.release.wait(self.delay)
+        self.connected = self.ok
+        return self.ok
+
+    def disconnect(self) -> None:
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def test_connection(self):
+        ok = self.connect()
+        return ok, "ok" if ok else "refused"
+
+
+def make_pool(*connections: SlowConnection) -> ConnectionPool:
+    """Создать пул с заданными подключениями."""
+    pool = ConnectionPool()
+    for connection in connections:
+        pool._connections[connection.config.id] = connection
+    return pool
+
+
+@pytest.mark.unit
+class TestConcurrentConnectAll:
+    """Параллельное подключение к станциям."""
+
+    async def test_connect_all_runs_concurrently(self):
+        """Время подключения равно самой медленной станции, а не сумме."""
+        pool = make_pool(*[SlowConnection(f"ws_{i}", 0.2) for i in range(8)])
+        try:
+            started = time.perf_counter()
+            results = await pool.connect_all(host_timeout=2)
+            elapsed = time.perf_counter() - started
+
+            assert results == {f"ws_{i}": True for i in range(8)}
+            assert elapsed < 0.2 * 8 / 2
+            assert sorted(pool.get_connected_workstations()) == sorted(results)
+        finally:
+            pool.cleanup()
+
+    async def test_host_timeout(self):
+        """Зависшая станция получает False по своему таймауту."""
+        release = threading.Event()
+        pool = make_pool(
+            SlowConnection("fast", 0.01),
+            SlowConnection("hung", 30, release=release),
+            SlowConnection("refused", 0.01, ok=False),
+        )
+        try:
+            started = time.perf_counter()
+            results = await pool.connect_all(host_timeout=0.3, deadline=5)
+
+            assert results == {"fast": True, "hung": False, "refused": False}
+            assert time.perf_counter() - started < 1.5
+        finally:
+            release.set()
+            pool.cleanup()
+
+    async def test_overall_deadline(self):
+        """Общий срок обхода ограничивает время даже при больших таймаутах станций."""
+        release = threading.Event()
+        pool = make_pool(
+            SlowConnection("fast", 0.01),
+            SlowConnection("hung", 30, release=release),
+        )
+        try:
+            started = time.perf_counter()
+            results = await pool.test_all(host_timeout=30, deadline=0.3)
+
+            assert results["fast"] == (True, "ok")
+            assert results["hung"][0] is False
+            assert "срок" in results["hung"][1]
+            assert time.perf_counter() - started < 1.5
+        finally:
+            release.set()
+            pool.cleanup()
+
+    async def test_results_stream_in_completion_order(self):
+        """Быстрые станции выдаются раньше медленных."""
+        pool = make_pool(
+            SlowConnection("slow", 0.4),
+            SlowConnection("fast", 0.01),
+        )
+        try:
+            order = []
+            async for ws_id, connected in pool.iter_connect_all(host_timeout=2):
+                order.append((ws_id, connected))
+
+            assert order == [("fast", True), ("slow", True)]
+        finally:
+            pool.cleanup()
+
+    async def test_disconnect_all(self):
+        """disconnect_all отключает все станции."""
+        pool = make_pool(*[SlowConnection(f"ws_{i}", 0.01) for i in range(4)])
+        try:
+            await pool.connect_all()
+            await pool.disconnect_all()
+            assert pool.get_connected_workstations() == []
+        finally:
+            pool.cleanup()
@@ -0,0 +1,189 @@
+"""
+🔢 Тесты счетчиков парка
+
+Проверяет:
+- Счетчики эмуляторов по станциям и статусам при изменениях реестра
+- Счетчики операций по статусам и типам при переходах
+- Замену операции с тем же ID и очистку завершенных без двойного учета
+- Снятие с учета завершенных операций при вытеснении и очистке
+- Чтение счетчиков за O(1) при 100k эмуляторов
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.counters import FleetCounters
+from src.core.inventory import EmulatorInventory
+from src.core.models import Emulator, EmulatorStatus, Operation, OperationStatus, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def emulators(workstation_id: str, count: int, running: int = 0):
+    """Эмуляторы станции, первые running из них запущены."""
+    return [
+        Emulator(id=f"{workstation_id}_emu-{i}", name=f"emu-{i}", workstation_id=workstation_id,
+                 status=EmulatorStatus.RUNNING if i < running else EmulatorStatus.STOPPED)
+        for i in range(count)
+    ]
+
+
+def assert_matches_index(inventory: EmulatorInventory):
+    """Счетчики совпадают с пересчетом реестра."""
+    counters = inventory.counters
+    all_emulators = inventory.by_status(EmulatorStatus.RUNNING) + inventory.by_status(EmulatorStatus.STOPPED)
+    for status in (EmulatorStatus.RUNNING, EmulatorStatus.STOPPED):
+        assert counters.emulators(status=status) == len(inventory.by_status(status))
+        for workstation_id in {emulator.workstation_id for emulator in all_emulators}:
+            assert counters.emulators(workstation_id, status) == len(inventory.by_status(status, workstation_id))
+    assert counters.emulators() == len(all_emulators)
+
+
+@pytest.fixture
+def manager():
+    """LDPlayerManager поверх симулятора с собственными счетчиками."""
+    fleet = SimulatedFleet(workstations=1, emulators=3, prefix="cnt_ws")
+    workstation = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+    ldplayer = LDPlayerManager(workstation)
+    ldplayer._counters = FleetCounters()
+    yield ldplayer
+    workstation.disconnect()
+    workstation.shutdown_executor()
+
+
+def operation(id: str, type: OperationType = OperationType.START) -> Operation:
+    """Операция станции cnt_ws_000."""
+    return Operation(id=id, type=type, emulator_id="cnt_ws_000_LDPlayer", workstation_id="cnt_ws_000")
+
+
+@pytest.mark.unit
+class TestEmulatorCounters:
+    """Счетчики эмуляторов ведутся реестром."""
+
+    def test_inventory_transitions(self):
+        """Замена списка, смена статуса, удаление и забывание станции."""
+        inventory = EmulatorInventory()
+        inventory.replace_workstation("ws1", emulators("ws1", 5, running=2))
+        inventory.replace_workstation("ws2", emulators("ws2", 3, running=3))
+        assert_matches_index(inventory)
+        assert inventory.counters.emulators("ws2", EmulatorStatus.RUNNING) == 3
+
+        inventory.set_status("ws1", "emu-4", EmulatorStatus.RUNNING)
+        inventory.remove("ws2", "emu-0")
+        inventory.replace_workstation("ws1", emulators("ws1", 4, running=1))
+        assert_matches_index(inventory)
+        assert inventory.counters.emulators(status=EmulatorStatus.RUNNING) == 3
+
+        inventory.forget_workstation("ws2")
+        assert inventory.counters.emulators("ws2") == 0
+        assert inventory.counters.emulators() == 4
+        assert inventory.get_stats()['by_status'] == {'running': 1, 'stopped': 3}
+
+        inventory.clear()
+        assert inventory.counters.get_stats()['emulators'] == {'total': 0, 'by_status': {}}
+
+
+@pytest.mark.unit
+class TestOperationCounters:
+    """Счетчики операций ведутся переходами."""
+
+    def test_transitions(self, manager):
+        """Постановка в очередь, запуск, завершение и отмена."""
+        counters = manager._counters
+        first, second = operation("op1"), operation("op2", OperationType.STOP)
+        manager.queue_operation(first)
+        manager.queue_operation(second)
+        assert counters.operations("cnt_ws_000", OperationStatus.PENDING) == 2
+
+        first.start()
+        assert counters.operations(status=OperationStatus.PENDING) == 1
+        assert counters.operations(status=OperationStatus.RUNNING) == 1
+
+        first.complete(result="ok")
+        second.cancel()
+        assert counters.operations(status=OperationStatus.COMPLETED) == 1
+        assert counters.operations_by_type(OperationType.STOP, OperationStatus.CANCELLED) == 1
+        assert counters.operations() == 2
+        assert counters.get_stats()['operations']['by_type'] == {'start': {'completed': 1}, 'stop': {'cancelled': 1}}
+
+    def test_replace_and_cleanup(self, manager):
+        """Повторный ID заменяет операцию, очистка снимает завершенные с учета."""
+        counters = manager._counters
+        stale = operation("op1")
+        manager.queue_operation(stale)
+        manager.queue_operation(operation("op1"))
+        stale.start()
+        assert counters.operations() == 1
+        assert counters.operations(status=OperationStatus.RUNNING) == 0
+
+        done = manager.get_operation("op1")
+        done.start()
+        done.complete()
+        done.completed_at = datetime.now() - timedelta(hours=2)
+
+        assert manager.cleanup_completed_operations(keep_hours=1) == 1
+        assert counters.operations() == 0
+        done.complete(success=False, error="после очистки")
+        assert counters.operations(status=OperationStatus.FAILED) == 0
+
+    def test_retired_eviction_and_cleanup(self, manager):
+        """Вытесненные и очищенные завершенные операции снимаются с учета."""
+        counters = manager._counters
+        manager._finished_limit = 2
+        retired = []
+        for i in range(3):
+            op = operation(f"op{i}")
+            manager.queue_operation(op)
+            op.start()
+            op.complete()
+            manager._retire(op)
+            retired.append(op)
+
+        assert manager.get_operation("op0") is None
+        assert counters.operations(status=OperationStatus.COMPLETED) == 2
+
+        retired[1].completed_at = datetime.now() - timedelta(hours=2)
+        assert manager.cleanup_completed_operations(keep_hours=1) == 1
+        assert manager.get_operation("op1") is None
+        assert manager.get_operation("op2") is retired[2]
+        assert counters.operations() == 1
+
+    async def test_batch_operations(self, manager):
+        """Пакетная операция учитывает операции по эмуляторам."""
+        operations = manager.batch_operation(["LDPlayer", "LDPlayer-1", "missing"], OperationType.START)
+        await manager._execute_batch(manager._operation_queue.get_nowait())
+
+        counters = manager._counters
+        assert counters.operations() == len(operations)
+        assert counters.operations(status=OperationStatus.COMPLETED) == 2
+        assert counters.operations(status=OperationStatus.FAILED) == 1
+
+
+@pytest.mark.performance
+class TestCountersScale:
+    """Чтение счетчиков не зависит от размера парка."""
+
+    def test_reads_100k_emulators(self):
+        """100 станций x 1000 эмуляторов: 20k чтений быстрее 200 мс."""
+        inventory = EmulatorInventory()
+        for ws in range(100):
+            inventory.replace_workstation(f"ws{ws}", emulators(f"ws{ws}", 1000, running=250))
+        counters = inventory.counters
+
+        started = time.perf_counter()
+        for i in range(10_000):
+            counters.emulators(f"ws{i % 100}", EmulatorStatus.RUNNING)
+            counters.emulators(status=EmulatorStatus.RUNNING)
+        elapsed = time.perf_counter() - started
+
+        assert counters.emulators() == 100_000
+        assert counters.emulators(status=EmulatorStatus.RUNNING) == 25_000
+        assert inventory.count(status=EmulatorStatus.STOPPED) == 75_000
+        assert elapsed < 0.2
@@ -0,0 +1,169 @@
+"""
+📈 Тесты истории метрик
+
+Проверяет:
+- Пакетную запись точек одной транзакцией
+- Минутные и часовые агрегаты (avg, min, max, count)
+- Удаление устаревших сырых точек при сохранении агрегатов
+- Выбор разрешения по длине интервала
+- WAL режим файловой базы
+- Запись истории мониторингом станций поверх симулятора
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.history import HistoryStore, emulator_series, workstation_series
+from src.core.inventory import get_inventory
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager, WorkstationMonitor
+
+# Начало прошлого часа: в пределах хранения сырых точек, агрегаты не пересекают границу часа
+T0 = (time.time() // 3600 - 1) * 3600
+
+
+@pytest.fixture
+def store():
+    """Хранилище в памяти."""
+    history = HistoryStore()
+    yield history
+    history.close()
+
+
+@pytest.mark.unit
+class TestHistoryStore:
+    """Запись, агрегаты и запросы."""
+
+    def test_batched_flush(self, store):
+        """Точки копятся в буфере и записываются одной транзакцией."""
+        for i in range(10):
+            store.record_workstation("ws1", {"active_emulators": i, "cpu_usage": 50.0}, T0 + i)
+
+        assert store.get_stats()['buffered'] == 20
+        assert store.flush() == 20
+        assert store.get_stats()['flushes'] == 1
+
+        result = store.query(workstation_series("ws1"), "active_emulators", T0, T0 + 9, resolution="raw")
+        assert [point['avg'] for point in result['points']] == list(range(10))
+
+    def test_rollups(self, store):
+        """Минутные и часовые агрегаты считаются при записи."""
+        for i in range(120):
+            store.record_workstation("ws1", {"cpu_usage": i}, T0 + i)
+        store.flush()
+        store.record_workstation("ws1", {"cpu_usage": 1000}, T0 + 30)
+
+        minutes = store.query(workstation_series("ws1"), "cpu_usage", T0, T0 + 119, resolution="1m")['points']
+        hours = store.query(workstation_series("ws1"), "cpu_usage", T0, T0 + 119, resolution="1h")['points']
+
+        assert [(p['ts'], p['count'], p['min'], p['max']) for p in minutes] == [
+            (T0, 61, 0, 1000), (T0 + 60, 60, 60, 119)
+        ]
+        assert minutes[1]['avg'] == pytest.approx(89.5)
+        assert (hours[0]['count'], hours[0]['max']) == (121, 1000)
+
+    def test_emulator_series(self, store):
+        """Состояние эмуляторов - ряд running по ID эмулятора."""
+        class Emu:
+            def __init__(self, id, status):
+                self.id, self.status = id, status
+
+        store.record_emulators([Emu("ws1_a", "running"), Emu("ws1_b", "stopped")], T0)
+        store.record_emulators([Emu("ws1_a", "stopped")], T0 + 10)
+
+        points = store.query(emulator_series("ws1_a"), "running", T0, T0 + 60, resolution="1m")['points']
+        assert points[0]['avg'] == 0.5
+
+    def test_prune_keeps_rollups(self, store):
+        """Сырые точки удаляются по сроку, агрегаты остаются."""
+        store.record_workstation("ws1", {"cpu_usage": 10}, T0)
+        store.flush()
+        store.retention[0] = 3600
+
+        assert store.prune(now=T0 + 7200) == 1
+        series = workstation_series("ws1")
+        assert store.query(series, "cpu_usage", T0, T0 + 60, resolution="raw")['points'] == []
+        assert len(store.query(series, "cpu_usage", T0, T0 + 60, resolution="1m")['points']) == 1
+
+    def test_choose_resolution(self, store):
+        """Разрешение по длине интервала и срокам хранения."""
+        now = time.time()
+
+        assert store.choose_resolution(now - 600, now) == "raw"
+        assert store.choose_resolution(now - 86400, now) == "1m"
+        assert store.choose_resolution(now - 30 * 86400, now) == "1h"
+        with pytest.raises(ValueError):
+            store.query("ws:ws1", "cpu_usage", now - 60, now, resolution="5m")
+
+    def test_wal_file(self, tmp_path):
+        """Файловая база работает в режиме WAL и переживает переоткрытие."""
+        path = tmp_path / "history.db"
+        store = HistoryStore(path)
+        store.record_workstation("ws1", {"cpu_usage": 1}, T0)
+        store.close()
+
+        store = HistoryStore(path)
+        try:
+            assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert len(store.query("ws:ws1", "cpu_usage", T0, T0 + 1, resolution="raw")['points']) == 1
+        finally:
+            store.close()
+
+
+@pytest.mark.unit
+class TestMonitorHistory:
+    """Мониторинг записывает историю."""
+
+    async def test_monitor_records(self, store):
+        """Тик мониторинга - точка станции и точки всех ее эмуляторов."""
+        fleet = SimulatedFleet(workstations=1, emulators=4, running=1, prefix="hist_ws")
+        manager = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+        monitor = WorkstationMonitor([manager], history=store)
+
+        try:
+            await monitor.start_monitoring(interval=60)
+            deadline = time.monotonic() + 5
+            while store.get_stats()['recorded'] < 11:
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.01)
+            await monitor.stop_monitoring()
+
+            now = time.time()
+            active = store.query(workstation_series("hist_ws_000"), "active_emulators", now - 60, now)
+            running = store.query(emulator_series("hist_ws_000_LDPlayer"), "running", now - 60, now)
+            assert active['resolution'] == "raw"
+            assert [point['avg'] for point in active['points']] == [1]
+            assert len(running['points']) == 1
+        finally:
+            get_inventory().forget_workstation("hist_ws_000")
+            manager.disconnect()
+            manager.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestHistoryScale:
+    """Пакетная запись парка."""
+
+    def test_flush_100k_samples(self, store):
+        """100 тиков x 1000 эмуляторов записываются быстрее 10 секунд."""
+        class Emu:
+            def __init__(self, id, status):
+                self.id, self.status = id, status
+
+        emulators = [Emu(f"ws_{i}", "running" if i % 3 else "stopped") for i in range(1000)]
+        for tick in range(100):
+            store.record_emulators(emulators, T0 + tick * 30)
+
+        started = time.perf_counter()
+        assert store.flush() == 100_000
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 10.0
+        points = store.query(emulator_series("ws_1"), "running", T0, T0 + 3000, resolution="1h")['points']
+        assert sum(point['count'] for point in points) == 100
@@ -0,0 +1,180 @@
+"""
+🗂️ Тесты реестра эмуляторов парка
+
+Проверяет:
+- Индексы по ID, имени на станции, станции и статусу
+- Замену состояния станции результатом list2
+- Обновление реестра результатами операций
+- Запросы к реестру из 50 000 эмуляторов без перебора
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.inventory import EmulatorInventory, get_inventory
+from src.core.models import Emulator, EmulatorStatus, Operation, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+from src.services.emulator_service import EmulatorService
+
+
+def make_emulator(ws_id: str, name: str, status=EmulatorStatus.STOPPED) -> Emulator:
+    """Создать эмулятор с ID в формате WorkstationManager."""
+    return Emulator(id=f"{ws_id}_{name}", name=name, workstation_id=ws_id, status=status)
+
+
+def fill(inventory: EmulatorInventory, workstations: int, emulators: int, running_every: int = 4) -> None:
+    """Заполнить реестр станциями с эмуляторами."""
+    for w in range(workstations):
+        ws_id = f"ws_{w}"
+        inventory.replace_workstation(ws_id, [
+            make_emulator(ws_id, f"emu-{i}",
+                          EmulatorStatus.RUNNING if i % running_every == 0 else EmulatorStatus.STOPPED)
+            for i in range(emulators)
+        ])
+
+
+@pytest.mark.unit
+class TestEmulatorInventory:
+    """Индексы и обновления реестра."""
+
+    def test_indexes(self):
+        """Эмулятор находится по ID, по имени на станции и по статусу."""
+        inventory = EmulatorInventory()
+        fill(inventory, workstations=2, emulators=8)
+
+        assert inventory.get("ws_1_emu-3").name == "emu-3"
+        assert inventory.find("ws_0", "emu-5").id == "ws_0_emu-5"
+        assert inventory.find("ws_0", "missing") is None
+        assert len(inventory.by_workstation("ws_1")) == 8
+        assert inventory.count(status=EmulatorStatus.RUNNING) == 4
+        assert inventory.count("ws_0", EmulatorStatus.RUNNING) == 2
+        assert {emu.workstation_id for emu in inventory.by_status("running", "ws_1")} == {"ws_1"}
+
+    def test_replace_workstation_diff(self):
+        """list2 заменяет состояние станции: новые добавлены, исчезнувшие удалены."""
+        inventory = EmulatorInventory()
+        fill(inventory, workstations=2, emulators=3)
+
+        counts = inventory.replace_workstation("ws_0", [
+            make_emulator("ws_0", "emu-0", EmulatorStatus.RUNNING),
+            make_emulator("ws_0", "emu-9"),
+        ])
+
+        assert counts == {'added': 1, 'updated': 1, 'removed': 2}
+        assert [emu.name for emu in inventory.by_workstation("ws_0")] == ["emu-0", "emu-9"]
+        assert inventory.get("ws_0_emu-1") is None
+        assert inventory.count("ws_1") == 3
+        assert inventory.count("ws_0", EmulatorStatus.RUNNING) == 1
+
+    def test_operation_results(self):
+        """Статус, переименование и удаление обновляют все индексы."""
+        inventory = EmulatorInventory()
+        fill(inventory, workstations=1, emulators=2, running_every=10)
+
+        assert inventory.set_status("ws_0", "emu-1", EmulatorStatus.RUNNING)
+        assert inventory.count("ws_0", EmulatorStatus.RUNNING) == 2
+
+        assert inventory.rename("ws_0", "emu-1", "farm")
+        assert inventory.get("ws_0_farm").status == EmulatorStatus.RUNNING
+        assert inventory.get("ws_0_emu-1") is None
+        assert inventory.find("ws_0", "emu-1") is None
+
+        assert inventory.remove("ws_0", "farm")
+        assert inventory.count(status=EmulatorStatus.RUNNING) == 1
+        assert not inventory.set_status("ws_0", "farm", EmulatorStatus.STOPPED)
+
+    def test_page(self):
+        """Страница станции и общее количество."""
+        inventory = EmulatorInventory()
+        fill(inventory, workstations=3, emulators=10)
+
+        page, total = inventory.page(offset=4, limit=3, workstation_id="ws_2")
+        assert total == 10
+        assert [emu.name for emu in page] == ["emu-4", "emu-5", "emu-6"]
+        assert inventory.page(limit=5)[1] == 30
+
+
+@pytest.mark.unit
+class TestInventoryWiring:
+    """Реестр обновляется менеджерами станций."""
+
+    def test_refresh_and_operations(self):
+        """list2 и операции WorkstationManager отражаются в реестре."""
+        fleet = SimulatedFleet(workstations=1, emulators=4, running=1, prefix="inv_wiring")
+        config = fleet.configs()[0]
+        manager = WorkstationManager(config, session_factory=fleet.session_factory)
+        inventory = get_inventory()
+
+        try:
+            assert manager.get_emulator_status("LDPlayer-2")[0] == EmulatorStatus.STOPPED
+            assert inventory.count(config.id) == 4
+
+            assert manager.start_emulator("LDPlayer-2")[0]
+            assert inventory.find(config.id, "LDPlayer-2").status == EmulatorStatus.RUNNING
+            assert inventory.count(config.id, EmulatorStatus.RUNNING) == 2
+
+            assert manager.rename_emulator("LDPlayer-3", "farm")[0]
+            assert inventory.find(config.id, "farm") is not None
+            assert manager.delete_emulator("farm")[0]
+            assert inventory.find(config.id, "farm") is None
+
+            ldplayer = LDPlayerManager(manager)
+            delete = Operation(id="op_delete", type=OperationType.DELETE, emulator_id="",
+                               workstation_id=config.id, parameters={'name': "LDPlayer-2"})
+            assert not ldplayer.is_operation_safe(delete)[0]
+        finally:
+            inventory.forget_workstation(config.id)
+            manager.disconnect()
+            manager.shutdown_executor()
+
+    async def test_service_queries_inventory(self):
+        """EmulatorService отвечает из реестра для менеджера с реестром."""
+        fleet = SimulatedFleet(workstations=1, emulators=3, prefix="inv_service")
+        config = fleet.configs()[0]
+        manager = WorkstationManager(config, session_factory=fleet.session_factory)
+        service = EmulatorService(LDPlayerManager(manager))
+
+        try:
+            emulators, total = await service.get_all(limit=2, workstation_id=config.id)
+            assert total == 3
+            assert len(emulators) == 2
+            assert (await service.get_by_id(f"{config.id}_LDPlayer-1")).name == "LDPlayer-1"
+        finally:
+            get_inventory().forget_workstation(config.id)
+            manager.disconnect()
+            manager.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestInventoryScale:
+    """Запросы к реестру из 50 000 эмуляторов."""
+
+    def test_lookups_at_50k(self):
+        """Поиск и выборки по индексам не зависят от размера парка."""
+        inventory = EmulatorInventory()
+        fill(inventory, workstations=250, emulators=200)
+        assert inventory.count() == 50000
+
+        lookups = 10000
+        started = time.perf_counter()
+        for i in range(lookups):
+            inventory.find(f"ws_{i % 250}", f"emu-{i % 200}")
+        per_lookup = (time.perf_counter() - started) / lookups
+
+        started = time.perf_counter()
+        station = inventory.by_workstation("ws_17")
+        running = inventory.count("ws_17", EmulatorStatus.RUNNING)
+        per_query = time.perf_counter() - started
+
+        # Линейный поиск по 50 000 эмуляторов занимает миллисекунды
+        assert per_lookup < 20e-6
+        assert per_query < 1e-3
+        assert len(station) == 200
+        assert running == 50
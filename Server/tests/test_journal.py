@@ -0,0 +1,184 @@
+"""
+📒 Тесты журнала операций
+
+Проверяет:
+- Групповую фиксацию переходов фоновым потоком
+- Воспроизведение незавершенных операций с последним статусом
+- Удаление завершенных операций по сроку хранения
+- Восстановление после перезапуска: возобновление ожидавших операций
+  и сверку прерванных с list2 поверх симулятора
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.counters import FleetCounters
+from src.core.inventory import get_inventory
+from src.core.journal import OperationJournal
+from src.core.models import Operation, OperationPriority, OperationStatus, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def operation(id: str, type: OperationType = OperationType.START, name: str = "LDPlayer",
+              workstation_id: str = "ws", **parameters) -> Operation:
+    """Операция над эмулятором name."""
+    return Operation(id=id, type=type, emulator_id=f"{workstation_id}_{name}", workstation_id=workstation_id,
+                     parameters={'name': name, **parameters}, priority=OperationPriority.BULK, owner="ops")
+
+
+@pytest.fixture
+def journal():
+    """Журнал в памяти."""
+    store = OperationJournal()
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestOperationJournal:
+    """Запись и воспроизведение журнала."""
+
+    def test_group_commit(self, journal):
+        """Переходы сотен операций фиксируются несколькими транзакциями."""
+        for i in range(300):
+            op = operation(f"op{i}")
+            journal.record_added(op)
+            op.status = OperationStatus.RUNNING
+            journal.record_transition(op)
+
+        deadline = time.monotonic() + 5
+        while journal.get_stats()['written'] < 600:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert journal.get_stats()['commits'] <= 10
+
+    def test_replay(self, journal):
+        """Незавершенные операции восстанавливаются с описанием и последним статусом."""
+        pending, running, done = operation("p", name="a"), operation("r", name="b"), operation("d", name="c")
+        for op in (pending, running, done):
+            journal.record_added(op)
+        running.status = OperationStatus.RUNNING
+        journal.record_transition(running)
+        done.complete(True, "ok")
+        journal.record_transition(done)
+
+        restored = {op.id: op for op in journal.replay()}
+
+        assert set(restored) == {"p", "r"}
+        assert restored["r"].status == OperationStatus.RUNNING
+        assert (restored["p"].type, restored["p"].parameters, restored["p"].priority, restored["p"].owner) == (
+            OperationType.START, {'name': 'a'}, OperationPriority.BULK, "ops"
+        )
+        assert restored["p"].created_at.timestamp() == pytest.approx(pending.created_at.timestamp())
+        assert journal.replay(workstation_id="other") == []
+
+    def test_readded_operation(self, journal):
+        """Повторная постановка операции с тем же ID начинает ее заново."""
+        first = operation("op")
+        journal.record_added(first)
+        first.complete(False, error="boom")
+        journal.record_transition(first)
+        journal.record_added(operation("op", name="other"))
+
+        [restored] = journal.replay()
+
+        assert (restored.status, restored.parameters['name']) == (OperationStatus.PENDING, "other")
+
+    def test_compact(self, journal):
+        """Завершенные раньше срока операции удаляются, незавершенные остаются."""
+        done, pending = operation("done"), operation("pending")
+        journal.record_added(done)
+        journal.record_added(pending)
+        done.cancel()
+        journal.record_transition(done)
+        journal.flush()
+
+        assert journal.compact(now=time.time() + journal.retention + 1) == 2
+        assert [op.id for op in journal.replay()] == ["pending"]
+
+
+@pytest.mark.unit
+class TestRecovery:
+    """Восстановление LDPlayerManager после перезапуска."""
+
+    async def test_restart(self, tmp_path):
+        """Ожидавшие операции возобновляются, прерванные сверяются с list2."""
+        fleet = SimulatedFleet(workstations=1, emulators=4, running=1, prefix="jrn_ws")
+        station = fleet.workstations["jrn_ws_000"]
+        path = tmp_path / "operations.db"
+
+        def make_manager(journal):
+            workstation = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+            manager = LDPlayerManager(workstation, journal=journal)
+            manager._counters = FleetCounters()
+            return manager
+
+        # Первый запуск сервера: операции поставлены, часть выполнялась в момент остановки
+        journal = OperationJournal(path)
+        manager = make_manager(journal)
+        operations = {
+            'launched': manager.start_emulator("LDPlayer"),
+            'interrupted': manager.start_emulator("LDPlayer-1"),
+            'queued': manager.stop_emulator("LDPlayer"),
+            'clone': manager.clone_emulator("LDPlayer", "copy"),
+            'finished': manager.start_emulator("LDPlayer-3"),
+        }
+        for key in ('launched', 'interrupted', 'clone', 'finished'):
+            operations[key].start()
+        operations['finished'].complete(True, "ok")
+        journal.close()
+        manager.workstation.shutdown_executor()
+
+        # Второй запуск: журнал воспроизводится перед обработкой очереди
+        journal = OperationJournal(path)
+        manager = make_manager(journal)
+        try:
+            summary = await manager.recover_operations()
+            assert summary == {'resumed': 2, 'reconciled': 1, 'failed': 1}
+
+            while not manager._operation_queue.empty():
+                await manager._execute_item(manager._operation_queue.get_nowait())
+
+            running = {emulator.name for emulator in station.emulators if emulator.running}
+            assert running == {"LDPlayer-1"}
+            assert manager._counters.operations(status=OperationStatus.COMPLETED) == 3
+            assert manager._counters.operations(status=OperationStatus.FAILED) == 1
+            assert journal.replay() == []
+        finally:
+            journal.close()
+            get_inventory().forget_workstation("jrn_ws_000")
+            manager.workstation.disconnect()
+            manager.workstation.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestJournalScale:
+    """Пропускная способность журнала."""
+
+    def test_rollout_500_emulators(self, tmp_path):
+        """Постановка, запуск и завершение 500 операций фиксируются быстрее секунды."""
+        journal = OperationJournal(tmp_path / "operations.db")
+        try:
+            started = time.perf_counter()
+            for i in range(500):
+                op = operation(f"op{i}", name=f"emu-{i}")
+                op.on_transition = lambda op, previous: journal.record_transition(op)
+                journal.record_added(op)
+                op.start()
+                op.complete(True, "ok")
+            journal.flush()
+            elapsed = time.perf_counter() - started
+
+            assert journal.get_stats()['written'] == 1500
+            assert journal.replay() == []
+            assert elapsed < 1.0
+        finally:
+            journal.close()
@@ -0,0 +1,174 @@
+"""
+⏱️ Тесты адаптивных таймаутов команд
+
+Проверяет:
+- Расчет таймаута как множителя p99 в заданных границах
+- Рост таймаута после превышения
+- Соблюдение срока в цикле получения вывода WinRM shell
+- Раздельное обучение таймаутов по действиям в WorkstationManager
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.remote.latency import LatencyTracker
+from src.remote.protocols import WinRMShell, WinRMOperationTimeoutError
+from src.remote.workstation import WorkstationManager
+
+
+class PollingProtocol:
+    """winrm.Protocol с пошаговым получением вывода и задержками по действиям."""
+
+    def __init__(self, delays=None, hang=False):
+        self.delays = delays or {}
+        self.hang = hang
+        self.closed = 0
+        self._commands = {}
+
+    def open_shell(self):
+        return "shell-1"
+
+    def close_shell(self, shell_id, close_session=True):
+        self.closed += 1
+
+    def run_command(self, shell_id, command, arguments=()):
+        action = arguments[0] if arguments else command
+        command_id = f"cmd-{len(self._commands)}"
+        self._commands[command_id] = time.monotonic() + self.delays.get(action, 0.0)
+        return command_id
+
+    def _raw_get_command_output(self, shell_id, command_id):
+        if self.hang:
+            time.sleep(0.02)
+            raise WinRMOperationTimeoutError()
+        done = time.monotonic() >= self._commands[command_id]
+        if not done:
+            time.sleep(0.01)
+        return b"ok" if done else b"", b"", 0 if done else -1, done
+
+    def get_command_output(self, shell_id, command_id):
+        raise AssertionError("ожидался пошаговый опрос с соблюдением срока")
+
+    def cleanup_command(self, shell_id, command_id):
+        pass
+
+
+class PollingSession:
+    """winrm.Session с PollingProtocol."""
+
+    def __init__(self, protocol: PollingProtocol):
+        self.protocol = protocol
+
+
+@pytest.mark.unit
+class TestLatencyTracker:
+    """Расчет адаптивных таймаутов."""
+
+    def test_default_until_enough_samples(self):
+        """Пока замеров мало, действует таймаут по умолчанию."""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record("echo", 0.01)
+
+        assert tracker.timeout_for("echo", 30) == 30
+        assert tracker.get_stats()["echo"]["timeout_seconds"] is None
+
+    def test_multiplier_of_p99_clamped(self):
+        """Таймаут = множитель * p99 в границах min/max."""
+        tracker = LatencyTracker(multiplier=3, min_timeout=1, max_timeout=100)
+        for _ in range(99):
+            tracker.record("fast", 0.01)
+            tracker.record("add", 2.0)
+            tracker.record("huge", 80.0)
+        tracker.record("add", 10.0)
+
+        assert tracker.timeout_for("fast", 30) == 1
+        assert tracker.timeout_for("add", 60) == pytest.approx(6.0)
+        assert tracker.timeout_for("huge", 60) == 100
+
+        stats = tracker.get_stats()["add"]
+        assert stats["samples"] == 100
+        assert stats["p99_ms"] == 2000.0
+        assert 2000.0 <= stats["ewma_ms"] <= 10000.0
+
+    def test_timeout_raises_next_deadline(self):
+        """После превышения таймаута следующий таймаут больше."""
+        tracker = LatencyTracker(multiplier=3, min_timeout=1, max_timeout=600, min_samples=5)
+        for _ in range(5):
+            tracker.record("add", 1.0)
+        first = tracker.timeout_for("add", 60)
+
+        tracker.record_timeout("add", first)
+
+        assert tracker.timeout_for("add", 60) == pytest.approx(first * 3)
+        assert tracker.get_stats()["add"]["timeouts"] == 1
+
+    def test_invalid_bounds(self):
+        """Некорректные границы отклоняются."""
+        with pytest.raises(ValueError):
+            LatencyTracker(min_timeout=10, max_timeout=1)
+
+
+@pytest.mark.unit
+class TestShellDeadline:
+    """Соблюдение срока при получении вывода команды."""
+
+    def test_hung_command_times_out(self):
+        """Зависшая команда прерывается по сроку, shell закрывается."""
+        protocol = PollingProtocol(hang=True)
+        shell = WinRMShell(PollingSession(protocol))
+
+        started = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            shell.run_cmd("ldconsole.exe", ["add"], timeout=0.2)
+
+        assert time.perf_counter() - started < 1.0
+        assert protocol.closed == 1
+        assert not shell.is_open
+
+    def test_output_collected_across_polls(self):
+        """Вывод собирается из нескольких опросов до завершения команды."""
+        protocol = PollingProtocol(delays={"add": 0.05})
+        shell = WinRMShell(PollingSession(protocol))
+
+        result = shell.run_cmd("ldconsole.exe", ["add"], timeout=5)
+
+        assert result.status_code == 0
+        assert result.std_out == b"ok"
+
+
+@pytest.mark.unit
+class TestWorkstationAdaptiveTimeouts:
+    """Таймауты WorkstationManager по действиям."""
+
+    def test_learns_per_action_timeouts(self):
+        """Быстрое действие получает короткий таймаут, медленное - не обрезается."""
+        protocol = PollingProtocol(delays={"add": 0.1})
+        session = PollingSession(protocol)
+        config = WorkstationConfig(id="ws_latency", name="ws_latency", ip_address="127.0.0.1")
+        config.min_command_timeout = 0.05
+        manager = WorkstationManager(config, session_factory=lambda cfg: session)
+        manager._winrm_session = session
+
+        try:
+            for _ in range(5):
+                assert manager.run_ldconsole_command("list2")[0] == 0
+                assert manager.run_ldconsole_command("add", "emu")[0] == 0
+
+            stats = manager.get_latency_stats()
+            fast = stats["ldconsole:list2"]["timeout_seconds"]
+            slow = stats["ldconsole:add"]["timeout_seconds"]
+
+            assert fast < 1.0
+            assert slow >= 0.3
+            assert manager.get_command_timeout(config.ldconsole_path, ["add"]) == pytest.approx(slow, abs=1e-3)
+            # Для неизвестного действия - таймаут по умолчанию
+            assert manager.get_command_timeout(config.ldconsole_path, ["remove"]) == 60
+        finally:
+            manager.disconnect()
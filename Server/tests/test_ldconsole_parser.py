@@ -0,0 +1,152 @@
+"""
+🧾 Тесты парсера вывода ldconsole
+
+Проверяет:
+- Разбор list2 формата LDPlayer 9 и формата с заголовком
+- Имена эмуляторов с запятыми
+- Строгие ошибки с номером строки и пропуск строк в нестрогом режиме
+- Разбор runninglist
+- Сохранение прежнего списка станции при некорректном выводе list2
+- Скорость разбора на 1k/10k/100k строк
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.inventory import get_inventory
+from src.remote.ldconsole_parser import (
+    LDConsoleParseError, List2Record, parse_list2, parse_list2_line, parse_runninglist
+)
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Дождаться выполнения условия фоновой работой менеджера."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "фоновый list2 не завершился"
+        time.sleep(0.01)
+
+
+def list2(count: int, running=()) -> str:
+    """Вывод list2 станции с count эмуляторами."""
+    lines = []
+    for i in range(count):
+        if i in running:
+            lines.append(f"{i},emu-{i},{1000 + i},{2000 + i},1,{3000 + i},{4000 + i},960,540,240")
+        else:
+            lines.append(f"{i},emu-{i},0,0,0,-1,-1,960,540,240")
+    return "\r\n".join(lines) + "\r\n"
+
+
+@pytest.mark.unit
+class TestParseList2:
+    """Разбор вывода list2."""
+
+    def test_ldplayer9_layout(self):
+        """Колонки LDPlayer 9 разбираются в записи."""
+        records = parse_list2(list2(3, running={1}))
+
+        assert [record.name for record in records] == ["emu-0", "emu-1", "emu-2"]
+        assert records[1] == List2Record(1, "emu-1", 1001, 2001, 1, 3001, 4001, 960, 540, 240)
+        assert [record.running for record in records] == [False, True, False]
+
+    def test_name_with_commas(self):
+        """Имя с запятыми: числовые колонки отсчитываются с конца строки."""
+        record = parse_list2_line("4,farm, eu,west,0,0,0,-1,-1,1280,720,320")
+
+        assert record.index == 4
+        assert record.name == "farm, eu,west"
+        assert (record.width, record.height, record.dpi) == (1280, 720, 320)
+
+    def test_headered_layout(self):
+        """Формат Name,Pid,Status,TopWindowHandle с hex handle."""
+        output = "Name,Pid,Status,TopWindowHandle\r\nleidian0,1234,Running,0x12345678\r\nleidian1,0,Stop,0\r\n"
+
+        records = parse_list2(output)
+
+        assert [(r.index, r.name, r.pid, r.running) for r in records] == [
+            (0, "leidian0", 1234, True), (1, "leidian1", -1, False)
+        ]
+        assert records[0].top_handle == 0x12345678
+
+    def test_strict_error_reports_line(self):
+        """Некорректная строка - ошибка с номером строки."""
+        output = list2(2) + "2,emu-2,0,0,zero,-1,-1,960,540,240\r\n"
+
+        with pytest.raises(LDConsoleParseError) as error:
+            parse_list2(output)
+
+        assert error.value.line_number == 3
+        assert "zero" in error.value.line
+
+    def test_non_strict_skips(self):
+        """Нестрогий режим пропускает обрезанные и мусорные строки."""
+        output = list2(2) + "2,emu-2,0,0\r\nldconsole: error\r\n"
+
+        assert [record.name for record in parse_list2(output, strict=False)] == ["emu-0", "emu-1"]
+
+    def test_empty_output(self):
+        """Пустой вывод - пустой список."""
+        assert parse_list2("") == []
+        assert parse_list2("\r\n\r\n") == []
+
+    def test_runninglist(self):
+        """runninglist - имена запущенных эмуляторов."""
+        assert parse_runninglist("emu-1\r\nfarm, eu\r\n\r\n") == ["emu-1", "farm, eu"]
+
+
+@pytest.mark.unit
+class TestWorkstationParseErrors:
+    """Некорректный list2 на WorkstationManager."""
+
+    def test_bad_output_keeps_previous_list(self):
+        """Частичный разбор не подменяет список станции."""
+        fleet = SimulatedFleet(workstations=1, emulators=5, prefix="parse_ws")
+        station = fleet.workstations["parse_ws_000"]
+        manager = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+
+        try:
+            manager.get_emulators_list()
+            station._ld_list2 = lambda params: (0, list2(2) + "2,emu-2,broken\r\n", "")
+            manager._cache_ttl = 0
+
+            assert len(manager.get_emulators_list()) == 5
+            wait_for(lambda: manager.get_emulators_cache_stats()['refresh_failures'] >= 1)
+
+            snapshot = manager.get_emulators_snapshot()
+            assert [emu.name for emu in snapshot.emulators][:2] == ["LDPlayer", "LDPlayer-1"]
+            assert len(snapshot.emulators) == 5
+            assert "строка 3" in snapshot.last_error
+            assert get_inventory().count("parse_ws_000") == 5
+        finally:
+            get_inventory().forget_workstation("parse_ws_000")
+            manager.disconnect()
+            manager.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestParseScale:
+    """Разбор list2 крупных станций."""
+
+    @pytest.mark.parametrize("rows", [1_000, 10_000, 100_000])
+    def test_parse_rate(self, rows):
+        """Разбор не дороже 20 мкс на строку."""
+        output = list2(rows, running=set(range(0, rows, 3)))
+
+        # Лучшее из нескольких прогонов: шум планировщика не влияет на порог
+        elapsed = float('inf')
+        for _ in range(3):
+            started = time.perf_counter()
+            records = parse_list2(output)
+            elapsed = min(elapsed, time.perf_counter() - started)
+
+        assert len(records) == rows
+        assert sum(record.running for record in records) == len(range(0, rows, 3))
+        assert elapsed / rows < 20e-6
@@ -0,0 +1,125 @@
+"""
+🧮 Тесты компактных моделей
+
+Проверяет:
+- Emulator, Operation и WorkstationConfig без __dict__ на экземпляр
+- Ленивое создание EmulatorConfig и сериализацию без него
+- Метки времени эмулятора как datetime при хранении unix time
+- Память на эмулятор при 100k экземплярах до и после
+"""
+
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.core.models import Emulator, EmulatorConfig, EmulatorStatus, Operation, OperationType
+
+
+class LegacyEmulator:
+    """Прежнее представление эмулятора: __dict__, EmulatorConfig и два datetime на экземпляр."""
+
+    def __init__(self, id, name, workstation_id, status=EmulatorStatus.CREATED, config=None):
+        self.id = id
+        self.name = name
+        self.workstation_id = workstation_id
+        self.status = status
+        self.config = config or EmulatorConfig()
+        self.created_date = datetime.now()
+        self.last_activity = datetime.now()
+        self.uptime = 0
+        self.adb_port = 5555
+        self.config_path = ''
+        self.start_count = 0
+        self.error_count = 0
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    """Память на экземпляр по tracemalloc (имена создаются заранее)."""
+    names = [f"LDPlayer-{i}" for i in range(count)]
+    ids = [f"ws_{name}" for name in names]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        instances = [factory(ids[i], names[i]) for i in range(count)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    assert len(instances) == count
+    # Память самого списка не относится к эмуляторам
+    return (allocated - sys.getsizeof(instances)) / count
+
+
+@pytest.mark.unit
+class TestCompactModels:
+    """Компактное представление моделей."""
+
+    def test_no_instance_dict(self):
+        """Экземпляры моделей не имеют __dict__."""
+        emulator = Emulator(id="ws_a", name="a", workstation_id="ws")
+        operation = Operation(id="op", type=OperationType.START, emulator_id="ws_a", workstation_id="ws")
+        config = WorkstationConfig(id="ws", name="ws", ip_address="10.0.0.1")
+
+        for instance in (emulator, operation, config):
+            assert not hasattr(instance, '__dict__')
+        with pytest.raises(AttributeError):
+            emulator.unknown_field = 1
+
+    def test_lazy_config(self):
+        """EmulatorConfig создается при первом обращении, to_dict его не создает."""
+        emulator = Emulator(id="ws_a", name="a", workstation_id="ws")
+
+        data = emulator.to_dict()
+        assert emulator._config is None
+        assert data['config']['screen_size'] == EmulatorConfig().screen_size
+
+        emulator.config.cpu_cores = 8
+        assert emulator.to_dict()['config']['cpu_cores'] == 8
+        assert Emulator(id="ws_b", name="b", workstation_id="ws").config.cpu_cores == 2
+
+    def test_timestamps(self):
+        """Метки времени - datetime, update_status обновляет активность."""
+        created = datetime(2025, 1, 2, 3, 4, 5)
+        emulator = Emulator(id="ws_a", name="a", workstation_id="ws", created_date=created)
+        assert emulator.created_date == created
+        assert isinstance(emulator.last_activity, datetime)
+
+        emulator.last_activity = datetime(2020, 1, 1)
+        emulator.update_status(EmulatorStatus.RUNNING)
+        assert emulator.last_activity > datetime(2020, 1, 1)
+        assert emulator.start_count == 1
+
+    def test_round_trip(self):
+        """from_dict(to_dict()) сохраняет поля."""
+        emulator = Emulator(id="ws_a", name="a", workstation_id="ws", status=EmulatorStatus.STOPPED,
+                            config=EmulatorConfig(cpu_cores=4), adb_port=5557)
+
+        restored = Emulator.from_dict(emulator.to_dict())
+
+        assert restored.to_dict() == emulator.to_dict()
+
+
+@pytest.mark.performance
+class TestModelMemory:
+    """Память на эмулятор при 100k экземплярах."""
+
+    def test_bytes_per_emulator(self):
+        """Компактный эмулятор занимает в 2.5 раза меньше прежнего."""
+        count = 100_000
+        before = bytes_per_instance(
+            lambda id, name: LegacyEmulator(id, name, "ws", EmulatorStatus.STOPPED), count
+        )
+        after = bytes_per_instance(
+            lambda id, name: Emulator(id=id, name=name, workstation_id="ws", status=EmulatorStatus.STOPPED), count
+        )
+
+        print(f"\nбайт на эмулятор при {count} экземплярах: до {before:.0f}, после {after:.0f}")
+        assert after * 2.5 < before
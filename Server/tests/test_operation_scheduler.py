@@ -0,0 +1,200 @@
+"""
+🚦 Тесты планировщика операций
+
+Проверяет:
+- Лимит одновременных операций по классам нагрузки (тяжелые/запуски/легкие)
+- Полосы приоритета: интерактивные операции раньше пакетных
+- Круговое обслуживание владельцев внутри полосы
+- Пропуск операций, отмененных в очереди
+- Метрики глубины очереди и времени ожидания
+- 300 запусков через LDPlayerManager поверх симулятора в пределах лимита
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.models import Operation, OperationPriority, OperationStatus, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.operation_scheduler import HEAVY, LAUNCH, LIGHT, OperationScheduler
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+class Recorder:
+    """Выполнение элементов с учетом порядка и пиковой параллельности по классам."""
+
+    def __init__(self, hold: float = 0.0):
+        self.hold = hold
+        self.order = []
+        self.active = {HEAVY: 0, LAUNCH: 0, LIGHT: 0}
+        self.peak = {HEAVY: 0, LAUNCH: 0, LIGHT: 0}
+        self.release = asyncio.Event()
+
+    async def __call__(self, item):
+        load_class, _, _ = OperationScheduler.classify(item)
+        self.order.append(item.id if isinstance(item, Operation) else [op.id for op in item])
+        self.active[load_class] += 1
+        self.peak[load_class] = max(self.peak[load_class], self.active[load_class])
+        try:
+            if self.hold:
+                await asyncio.sleep(self.hold)
+            else:
+                await self.release.wait()
+        finally:
+            self.active[load_class] -= 1
+
+
+def operation(id: str, type: OperationType = OperationType.STOP,
+              priority: OperationPriority = OperationPriority.NORMAL, owner: str = None) -> Operation:
+    """Операция станции ws."""
+    return Operation(id=id, type=type, emulator_id=f"ws_{id}", workstation_id="ws",
+                     priority=priority, owner=owner)
+
+
+@pytest.mark.unit
+class TestOperationScheduler:
+    """Порядок и ограничения планировщика."""
+
+    async def test_class_limits(self):
+        """Тяжелые операции, запуски и легкие операции ограничены своими лимитами независимо."""
+        recorder = Recorder(hold=0.01)
+        scheduler = OperationScheduler(recorder, concurrency={HEAVY: 1, LAUNCH: 2, LIGHT: 3})
+
+        for i in range(5):
+            scheduler.submit(operation(f"create-{i}", OperationType.CREATE))
+        for i in range(4):
+            scheduler.submit(operation(f"start-{i}", OperationType.START))
+        for i in range(10):
+            scheduler.submit(operation(f"stop-{i}"))
+        assert (scheduler.running(HEAVY), scheduler.running(LAUNCH), scheduler.running(LIGHT)) == (1, 2, 3)
+        assert scheduler.queue_depth() == 13
+
+        await scheduler.drain()
+
+        assert recorder.peak == {HEAVY: 1, LAUNCH: 2, LIGHT: 3}
+        assert scheduler.stats['completed'] == 19
+        assert scheduler.queue_depth() == 0
+
+    async def test_priority_lanes(self):
+        """Интерактивная операция обгоняет ожидающие пакетные."""
+        recorder = Recorder()
+        scheduler = OperationScheduler(recorder, concurrency={LIGHT: 1})
+
+        for i in range(3):
+            scheduler.submit(operation(f"bulk-{i}", priority=OperationPriority.BULK))
+        scheduler.submit(operation("normal"))
+        scheduler.submit(operation("click", priority=OperationPriority.INTERACTIVE))
+        recorder.release.set()
+        await scheduler.drain()
+
+        assert recorder.order == ["bulk-0", "click", "normal", "bulk-1", "bulk-2"]
+
+    async def test_fair_owners(self):
+        """Владельцы одной полосы обслуживаются по кругу."""
+        recorder = Recorder()
+        scheduler = OperationScheduler(recorder, concurrency={LIGHT: 1})
+
+        scheduler.submit(operation("warmup"))
+        for i in range(4):
+            scheduler.submit(operation(f"alice-{i}", owner="alice"))
+        scheduler.submit(operation("bob-0", owner="bob"))
+        scheduler.submit(operation("bob-1", owner="bob"))
+        recorder.release.set()
+        await scheduler.drain()
+
+        assert recorder.order == ["warmup", "alice-0", "bob-0", "alice-1", "bob-1", "alice-2", "alice-3"]
+
+    async def test_batch_and_cancel(self):
+        """Пакет занимает один слот с наивысшим приоритетом, отмененные пропускаются."""
+        recorder = Recorder()
+        scheduler = OperationScheduler(recorder, concurrency={LIGHT: 1})
+
+        scheduler.submit(operation("running"))
+        cancelled = operation("cancelled", priority=OperationPriority.INTERACTIVE)
+        scheduler.submit(cancelled)
+        scheduler.submit(operation("normal"))
+        batch = [operation("b-0", priority=OperationPriority.BULK),
+                 operation("b-1", priority=OperationPriority.INTERACTIVE)]
+        scheduler.submit(batch)
+        cancelled.cancel()
+
+        recorder.release.set()
+        await scheduler.drain()
+
+        assert recorder.order == ["running", ["b-0", "b-1"], "normal"]
+        assert scheduler.stats['skipped'] == 1
+
+    async def test_metrics(self):
+        """Глубина полос и время ожидания по приоритетам."""
+        recorder = Recorder()
+        scheduler = OperationScheduler(recorder, concurrency={LIGHT: 1})
+
+        scheduler.submit(operation("first"))
+        scheduler.submit(operation("bulk", priority=OperationPriority.BULK))
+        stats = scheduler.get_stats()
+        assert stats['classes'][LIGHT] == {
+            'limit': 1, 'running': 1, 'queued': {'interactive': 0, 'normal': 0, 'bulk': 1}
+        }
+
+        await asyncio.sleep(0.02)
+        recorder.release.set()
+        await scheduler.drain()
+
+        waits = scheduler.get_stats()['wait_seconds']
+        assert waits['bulk']['count'] == 1
+        assert waits['bulk']['max'] >= 0.02
+        assert waits['normal']['count'] == 1
+
+    def test_invalid_limit(self):
+        """Лимит меньше 1 отклоняется."""
+        with pytest.raises(ValueError):
+            OperationScheduler(Recorder(), concurrency={HEAVY: 0})
+
+
+@pytest.mark.performance
+class TestSchedulerLoad:
+    """Очередь запусков на одной станции."""
+
+    async def test_300_launches(self):
+        """300 запусков выполняются не более чем по 8 одновременно."""
+        fleet = SimulatedFleet(workstations=1, emulators=300, prefix="sched_ws", latency=0.001)
+        workstation = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+        manager = LDPlayerManager(workstation, concurrency={LAUNCH: 8})
+
+        execute = manager.scheduler._execute
+        active, peak = 0, 0
+
+        async def counted(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                await execute(item)
+            finally:
+                active -= 1
+
+        manager.scheduler._execute = counted
+        processor = asyncio.create_task(manager.start_operation_processor())
+        try:
+            names = [emulator.name for emulator in fleet.workstations["sched_ws_000"].emulators]
+            operations = [manager.start_emulator(name, owner="ui") for name in names]
+
+            deadline = time.monotonic() + 60
+            while any(op.status in (OperationStatus.PENDING, OperationStatus.RUNNING) for op in operations):
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.01)
+
+            assert peak == 8
+            assert [op.status for op in operations].count(OperationStatus.COMPLETED) == 300
+            assert manager.get_scheduler_stats()['wait_seconds']['interactive']['count'] == 300
+        finally:
+            processor.cancel()
+            await manager.scheduler.drain()
+            workstation.disconnect()
+            workstation.shutdown_executor()
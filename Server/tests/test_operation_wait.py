@@ -0,0 +1,195 @@
+"""
+⏱️ Тесты ожидания завершения операций
+
+Проверяет:
+- Пробуждение ожидающих в момент завершения операции, без опроса
+- Таймаут ожидания и завершение из потока пула
+- wait_for_operation для уже выполненной и неизвестной операции
+- Окончательность конечного статуса и отмену только ожидающих операций
+- Long-poll GET /api/operations/{id}?wait=N
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import operations as operations_api
+from src.api.dependencies import ldplayer_managers
+from src.core.config import SystemConfig, get_system_config
+from src.core.counters import FleetCounters
+from src.core.inventory import get_inventory
+from src.core.models import Operation, OperationStatus, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def operation(id: str = "op") -> Operation:
+    """Операция запуска эмулятора."""
+    return Operation(id=id, type=OperationType.START, emulator_id="ws_LDPlayer", workstation_id="ws",
+                     parameters={'name': "LDPlayer"})
+
+
+@pytest.fixture
+def manager():
+    """LDPlayerManager поверх симулятора с собственными счетчиками."""
+    fleet = SimulatedFleet(workstations=1, emulators=2, prefix="wait_ws")
+    config = fleet.configs()[0]
+    ldplayer = LDPlayerManager(WorkstationManager(config, session_factory=fleet.session_factory))
+    ldplayer._counters = FleetCounters()
+    yield ldplayer
+    get_inventory().forget_workstation(config.id)
+    ldplayer.workstation.disconnect()
+    ldplayer.workstation.shutdown_executor()
+
+
+@pytest.mark.unit
+class TestOperationWait:
+    """Ожидание завершения операции."""
+
+    async def test_wakes_on_completion(self):
+        """Все ожидающие просыпаются сразу после завершения."""
+        op = operation()
+        waiters = [asyncio.create_task(op.wait(5)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        op.start()
+        await asyncio.sleep(0.01)
+        assert not any(waiter.done() for waiter in waiters)
+
+        completed = time.perf_counter()
+        op.complete(True, "ok")
+        assert await asyncio.gather(*waiters) == [True, True, True]
+        assert time.perf_counter() - completed < 0.05
+        assert op._waiters is None
+
+    async def test_timeout_and_finished(self):
+        """Таймаут возвращает False, завершенная операция - True без ожидания."""
+        op = operation()
+
+        assert await op.wait(0.01) is False
+        assert op._waiters == []
+
+        op.cancel()
+        assert await op.wait(0) is True
+
+    async def test_completion_from_thread(self):
+        """Завершение в потоке пула будит ожидающего в его цикле."""
+        op = operation()
+        waiter = asyncio.create_task(op.wait(5))
+        await asyncio.sleep(0.01)
+
+        await asyncio.to_thread(op.complete, False, None, "boom")
+
+        assert await waiter is True
+        assert op.status == OperationStatus.FAILED
+
+
+@pytest.mark.unit
+class TestFinalStatus:
+    """Конечный статус не меняется."""
+
+    def test_complete_after_cancel(self):
+        """Завершение отмененной операции не перезаписывает итог и не шлет второй переход."""
+        op = operation()
+        transitions = []
+        op.on_transition = lambda operation, previous: transitions.append((previous, operation.status))
+
+        op.start()
+        assert op.cancel() is True
+        op.complete(True, "ok")
+        op.start()
+
+        assert op.status == OperationStatus.CANCELLED
+        assert op.result is None
+        assert op.cancel() is False
+        assert transitions == [
+            (OperationStatus.PENDING, OperationStatus.RUNNING),
+            (OperationStatus.RUNNING, OperationStatus.CANCELLED),
+        ]
+
+    async def test_cancel_pending_only(self, manager):
+        """Отменяется ожидающая операция, выполняющаяся - нет."""
+        pending = manager.start_emulator("LDPlayer-1")
+        running = manager.stop_emulator("LDPlayer")
+        running.start()
+
+        assert manager.cancel_operation(pending.id)
+        assert not manager.cancel_operation(running.id)
+        assert not manager.cancel_operation(pending.id)
+        assert manager.get_active_operations() == [running]
+
+        # Планировщик не выполняет отмененную операцию
+        await manager._execute_item(pending)
+        assert pending.status == OperationStatus.CANCELLED
+        assert manager.get_operation(pending.id) is pending
+
+
+@pytest.mark.unit
+class TestWaitForOperation:
+    """LDPlayerManager.wait_for_operation."""
+
+    async def test_finished_operation(self, manager):
+        """Выполненная операция находится и возвращается сразу."""
+        op = manager.start_emulator("LDPlayer-1")
+        waiter = asyncio.create_task(manager.wait_for_operation(op.id, timeout=5))
+
+        await manager._execute_item(manager._operation_queue.get_nowait())
+
+        assert (await waiter).status == OperationStatus.COMPLETED
+        assert manager.get_active_operations() == []
+        assert await manager.wait_for_operation(op.id) is op
+
+    async def test_unknown_and_timeout(self, manager):
+        """Неизвестная операция - ValueError, незавершенная - TimeoutError."""
+        op = manager.stop_emulator("LDPlayer")
+
+        with pytest.raises(ValueError):
+            await manager.wait_for_operation("missing")
+        with pytest.raises(asyncio.TimeoutError):
+            await manager.wait_for_operation(op.id, timeout=0.01)
+
+
+@pytest.mark.unit
+class TestLongPoll:
+    """GET /api/operations/{id}?wait=N."""
+
+    async def test_long_poll(self, manager):
+        """Ответ приходит при завершении операции, без wait - сразу."""
+        app = FastAPI()
+        app.include_router(operations_api.router)
+        app.dependency_overrides[get_system_config] = lambda: SystemConfig(
+            workstations=[manager.workstation.config]
+        )
+        ws_id = manager.workstation.config.id
+        ldplayer_managers[ws_id] = manager
+
+        try:
+            op = manager.start_emulator("LDPlayer-1")
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(f"/api/operations/{op.id}")
+                assert response.json()["status"] == "pending"
+
+                poll = asyncio.create_task(client.get(f"/api/operations/{op.id}", params={"wait": 10}))
+                await asyncio.sleep(0.05)
+                assert not poll.done()
+
+                started = time.perf_counter()
+                await manager._execute_item(manager._operation_queue.get_nowait())
+                response = await poll
+
+                assert response.json()["status"] == "completed"
+                assert time.perf_counter() - started < 1.0
+
+                response = await client.get(f"/api/operations/{op.id}", params={"wait": 61})
+                assert response.status_code == 422
+        finally:
+            ldplayer_managers.pop(ws_id, None)
@@ -0,0 +1,231 @@
+"""
+🧬 Тесты конвейеров операций
+
+Проверяет:
+- Проверку DAG: повтор ID, неизвестная зависимость, цикл, недопустимый тип шага
+- Подготовку эмуляторов clone → modify → launch поверх симулятора без обращений клиента
+- Частичный отказ: зависимые шаги отменяются, независимые ветви доводятся до конца
+- Отмену конвейера и прерывание конвейера перезапуском сервера
+- Параллельное выполнение независимых ветвей
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.counters import FleetCounters
+from src.core.inventory import get_inventory
+from src.core.journal import OperationJournal
+from src.core.models import OperationStatus, OperationType
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.pipeline import OperationPipeline, PipelineStep
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def step(id: str, type: str = "start", after=(), **parameters) -> PipelineStep:
+    """Шаг конвейера из описания запроса."""
+    return PipelineStep.from_dict({'id': id, 'type': type, 'parameters': parameters, 'after': list(after)})
+
+
+def simulated(prefix: str, emulators: int = 1, **profile):
+    """Станция симулятора и LDPlayerManager с собственными счетчиками."""
+    fleet = SimulatedFleet(workstations=1, emulators=emulators, prefix=prefix, **profile)
+    config = fleet.configs()[0]
+    manager = LDPlayerManager(WorkstationManager(config, session_factory=fleet.session_factory))
+    manager._counters = FleetCounters()
+    return fleet.workstations[config.id], manager
+
+
+@pytest.fixture
+async def station():
+    """Станция симулятора с эмулятором-образцом LDPlayer и запущенным обработчиком операций."""
+    simulator, manager = simulated("pipe_ws")
+    processor = asyncio.create_task(manager.start_operation_processor())
+    yield simulator, manager
+    processor.cancel()
+    await manager.scheduler.drain()
+    get_inventory().forget_workstation(manager.workstation.config.id)
+    manager.workstation.disconnect()
+    manager.workstation.shutdown_executor()
+
+
+def emulators(simulator):
+    """Эмуляторы станции по имени."""
+    return {emulator.name: emulator for emulator in simulator.emulators}
+
+
+@pytest.mark.unit
+class TestPipelineGraph:
+    """Проверка описания конвейера."""
+
+    def test_topological_order(self):
+        """Шаги упорядочиваются по зависимостям, ID операций содержат ID конвейера."""
+        pipeline = OperationPipeline("p", "ws", [
+            step("start", after=["modify"], name="a"),
+            step("modify", "modify", after=["clone"], name="a", cpu=4),
+            step("clone", "clone", source_name="base", new_name="a"),
+        ])
+
+        assert list(pipeline.steps) == ["clone", "modify", "start"]
+        assert pipeline.steps["start"].parameters['pipeline'] == {'id': "p", 'after': ["p:modify"]}
+        assert pipeline.steps["clone"].emulator_id == "ws_a"
+        assert pipeline.operation.type == OperationType.PIPELINE
+
+    @pytest.mark.parametrize("steps", [
+        [],
+        [step("a"), step("a")],
+        [step("a", after=["missing"])],
+        [step("a", after=["b"]), step("b", after=["a"])],
+    ])
+    def test_invalid_graph(self, steps):
+        """Пустой конвейер, повтор ID, неизвестная зависимость и цикл отклоняются."""
+        with pytest.raises(ValueError):
+            OperationPipeline("p", "ws", steps)
+
+    def test_invalid_step(self):
+        """Неизвестный тип и вложенный конвейер не являются шагами."""
+        with pytest.raises(ValueError):
+            step("a", "explode")
+        with pytest.raises(ValueError):
+            step("a", "pipeline")
+
+
+@pytest.mark.unit
+class TestPipelineExecution:
+    """Выполнение конвейеров LDPlayerManager."""
+
+    async def test_provision(self, station):
+        """Копии создаются, настраиваются и запускаются одним запросом."""
+        simulator, manager = station
+
+        operation = manager.provision_emulators("LDPlayer", ["farm-1", "farm-2"], settings={'cpu': 4})
+        assert await operation.wait(10)
+
+        assert operation.status == OperationStatus.COMPLETED
+        assert operation.result.startswith("Выполнено шагов: 6 из 6")
+        farm = emulators(simulator)
+        assert [(farm[name].cpu, farm[name].running) for name in ("farm-1", "farm-2")] == [(4, True), (4, True)]
+        assert manager.get_active_operations() == []
+        assert manager.get_operation(f"{operation.id}:start:farm-1").status == OperationStatus.COMPLETED
+
+    async def test_partial_failure(self, station):
+        """Ошибка шага отменяет его зависимые шаги, независимая ветвь выполняется."""
+        simulator, manager = station
+
+        operation = manager.run_pipeline([
+            {'id': "clone-a", 'type': "clone", 'parameters': {'source_name': "LDPlayer", 'new_name': "a"}},
+            {'id': "modify-a", 'type': "modify", 'parameters': {'name': "a"}, 'after': ["clone-a"]},
+            {'id': "start-a", 'type': "start", 'parameters': {'name': "a"}, 'after': ["modify-a"]},
+            {'id': "clone-b", 'type': "clone", 'parameters': {'source_name': "LDPlayer", 'new_name': "b"}},
+            {'id': "start-b", 'type': "start", 'parameters': {'name': "b"}, 'after': ["clone-b"]},
+        ])
+        assert await operation.wait(10)
+
+        steps = {step_id: manager.get_operation(f"{operation.id}:{step_id}")
+                 for step_id in ("clone-a", "modify-a", "start-a", "start-b")}
+        assert {step_id: op.status for step_id, op in steps.items()} == {
+            "clone-a": OperationStatus.COMPLETED,
+            "modify-a": OperationStatus.FAILED,
+            "start-a": OperationStatus.CANCELLED,
+            "start-b": OperationStatus.COMPLETED,
+        }
+        assert "modify-a" in steps["start-a"].result
+        assert operation.status == OperationStatus.FAILED
+        assert "modify-a" in operation.error_message
+
+        # Выполненные шаги не откатываются
+        farm = emulators(simulator)
+        assert (farm["a"].running, farm["b"].running) == (False, True)
+
+
+@pytest.mark.unit
+class TestPipelineInterruption:
+    """Отмена и перезапуск сервера."""
+
+    async def test_cancel(self):
+        """Отмена конвейера отменяет ожидающие шаги."""
+        simulator, manager = simulated("pipe_cancel_ws")
+        try:
+            operation = manager.provision_emulators("LDPlayer", ["c-1", "c-2"])
+            await asyncio.sleep(0.01)
+            assert manager._operation_queue.qsize() == 2
+
+            task = manager._pipelines[operation.id]
+            assert manager.cancel_operation(operation.id)
+            await asyncio.wait_for(task, 1)
+
+            steps = [manager.get_operation(entry['operation_id']) for entry in operation.parameters['steps']]
+            assert all(step.status == OperationStatus.CANCELLED for step in steps)
+            assert manager.get_active_operations() == []
+        finally:
+            get_inventory().forget_workstation(manager.workstation.config.id)
+            manager.workstation.shutdown_executor()
+
+    async def test_restart(self):
+        """После перезапуска конвейер и его ожидающие шаги завершаются с понятным статусом."""
+        journal = OperationJournal()
+        simulator, manager = simulated("pipe_restart_ws")
+        manager.journal = journal
+        try:
+            operation = manager.provision_emulators("LDPlayer", ["r-1"])
+            await asyncio.sleep(0.01)
+            manager._pipelines[operation.id].cancel()
+            manager.workstation.shutdown_executor()
+
+            _, manager = simulated("pipe_restart_ws")
+            manager.journal = journal
+            summary = await manager.recover_operations()
+
+            assert summary == {'resumed': 0, 'reconciled': 0, 'failed': 3}
+            assert manager.get_operation(operation.id).status == OperationStatus.FAILED
+            assert manager.get_operation(f"{operation.id}:start:r-1").status == OperationStatus.CANCELLED
+            assert journal.replay() == []
+        finally:
+            journal.close()
+            get_inventory().forget_workstation(manager.workstation.config.id)
+            manager.workstation.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestPipelineScale:
+    """Параллельная подготовка эмуляторов."""
+
+    async def test_parallel_branches(self):
+        """Цепочки 20 эмуляторов идут параллельно в пределах лимитов классов."""
+        simulator, manager = simulated("pipe_scale_ws", latency=0.005)
+        execute = manager.scheduler._execute
+        active, peak = 0, 0
+
+        async def counted(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                await execute(item)
+            finally:
+                active -= 1
+
+        manager.scheduler._execute = counted
+        processor = asyncio.create_task(manager.start_operation_processor())
+        try:
+            names = [f"scale-{i}" for i in range(20)]
+            started = time.perf_counter()
+            operation = manager.provision_emulators("LDPlayer", names, settings={'memory': 4096})
+            assert await operation.wait(60)
+
+            assert operation.status == OperationStatus.COMPLETED
+            assert all(emulators(simulator)[name].running for name in names)
+            assert 1 < peak <= sum(manager.scheduler.concurrency.values())
+            print(f"20 эмуляторов подготовлено за {time.perf_counter() - started:.2f}s, пик {peak}")
+        finally:
+            processor.cancel()
+            await manager.scheduler.drain()
+            get_inventory().forget_workstation(manager.workstation.config.id)
+            manager.workstation.disconnect()
+            manager.workstation.shutdown_executor()
@@ -0,0 +1,267 @@
+"""
+🔄 Тесты сверки снимков list2 и шины событий
+
+Проверяет:
+- События добавления, удаления и смены статуса между снимками
+- Разбор только измененных строк и переиспользование объектов
+- Применение изменений к реестру парка
+- Доставку событий из потока пула в асинхронный поток шины
+- Сверку вывода list2 с заголовком Name,Pid,Status,TopWindowHandle
+- Сверку на WorkstationManager поверх симулятора
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.events import EventBus, get_event_bus, EMULATOR_ADDED, EMULATOR_REMOVED, EMULATOR_STATUS_CHANGED
+from src.core.inventory import EmulatorInventory, get_inventory
+from src.core.models import Emulator, EmulatorStatus
+from src.remote.reconciler import ListReconciler
+from src.remote.simulator import SimulatedFleet
+from src.remote.workstation import WorkstationManager
+
+
+def parse_line(line: str):
+    """Разбор строки list2 как в WorkstationManager."""
+    parts = line.split(',')
+    if len(parts) < 10:
+        return None
+    running = parts[2] != '0' or parts[3] != '0' or parts[4] != '0'
+    return Emulator(id=f"ws_{parts[1]}", name=parts[1], workstation_id="ws",
+                    status=EmulatorStatus.RUNNING if running else EmulatorStatus.STOPPED)
+
+
+def list2(count: int, running=()) -> str:
+    """Вывод list2 станции с count эмуляторами."""
+    lines = []
+    for i in range(count):
+        if i in running:
+            lines.append(f"{i},emu-{i},{1000 + i},{2000 + i},1,{3000 + i},{4000 + i},960,540,240")
+        else:
+            lines.append(f"{i},emu-{i},0,0,0,-1,-1,960,540,240")
+    return "\r\n".join(lines) + "\r\n"
+
+
+@pytest.mark.unit
+class TestListReconciler:
+    """Сверка последовательных снимков."""
+
+    def test_first_snapshot_adds_all(self):
+        """Первый снимок - все эмуляторы добавлены."""
+        reconciler = ListReconciler("ws", parse_line)
+
+        emulators, changes = reconciler.reconcile(list2(3, running={1}))
+
+        assert [emu.name for emu in emulators] == ["emu-0", "emu-1", "emu-2"]
+        assert [change.type for change in changes] == [EMULATOR_ADDED] * 3
+        assert changes[1].status == EmulatorStatus.RUNNING
+        assert changes[1].index == 1
+
+    def test_unchanged_snapshot(self):
+        """Неизменный снимок - нет событий, строки не разбираются, объекты те же."""
+        reconciler = ListReconciler("ws", parse_line)
+        first, _ = reconciler.reconcile(list2(50))
+        parsed = reconciler.stats['parsed']
+
+        second, changes = reconciler.reconcile(list2(50))
+
+        assert changes == []
+        assert reconciler.stats['parsed'] == parsed
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_status_add_remove(self):
+        """Запуск, удаление и создание дают по одному событию."""
+        reconciler = ListReconciler("ws", parse_line)
+        first, _ = reconciler.reconcile(list2(4))
+
+        output = list2(4, running={2}).replace("3,emu-3,0,0,0,-1,-1,960,540,240", "3,farm,0,0,0,-1,-1,960,540,240")
+        emulators, changes = reconciler.reconcile(output)
+
+        by_type = {change.type: change for change in changes}
+        assert len(changes) == 3
+        assert by_type[EMULATOR_STATUS_CHANGED].name == "emu-2"
+        assert by_type[EMULATOR_STATUS_CHANGED].previous_status == EmulatorStatus.STOPPED
+        assert by_type[EMULATOR_ADDED].name == "farm"
+        assert by_type[EMULATOR_REMOVED].name == "emu-3"
+        # Смена статуса применяется к прежнему объекту
+        assert emulators[2] is first[2]
+        assert first[2].status == EmulatorStatus.RUNNING
+
+    def test_handle_change_without_status_change(self):
+        """Новые handle запущенного эмулятора - строка разобрана, событий нет."""
+        reconciler = ListReconciler("ws", parse_line)
+        reconciler.reconcile(list2(2, running={0}))
+
+        _, changes = reconciler.reconcile(list2(2, running={0}).replace("1000,2000", "1001,2001"))
+
+        assert changes == []
+
+    def test_unconfirmed_operation_status(self):
+        """Статус, выставленный операцией, возвращается к подтвержденному list2."""
+        reconciler = ListReconciler("ws", parse_line)
+        emulators, _ = reconciler.reconcile(list2(2))
+        emulators[1].status = EmulatorStatus.RUNNING
+
+        _, changes = reconciler.reconcile(list2(2))
+
+        assert [(c.type, c.status) for c in changes] == [(EMULATOR_STATUS_CHANGED, EmulatorStatus.STOPPED)]
+        assert emulators[1].status == EmulatorStatus.STOPPED
+
+
+@pytest.mark.unit
+class TestHeaderedList2:
+    """Вывод list2 с заголовком (старые версии, dnconsole)."""
+
+    def test_headered_snapshots(self):
+        """Снимки с заголовком сверяются так же, как строки LDPlayer 9."""
+        reconciler = ListReconciler("ws", parse_line)
+        header = "Name,Pid,Status,TopWindowHandle\r\n"
+
+        emulators, changes = reconciler.reconcile(header + "emu-0,-1,Stopped,0\r\nemu-1,4321,Running,0x1A2B\r\n")
+        assert [(emu.name, emu.status) for emu in emulators] == [
+            ("emu-0", EmulatorStatus.STOPPED), ("emu-1", EmulatorStatus.RUNNING)
+        ]
+        assert [change.type for change in changes] == [EMULATOR_ADDED, EMULATOR_ADDED]
+
+        emulators, changes = reconciler.reconcile(header + "emu-0,555,Running,0x10\r\nemu-1,4321,Running,0x1A2B\r\n")
+        assert [(change.type, change.name) for change in changes] == [(EMULATOR_STATUS_CHANGED, "emu-0")]
+        assert reconciler.stats['parsed'] == 3
+
+    def test_workstation_refresh(self):
+        """Станция с заголовком list2 заполняет кэш при обычном обновлении."""
+        fleet = SimulatedFleet(workstations=1, emulators=2, prefix="hdr_ws")
+        config = fleet.configs()[0]
+        manager = WorkstationManager(config, session_factory=fleet.session_factory)
+        manager._fetch_list2_output = lambda: "Name,Pid,Status,TopWindowHandle\r\nLDPlayer,-1,Stopped,0\r\n"
+        try:
+            assert [emu.name for emu in manager.get_emulators_list()] == ["LDPlayer"]
+            assert get_inventory().find(config.id, "LDPlayer") is not None
+        finally:
+            get_inventory().forget_workstation(config.id)
+            manager.shutdown_executor()
+
+
+@pytest.mark.unit
+class TestInventoryApplyChanges:
+    """Реестр потребляет изменения сверки."""
+
+    def test_apply_changes(self):
+        """Индексы реестра совпадают с полной заменой станции."""
+        reconciler = ListReconciler("ws", parse_line)
+        inventory = EmulatorInventory()
+        emulators, _ = reconciler.reconcile(list2(5))
+        inventory.replace_workstation("ws", emulators)
+
+        output = list2(5, running={0, 3}).replace("4,emu-4,0,0,0,-1,-1,960,540,240\r\n", "")
+        emulators, changes = reconciler.reconcile(output)
+
+        assert inventory.apply_changes("ws", changes) == 3
+        assert inventory.count("ws") == 4
+        assert inventory.count("ws", EmulatorStatus.RUNNING) == 2
+        assert inventory.find("ws", "emu-4") is None
+        assert inventory.find("ws", "emu-3") is emulators[3]
+
+
+@pytest.mark.unit
+class TestEventBus:
+    """Доставка событий шины."""
+
+    def test_handlers(self):
+        """Синхронный обработчик получает события до отписки."""
+        bus = EventBus()
+        received = []
+        unsubscribe = bus.subscribe(received.append)
+
+        bus.publish(["a", "b"])
+        unsubscribe()
+        bus.publish(["c"])
+
+        assert received == ["a", "b"]
+        assert bus.get_stats()['published'] == 3
+
+    async def test_stream_from_thread(self):
+        """События из потока пула попадают в асинхронный поток по порядку."""
+        bus = EventBus()
+        stream = bus.stream()
+
+        thread = threading.Thread(target=bus.publish, args=([1, 2, 3],))
+        thread.start()
+        thread.join()
+
+        received = [await asyncio.wait_for(stream.get(), 1) for _ in range(3)]
+        stream.close()
+
+        assert received == [1, 2, 3]
+        assert bus.get_stats()['streams'] == 0
+
+    async def test_slow_stream_drops(self):
+        """Переполненный поток теряет события, а не блокирует публикацию."""
+        bus = EventBus()
+        stream = bus.stream(maxsize=2)
+
+        bus.publish(range(5))
+        await asyncio.sleep(0)
+
+        assert bus.get_stats()['dropped'] == 3
+        stream.close()
+
+
+@pytest.mark.unit
+class TestWorkstationReconcile:
+    """Сверка в WorkstationManager."""
+
+    def test_refresh_publishes_changes(self):
+        """Повторный опрос станции публикует только изменения."""
+        fleet = SimulatedFleet(workstations=1, emulators=10, running=2, prefix="rec_ws")
+        station = fleet.workstations["rec_ws_000"]
+        manager = WorkstationManager(fleet.configs()[0], session_factory=fleet.session_factory)
+        events = []
+        unsubscribe = get_event_bus().subscribe(
+            lambda event: events.append(event) if event.workstation_id == "rec_ws_000" else None
+        )
+
+        try:
+            manager.get_emulators_list()
+            station.ldconsole(["launch", "--name", "LDPlayer-5"])
+            station.ldconsole(["add", "--name", "farm"])
+            manager._invalidate_emulators_cache()
+            manager.get_emulators_list()
+
+            assert [e.type for e in events[:10]] == [EMULATOR_ADDED] * 10
+            assert [(e.type, e.name) for e in events[10:]] == [
+                (EMULATOR_STATUS_CHANGED, "LDPlayer-5"), (EMULATOR_ADDED, "farm")
+            ]
+            assert get_inventory().count("rec_ws_000", EmulatorStatus.RUNNING) == 3
+            assert get_inventory().count("rec_ws_000") == 11
+        finally:
+            unsubscribe()
+            get_inventory().forget_workstation("rec_ws_000")
+            manager.disconnect()
+            manager.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestReconcileScale:
+    """Стоимость опроса пропорциональна изменениям."""
+
+    def test_tick_cost(self):
+        """Снимок 2000 эмуляторов с одним изменением разбирает одну строку."""
+        reconciler = ListReconciler("ws", parse_line)
+        reconciler.reconcile(list2(2000))
+        parsed = reconciler.stats['parsed']
+        output = list2(2000, running={1500})
+
+        started = time.perf_counter()
+        _, changes = reconciler.reconcile(output)
+        elapsed = time.perf_counter() - started
+
+        assert len(changes) == 1
+        assert reconciler.stats['parsed'] - parsed == 1
+        assert elapsed < 0.05
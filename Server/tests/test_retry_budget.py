@@ -0,0 +1,146 @@
+"""
+🪙 Тесты бюджета повторных попыток
+
+Проверяет:
+- Повторы ограничены долей от первых попыток
+- Глобальный бюджет ограничивает весь парк станций
+- Пополнение бюджета по времени
+- run_command не повторяет команду сверх бюджета
+- run_command_async не повторяет команду после истечения своего таймаута
+"""
+
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.remote.workstation import WorkstationManager
+from src.utils.retry_budget import RetryBudgets, get_retry_budgets
+
+
+class FakeClock:
+    """Управляемое монотонное время."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DeadSession:
+    """WinRM сессия недоступной станции."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def run_cmd(self, command, args=()):
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+
+@pytest.mark.unit
+class TestRetryBudgets:
+    """Расчет бюджета повторов."""
+
+    def test_retries_limited_by_ratio(self):
+        """Повторов не больше доли от первых попыток (плюс емкость)."""
+        budgets = RetryBudgets(ratio=0.2, min_per_second=0, max_tokens=5,
+                               global_max_tokens=1000, clock=FakeClock())
+
+        allowed = 0
+        for _ in range(100):
+            budgets.record_attempt("ws_1")
+            # Каждая операция падает и хочет 2 повтора
+            allowed += sum(budgets.try_retry("ws_1") for _ in range(2))
+
+        assert allowed <= 5 + 100 * 0.2
+        stats = budgets.get_stats()["workstations"]["ws_1"]
+        assert stats["retries_allowed"] == allowed
+        assert stats["retries_denied"] == 200 - allowed
+        assert stats["attempts"] == 100
+
+    def test_global_budget_caps_fleet(self):
+        """Глобальный бюджет отклоняет повторы, даже если у станций есть токены."""
+        budgets = RetryBudgets(min_per_second=0, max_tokens=10, global_ratio=0.0,
+                               global_min_per_second=0, global_max_tokens=3, clock=FakeClock())
+
+        results = [budgets.try_retry(f"ws_{i}") for i in range(8)]
+
+        assert results.count(True) == 3
+        stats = budgets.get_stats()
+        assert stats["global"]["retries_denied"] == 5
+        assert stats["workstations"]["ws_7"]["tokens"] == 10
+
+    def test_refill_over_time(self):
+        """Бюджет пополняется по времени без новых запросов."""
+        clock = FakeClock()
+        budgets = RetryBudgets(min_per_second=0.5, max_tokens=1, clock=clock)
+
+        assert budgets.try_retry("ws_1")
+        assert not budgets.try_retry("ws_1")
+
+        clock.now += 2
+        assert budgets.try_retry("ws_1")
+
+    def test_global_only_key(self):
+        """Без ID станции используется только глобальный бюджет."""
+        budgets = RetryBudgets(global_min_per_second=0, global_max_tokens=1, clock=FakeClock())
+
+        assert budgets.try_retry()
+        assert not budgets.try_retry()
+        assert budgets.get_stats()["workstations"] == {}
+
+
+@pytest.mark.unit
+class TestRunCommandBudget:
+    """Повторы run_command в пределах бюджета."""
+
+    def test_no_retry_when_budget_exhausted(self):
+        """Исчерпанный бюджет станции - команда падает после первой попытки."""
+        session = DeadSession()
+        config = WorkstationConfig(id="ws_budget", name="ws_budget", ip_address="127.0.0.1")
+        manager = WorkstationManager(config, session_factory=lambda cfg: session)
+        manager._winrm_session = session
+
+        budget = get_retry_budgets().get_budget(config.id)
+        budget.tokens = 0
+        budget.min_per_second = 0
+        denied_before = budget.stats["retries_denied"]
+
+        try:
+            with pytest.raises(ConnectionError):
+                manager.run_command("echo", ["test"])
+
+            assert budget.stats["retries_denied"] == denied_before + 1
+            assert budget.stats["retries_allowed"] == 0
+            assert budget.stats["attempts"] == 1
+        finally:
+            manager.disconnect()
+
+    async def test_no_retry_past_caller_deadline(self):
+        """Пауза перед повтором длиннее таймаута вызывающего - повтора нет."""
+        session = DeadSession()
+        config = WorkstationConfig(id="ws_deadline", name="ws_deadline", ip_address="127.0.0.1")
+        manager = WorkstationManager(config, session_factory=lambda cfg: session)
+        manager._winrm_session = session
+
+        budget = get_retry_budgets().get_budget(config.id)
+        budget.tokens = 10
+        allowed_before, attempts_before = budget.stats["retries_allowed"], budget.stats["attempts"]
+
+        try:
+            started = time.monotonic()
+            with pytest.raises(ConnectionError):
+                await manager.run_command_async("echo", ["test"], timeout=1.0)
+
+            assert time.monotonic() - started < 1.0
+            assert budget.stats["attempts"] == attempts_before + 1
+            assert budget.stats["retries_allowed"] == allowed_before
+        finally:
+            manager.disconnect()
+            manager.shutdown_executor()
@@ -0,0 +1,224 @@
+"""
+🏊 Тесты пула сессий рабочей станции
+
+Проверяет:
+- Выдачу и возврат сессий, ограничение max_size и ожидание
+- Выбрасывание сессии после сетевой ошибки
+- Пробы простаивающих сессий, вытеснение по простою и добор до min_size
+- Параллельные команды одной станции через разные WinRM сессии
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.remote.session_pool import SessionPool
+from src.remote.workstation import WorkstationManager
+
+
+class FakeResource:
+    """Сессия пула с флагами живости и закрытия."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.alive = True
+        self.closed = False
+
+
+def make_pool(**kwargs) -> SessionPool:
+    """Создать пул из FakeResource."""
+    counter = iter(range(1000))
+    kwargs.setdefault('probe', lambda resource: resource.alive)
+    return SessionPool(
+        name="ws_pool",
+        factory=lambda: FakeResource(next(counter)),
+        closer=lambda resource: setattr(resource, 'closed', True),
+        **kwargs
+    )
+
+
+@pytest.mark.unit
+class TestSessionPool:
+    """Выдача, возврат и ограничения пула."""
+
+    def test_borrow_and_return(self):
+        """Возвращенная сессия выдается повторно."""
+        pool = make_pool(max_size=2)
+
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            assert pool.get_stats()['in_use'] == 1
+
+        assert first is second
+        stats = pool.get_stats()
+        assert stats['created'] == 1
+        assert stats['borrowed'] == 2
+        assert stats['idle'] == 1 and stats['in_use'] == 0
+
+    def test_max_size_and_timeout(self):
+        """Сверх max_size сессии не создаются, ожидание ограничено таймаутом."""
+        pool = make_pool(max_size=2)
+        held = [pool.acquire(), pool.acquire()]
+
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+        assert pool.size == 2
+        assert pool.get_stats()['wait_timeouts'] == 1
+
+        # Ожидающий получает сессию сразу после возврата
+        threading.Timer(0.05, pool.release, args=(held[0],)).start()
+        assert pool.acquire(timeout=2) is held[0]
+        assert pool.get_stats()['peak_in_use'] == 2
+
+    def test_discard_on_error(self):
+        """После сетевой ошибки сессия закрывается, а не возвращается."""
+        pool = make_pool()
+
+        with pytest.raises(ConnectionError):
+            with pool.lease() as resource:
+                raise ConnectionError("reset")
+
+        assert resource.closed
+        assert pool.size == 0
+
+        # Прочие исключения не портят сессию
+        with pytest.raises(ValueError):
+            with pool.lease() as other:
+                raise ValueError("bad args")
+        assert not other.closed and pool.size == 1
+
+    def test_factory_error_frees_slot(self):
+        """Неудачное создание сессии не занимает место в пуле."""
+        pool = SessionPool(name="ws_pool", factory=lambda: 1 / 0, max_size=1)
+
+        for _ in range(2):
+            with pytest.raises(ZeroDivisionError):
+                pool.acquire(timeout=0.05)
+        assert pool.size == 0
+        assert pool.get_stats()['create_errors'] == 2
+
+    def test_closed_pool(self):
+        """Закрытый пул закрывает свободные сессии и не выдает новые."""
+        pool = make_pool()
+        resource = pool.acquire()
+        idle = pool.acquire()
+        pool.release(idle)
+
+        pool.close()
+        assert idle.closed
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+        # Занятая сессия закрывается при возврате
+        pool.release(resource)
+        assert resource.closed
+        assert pool.size == 0
+
+
+@pytest.mark.unit
+class TestSessionPoolMaintenance:
+    """Фоновое обслуживание пула."""
+
+    def test_probe_failure_evicts(self):
+        """Сессия, не прошедшая пробу, закрывается и заменяется до min_size."""
+        pool = make_pool(min_size=1)
+        resource = pool.acquire()
+        pool.release(resource)
+        resource.alive = False
+
+        result = pool.maintain()
+
+        assert result == {'probed': 1, 'closed': 1, 'created': 1}
+        assert resource.closed
+        assert pool.size == 1
+        assert pool.acquire() is not resource
+
+    def test_idle_eviction_keeps_min_size(self):
+        """Простаивающие сессии закрываются до min_size, начиная со старых."""
+        pool = make_pool(min_size=1, max_size=4, idle_timeout=10)
+        resources = [pool.acquire() for _ in range(3)]
+        for resource in resources:
+            pool.release(resource)
+        for entry in pool._idle:
+            entry.last_used -= 60
+        # Самая свежая из простаивающих остается
+        pool._idle[-1].last_used += 1
+
+        pool.maintain()
+
+        assert pool.size == 1
+        assert pool.get_stats()['evicted_idle'] == 2
+        assert [resource.closed for resource in resources] == [True, True, False]
+
+    def test_top_up_to_min_size(self):
+        """maintain() заранее создает сессии до min_size."""
+        pool = make_pool(min_size=2, max_size=4)
+
+        assert pool.maintain()['created'] == 2
+        assert pool.get_stats()['idle'] == 2
+
+
+class _Response:
+    """Ответ команды в формате pywinrm."""
+
+    status_code = 0
+    std_out = b"ok"
+    std_err = b""
+
+
+class SlowSession:
+    """WinRM сессия, в которой команда занимает заданное время."""
+
+    def __init__(self, delay: float, sessions: list):
+        self.delay = delay
+        self.active = 0
+        sessions.append(self)
+
+    def run_cmd(self, command, args=()):
+        self.active += 1
+        try:
+            if command != 'echo':
+                time.sleep(self.delay)
+                assert self.active == 1, "сессия используется одновременно"
+            return _Response()
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.performance
+class TestWorkstationSessionPool:
+    """Параллельные команды одной рабочей станции."""
+
+    def test_parallel_commands_use_separate_sessions(self):
+        """4 параллельные команды выполняются за время одной, каждая в своей сессии."""
+        sessions = []
+        config = WorkstationConfig(id="ws_parallel", name="ws_parallel", ip_address="127.0.0.1")
+        config.max_sessions = 4
+        manager = WorkstationManager(config, session_factory=lambda cfg: SlowSession(0.2, sessions))
+        assert manager.connect()
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda _: manager.run_command('ldconsole.exe', ['list2']), range(4)))
+            elapsed = time.perf_counter() - started
+
+            assert all(code == 0 for code, _, _ in results)
+            assert len(sessions) == 4
+            assert elapsed < 0.2 * 4 / 2
+
+            stats = manager.get_session_pool_stats()
+            assert stats['total'] == 4 and stats['in_use'] == 0
+            assert stats['peak_in_use'] == 4
+        finally:
+            manager.disconnect()
+
+        assert manager.get_session_pool_stats() == {}
@@ -0,0 +1,292 @@
+"""
+🧪 Тесты симулятора рабочих станций LDPlayer
+
+Проверяет:
+- Вывод ldconsole (list2, runninglist, isrunning) и изменение состояния
+- WorkstationManager, LDPlayerManager и RemoteLDPlayerScanner поверх симулятора
+- Подключение ConnectionPool через фабрику сессий
+- Внедрение сетевых сбоев
+- Опрос парка 50 станций x 200 эмуляторов
+- Статус эмуляторов сканера одним runninglist вместо isrunning на каждый
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.models import EmulatorStatus, OperationStatus, OperationType
+from src.remote.emulator_scanner import (
+    EmulatorInfo, EmulatorScanner, EmulatorStatus as ScannedStatus, LocalLDPlayerScanner
+)
+from src.remote.ldplayer_manager import LDPlayerManager
+from src.remote.protocols import ConnectionPool
+from src.remote.simulator import SimulatedFleet, SimulatedWorkstation
+from src.remote.workstation import WorkstationManager
+
+
+def make_managers(fleet: SimulatedFleet):
+    """Создать менеджеры для всех станций парка."""
+    return [
+        WorkstationManager(config, session_factory=fleet.session_factory)
+        for config in fleet.configs()
+    ]
+
+
+def station_runner(station: SimulatedWorkstation):
+    """ldconsole станции для LocalLDPlayerScanner: один запуск - одна задержка."""
+    def run(args):
+        station.round_trip()
+        return station.ldconsole(args)
+    return run
+
+
+def unknown(names):
+    """Эмуляторы сканера с неизвестным статусом."""
+    return [EmulatorInfo(name=name) for name in names]
+
+
+def close_managers(managers):
+    """Отключить менеджеры и остановить их пулы потоков."""
+    for manager in managers:
+        manager.disconnect()
+        manager.shutdown_executor()
+
+
+@pytest.mark.unit
+class TestSimulatedLDConsole:
+    """Вывод и состояние фейкового ldconsole."""
+
+    def test_list2_format(self):
+        """list2 - 10 полей, у запущенного эмулятора ненулевые handle и pid."""
+        station = SimulatedWorkstation("ws", emulators=3, running=1)
+
+        code, stdout, _ = station.ldconsole(["list2"])
+        lines = stdout.splitlines()
+
+        assert code == 0
+        assert len(lines) == 3
+        running = lines[0].split(",")
+        assert len(running) == 10
+        assert running[1] == "LDPlayer"
+        assert running[2] != "0" and running[4] == "1" and int(running[5]) > 0
+        assert lines[2] == "2,LDPlayer-2,0,0,0,-1,-1,960,540,240"
+
+    def test_launch_and_running_queries(self):
+        """launch/quit меняют вывод runninglist и isrunning."""
+        station = SimulatedWorkstation("ws", emulators=2)
+
+        assert station.ldconsole(["isrunning", "--name", "LDPlayer-1"])[1] == "stop"
+        assert station.ldconsole(["launch", "--name", "LDPlayer-1"])[0] == 0
+        assert station.ldconsole(["isrunning", "--index", "1"])[1] == "running"
+        assert station.ldconsole(["runninglist"])[1] == "LDPlayer-1\r\n"
+
+        station.ldconsole(["quitall"])
+        assert station.running_count == 0
+        assert station.ldconsole(["launch", "--name", "missing"])[0] != 0
+
+    def test_add_returns_index(self):
+        """add возвращает индекс как код возврата и занимает свободный индекс."""
+        station = SimulatedWorkstation("ws", emulators=3)
+        station.ldconsole(["remove", "--name", "LDPlayer-1"])
+
+        assert station.ldconsole(["add"])[0] == 1
+        assert station.ldconsole(["add", "--name", "farm"])[0] == 3
+        assert station.ldconsole(["copy", "--name", "clone", "--from", "farm"])[0] == 4
+        assert [emulator.name for emulator in station.emulators] == [
+            "LDPlayer", "LDPlayer-1", "LDPlayer-2", "farm", "clone"
+        ]
+
+    def test_unknown_command(self):
+        """Неизвестная команда завершается ошибкой, а не исключением."""
+        station = SimulatedWorkstation("ws")
+
+        assert station.execute("ipconfig")[0] == 1
+        assert station.ldconsole(["explode"])[0] == 1
+
+
+@pytest.mark.unit
+class TestManagersOnSimulator:
+    """Менеджеры сервера поверх симулятора."""
+
+    def test_workstation_lifecycle(self):
+        """Список, создание, запуск и остановка эмулятора через WorkstationManager."""
+        fleet = SimulatedFleet(workstations=1, emulators=5, running=2, prefix="sim_life")
+        station = fleet.workstations["sim_life_000"]
+        managers = make_managers(fleet)
+        manager = managers[0]
+
+        try:
+            assert manager.connect()
+            emulators = manager.get_emulators_list()
+            assert len(emulators) == 5
+            assert sum(emu.status == EmulatorStatus.RUNNING for emu in emulators) == 2
+
+            ok, message = manager.create_emulator("farm-1", {"resolution": "1280,720,320", "cpu": 4})
+            assert ok, message
+            created = station.emulators[-1]
+            assert (created.name, created.width, created.cpu) == ("farm-1", 1280, 4)
+
+            assert manager.start_emulator("farm-1")[0]
+            assert station.ldconsole(["isrunning", "--name", "farm-1"])[1] == "running"
+            manager._invalidate_emulators_cache()
+            assert manager.stop_emulator("farm-1")[0]
+            assert station.running_count == 2
+        finally:
+            close_managers(managers)
+
+    async def test_batch_start(self):
+        """Пакетный запуск через LDPlayerManager запускает эмуляторы станции."""
+        fleet = SimulatedFleet(workstations=1, emulators=20, prefix="sim_batch")
+        station = fleet.workstations["sim_batch_000"]
+        managers = make_managers(fleet)
+        manager = LDPlayerManager(managers[0])
+
+        try:
+            names = [emulator.name for emulator in station.emulators] + ["missing"]
+            operations = manager.batch_operation(names, OperationType.START)
+            await manager._execute_batch(manager._operation_queue.get_nowait())
+
+            assert [op.status for op in operations].count(OperationStatus.COMPLETED) == 20
+            assert operations[-1].status == OperationStatus.FAILED
+            assert station.running_count == 20
+        finally:
+            close_managers(managers)
+
+    def test_remote_scanner(self):
+        """RemoteLDPlayerScanner разбирает list2 станции через WinRM скрипт."""
+        fleet = SimulatedFleet(workstations=2, emulators=4, running=1, prefix="sim_scan")
+        config = fleet.configs()[1]
+
+        scanner = EmulatorScanner.create(config.ip_address, session_factory=fleet.session_factory)
+        emulators = scanner.scan()
+
+        assert [emu.name for emu in emulators] == ["LDPlayer", "LDPlayer-1", "LDPlayer-2", "LDPlayer-3"]
+        assert [emu.status for emu in emulators].count(ScannedStatus.RUNNING) == 1
+
+    def test_local_scanner(self, tmp_path):
+        """LocalLDPlayerScanner разбирает list2 станции через переданный запуск ldconsole."""
+        station = SimulatedWorkstation("ws", emulators=3, running=2)
+        scanner = LocalLDPlayerScanner(str(tmp_path), ldconsole_runner=station_runner(station))
+
+        emulators = scanner.scan()
+
+        assert [emu.status for emu in emulators] == [ScannedStatus.RUNNING, ScannedStatus.RUNNING, ScannedStatus.STOPPED]
+
+    def test_status_probe_single_call(self, tmp_path):
+        """Неизвестные статусы локального и удаленного сканера - один runninglist."""
+        fleet = SimulatedFleet(workstations=1, emulators=20, running=5, prefix="sim_probe")
+        station = fleet.workstations["sim_probe_000"]
+        names = [emulator.name for emulator in station.emulators]
+
+        local = unknown(names)
+        LocalLDPlayerScanner(str(tmp_path), ldconsole_runner=station_runner(station))._check_running_status(local)
+        assert station.stats["round_trips"] == 1
+
+        remote = unknown(names)
+        scanner = EmulatorScanner.create(fleet.configs()[0].ip_address, session_factory=fleet.session_factory)
+        scanner._create_session()
+        scanner._check_running_status(remote)
+        # Один PowerShell скрипт на станции
+        assert station.stats["commands"] == 1
+
+        for emulators in (local, remote):
+            assert [emu.status for emu in emulators].count(ScannedStatus.RUNNING) == 5
+            assert ScannedStatus.UNKNOWN not in [emu.status for emu in emulators]
+
+    async def test_connection_pool(self):
+        """ConnectionPool подключает станции через фабрику сессий."""
+        fleet = SimulatedFleet(workstations=3, prefix="sim_pool")
+        pool = ConnectionPool(session_factory=fleet.session_factory)
+
+        try:
+            connections = [pool.get_connection(config) for config in fleet.configs()]
+            results = await pool.connect_all()
+            assert len(results) == 3 and all(results.values())
+
+            assert connections[0].execute_command("echo", ["ping"]) == (0, "ping\r\n", "")
+        finally:
+            pool.cleanup()
+
+
+@pytest.mark.unit
+class TestFailureInjection:
+    """Сетевые сбои симулятора."""
+
+    def test_failure_rate(self):
+        """Доля сбоев соответствует failure_rate и воспроизводима по seed."""
+        def failures(seed):
+            station = SimulatedWorkstation("ws", failure_rate=0.3, seed=seed)
+            for _ in range(1000):
+                try:
+                    station.round_trip()
+                except ConnectionError:
+                    pass
+            return station.stats["failures_injected"]
+
+        assert failures(7) == failures(7)
+        assert 250 < failures(7) < 350
+
+    def test_offline_station(self):
+        """Недоступная станция - подключение не удается."""
+        fleet = SimulatedFleet(workstations=1, prefix="sim_offline")
+        fleet.workstations["sim_offline_000"].online = False
+        managers = make_managers(fleet)
+
+        try:
+            assert not managers[0].connect()
+        finally:
+            close_managers(managers)
+
+
+@pytest.mark.performance
+class TestFleetBenchmark:
+    """Опрос парка на симуляторе."""
+
+    async def test_poll_50_workstations_200_emulators(self):
+        """50 станций x 200 эмуляторов опрашиваются параллельно, а не последовательно."""
+        fleet = SimulatedFleet(workstations=50, emulators=200, running=50,
+                               latency=0.01, jitter=0.005, seed=1, prefix="sim_bench")
+        managers = make_managers(fleet)
+
+        try:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                manager.get_emulators_list_async() for manager in managers
+            ))
+            elapsed = time.perf_counter() - started
+
+            assert sum(len(emulators) for emulators in results) == 10000
+            assert sum(
+                emu.status == EmulatorStatus.RUNNING for emulators in results for emu in emulators
+            ) == 2500
+            # Последовательно: 50 станций x (подключение + list2) x задержка >= 5s
+            assert elapsed < 5.0
+        finally:
+            close_managers(managers)
+
+    def test_status_probe_100_emulators(self, tmp_path):
+        """Статус 100 эмуляторов: runninglist против isrunning на каждый (2ms на запуск)."""
+        station = SimulatedWorkstation("ws", emulators=100, running=30, latency=0.002)
+        run = station_runner(station)
+        names = [emulator.name for emulator in station.emulators]
+
+        # До: отдельный isrunning на каждый эмулятор
+        started = time.perf_counter()
+        before = {name: run(["isrunning", "--name", name])[1] == "running" for name in names}
+        per_emulator = time.perf_counter() - started
+
+        # После: один runninglist
+        emulators = unknown(names)
+        scanner = LocalLDPlayerScanner(str(tmp_path), ldconsole_runner=run)
+        started = time.perf_counter()
+        scanner._check_running_status(emulators)
+        batched = time.perf_counter() - started
+
+        assert {emu.name: emu.status == ScannedStatus.RUNNING for emu in emulators} == before
+        assert station.stats["round_trips"] == 101
+        assert batched * 10 < per_emulator
@@ -0,0 +1,169 @@
+"""
+🔁 Тесты переиспользования WinRM shell
+
+Проверяет:
+- Несколько команд выполняются в одном shell
+- Пересоздание shell после ошибки, простоя и лимита команд
+- Счетчики сэкономленных round-trip
+- WorkstationManager не открывает shell на каждую команду
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.remote.protocols import WinRMShell
+from src.remote.workstation import WorkstationManager
+
+
+class FakeProtocol:
+    """Имитация winrm.Protocol со счетчиками вызовов."""
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+        self.commands = []
+        self.fail_next = False
+        self._next_shell = 0
+
+    def open_shell(self):
+        self.opened += 1
+        self._next_shell += 1
+        return f"shell-{self._next_shell}"
+
+    def close_shell(self, shell_id, close_session=True):
+        self.closed += 1
+
+    def run_command(self, shell_id, command, arguments=()):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("connection reset")
+        self.commands.append((shell_id, command, list(arguments)))
+        return f"cmd-{len(self.commands)}"
+
+    def get_command_output(self, shell_id, command_id):
+        return b"ok", b"", 0
+
+    def cleanup_command(self, shell_id, command_id):
+        pass
+
+
+class FakeSession:
+    """Имитация winrm.Session с протоколом."""
+
+    def __init__(self):
+        self.protocol = FakeProtocol()
+        self.one_shot = 0
+
+    def run_cmd(self, command, args=()):
+        self.one_shot += 1
+        return type("Response", (), {"status_code": 0, "std_out": b"ok", "std_err": b""})()
+
+
+@pytest.mark.unit
+class TestWinRMShell:
+    """Долгоживущий shell."""
+
+    def test_commands_share_one_shell(self):
+        """Все команды идут через один shell."""
+        session = FakeSession()
+        shell = WinRMShell(session)
+
+        for _ in range(5):
+            result = shell.run_cmd("ldconsole.exe", ["list2"])
+            assert result.status_code == 0
+            assert result.std_out == b"ok"
+
+        assert session.protocol.opened == 1
+        assert {shell_id for shell_id, _, _ in session.protocol.commands} == {"shell-1"}
+
+        stats = shell.get_stats()
+        assert stats["commands"] == 5
+        assert stats["reused_commands"] == 4
+        assert stats["round_trips_saved"] == 8
+
+    def test_recycle_after_error(self):
+        """После ошибки shell закрывается и следующий вызов открывает новый."""
+        session = FakeSession()
+        shell = WinRMShell(session)
+        shell.run_cmd("echo", ["test"])
+
+        session.protocol.fail_next = True
+        with pytest.raises(ConnectionError):
+            shell.run_cmd("echo", ["test"])
+        assert not shell.is_open
+
+        shell.run_cmd("echo", ["test"])
+        assert session.protocol.opened == 2
+        assert shell.get_stats()["errors"] == 1
+
+    def test_recycle_when_idle_or_exhausted(self):
+        """Shell пересоздается после простоя и после лимита команд."""
+        session = FakeSession()
+        shell = WinRMShell(session, max_idle_seconds=0, max_commands=1000)
+        shell.run_cmd("echo")
+        shell._last_used -= 1
+        shell.run_cmd("echo")
+        assert session.protocol.opened == 2
+
+        session = FakeSession()
+        shell = WinRMShell(session, max_commands=2)
+        for _ in range(5):
+            shell.run_cmd("echo")
+        assert session.protocol.opened == 3
+        assert shell.get_stats()["shells_recycled"] == 2
+
+    def test_busy_shell_falls_back_to_one_shot(self):
+        """Занятый shell не блокирует другие потоки."""
+        session = FakeSession()
+        shell = WinRMShell(session)
+        shell._lock.acquire()
+        try:
+            result = shell.run_cmd("echo", ["test"])
+        finally:
+            shell._lock.release()
+
+        assert result.status_code == 0
+        assert session.one_shot == 1
+        assert session.protocol.opened == 0
+
+    def test_close(self):
+        """close() закрывает shell на удаленной стороне."""
+        session = FakeSession()
+        shell = WinRMShell(session)
+        shell.run_cmd("echo")
+        shell.close()
+
+        assert session.protocol.closed == 1
+        assert not shell.is_open
+
+
+@pytest.mark.unit
+class TestWorkstationShellReuse:
+    """Переиспользование shell в WorkstationManager."""
+
+    def test_run_command_reuses_shell(self):
+        """Серия команд открывает один shell и не делает лишних проверок."""
+        session = FakeSession()
+        manager = WorkstationManager(WorkstationConfig(
+            id="ws_shell", name="ws_shell", ip_address="127.0.0.1"
+        ), session_factory=lambda config: session)
+        manager._winrm_session = session
+
+        for _ in range(10):
+            assert manager.run_command("ldconsole.exe", ["list2"])[0] == 0
+
+        protocol = session.protocol
+        assert protocol.opened == 1
+        # Первая проверка подключения + 10 команд, без echo перед каждой
+        assert len(protocol.commands) == 11
+        assert manager.get_shell_stats()["round_trips_saved"] == 20
+
+        manager.disconnect()
+        assert protocol.closed == 1
+        assert manager.get_session_pool_stats() == {}
+        # Счетчики накапливаются за время работы менеджера
+        assert manager.get_shell_stats()["commands"] == 11
@@ -0,0 +1,286 @@
+"""
+⚡ Тесты асинхронного выполнения команд WorkstationManager
+
+Проверяет:
+- Команды выполняются в пуле потоков станции, а не в event loop
+- Зависший хост не увеличивает задержку event loop
+- Таймаут превращается в TimeoutError и освобождает корутину
+- Одновременные запросы списка эмуляторов объединяются в один list2
+- Запрос списка не ждет потоков пула, занятых его же ожидающими
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import WorkstationConfig
+from src.core.models import EmulatorStatus
+from src.remote.workstation import WorkstationManager
+
+
+LIST2_OUTPUT = (
+    "0,LDPlayer,0,0,0,-1,-1,960,540,240\r\n"
+    "1,worker-1,132456,264912,2548,1234,5678,960,540,240\r\n"
+)
+
+
+class _Result:
+    """Результат команды в формате pywinrm."""
+
+    def __init__(self, stdout: str = "", status_code: int = 0):
+        self.status_code = status_code
+        self.std_out = stdout.encode("utf-8")
+        self.std_err = b""
+
+
+class FakeSession:
+    """Имитация winrm.Session с настраиваемой задержкой."""
+
+    def __init__(self, delay: float = 0.0, hang: threading.Event = None):
+        self.delay = delay
+        self.hang = hang
+        self.calls = 0
+        self.list_calls = 0
+
+    def run_cmd(self, command, args=()):
+        self.calls += 1
+        if 'list2' in args:
+            self.list_calls += 1
+        if self.hang is not None:
+            self.hang.wait(10)
+        elif self.delay:
+            time.sleep(self.delay)
+        if 'list2' in args:
+            return _Result(LIST2_OUTPUT)
+        return _Result("test")
+
+
+def make_manager(ws_id: str, session: FakeSession) -> WorkstationManager:
+    """Создать менеджер станции с подменённой WinRM сессией."""
+    manager = WorkstationManager(WorkstationConfig(
+        id=ws_id, name=ws_id, ip_address="127.0.0.1", max_concurrent_commands=2
+    ), session_factory=lambda config: session)
+    manager._winrm_session = session
+    return manager
+
+
+async def measure_loop_lag(duration: float, interval: float = 0.01) -> float:
+    """Измерить максимальную задержку event loop за duration секунд."""
+    worst = 0.0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+@pytest.mark.unit
+class TestAsyncCommandExecution:
+    """Асинхронный путь выполнения команд."""
+
+    async def test_emulators_list_async(self):
+        """list2 парсится через асинхронный путь и кэшируется."""
+        session = FakeSession()
+        manager = make_manager("ws_async_list", session)
+        try:
+            emulators = await manager.get_emulators_list_async()
+            assert [emu.name for emu in emulators] == ["LDPlayer", "worker-1"]
+            assert emulators[1].status == EmulatorStatus.RUNNING
+
+            calls = session.calls
+            assert await manager.get_emulators_list_async() is emulators
+            assert session.calls == calls
+        finally:
+            manager.shutdown_executor()
+
+    async def test_timeout_raises_timeout_error(self):
+        """Зависшая команда завершается TimeoutError по таймауту."""
+        hang = threading.Event()
+        manager = make_manager("ws_async_timeout", FakeSession(hang=hang))
+        try:
+            started = time.perf_counter()
+            with pytest.raises(TimeoutError):
+                await manager.run_command_async("echo", ["test"], timeout=0.2)
+            assert time.perf_counter() - started < 1.0
+        finally:
+            hang.set()
+            manager.shutdown_executor()
+
+    async def test_executor_is_bounded(self):
+        """Одновременно выполняется не больше max_concurrent_commands команд."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        manager = make_manager("ws_async_bounded", FakeSession())
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        try:
+            await asyncio.gather(*[manager.run_in_executor(work) for _ in range(8)])
+            assert peak == 2
+        finally:
+            manager.shutdown_executor()
+
+
+@pytest.mark.performance
+class TestHangingHostLatency:
+    """Зависший хост не должен влиять на отзывчивость event loop."""
+
+    async def test_loop_latency_flat_with_hanging_host(self):
+        """Задержка loop не растёт, пока один хост висит, а другой отвечает."""
+        hang = threading.Event()
+        hanging = make_manager("ws_async_hang", FakeSession(hang=hang))
+        healthy = make_manager("ws_async_ok", FakeSession(delay=0.05))
+
+        try:
+            baseline = await measure_loop_lag(0.3)
+
+            stuck = [
+                asyncio.ensure_future(hanging.run_command_async("echo", ["test"], timeout=5))
+                for _ in range(10)
+            ]
+            lag_task = asyncio.ensure_future(measure_loop_lag(0.5))
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*[
+                healthy.run_command_async("echo", ["test"], timeout=5) for _ in range(4)
+            ])
+            healthy_elapsed = time.perf_counter() - started
+            lag = await lag_task
+
+            assert all(code == 0 for code, _, _ in results)
+            # Здоровая станция не ждёт потоки зависшей
+            assert healthy_elapsed < 2.0
+            assert lag < max(0.2, baseline * 5)
+
+            for task in stuck:
+                task.cancel()
+            await asyncio.gather(*stuck, return_exceptions=True)
+        finally:
+            hang.set()
+            hanging.shutdown_executor()
+            healthy.shutdown_executor()
+
+
+@pytest.mark.unit
+class TestEmulatorListSingleFlight:
+    """Объединение одновременных запросов списка эмуляторов."""
+
+    async def test_concurrent_requests_share_one_call(self):
+        """100 одновременных запросов выполняют один list2."""
+        session = FakeSession(delay=0.1)
+        manager = make_manager("ws_flight", session)
+        try:
+            results = await asyncio.gather(*[
+                manager.get_emulators_list_async() for _ in range(100)
+            ])
+
+            assert session.list_calls == 1
+            assert all(len(emulators) == 2 for emulators in results)
+            stats = manager.get_emulators_cache_stats()
+            assert stats.pop('age') < 30
+            assert stats == {
+                'hits': 0, 'coalesced': 99, 'remote_calls': 1,
+                'patches': 0, 'verifications': 0, 'version': 1, 'verified': True,
+                'stale_served': 0, 'background_refreshes': 0, 'refresh_failures': 0, 'stale': False
+            }
+
+            # Повторный запрос обслуживается из кэша
+            await manager.get_emulators_list_async()
+            assert manager.get_emulators_cache_stats()['hits'] == 1
+            assert session.list_calls == 1
+        finally:
+            manager.shutdown_executor()
+
+    async def test_sync_and_async_callers_share_flight(self):
+        """Синхронные вызовы из потоков присоединяются к тому же запросу."""
+        session = FakeSession(delay=0.1)
+        manager = make_manager("ws_flight_mixed", session)
+        try:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(
+                *[manager.get_emulators_list_async() for _ in range(5)],
+                *[loop.run_in_executor(None, manager.get_emulators_list) for _ in range(5)]
+            )
+
+            assert session.list_calls == 1
+            assert all(len(emulators) == 2 for emulators in results)
+        finally:
+            manager.shutdown_executor()
+
+    async def test_cancelled_waiter_does_not_cancel_fetch(self):
+        """Отмена одного ожидающего не отменяет запрос для остальных."""
+        session = FakeSession(delay=0.2)
+        manager = make_manager("ws_flight_cancel", session)
+        try:
+            first = asyncio.ensure_future(manager.get_emulators_list_async())
+            second = asyncio.ensure_future(manager.get_emulators_list_async())
+            await asyncio.sleep(0.05)
+            first.cancel()
+
+            assert len(await second) == 2
+            assert session.list_calls == 1
+        finally:
+            manager.shutdown_executor()
+
+    async def test_pool_followers_do_not_deadlock(self):
+        """Операции в пуле, ждущие общий list2, не блокируют сам запрос."""
+        session = FakeSession(delay=0.1)
+        manager = make_manager("ws_flight_pool", session)
+        release = threading.Event()
+
+        def operation():
+            # Как start_emulator: поток пула ждет список через find_emulator
+            release.wait(5)
+            return manager.get_emulators_list()
+
+        try:
+            loop = asyncio.get_running_loop()
+            jobs = [loop.run_in_executor(manager._get_executor(), operation)
+                    for _ in range(manager._max_concurrent_commands)]
+            leader = asyncio.ensure_future(manager.get_emulators_list_async(timeout=5))
+            await asyncio.sleep(0.01)
+            release.set()
+
+            results = await asyncio.wait_for(asyncio.gather(leader, *jobs), 3)
+
+            assert all(len(emulators) == 2 for emulators in results)
+            assert session.list_calls == 1
+        finally:
+            release.set()
+            # При взаимной блокировке ожидающие в пуле освобождаются, чтобы тест упал, а не завис
+            flight = manager._emulators_flight
+            if flight is not None and not flight.done():
+                flight.set_result([])
+            manager.shutdown_executor()
+
+    async def test_invalidation_starts_fresh_fetch(self):
+        """После изменения на станции результат старого запроса не кэшируется."""
+        session = FakeSession(delay=0.1)
+        manager = make_manager("ws_flight_stale", session)
+        try:
+            stale = asyncio.ensure_future(manager.get_emulators_list_async())
+            await asyncio.sleep(0.02)
+            manager._invalidate_emulators_cache()
+
+            await manager.get_emulators_list_async()
+            await stale
+
+            assert session.list_calls == 2
+            assert manager._emulators_cache is not None
+        finally:
+            manager.shutdown_executor()
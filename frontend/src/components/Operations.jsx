@@ -1,24 +1,67 @@
 import { useState, useEffect } from 'react';
 import { api } from '../services/api';
 
+// Long-poll: сервер отвечает при завершении операции или через WAIT_SECONDS
+const WAIT_SECONDS = 30;
+// Одновременно ожидается не больше MAX_WATCHED самых старых незавершенных операций
+const MAX_WATCHED = 3;
+// Без незавершенных операций список перечитывается с этим интервалом
+const IDLE_REFRESH_MS = 15000;
+
+const isActive = (op) => ['pending', 'running'].includes(String(op.status).toLowerCase());
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+const byAge = (a, b) => new Date(a.created_at) - new Date(b.created_at);
+
 export default function Operations() {
   const [operations, setOperations] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
   useEffect(() => {
-    fetchOperations();
-    const interval = setInterval(fetchOperations, 3000); // Real-time updates
-    return () => clearInterval(interval);
+    let stopped = false;
+    let controller = null;
+
+    // Вместо опроса раз в 3 секунды список перечитывается, когда
+    // завершается одна из самых старых незавершенных операций
+    const watch = async () => {
+      while (!stopped) {
+        const current = await fetchOperations();
+        if (stopped) break;
+        const active = current.filter(isActive).sort(byAge).slice(0, MAX_WATCHED);
+        if (active.length > 0) {
+          controller = new AbortController();
+          const { signal } = controller;
+          await Promise.race(
+            active.map(op => api.getOperation(op.id, WAIT_SECONDS, signal)
+              .catch(() => signal.aborted || sleep(IDLE_REFRESH_MS)))
+          );
+          // Остальные long-poll запросы раунда больше не нужны
+          controller.abort();
+          controller = null;
+        } else {
+          await sleep(IDLE_REFRESH_MS);
+        }
+      }
+    };
+
+    watch();
+    return () => {
+      stopped = true;
+      if (controller) controller.abort();
+    };
   }, []);
 
   const fetchOperations = async () => {
     try {
-      const response = await api.get('/api/operations?skip=0&limit=50');
-      setOperations(response.data || []);
+      const response = await api.getOperations();
+      const list = Array.isArray(response) ? response : (response.data || []);
+      setOperations(list);
       setError(null);
+      return list;
     } catch (err) {
       setError(err.message);
+      await sleep(IDLE_REFRESH_MS);
+      return [];
     } finally {
       setLoading(false);
     }
@@ -52,7 +52,9 @@ class ApiClient {
 
       return data;
     } catch (error) {
-      console.error('API Error:', error);
+      if (error.name !== 'AbortError') {
+        console.error('API Error:', error);
+      }
       throw error;
     }
   }
@@ -145,8 +147,11 @@ class ApiClient {
     return this.request('/api/operations');
   }
 
-  async getOperation(operation_id) {
-    return this.request(`/api/operations/${operation_id}`);
+  async getOperation(operation_id, wait = 0, signal = undefined) {
+    // wait > 0: long-poll, ответ приходит при завершении операции или по таймауту;
+    // signal (AbortController) прерывает ожидание
+    const query = wait > 0 ? `?wait=${wait}` : '';
+    return this.request(`/api/operations/${operation_id}${query}`, { signal });
   }
 
   async cancelOperation(operation_id) {